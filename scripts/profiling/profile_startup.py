@@ -0,0 +1,66 @@
+"""Profile cold-start cost: module import time and Numba JIT warm-up."""
+
+import os
+import subprocess
+import sys
+import time
+
+TOP_N = 15
+
+
+def profile_imports():
+    """Runs `python -X importtime` in a fresh interpreter and prints the top modules."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(["src", os.environ.get("PYTHONPATH", "")]),
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import crypto_signals.main"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.strip()))
+
+    if not rows:
+        print("Import failed:")
+        print(proc.stderr[-2000:])
+        return
+
+    total = next(c for c, _, m in rows if m == "crypto_signals.main")
+    print(f"import crypto_signals.main: {total / 1000:.1f} ms")
+
+    print(f"\nTop {TOP_N} by cumulative time:")
+    for cumulative, _, module in sorted(rows, reverse=True)[:TOP_N]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    print(f"\nTop {TOP_N} by self time:")
+    for _, self_time, module in sorted(rows, key=lambda r: r[1], reverse=True)[:TOP_N]:
+        print(f"  {self_time / 1000:8.1f} ms  {module}")
+
+
+def profile_jit():
+    """Times warmup_jit(); loads from the Numba cache instead of compiling when warm."""
+    from crypto_signals.analysis.structural import warmup_jit
+
+    start = time.perf_counter()
+    warmup_jit()
+    end = time.perf_counter()
+    cache_dir = os.environ.get("NUMBA_CACHE_DIR", "__pycache__ (default)")
+    print(f"\nwarmup_jit: {(end - start) * 1000:.1f} ms (NUMBA_CACHE_DIR={cache_dir})")
+
+
+def main():
+    """Prints the import-time report followed by JIT warm-up timing."""
+    profile_imports()
+    profile_jit()
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,7 @@ CREATE TABLE IF NOT EXISTS `{{PROJECT_ID}}.crypto_analytics.fact_trades` (
     exit_time TIMESTAMP,
     exit_reason STRING,
     max_favorable_excursion FLOAT64,
+    max_adverse_excursion FLOAT64,
     pnl_pct NUMERIC,
     pnl_usd NUMERIC,
     fees_usd NUMERIC,
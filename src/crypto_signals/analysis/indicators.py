@@ -100,33 +100,38 @@ class TechnicalIndicators:
         # Default pandas-ta kc uses EMA for basis.
         df.ta.kc(length=20, scalar=2.0, mamode="ema", append=True)
 
-        # 6. Chandelier Exit (Long): High_Max(22) - 3 * ATR(22)
-        # Note: Standard Chandelier uses 22 periods. We can stick to 14/20 consistency
-        # or use standard. Plan said "High_Max - 3*ATR".
-        # Let's compute it explicitly using rolling max high.
-        # We need a longer lookback for the trend typically. 22 is standard.
-        # Using 22 to match standard definition unless specified otherwise.
-        atr_period = 22
-        lookback = 22
-
-        # Calculate ATR-22 if not present (we usually have 14)
-        # We can't rely on 14 for a 22-period chandelier perfectly, but often 14 is used.
-        # Let's assume standard chandelier uses its own period.
-        if f"ATRr_{atr_period}" not in df.columns:
-            df.ta.atr(length=atr_period, append=True)
-
-        atr_col_chand = f"ATRr_{atr_period}"
+        # 6. Chandelier Exit (22, 3.0)
+        TechnicalIndicators.add_chandelier_exit(df)
+
+        return df
+
+    @staticmethod
+    def add_chandelier_exit(
+        df: pd.DataFrame, period: int = 22, multiplier: float = 3.0
+    ) -> pd.DataFrame:
+        """
+        Add Chandelier Exit trailing-stop levels in-place.
+
+        Columns added (if ATR can be computed):
+        - CHANDELIER_EXIT_LONG: High_Max(period) - multiplier * ATR(period)
+        - CHANDELIER_EXIT_SHORT: Low_Min(period) + multiplier * ATR(period)
+        """
+        # Standard Chandelier uses its own 22-period ATR (we usually have 14)
+        if f"ATRr_{period}" not in df.columns:
+            df.ta.atr(length=period, append=True)
+
+        atr_col_chand = f"ATRr_{period}"
         # Fallback if pandas-ta names it differently
-        if atr_col_chand not in df.columns and f"ATR_{atr_period}" in df.columns:
-            atr_col_chand = f"ATR_{atr_period}"
+        if atr_col_chand not in df.columns and f"ATR_{period}" in df.columns:
+            atr_col_chand = f"ATR_{period}"
 
         if atr_col_chand in df.columns:
-            high_max = df["high"].rolling(window=lookback).max()
-            low_min = df["low"].rolling(window=lookback).min()
+            high_max = df["high"].rolling(window=period).max()
+            low_min = df["low"].rolling(window=period).min()
             # Chandelier Exit Long: trails up as price rises
-            df["CHANDELIER_EXIT_LONG"] = high_max - (df[atr_col_chand] * 3.0)
+            df["CHANDELIER_EXIT_LONG"] = high_max - (df[atr_col_chand] * multiplier)
             # Chandelier Exit Short: trails down as price falls
-            df["CHANDELIER_EXIT_SHORT"] = low_min + (df[atr_col_chand] * 3.0)
+            df["CHANDELIER_EXIT_SHORT"] = low_min + (df[atr_col_chand] * multiplier)
 
         return df
 
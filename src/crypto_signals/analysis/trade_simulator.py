@@ -0,0 +1,213 @@
+"""
+Theoretical Trade Simulator.
+
+Replays signals that were never executed (rejected, expired, invalidated)
+against daily bars using the same exit ladder as live trading:
+
+1. Before TP1: full position, stop at ``suggested_stop``.
+2. TP1 hit: scale out 50% and move the stop to breakeven (entry).
+   If the signal has no TP2, TP1 closes the whole position.
+3. TP2 hit: scale out 50% of the remainder and move the stop to TP1.
+4. Runner: exits at TP3, on its stop, or when the close crosses the
+   Chandelier Exit (trailing).
+
+All signals for one symbol are simulated together: entry offsets are located
+with ``searchsorted`` and each bar is evaluated once for every open signal
+with vectorized NumPy operations. Shorts are simulated in negated price space
+so a single (long) code path serves both sides.
+
+Within a bar, targets take priority over stops (optimistic, matching the
+previous TP1/SL-only simulation), and the Chandelier check uses the close.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Fractions closed at each target (mirrors main.py TP automation)
+TP1_SCALE_OUT = 0.5
+TP2_SCALE_OUT = 0.5
+
+EXIT_TP1 = "THEORETICAL_TP1"
+EXIT_TP2 = "THEORETICAL_TP2"
+EXIT_TP3 = "THEORETICAL_TP3"
+EXIT_SL = "THEORETICAL_SL"
+EXIT_TRAIL = "THEORETICAL_TRAIL"
+EXIT_OPEN = "THEORETICAL_OPEN"
+
+# Ladder stages
+_PRE_TP1, _AFTER_TP1, _AFTER_TP2, _CLOSED = 0, 1, 2, 3
+
+
+def _column(bars: pd.DataFrame, name: str) -> np.ndarray:
+    """Float column as an array (all NaN if missing)."""
+    if name not in bars.columns:
+        return np.full(len(bars), np.nan)
+    return bars[name].to_numpy(dtype=float)
+
+
+def simulate_signals(
+    bars: pd.DataFrame,
+    entry_times: Any,
+    entry_price: np.ndarray,
+    stop_loss: np.ndarray,
+    take_profit_1: np.ndarray,
+    take_profit_2: np.ndarray,
+    take_profit_3: np.ndarray,
+    is_long: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate the exit ladder for many signals on one symbol's daily bars.
+
+    Args:
+        bars: Daily OHLC bars indexed by timestamp (sorted). Optional
+            CHANDELIER_EXIT_LONG / CHANDELIER_EXIT_SHORT columns enable the
+            trailing runner exit.
+        entry_times: Signal creation times (one per signal). Simulation starts
+            on the bar of the creation day.
+        entry_price: Entry prices.
+        stop_loss: Initial stop-loss levels.
+        take_profit_1: TP1 levels.
+        take_profit_2: TP2 levels (NaN if absent).
+        take_profit_3: TP3 levels (NaN if absent).
+        is_long: True for buy signals, False for sell signals.
+
+    Returns:
+        Dict of per-signal arrays:
+            exit_price: Quantity-weighted exit price (NaN if no bars after entry).
+            exit_reason: Furthest stage reached (EXIT_* constant, None if no bars).
+            exit_offset: Bar position of the final exit (-1 if no bars).
+            entry_offset: Bar position of the first simulated bar.
+    """
+    count = len(entry_price)
+    n_bars = len(bars)
+    index = pd.DatetimeIndex(bars.index)
+
+    entry_days = pd.DatetimeIndex(pd.to_datetime(entry_times, utc=True)).floor("D")
+    if index.tz is None:
+        entry_days = entry_days.tz_convert(None)
+    else:
+        entry_days = entry_days.tz_convert(index.tz)
+    entry_offset = index.searchsorted(entry_days, side="left")
+    has_bars = entry_offset < n_bars
+
+    # Negated price space for shorts: a short's high is -low and vice versa
+    sign = np.where(is_long, 1.0, -1.0)
+    entry = entry_price * sign
+    tp1 = take_profit_1 * sign
+    tp2 = take_profit_2 * sign
+    tp3 = take_profit_3 * sign
+    has_tp2 = ~np.isnan(tp2)
+
+    high, low, close = (_column(bars, c) for c in ("high", "low", "close"))
+    chandelier_long = _column(bars, "CHANDELIER_EXIT_LONG")
+    chandelier_short = _column(bars, "CHANDELIER_EXIT_SHORT")
+
+    stage = np.where(has_bars, _PRE_TP1, _CLOSED)
+    stop = stop_loss * sign
+    remaining = np.ones(count)
+    realized = np.zeros(count)  # Sum of qty * price (signed space)
+    exit_offset = np.full(count, -1)
+    reason = np.full(count, None, dtype=object)
+
+    def close_out(mask, fraction, price, t, label, stage_after):
+        """Close ``fraction`` of the remaining quantity for masked signals."""
+        qty = remaining * fraction
+        realized[mask] += (qty * price)[mask]
+        remaining[mask] -= qty[mask]
+        exit_offset[mask] = t
+        reason[mask] = label[mask] if isinstance(label, np.ndarray) else label
+        stage[mask] = (
+            stage_after[mask] if isinstance(stage_after, np.ndarray) else stage_after
+        )
+
+    start = int(entry_offset[has_bars].min()) if has_bars.any() else n_bars
+    for t in range(start, n_bars):
+        started = entry_offset <= t
+        open_now = started & (stage != _CLOSED)
+        if not open_now.any():
+            if started.all():
+                break
+            continue
+
+        bar_high = np.where(is_long, high[t], -low[t])
+        bar_low = np.where(is_long, low[t], -high[t])
+        bar_close = close[t] * sign
+        chandelier = np.where(is_long, chandelier_long[t], -chandelier_short[t])
+        stage_at_open = stage.copy()
+
+        # Stage 0: TP1 (scale out, stop -> breakeven) or initial stop
+        pre = open_now & (stage_at_open == _PRE_TP1)
+        tp1_hit = pre & (bar_high >= tp1)
+        sl_hit = pre & ~tp1_hit & (bar_low <= stop)
+        close_out(
+            tp1_hit,
+            np.where(has_tp2, TP1_SCALE_OUT, 1.0),
+            tp1,
+            t,
+            EXIT_TP1,
+            np.where(has_tp2, _AFTER_TP1, _CLOSED),
+        )
+        stop = np.where(tp1_hit, entry, stop)
+        close_out(sl_hit, 1.0, stop, t, EXIT_SL, _CLOSED)
+
+        # Stage 1: TP2 (scale out, stop -> TP1), breakeven stop, or trail
+        mid = open_now & (stage_at_open == _AFTER_TP1)
+        tp2_hit = mid & (bar_high >= tp2)
+        close_out(tp2_hit, TP2_SCALE_OUT, tp2, t, EXIT_TP2, _AFTER_TP2)
+        stop = np.where(tp2_hit, tp1, stop)
+
+        # Stage 2 runner: TP3 target
+        runner = open_now & (stage_at_open == _AFTER_TP2)
+        tp3_hit = runner & (bar_high >= tp3)
+        close_out(tp3_hit, 1.0, tp3, t, EXIT_TP3, _CLOSED)
+
+        # Stages 1-2: stop, then Chandelier close-cross for what remains
+        managed = (mid & ~tp2_hit) | (runner & ~tp3_hit)
+        stop_hit = managed & (bar_low <= stop)
+        trail_hit = managed & ~stop_hit & (bar_close < chandelier)
+        # A breakeven/TP1 stop keeps the furthest target reached as the reason
+        stop_reason = np.where(stage_at_open == _AFTER_TP2, EXIT_TP2, EXIT_TP1)
+        close_out(stop_hit, 1.0, stop, t, stop_reason, _CLOSED)
+        close_out(trail_hit, 1.0, bar_close, t, EXIT_TRAIL, _CLOSED)
+
+    # Whatever is still open is marked to the last close
+    still_open = has_bars & (stage != _CLOSED)
+    if n_bars:
+        last_close = close[-1] * sign
+        realized[still_open] += (remaining * last_close)[still_open]
+        exit_offset[still_open] = n_bars - 1
+        reason[still_open & (stage == _PRE_TP1)] = EXIT_OPEN
+
+    exit_price = np.where(has_bars, realized * sign, np.nan)
+    return {
+        "exit_price": exit_price,
+        "exit_reason": reason,
+        "exit_offset": exit_offset,
+        "entry_offset": entry_offset,
+    }
+
+
+def simulate_signal(
+    bars: pd.DataFrame,
+    entry_time: Any,
+    entry_price: float,
+    stop_loss: float,
+    take_profit_1: float,
+    take_profit_2: Optional[float] = None,
+    take_profit_3: Optional[float] = None,
+    is_long: bool = True,
+) -> Dict[str, Any]:
+    """Simulate a single signal (convenience wrapper around simulate_signals)."""
+    result = simulate_signals(
+        bars,
+        [entry_time],
+        np.array([entry_price], dtype=float),
+        np.array([stop_loss], dtype=float),
+        np.array([take_profit_1], dtype=float),
+        np.array([np.nan if take_profit_2 is None else take_profit_2], dtype=float),
+        np.array([np.nan if take_profit_3 is None else take_profit_3], dtype=float),
+        np.array([is_long]),
+    )
+    return {key: values[0] for key, values in result.items()}
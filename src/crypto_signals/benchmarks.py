@@ -0,0 +1,543 @@
+"""
+Analysis Benchmark Suite.
+
+Repeatable timings for the signal hot path on seeded synthetic OHLCV, stored
+as JSON and compared against a saved baseline:
+- ``TechnicalIndicators.add_all_indicators``
+- ``find_pivots`` / ``_zigzag_core`` / ``fast_pip``
+- ``PatternAnalyzer.check_patterns``
+- ``HarmonicAnalyzer.scan_all_patterns``
+- ``SignalGenerator.generate_signals`` / ``check_exits`` (per batch of symbols)
+
+Every sample is one timed call; per-call setup (fresh DataFrame copies) is
+excluded. Regressions are flagged only when the slowdown is both
+statistically significant (one-sided Mann-Whitney U on the raw samples) and
+larger than a minimum relative effect, so run-to-run noise does not fail the
+gate. Absolute budgets pin the documented latency claims (sub-5ms ZigZag on
+10^6 points, sub-2ms harmonic scans).
+
+Usage (see ``crypto_signals.scripts.diagnostics.benchmark`` for the CLI):
+    >>> results = run_suite("quick")
+    >>> save_results(results, "temp/benchmarks/baseline_quick.json")
+    >>> report = compare_results(load_results("baseline.json"), results)
+    >>> report.passed
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+RESULTS_SCHEMA_VERSION = 1
+
+SUITE_QUICK = "quick"
+SUITE_FULL = "full"
+
+# Bar counts exercised per suite (single symbol), and symbol counts for the
+# per-run SignalGenerator cases (production lookback of 365 daily bars)
+SUITE_BARS: Dict[str, Tuple[int, ...]] = {
+    SUITE_QUICK: (250, 1_000),
+    SUITE_FULL: (250, 1_000, 10_000, 100_000, 1_000_000),
+}
+SUITE_SYMBOLS: Dict[str, Tuple[int, ...]] = {
+    SUITE_QUICK: (1, 10),
+    SUITE_FULL: (1, 10, 100, 1_000),
+}
+SIGNAL_LOOKBACK_BARS = 365
+
+# Daily bars until the index would pass pandas' Timestamp range, then minutes
+DAILY_INDEX_MAX_BARS = 90_000
+
+DEFAULT_SEED = 42
+DEFAULT_MIN_SAMPLES = 5
+DEFAULT_MAX_SAMPLES = 50
+DEFAULT_MAX_TIME = 2.0  # seconds of sampling per case
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_SLOWDOWN = 0.10  # 10% slower median before a shift counts
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Absolute latency budget (median seconds) for one benchmark."""
+
+    benchmark: str
+    max_seconds: float
+    bars: Optional[int] = None  # None: every size
+    claim: str = ""
+
+    def applies_to(self, result: "BenchmarkResult") -> bool:
+        if result.name != self.benchmark:
+            return False
+        return self.bars is None or result.params.get("bars") == self.bars
+
+
+BUDGETS: Tuple[Budget, ...] = (
+    Budget(
+        "structural.zigzag_core",
+        0.005,
+        bars=1_000_000,
+        claim="structural.py: sub-5ms ZigZag on 10^6 data points",
+    ),
+    Budget(
+        "harmonics.scan_all_patterns",
+        0.002,
+        claim="harmonics.py: sub-2ms harmonic scans",
+    ),
+)
+
+
+def synthetic_ohlcv(
+    bars: int, seed: int = DEFAULT_SEED, start: str = "2000-01-01"
+) -> pd.DataFrame:
+    """
+    Seeded OHLCV random walk with volatility regimes.
+
+    Regime switches produce trends, ranges and sharp reversals, so pivots,
+    candlestick and harmonic detectors all have something to find.
+
+    Args:
+        bars: Number of rows.
+        seed: RNG seed; the same seed always yields the same frame.
+        start: First timestamp (UTC).
+
+    Returns:
+        DataFrame indexed by UTC timestamp with open/high/low/close/volume.
+    """
+    rng = np.random.default_rng(seed)
+    regime_vol = rng.choice([0.01, 0.02, 0.04], size=bars // 50 + 1)
+    regime_drift = rng.normal(0.0, 0.002, size=bars // 50 + 1)
+    vol = np.repeat(regime_vol, 50)[:bars]
+    drift = np.repeat(regime_drift, 50)[:bars]
+
+    close = 100.0 * np.exp(np.cumsum(rng.normal(drift, vol)))
+    open_ = close * (1 + rng.normal(0.0, vol / 4))
+    wick = np.abs(rng.normal(0.0, vol / 2, size=(2, bars)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.lognormal(10.0, 1.0, size=bars) * (1 + vol * 50)
+
+    freq = "D" if bars <= DAILY_INDEX_MAX_BARS else "min"
+    index = pd.date_range(start, periods=bars, freq=freq, tz="UTC", name="timestamp")
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=index,
+    )
+
+
+class _NullRepository:
+    """In-memory stand-in so SignalGenerator cases never touch Firestore."""
+
+    def get_open_position_by_symbol(self, symbol: str) -> None:
+        return None
+
+    def get_most_recent_exit(self, **kwargs: Any) -> None:
+        return None
+
+
+# A case maps its parameters to (prepare, run): prepare() builds the per-call
+# arguments outside the timer, run(*args) is the timed call.
+CaseFactory = Callable[..., Tuple[Callable[[], tuple], Callable[..., Any]]]
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One benchmark and the sizes it runs at."""
+
+    name: str
+    factory: CaseFactory
+    scale: str  # "bars" or "symbols"
+    max_size: Optional[int] = None  # Skip larger sizes (super-linear cases)
+
+    def sizes(self, suite: str) -> List[int]:
+        grid = SUITE_BARS[suite] if self.scale == "bars" else SUITE_SYMBOLS[suite]
+        return [n for n in grid if self.max_size is None or n <= self.max_size]
+
+
+def _indicators_case(bars: int, seed: int):
+    from crypto_signals.analysis.indicators import TechnicalIndicators
+
+    df = synthetic_ohlcv(bars, seed)
+    return (lambda: (df.copy(),)), TechnicalIndicators.add_all_indicators
+
+
+def _find_pivots_case(bars: int, seed: int):
+    from crypto_signals.analysis.structural import find_pivots
+
+    df = synthetic_ohlcv(bars, seed)
+    return (lambda: (df,)), find_pivots
+
+
+def _zigzag_case(bars: int, seed: int):
+    from crypto_signals.analysis.structural import _zigzag_core
+
+    df = synthetic_ohlcv(bars, seed)
+    highs = df["high"].to_numpy(np.float64)
+    lows = df["low"].to_numpy(np.float64)
+    return (lambda: (highs, lows, 0.05)), _zigzag_core
+
+
+def _fast_pip_case(bars: int, seed: int):
+    from crypto_signals.analysis.structural import fast_pip
+
+    df = synthetic_ohlcv(bars, seed)
+    return (lambda: (df,)), fast_pip
+
+
+def _check_patterns_case(bars: int, seed: int):
+    from crypto_signals.analysis.indicators import TechnicalIndicators
+    from crypto_signals.analysis.patterns import PatternAnalyzer
+
+    df = TechnicalIndicators.add_all_indicators(synthetic_ohlcv(bars, seed))
+    return (lambda: (df,)), lambda frame: PatternAnalyzer(frame).check_patterns()
+
+
+def _harmonics_case(bars: int, seed: int):
+    from crypto_signals.analysis.harmonics import HarmonicAnalyzer
+    from crypto_signals.analysis.structural import find_pivots
+
+    pivots = find_pivots(synthetic_ohlcv(bars, seed))
+    return (lambda: (pivots,)), lambda p: HarmonicAnalyzer(p).scan_all_patterns()
+
+
+def _signal_generator_case(method: str):
+    def factory(symbols: int, seed: int):
+        from crypto_signals.domain.schemas import AssetClass
+        from crypto_signals.engine.signal_generator import SignalGenerator
+
+        repo = _NullRepository()
+        generator = SignalGenerator(
+            market_provider=None,  # type: ignore[arg-type]  # Frames are passed in
+            signal_repo=repo,
+            position_repo=repo,
+        )
+        frames = [
+            (f"SYM{i}/USD", synthetic_ohlcv(SIGNAL_LOOKBACK_BARS, seed + i))
+            for i in range(symbols)
+        ]
+
+        def prepare():
+            return ([(symbol, df.copy()) for symbol, df in frames],)
+
+        def run(batch):
+            for symbol, df in batch:
+                if method == "generate_signals":
+                    generator.generate_signals(symbol, AssetClass.CRYPTO, dataframe=df)
+                else:
+                    generator.check_exits([], symbol, AssetClass.CRYPTO, dataframe=df)
+
+        return prepare, run
+
+    return factory
+
+
+CASES: Tuple[BenchmarkCase, ...] = (
+    BenchmarkCase("indicators.add_all_indicators", _indicators_case, "bars"),
+    BenchmarkCase("structural.find_pivots", _find_pivots_case, "bars"),
+    BenchmarkCase("structural.zigzag_core", _zigzag_case, "bars"),
+    BenchmarkCase("structural.fast_pip", _fast_pip_case, "bars"),
+    # check_patterns grows super-linearly (~15s at 10k bars)
+    BenchmarkCase(
+        "patterns.check_patterns", _check_patterns_case, "bars", max_size=10_000
+    ),
+    BenchmarkCase("harmonics.scan_all_patterns", _harmonics_case, "bars"),
+    BenchmarkCase(
+        "signal_generator.generate_signals",
+        _signal_generator_case("generate_signals"),
+        "symbols",
+    ),
+    BenchmarkCase(
+        "signal_generator.check_exits",
+        _signal_generator_case("check_exits"),
+        "symbols",
+    ),
+)
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing samples (seconds per call) for one case at one size."""
+
+    name: str
+    params: Dict[str, int]
+    samples: List[float]
+
+    @property
+    def key(self) -> str:
+        args = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{args}]"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "name": self.name,
+            "params": self.params,
+            "unit": "seconds",
+            "median": self.median,
+            "mean": statistics.fmean(ordered),
+            "min": ordered[0],
+            "max": ordered[-1],
+            "p95": ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)],
+            "samples": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BenchmarkResult":
+        return cls(data["name"], dict(data["params"]), list(data["samples"]))
+
+
+def measure(
+    prepare: Callable[[], tuple],
+    run: Callable[..., Any],
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+    max_time: float = DEFAULT_MAX_TIME,
+) -> List[float]:
+    """
+    Time ``run(*prepare())`` repeatedly after one untimed warm-up call.
+
+    Sampling stops after ``max_samples`` or once ``max_time`` seconds have
+    been spent, but never before ``min_samples``.
+    """
+    run(*prepare())  # Warm-up: JIT compilation, lazy imports, caches
+
+    samples: List[float] = []
+    deadline = time.perf_counter() + max_time
+    while len(samples) < max_samples:
+        args = prepare()
+        start = time.perf_counter_ns()
+        run(*args)
+        samples.append((time.perf_counter_ns() - start) / 1e9)
+        if len(samples) >= min_samples and time.perf_counter() >= deadline:
+            break
+    return samples
+
+
+def run_suite(
+    suite: str = SUITE_QUICK,
+    only: Optional[Sequence[str]] = None,
+    seed: int = DEFAULT_SEED,
+    min_samples: int = DEFAULT_MIN_SAMPLES,
+    max_samples: int = DEFAULT_MAX_SAMPLES,
+    max_time: float = DEFAULT_MAX_TIME,
+) -> List[BenchmarkResult]:
+    """
+    Run every case of a suite at each of its sizes.
+
+    Args:
+        suite: SUITE_QUICK (CI-sized) or SUITE_FULL (up to 1M bars / 1000 symbols).
+        only: Substrings; keep cases whose key contains any of them.
+        seed: Synthetic data seed (fixed so runs are comparable).
+
+    Returns:
+        One result per case and size, in suite order.
+    """
+    if suite not in SUITE_BARS:
+        raise ValueError(f"Unknown benchmark suite: {suite}")
+
+    from crypto_signals.analysis.structural import warmup_jit
+
+    warmup_jit()
+    results = []
+    for case in CASES:
+        for size in case.sizes(suite):
+            result = BenchmarkResult(case.name, {case.scale: size}, [])
+            if only and not any(pattern in result.key for pattern in only):
+                continue
+            prepare, run = case.factory(size, seed)
+            result.samples = measure(prepare, run, min_samples, max_samples, max_time)
+            logger.info(
+                f"{result.key}: median {result.median * 1e3:.3f}ms "
+                f"({len(result.samples)} samples)"
+            )
+            results.append(result)
+    return results
+
+
+def _environment() -> Dict[str, Any]:
+    versions = {"python": platform.python_version()}
+    for module in ("numpy", "pandas", "numba"):
+        mod = sys.modules.get(module)
+        versions[module] = getattr(mod, "__version__", None)
+    return {
+        **versions,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def save_results(
+    results: Sequence[BenchmarkResult], path: str, suite: str = SUITE_QUICK
+) -> None:
+    """Write results (raw samples included) as a JSON baseline file."""
+    payload = {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "suite": suite,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "results": {r.key: r.to_dict() for r in results},
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_results(path: str) -> List[BenchmarkResult]:
+    """Read a results file written by ``save_results``."""
+    with open(path, encoding="utf-8") as f:
+        payload = json.load(f)
+    version = payload.get("schema_version")
+    if version != RESULTS_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported benchmark results schema: {version}")
+    return [BenchmarkResult.from_dict(r) for r in payload["results"].values()]
+
+
+def mann_whitney_greater(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    One-sided Mann-Whitney U p-value for "current is slower than baseline".
+
+    Normal approximation with tie and continuity corrections; distribution
+    free, so skewed timing samples and outliers do not inflate significance.
+    """
+    n1, n2 = len(current), len(baseline)
+    n = n1 + n2
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+
+    rank_sum = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        ties = j - i + 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        tie_term += ties**3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0  # Every sample identical
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Comparison:
+    """Current vs baseline for one benchmark key."""
+
+    key: str
+    baseline_median: float
+    current_median: float
+    p_value: float
+    regressed: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.current_median / self.baseline_median
+
+
+@dataclass
+class BudgetCheck:
+    """A budgeted benchmark's median against its (scaled) limit."""
+
+    key: str
+    budget: Budget
+    limit: float
+    median: float
+
+    @property
+    def exceeded(self) -> bool:
+        return self.median > self.limit
+
+
+@dataclass
+class ComparisonReport:
+    """Outcome of a baseline comparison; ``passed`` gates CI."""
+
+    comparisons: List[Comparison] = field(default_factory=list)
+    budgets: List[BudgetCheck] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)  # In baseline, not in current
+
+    @property
+    def regressions(self) -> List[Comparison]:
+        return [c for c in self.comparisons if c.regressed]
+
+    @property
+    def budget_violations(self) -> List[BudgetCheck]:
+        return [b for b in self.budgets if b.exceeded]
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions and not self.budget_violations
+
+
+def check_budgets(
+    results: Sequence[BenchmarkResult], budget_scale: float = 1.0
+) -> List[BudgetCheck]:
+    """
+    Check results against BUDGETS.
+
+    Args:
+        budget_scale: Multiplier for every limit, for runners slower than the
+            hardware the claims were measured on.
+    """
+    return [
+        BudgetCheck(result.key, budget, budget.max_seconds * budget_scale, result.median)
+        for result in results
+        for budget in BUDGETS
+        if budget.applies_to(result)
+    ]
+
+
+def compare_results(
+    baseline: Sequence[BenchmarkResult],
+    current: Sequence[BenchmarkResult],
+    alpha: float = DEFAULT_ALPHA,
+    min_slowdown: float = DEFAULT_MIN_SLOWDOWN,
+    budget_scale: float = 1.0,
+) -> ComparisonReport:
+    """
+    Compare two runs case by case.
+
+    A case regresses when its samples are significantly slower (p < alpha)
+    AND its median grew by more than ``min_slowdown``. Cases only present in
+    ``current`` are reported through budgets only.
+    """
+    current_by_key = {r.key: r for r in current}
+    report = ComparisonReport(budgets=check_budgets(current, budget_scale))
+    for base in baseline:
+        result = current_by_key.get(base.key)
+        if result is None:
+            report.missing.append(base.key)
+            continue
+        p_value = mann_whitney_greater(result.samples, base.samples)
+        comparison = Comparison(
+            key=base.key,
+            baseline_median=base.median,
+            current_median=result.median,
+            p_value=p_value,
+            regressed=p_value < alpha
+            and result.median > base.median * (1 + min_slowdown),
+        )
+        report.comparisons.append(comparison)
+    return report
@@ -12,6 +12,7 @@ from typing import Any
 
 from alpaca.data.historical import CryptoHistoricalDataClient, StockHistoricalDataClient
 from alpaca.trading.client import TradingClient
+from alpaca.trading.stream import TradingStream
 from pydantic import Field, SecretStr, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -151,6 +152,47 @@ class Settings(BaseSettings):
         le=10.0,
     )
 
+    ALPACA_REQUESTS_PER_MINUTE: int = Field(
+        default=180,
+        description=(
+            "Process-wide request budget for the Alpaca Trading API: every "
+            "request of a get_trading_client() client is paced by it. Alpaca "
+            "allows 200 req/min."
+        ),
+        ge=1,
+        le=1000,
+    )
+
+    ALPACA_DATA_REQUESTS_PER_MINUTE: int = Field(
+        default=180,
+        description=(
+            "Process-wide request budget for the Alpaca Market Data API "
+            "(metered separately from trading). Basic plans allow 200 req/min."
+        ),
+        ge=1,
+        le=10000,
+    )
+
+    PATCH_MAX_WORKERS: int = Field(
+        default=4,
+        description=(
+            "Maximum number of concurrent Alpaca order lookups when collecting "
+            "exit price corrections in the price patch pipeline."
+        ),
+        ge=1,
+        le=20,
+    )
+
+    ARCHIVAL_MAX_WORKERS: int = Field(
+        default=4,
+        description=(
+            "Maximum number of concurrent Alpaca order lookups and bar fetches "
+            "in the trade archival prefetch stage."
+        ),
+        ge=1,
+        le=20,
+    )
+
     MAX_WORKERS: int = Field(
         default=3,
         description="Maximum number of parallel worker threads for asset processing.",
@@ -158,11 +200,110 @@ class Settings(BaseSettings):
         le=20,
     )
 
+    SIGNAL_PIPELINE_MAX_WORKERS: int = Field(
+        default=4,
+        description=(
+            "Maximum number of symbols processed concurrently in Phase 3 "
+            "(persistence, notification, execution). Signals for the same "
+            "symbol are always processed in order."
+        ),
+        ge=1,
+        le=20,
+    )
+
+    SIGNAL_PERSIST_CONCURRENCY: int = Field(
+        default=2,
+        description=(
+            "Maximum number of concurrent Firestore signal writes in Phase 3 "
+            "(bounds write bursts below SIGNAL_PIPELINE_MAX_WORKERS)."
+        ),
+        ge=1,
+        le=20,
+    )
+
+    SIGNAL_NOTIFY_CONCURRENCY: int = Field(
+        default=2,
+        description=(
+            "Maximum number of concurrent Discord notifications in Phase 3 "
+            "(keeps bursts under the webhook rate limit)."
+        ),
+        ge=1,
+        le=10,
+    )
+
+    JOB_SCHEDULER_MAX_WORKERS: int = Field(
+        default=4,
+        description=(
+            "Maximum number of startup jobs (reconciliation, archival, patches, "
+            "snapshots) run concurrently alongside signal generation."
+        ),
+        ge=1,
+        le=10,
+    )
+
+    JOB_TIMEOUT_SECONDS: int = Field(
+        default=900,
+        description=(
+            "Per-job timeout for startup jobs. Jobs exceeding it are abandoned "
+            "and their dependents skipped."
+        ),
+        ge=30,
+    )
+
     # Execution Engine
     ENABLE_EXECUTION: bool = Field(
         default=False,
         description="Enable order execution (requires ALPACA_PAPER_TRADING=True)",
     )
+    ENABLE_BULK_POSITION_SYNC: bool = Field(
+        default=True,
+        description=(
+            "Sync open positions against one paginated broker snapshot "
+            "(orders + positions) instead of per-position API calls."
+        ),
+    )
+    ENABLE_TRADE_UPDATES_STREAM: bool = Field(
+        default=False,
+        description=(
+            "Track order fills from Alpaca's trade_updates websocket instead of "
+            "sleep-polling the order after submission."
+        ),
+    )
+    TRADE_UPDATES_REPLAY_FILE: str | None = Field(
+        default=None,
+        description=(
+            "Replay recorded trade_updates events from this JSONL file instead of "
+            "connecting to Alpaca (local testing)."
+        ),
+    )
+    FILL_WAIT_TIMEOUT_SECONDS: float = Field(
+        default=10.0,
+        description=(
+            "Maximum seconds to wait for a fill event before deferring the fill "
+            "price to the position sync backfill."
+        ),
+        ge=0.1,
+        le=120.0,
+    )
+    EXECUTION_MAX_WORKERS: int = Field(
+        default=4,
+        description=(
+            "Maximum number of concurrent order submissions when executing the "
+            "batch of approved Phase 3 signals (paced by ALPACA_REQUESTS_PER_MINUTE)."
+        ),
+        ge=1,
+        le=20,
+    )
+    ORDER_SUBMIT_MAX_RETRIES: int = Field(
+        default=2,
+        description=(
+            "Retries for an order submission that failed with a transient error. "
+            "Each retry first looks the order up by client_order_id (the signal "
+            "ID), so an order that reached the broker is never submitted twice."
+        ),
+        ge=0,
+        le=5,
+    )
     RISK_PER_TRADE: float = Field(
         default=100.0,
         description=(
@@ -206,6 +347,15 @@ class Settings(BaseSettings):
         default=100.0,
         description="Minimum buying power required to perform a trade.",
     )
+    CORRELATION_WINDOW_DAYS: int = Field(
+        default=90,
+        description=(
+            "Rolling window (daily log returns) of the correlation risk gate. "
+            "Maintained incrementally from the bars fetched in Phase 1."
+        ),
+        ge=20,
+        le=365,
+    )
 
     ENABLE_EQUITIES: bool = Field(
         default=False,
@@ -235,6 +385,21 @@ class Settings(BaseSettings):
         default=True,
         description="Automatically add missing columns to BigQuery tables.",
     )
+    SCHEMA_CACHE_TTL_SECONDS: int = Field(
+        default=900,
+        ge=0,
+        description=(
+            "Trust a validated table schema for this long without calling "
+            "get_table (0 = always fetch and compare the table etag)."
+        ),
+    )
+    SCHEMA_CACHE_PATH: str | None = Field(
+        default=None,
+        description=(
+            "Optional JSON file persisting SchemaGuardian fingerprints across "
+            "processes (in-memory only if unset)."
+        ),
+    )
 
     USE_LEGACY_ARCHIVAL: bool = Field(
         default=True,
@@ -256,6 +421,55 @@ class Settings(BaseSettings):
         ge=1000.0,
     )
 
+    # === Metrics Export ===
+    METRICS_EXPORT_PATH: str | None = Field(
+        default=None,
+        description=(
+            "Write the metrics registry as OpenMetrics text to this file at the "
+            "end of each run (disabled if unset)."
+        ),
+    )
+    METRICS_HTTP_PORT: int | None = Field(
+        default=None,
+        ge=1,
+        le=65535,
+        description="Serve OpenMetrics on http://0.0.0.0:<port>/metrics while running.",
+    )
+
+    # === Run Tracing ===
+    TRACE_EXPORT_DIR: str | None = Field(
+        default=None,
+        description=(
+            "Record a span tree for each run and write it to this directory "
+            "(tracing disabled if unset)."
+        ),
+    )
+    TRACE_EXPORT_FORMAT: str = Field(
+        default="chrome",
+        pattern="^(chrome|otlp)$",
+        description="Trace file format: Chrome trace events or OTLP JSON.",
+    )
+
+    # === Sampling Profiler ===
+    PROFILE_DIR: str | None = Field(
+        default=None,
+        description=(
+            "Profile each run with the sampling profiler and write the output to "
+            "this directory (profiling disabled if unset)."
+        ),
+    )
+    PROFILE_INTERVAL_MS: int = Field(
+        default=10,
+        ge=1,
+        le=1000,
+        description="Sampling profiler interval in milliseconds.",
+    )
+    PROFILE_FORMAT: str = Field(
+        default="both",
+        pattern="^(collapsed|speedscope|both)$",
+        description="Profile output: collapsed stacks, speedscope JSON, or both.",
+    )
+
     # === Cooldown Configuration (Issue #117 Strategic Feedback) ===
     COOLDOWN_SCOPE: str = Field(
         default="SYMBOL",
@@ -362,10 +576,32 @@ def get_trading_client() -> TradingClient:
     Get an authenticated Alpaca TradingClient.
 
     Returns:
-        TradingClient: Authenticated client
+        TradingClient: Authenticated client whose requests share the
+        process-wide Alpaca Trading API rate limiter
     """
+    # Deferred: rate_limit reads the settings from this module
+    from crypto_signals.utils.rate_limit import get_alpaca_rate_limiter, rate_limited
+
     settings = get_settings()
-    return TradingClient(
+    return rate_limited(
+        TradingClient(
+            api_key=settings.ALPACA_API_KEY,
+            secret_key=settings.ALPACA_SECRET_KEY,
+            paper=settings.is_paper_trading,
+        ),
+        get_alpaca_rate_limiter(),
+    )
+
+
+def get_trading_stream() -> TradingStream:
+    """
+    Get an authenticated Alpaca TradingStream (trade_updates websocket).
+
+    Returns:
+        TradingStream: Authenticated, not yet running stream
+    """
+    settings = get_settings()
+    return TradingStream(
         api_key=settings.ALPACA_API_KEY,
         secret_key=settings.ALPACA_SECRET_KEY,
         paper=settings.is_paper_trading,
@@ -377,12 +613,21 @@ def get_stock_data_client() -> StockHistoricalDataClient:
     Get an authenticated Alpaca StockHistoricalDataClient.
 
     Returns:
-        StockHistoricalDataClient: Authenticated client
+        StockHistoricalDataClient: Authenticated client whose requests share the
+        process-wide Alpaca Market Data rate limiter
     """
+    from crypto_signals.utils.rate_limit import (
+        get_alpaca_data_rate_limiter,
+        rate_limited,
+    )
+
     settings = get_settings()
-    return StockHistoricalDataClient(
-        api_key=settings.ALPACA_API_KEY,
-        secret_key=settings.ALPACA_SECRET_KEY,
+    return rate_limited(
+        StockHistoricalDataClient(
+            api_key=settings.ALPACA_API_KEY,
+            secret_key=settings.ALPACA_SECRET_KEY,
+        ),
+        get_alpaca_data_rate_limiter(),
     )
 
 
@@ -391,12 +636,21 @@ def get_crypto_data_client() -> CryptoHistoricalDataClient:
     Get an authenticated Alpaca CryptoHistoricalDataClient.
 
     Returns:
-        CryptoHistoricalDataClient: Authenticated client
+        CryptoHistoricalDataClient: Authenticated client whose requests share the
+        process-wide Alpaca Market Data rate limiter
     """
+    from crypto_signals.utils.rate_limit import (
+        get_alpaca_data_rate_limiter,
+        rate_limited,
+    )
+
     settings = get_settings()
-    return CryptoHistoricalDataClient(
-        api_key=settings.ALPACA_API_KEY,
-        secret_key=settings.ALPACA_SECRET_KEY,
+    return rate_limited(
+        CryptoHistoricalDataClient(
+            api_key=settings.ALPACA_API_KEY,
+            secret_key=settings.ALPACA_SECRET_KEY,
+        ),
+        get_alpaca_data_rate_limiter(),
     )
 
 
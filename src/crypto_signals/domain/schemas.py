@@ -848,6 +848,10 @@ class TradeExecution(BaseModel):
         default=None,
         description="Highest price reached during trade",
     )
+    max_adverse_excursion: Optional[float] = Field(
+        default=None,
+        description="Largest adverse price move from entry during trade",
+    )
     pnl_pct: float = Field(
         ...,
         description="Profit/Loss as percentage",
@@ -1568,3 +1572,70 @@ class StagingStrategy(BaseModel):
         default=None,
         description="Human-readable name of the primary pattern (for backward compatibility normalization)",
     )
+
+
+# =============================================================================
+# BIGQUERY: STRATEGY AGGREGATES (Table: agg_strategy_pattern_daily)
+# =============================================================================
+
+
+class AggStrategyPatternDaily(BaseModel):
+    """
+    Daily per-strategy, per-pattern performance aggregate.
+
+    Maintained incrementally by the archival pipelines: after each MERGE into
+    fact_trades (source LIVE) or fact_theoretical_signals (source THEORETICAL),
+    only the affected (ds, strategy_id) groups are recomputed and upserted.
+
+    Sums and counts are stored alongside the derived ratios so rows can be
+    rolled up correctly across days, strategies or patterns.
+
+    Partitioned by: ds | Clustered by: source, strategy_id, pattern_name
+    """
+
+    ds: date = Field(..., description="Partition key - trade/signal date")
+    agg_id: str = Field(
+        ..., description="Natural key: ds|source|strategy_id|pattern_name"
+    )
+    source: str = Field(
+        ...,
+        description="LIVE (fact_trades) or THEORETICAL (fact_theoretical_signals)",
+    )
+    strategy_id: str = Field(..., description="Strategy identifier")
+    pattern_name: str = Field(..., description="Pattern traded or signalled")
+
+    # === Counts ===
+    trade_count: int = Field(..., description="Closed (or simulated) trades")
+    win_count: int = Field(..., description="Trades with positive PnL")
+    loss_count: int = Field(..., description="Trades with negative PnL")
+
+    # === PnL ===
+    total_pnl_usd: float = Field(..., description="Sum of PnL in USD")
+    gross_win_usd: float = Field(..., description="Sum of positive PnL in USD")
+    gross_loss_usd: float = Field(..., description="Sum of negative PnL in USD")
+    sum_pnl_pct: float = Field(..., description="Sum of PnL percentages")
+    win_rate: Optional[float] = Field(default=None, description="win_count / trade_count")
+    expectancy_usd: Optional[float] = Field(
+        default=None, description="Average PnL per trade in USD"
+    )
+    avg_pnl_pct: Optional[float] = Field(
+        default=None, description="Average PnL percentage per trade"
+    )
+
+    # === Risk-adjusted ===
+    r_count: int = Field(..., description="Trades with a known initial risk")
+    sum_r_multiple: Optional[float] = Field(
+        default=None, description="Sum of R-multiples (PnL / initial stop risk)"
+    )
+    avg_r_multiple: Optional[float] = Field(
+        default=None, description="Average R-multiple"
+    )
+    mfe_count: int = Field(..., description="Trades with a recorded MFE")
+    sum_mfe_pct: Optional[float] = Field(
+        default=None, description="Sum of max favorable excursion (% of entry)"
+    )
+    avg_mfe_pct: Optional[float] = Field(
+        default=None, description="Average max favorable excursion (% of entry)"
+    )
+
+    updated_at: datetime = Field(..., description="When this row was recomputed")
@@ -0,0 +1,220 @@
+"""
+Account Activity Ledger.
+
+Fetches Alpaca account activities (CFEE crypto fees, CSD settlements) for a
+date window in one paginated pass and indexes them by order ID and symbol, so
+fee reconciliation resolves each trade with an in-memory lookup instead of one
+``/account/activities`` call per trade.
+
+The ledger can be extended incrementally: ``extend()`` only fetches the days
+outside the window already covered (high-water marks on both ends).
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from crypto_signals.utils.symbols import normalize_alpaca_symbol
+from loguru import logger
+
+# Activity types needed by the fee consumers (trade archival, fee patch)
+LEDGER_ACTIVITY_TYPES = ("CFEE", "CSD")
+# Alpaca caps /account/activities at 100 results per page
+ACTIVITIES_PAGE_SIZE = 100
+# Hard stop for pagination (100 * 200 = 20k activities) to bound fetch cost
+MAX_ACTIVITY_PAGES = 200
+
+
+def _activity_date(activity: Dict[str, Any]) -> Optional[date]:
+    """Calendar date of an activity ("date" for NTAs, "transaction_time" for fills)."""
+    raw = activity.get("date") or activity.get("transaction_time")
+    if not raw:
+        return None
+    try:
+        return date.fromisoformat(str(raw)[:10])
+    except ValueError:
+        return None
+
+
+@dataclass
+class ActivityLedger:
+    """
+    Account activities for a date window, indexed for O(1) lookups.
+
+    Attributes:
+        start_date: First day covered (inclusive).
+        end_date: Last day covered (inclusive).
+        activity_types: Activity types fetched (e.g. ("CFEE", "CSD")).
+        by_order_id: Activities keyed by their ``order_id``.
+        by_symbol: Activities keyed by Alpaca symbol (no slash, e.g. "BTCUSD").
+    """
+
+    start_date: date
+    end_date: date
+    activity_types: tuple[str, ...] = LEDGER_ACTIVITY_TYPES
+    by_order_id: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    by_symbol: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    _seen_ids: set = field(default_factory=set, repr=False)
+
+    def add(self, activity: Dict[str, Any]) -> None:
+        """Index an activity, ignoring duplicates (pages overlap at boundaries)."""
+        activity_id = activity.get("id")
+        if activity_id is not None:
+            if activity_id in self._seen_ids:
+                return
+            self._seen_ids.add(activity_id)
+
+        order_id = activity.get("order_id")
+        if order_id:
+            self.by_order_id.setdefault(str(order_id), []).append(activity)
+        symbol = activity.get("symbol")
+        if symbol:
+            key = normalize_alpaca_symbol(str(symbol))
+            self.by_symbol.setdefault(key, []).append(activity)
+
+    def __len__(self) -> int:
+        return len(self._seen_ids)
+
+    def covers(self, start_date: date, end_date: date) -> bool:
+        """True if the window [start_date, end_date] is already loaded."""
+        return self.start_date <= start_date and end_date <= self.end_date
+
+    def for_order(self, order_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Activities linked to an order ID."""
+        if not order_id:
+            return []
+        return self.by_order_id.get(str(order_id), [])
+
+    def for_symbol(
+        self,
+        symbol: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        activity_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Activities for a symbol, optionally restricted to a date window and type.
+
+        Args:
+            symbol: Trading symbol (with or without slash)
+            start_date: First day to include (inclusive)
+            end_date: Last day to include (inclusive)
+            activity_type: e.g. "CFEE"
+
+        Returns:
+            Matching activities in fetch order (oldest first).
+        """
+        matches = []
+        for activity in self.by_symbol.get(normalize_alpaca_symbol(symbol), []):
+            # Records without a type are kept (the ledger was fetched by type)
+            kind = activity.get("activity_type", activity_type)
+            if activity_type and kind != activity_type:
+                continue
+            if start_date or end_date:
+                day = _activity_date(activity)
+                if day is None:
+                    continue
+                if start_date and day < start_date:
+                    continue
+                if end_date and day > end_date:
+                    continue
+            matches.append(activity)
+        return matches
+
+    def extend(self, trading_client: Any, start_date: date, end_date: date) -> None:
+        """
+        Grow the covered window to include [start_date, end_date].
+
+        Only the missing days on either side are fetched.
+        """
+        if start_date < self.start_date:
+            self._load(trading_client, start_date, self.start_date - timedelta(days=1))
+            self.start_date = start_date
+        if end_date > self.end_date:
+            self._load(trading_client, self.end_date + timedelta(days=1), end_date)
+            self.end_date = end_date
+
+    def _load(self, trading_client: Any, start_date: date, end_date: date) -> None:
+        """Fetch and index all activities for [start_date, end_date]."""
+        for activity in _fetch_activities(
+            trading_client, self.activity_types, start_date, end_date
+        ):
+            self.add(activity)
+
+
+def fetch_activity_ledger(
+    trading_client: Any,
+    start_date: date,
+    end_date: date,
+    activity_types: Sequence[str] = LEDGER_ACTIVITY_TYPES,
+) -> ActivityLedger:
+    """
+    Fetch every activity of the given types in [start_date, end_date].
+
+    Args:
+        trading_client: Alpaca TradingClient (uses the public ``get`` method)
+        start_date: First day to load (inclusive)
+        end_date: Last day to load (inclusive)
+        activity_types: Activity types to request
+
+    Returns:
+        ActivityLedger indexed by order ID and symbol.
+
+    Raises:
+        Exception: Propagates Alpaca API errors so callers can retry.
+    """
+    ledger = ActivityLedger(
+        start_date=start_date, end_date=end_date, activity_types=tuple(activity_types)
+    )
+    ledger._load(trading_client, start_date, end_date)
+    logger.info(
+        f"Activity ledger: {len(ledger)} activities "
+        f"({start_date.isoformat()} to {end_date.isoformat()})",
+        extra={
+            "activities": len(ledger),
+            "orders": len(ledger.by_order_id),
+            "symbols": len(ledger.by_symbol),
+        },
+    )
+    return ledger
+
+
+def _fetch_activities(
+    trading_client: Any,
+    activity_types: Sequence[str],
+    start_date: date,
+    end_date: date,
+) -> List[Dict[str, Any]]:
+    """Page through /account/activities oldest-first using the page_token cursor."""
+    activities: List[Dict[str, Any]] = []
+    page_token: Optional[str] = None
+
+    for _ in range(MAX_ACTIVITY_PAGES):
+        params: Dict[str, Any] = {
+            "activity_types": ",".join(activity_types),
+            # "after"/"until" are exclusive bounds
+            "after": (start_date - timedelta(days=1)).isoformat(),
+            "until": (end_date + timedelta(days=1)).isoformat(),
+            "direction": "asc",
+            "page_size": ACTIVITIES_PAGE_SIZE,
+        }
+        if page_token:
+            params["page_token"] = page_token
+
+        page = trading_client.get("/account/activities", params) or []
+        page = [a for a in page if isinstance(a, dict)]
+        activities.extend(page)
+
+        if len(page) < ACTIVITIES_PAGE_SIZE:
+            break
+        next_token = page[-1].get("id")
+        if not next_token or next_token == page_token:
+            break
+        page_token = next_token
+    else:
+        logger.warning(
+            f"Activity ledger truncated at {MAX_ACTIVITY_PAGES} pages",
+            extra={"activities": len(activities)},
+        )
+
+    return activities
@@ -0,0 +1,199 @@
+"""
+Broker State Snapshot.
+
+Captures Alpaca orders and positions in a handful of paginated calls and
+indexes them in memory, so position sync and reconciliation can resolve
+order/position lookups without one API round-trip per position.
+
+Orders are fetched with ``nested=True``: bracket legs (TP/SL) are returned
+inside their parent order and are indexed alongside it.
+"""
+
+from bisect import insort
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from alpaca.common.enums import Sort
+from alpaca.trading.enums import QueryOrderStatus
+from alpaca.trading.requests import GetOrdersRequest
+from crypto_signals.utils.symbols import normalize_alpaca_symbol
+from loguru import logger
+
+# Alpaca caps GET /v2/orders at 500 results per page
+ORDERS_PAGE_SIZE = 500
+# Hard stop for pagination (500 * 20 = 10k orders) to bound snapshot cost
+MAX_ORDER_PAGES = 20
+
+
+@dataclass
+class BrokerSnapshot:
+    """
+    Point-in-time view of broker state indexed for O(1) lookups.
+
+    Attributes:
+        orders_by_id: Every fetched order (parents and nested legs) by order ID.
+        orders_by_symbol: The same orders keyed by Alpaca symbol, newest first.
+        positions_by_symbol: Open broker positions keyed by Alpaca symbol
+            (no slash, e.g. "BTCUSD").
+        since: Lower bound of the order window; older orders are not indexed.
+        orders_loaded: True once the order window has been fetched. A
+            positions-only snapshot cannot answer order lookups.
+        captured_at: When the snapshot was taken.
+    """
+
+    orders_by_id: Dict[str, Any] = field(default_factory=dict)
+    orders_by_symbol: Dict[str, List[Any]] = field(default_factory=dict)
+    positions_by_symbol: Dict[str, Any] = field(default_factory=dict)
+    since: Optional[datetime] = None
+    orders_loaded: bool = False
+    captured_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def add_order(self, order: Any) -> None:
+        """Index an order and its nested legs by ID and by symbol."""
+        order_id = getattr(order, "id", None)
+        if order_id and str(order_id) not in self.orders_by_id:
+            self.orders_by_id[str(order_id)] = order
+            symbol = normalize_alpaca_symbol(str(getattr(order, "symbol", "")))
+            insort(
+                self.orders_by_symbol.setdefault(symbol, []),
+                order,
+                key=_newest_first,
+            )
+        for leg in getattr(order, "legs", None) or []:
+            self.add_order(leg)
+
+    def get_order(self, order_id: Optional[str]) -> Optional[Any]:
+        """Return an indexed order, or None if it is outside the snapshot."""
+        if not order_id:
+            return None
+        return self.orders_by_id.get(str(order_id))
+
+    def get_position(self, symbol: str) -> Optional[Any]:
+        """Return the open broker position for a symbol, or None if flat."""
+        return self.positions_by_symbol.get(normalize_alpaca_symbol(symbol))
+
+    def has_position(self, symbol: str) -> bool:
+        """True if the broker holds an open position for the symbol."""
+        return normalize_alpaca_symbol(symbol) in self.positions_by_symbol
+
+    def orders_for_symbol(
+        self,
+        symbol: str,
+        side: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[Any]:
+        """
+        Return indexed orders for a symbol, newest first.
+
+        Args:
+            symbol: Trading symbol (with or without slash)
+            side: Optional side filter ("buy" / "sell")
+            status: Optional status filter (e.g. "filled")
+
+        Returns:
+            List of matching orders (parents and legs).
+        """
+        orders = self.orders_by_symbol.get(normalize_alpaca_symbol(symbol), [])
+        return [
+            order
+            for order in orders
+            if (not side or _enum_value(getattr(order, "side", None)) == side.lower())
+            and (
+                not status
+                or _enum_value(getattr(order, "status", None)) == status.lower()
+            )
+        ]
+
+
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _newest_first(order: Any) -> float:
+    """Sort key placing the most recently submitted orders first."""
+    return -(getattr(order, "submitted_at", None) or _EPOCH).timestamp()
+
+
+def _enum_value(value: Any) -> str:
+    """Normalize Alpaca enums / strings ("OrderStatus.FILLED", "filled") to "filled"."""
+    if value is None:
+        return ""
+    raw = getattr(value, "value", value)
+    return str(raw).split(".")[-1].lower()
+
+
+def fetch_broker_snapshot(
+    trading_client: Any,
+    since: Optional[datetime],
+    include_positions: bool = True,
+) -> BrokerSnapshot:
+    """
+    Fetch all orders submitted after ``since`` and all open positions.
+
+    Orders are paginated newest-first using the ``until`` cursor. Pages overlap
+    at the boundary timestamp, so results are de-duplicated by order ID.
+
+    Args:
+        trading_client: Alpaca TradingClient
+        since: Only orders submitted after this time are fetched
+        include_positions: Also fetch open positions (one extra call)
+
+    Returns:
+        BrokerSnapshot with orders and positions indexed.
+
+    Raises:
+        Exception: Propagates Alpaca API errors so callers can fall back to
+            per-position lookups.
+    """
+    snapshot = BrokerSnapshot(since=since)
+
+    until: Optional[datetime] = None
+    pages = 0
+    while pages < MAX_ORDER_PAGES:
+        request = GetOrdersRequest(
+            status=QueryOrderStatus.ALL,
+            limit=ORDERS_PAGE_SIZE,
+            after=since,
+            until=until,
+            direction=Sort.DESC,
+            nested=True,
+        )
+        page = trading_client.get_orders(filter=request) or []
+        pages += 1
+
+        oldest: Optional[datetime] = None
+        for order in page:
+            snapshot.add_order(order)
+            submitted_at = getattr(order, "submitted_at", None)
+            if submitted_at and (oldest is None or submitted_at < oldest):
+                oldest = submitted_at
+
+        if len(page) < ORDERS_PAGE_SIZE or oldest is None:
+            break
+        if until is not None and oldest >= until:
+            # No progress (page full of identical timestamps) - stop paginating
+            break
+        until = oldest
+    else:
+        logger.warning(
+            f"Broker snapshot truncated at {MAX_ORDER_PAGES} order pages",
+            extra={"orders_indexed": len(snapshot.orders_by_id)},
+        )
+    snapshot.orders_loaded = True
+
+    if include_positions:
+        for position in trading_client.get_all_positions() or []:
+            symbol = normalize_alpaca_symbol(str(getattr(position, "symbol", "")))
+            if symbol:
+                snapshot.positions_by_symbol[symbol] = position
+
+    logger.info(
+        f"Broker snapshot: {len(snapshot.orders_by_id)} orders, "
+        f"{len(snapshot.positions_by_symbol)} positions in {pages} order page(s)",
+        extra={
+            "orders": len(snapshot.orders_by_id),
+            "positions": len(snapshot.positions_by_symbol),
+            "order_pages": pages,
+        },
+    )
+    return snapshot
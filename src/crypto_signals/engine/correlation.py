@@ -0,0 +1,266 @@
+"""
+Rolling Correlation Service.
+
+Maintains an aligned (day x symbol) matrix of daily log returns for the whole
+symbol universe over a rolling window, together with the pairwise running sums
+(counts, sums, sums of squares and cross products over jointly observed days)
+that define the correlation matrix.
+
+The sums are updated incrementally instead of recomputing pairwise
+correlations per risk check:
+
+    - update(symbol, closes) replaces one symbol's column: O(window x symbols)
+    - a new day rolls the window forward: O(days x symbols^2)
+    - max_correlation(symbol, others) is one vectorized row lookup
+
+Phase 1 feeds the bars it already fetched for signal generation, so the
+correlation gate only fetches bars for symbols outside the scanned universe
+(e.g. open positions on symbols no longer configured).
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Default rolling window (daily returns) for the correlation gate
+DEFAULT_WINDOW_DAYS = 90
+# Minimum jointly observed days before a pair's correlation is defined
+DEFAULT_MIN_PERIODS = 20
+
+
+class CorrelationService:
+    """
+    Incrementally maintained rolling correlation of daily log returns.
+
+    Thread-safe: Phase 1 workers update symbols concurrently while the risk
+    engine reads.
+
+    Example:
+        >>> service = CorrelationService(window=90)
+        >>> service.update("BTC/USD", btc_bars["close"])
+        >>> service.update("ETH/USD", eth_bars["close"])
+        >>> service.max_correlation("BTC/USD", ["ETH/USD"])
+        ('ETH/USD', 0.87)
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW_DAYS,
+        min_periods: int = DEFAULT_MIN_PERIODS,
+    ):
+        """
+        Initialize an empty service.
+
+        Args:
+            window: Number of daily returns kept per symbol.
+            min_periods: Minimum jointly observed days for a defined correlation.
+        """
+        self.window = int(window)
+        self.min_periods = int(min_periods)
+        self._lock = threading.RLock()
+        self._index: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._end: Optional[pd.Timestamp] = None
+        capacity = 16
+        # Log returns; NaN where a symbol has no bar for the day
+        self._returns = np.full((self.window, capacity), np.nan)
+        # Pairwise sums over days where both symbols have a return:
+        #   count[i, j] = n,  sum_x[i, j] = sum(x_i),  sum_xx[i, j] = sum(x_i^2),
+        #   sum_xy[i, j] = sum(x_i * x_j)
+        self._count = np.zeros((capacity, capacity))
+        self._sum_x = np.zeros((capacity, capacity))
+        self._sum_xx = np.zeros((capacity, capacity))
+        self._sum_xy = np.zeros((capacity, capacity))
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols currently in the matrix."""
+        with self._lock:
+            return list(self._symbols)
+
+    def has(self, symbol: str) -> bool:
+        """True if the symbol has been added."""
+        with self._lock:
+            return symbol in self._index
+
+    def update(self, symbol: str, closes: pd.Series) -> None:
+        """
+        Replace a symbol's returns from its daily close prices.
+
+        Bars newer than the current window end roll the window forward for
+        every symbol. Bars older than the window are ignored.
+
+        Args:
+            symbol: Trading symbol (e.g. "BTC/USD").
+            closes: Daily close prices indexed by timestamp.
+        """
+        returns = _daily_log_returns(closes)
+        if returns.empty:
+            logger.debug(f"Correlation: no returns for {symbol}")
+            return
+
+        with self._lock:
+            last = returns.index.max()
+            if self._end is None:
+                self._end = last
+            elif last > self._end:
+                self._roll((last - self._end).days)
+                self._end = last
+
+            column = np.full(self.window, np.nan)
+            offsets = (self._end - returns.index).days.to_numpy()
+            rows = self.window - 1 - offsets
+            in_window = (rows >= 0) & (rows < self.window)
+            column[rows[in_window]] = returns.to_numpy()[in_window]
+
+            j = self._column(symbol)
+            self._returns[:, j] = column
+            self._refresh_column(j)
+
+    def max_correlation(
+        self, symbol: str, others: Iterable[str]
+    ) -> Tuple[Optional[str], float]:
+        """
+        Highest correlation of ``symbol`` against a set of symbols.
+
+        Args:
+            symbol: Candidate symbol.
+            others: Symbols to compare against (unknown symbols are ignored).
+
+        Returns:
+            (most correlated symbol, correlation), or (None, nan) if no pair
+            has at least ``min_periods`` jointly observed days.
+        """
+        with self._lock:
+            if symbol not in self._index:
+                return None, float("nan")
+            names = [s for s in dict.fromkeys(others) if s in self._index and s != symbol]
+            if not names:
+                return None, float("nan")
+            i = self._index[symbol]
+            js = np.array([self._index[s] for s in names])
+            corr = self._correlation(np.array([i]), js)[0]
+
+        if np.all(np.isnan(corr)):
+            return None, float("nan")
+        k = int(np.nanargmax(corr))
+        return names[k], float(corr[k])
+
+    def correlation_matrix(self, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """
+        Correlation matrix for a set of symbols (default: the whole universe).
+
+        Enables cluster- or portfolio-level gates without recomputation.
+        Undefined pairs (fewer than ``min_periods`` joint days) are NaN.
+        """
+        with self._lock:
+            names = [
+                s
+                for s in dict.fromkeys(symbols if symbols is not None else self._symbols)
+                if s in self._index
+            ]
+            idx = np.array([self._index[s] for s in names], dtype=int)
+            corr = self._correlation(idx, idx) if names else np.empty((0, 0))
+        return pd.DataFrame(corr, index=names, columns=names)
+
+    # --- Internals ----------------------------------------------------------
+
+    def _column(self, symbol: str) -> int:
+        """Return the column for a symbol, adding it (and growing) if new."""
+        j = self._index.get(symbol)
+        if j is not None:
+            return j
+        j = len(self._symbols)
+        if j >= self._returns.shape[1]:
+            self._grow(2 * self._returns.shape[1])
+        self._index[symbol] = j
+        self._symbols.append(symbol)
+        return j
+
+    def _grow(self, capacity: int) -> None:
+        size = self._returns.shape[1]
+        returns = np.full((self.window, capacity), np.nan)
+        returns[:, :size] = self._returns
+        self._returns = returns
+        for name in ("_count", "_sum_x", "_sum_xx", "_sum_xy"):
+            grown = np.zeros((capacity, capacity))
+            grown[:size, :size] = getattr(self, name)
+            setattr(self, name, grown)
+
+    def _active(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Zero-filled returns and the validity mask for the active columns."""
+        block = self._returns[:, : len(self._symbols)]
+        mask = (~np.isnan(block)).astype(float)
+        return np.nan_to_num(block), mask
+
+    def _refresh_column(self, j: int) -> None:
+        """Recompute row and column ``j`` of every pairwise sum."""
+        n = len(self._symbols)
+        x, mask = self._active()
+        xj, mj = x[:, j], mask[:, j]
+
+        count = mask.T @ mj
+        self._count[:n, j] = count
+        self._count[j, :n] = count
+        self._sum_x[:n, j] = x.T @ mj
+        self._sum_x[j, :n] = mask.T @ xj
+        self._sum_xx[:n, j] = (x * x).T @ mj
+        self._sum_xx[j, :n] = mask.T @ (xj * xj)
+        cross = x.T @ xj
+        self._sum_xy[:n, j] = cross
+        self._sum_xy[j, :n] = cross
+
+    def _roll(self, days: int) -> None:
+        """Drop the oldest ``days`` rows and open empty rows for new days."""
+        n = len(self._symbols)
+        if days >= self.window:
+            self._returns[:] = np.nan
+            for name in ("_count", "_sum_x", "_sum_xx", "_sum_xy"):
+                getattr(self, name)[:] = 0.0
+            return
+
+        dropped = self._returns[:days, :n]
+        mask = (~np.isnan(dropped)).astype(float)
+        x = np.nan_to_num(dropped)
+        self._count[:n, :n] -= mask.T @ mask
+        self._sum_x[:n, :n] -= x.T @ mask
+        self._sum_xx[:n, :n] -= (x * x).T @ mask
+        self._sum_xy[:n, :n] -= x.T @ x
+
+        self._returns[:-days] = self._returns[days:]
+        self._returns[-days:] = np.nan
+
+    def _correlation(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Pearson correlation for the (rows x cols) block from the running sums."""
+        grid = np.ix_(rows, cols)
+        n = self._count[grid]
+        sxy = self._sum_xy[grid]
+        sx = self._sum_x[grid]
+        sy = self._sum_x.T[grid]
+        sxx = self._sum_xx[grid]
+        syy = self._sum_xx.T[grid]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * sxy - sx * sy
+            var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+            corr = cov / np.sqrt(var)
+        corr[(n < self.min_periods) | ~(var > 0)] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+
+def _daily_log_returns(closes: pd.Series) -> pd.Series:
+    """Log returns indexed by UTC calendar day (last close per day)."""
+    series = pd.Series(closes, dtype=float).dropna()
+    series = series[series > 0]
+    if series.empty:
+        return series
+
+    index = pd.DatetimeIndex(series.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    series.index = index.normalize()
+    series = series.groupby(level=0).last().sort_index()
+    return np.log(series).diff().dropna()
@@ -6,17 +6,22 @@ for atomic Entry, Take-Profit, and Stop-Loss management.
 
 Key Capabilities:
     - execute_signal(): Submit bracket orders with Entry, TP, and SL
+    - execute_signals(): Risk-check a batch of signals, then submit concurrently
     - sync_position_status(): Synchronize position with broker state
     - modify_stop_loss(): Trail stop-loss orders (for Chandelier Exits)
     - close_position_emergency(): Cancel all legs and exit at market
     - get_order_details(): Retrieve order for analytics enrichment
 """
 
+import threading
+from concurrent.futures import as_completed
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
 from time import sleep
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, Iterator, List, Optional, Sequence, cast
 
-from alpaca.common.exceptions import APIError
+import requests  # type: ignore
+from alpaca.common.exceptions import APIError, RetryException
 from alpaca.trading.client import TradingClient
 from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
 from alpaca.trading.models import Order
@@ -37,10 +42,16 @@ from crypto_signals.domain.schemas import (
 from crypto_signals.domain.schemas import (
     OrderSide as DomainOrderSide,
 )
-from crypto_signals.engine.risk import RiskEngine
+from crypto_signals.engine.activity_ledger import ActivityLedger, fetch_activity_ledger
+from crypto_signals.engine.broker_snapshot import BrokerSnapshot, fetch_broker_snapshot
+from crypto_signals.engine.correlation import CorrelationService
+from crypto_signals.engine.order_events import OrderEventHub, get_order_event_hub
+from crypto_signals.engine.risk import RiskCheckResult, RiskEngine
 from crypto_signals.market.data_provider import MarketDataProvider
+from crypto_signals.metrics import track_api_call
 from crypto_signals.observability import console, get_metrics_collector
 from crypto_signals.repository.firestore import PositionRepository
+from crypto_signals.tracing import TracedThreadPoolExecutor
 from crypto_signals.utils.symbols import normalize_alpaca_symbol
 from loguru import logger
 from rich.panel import Panel
@@ -64,6 +75,36 @@ _MANUAL_EXIT_VERIFICATION_MIN_AGE_MINUTES = 5
 # Statuses indicating an order has been received by Alpaca but not yet filled/canceled
 _QUEUED_ORDER_STATUSES = {"accepted", "pending_new", "new"}
 
+# Extra lookback before the oldest position when building a bulk sync snapshot
+_SNAPSHOT_LOOKBACK_MARGIN = timedelta(days=1)
+
+# Base delay between order submission retries (multiplied by the attempt number)
+_SUBMIT_RETRY_BACKOFF_SECONDS = 0.5
+
+
+def _is_duplicate_client_order_id(error: Exception) -> bool:
+    """True if Alpaca rejected the order because its client_order_id exists."""
+    return (
+        isinstance(error, APIError)
+        and error.status_code == 422
+        and "client_order_id" in str(error)
+    )
+
+
+def _is_retryable_submit_error(error: Exception) -> bool:
+    """
+    True if a failed submission may have reached the broker or may succeed
+    on retry: network errors, rate limits, 5xx and duplicate client_order_id.
+    """
+    if isinstance(error, (requests.exceptions.RequestException, RetryException)):
+        return True
+    if isinstance(error, APIError):
+        status = error.status_code
+        if status is None:
+            return False
+        return status == 429 or status >= 500 or _is_duplicate_client_order_id(error)
+    return False
+
 
 class ExecutionEngine:
     """
@@ -74,18 +115,24 @@ class ExecutionEngine:
 
     Methods:
         execute_signal: Submit bracket order for a Signal
+        execute_signals: Risk-check a batch of Signals, then submit concurrently
         get_order_details: Retrieve order by ID for enrichment
         sync_position_status: Sync position with Alpaca broker state
         modify_stop_loss: Replace stop-loss order (trailing)
         close_position_emergency: Cancel legs and exit at market
     """
 
+    # Active broker snapshot for bulk position sync (see broker_snapshot())
+    _broker_snapshot: Optional[BrokerSnapshot] = None
+
     def __init__(
         self,
         trading_client: Optional[TradingClient] = None,
         repository: Optional[PositionRepository] = None,
         reconciler: Optional[Any] = None,
         market_provider: Optional[MarketDataProvider] = None,
+        order_events: Optional[OrderEventHub] = None,
+        correlation_service: Optional[CorrelationService] = None,
     ):
         """
         Initialize the ExecutionEngine.
@@ -93,15 +140,29 @@ class ExecutionEngine:
         Args:
             trading_client: Optional TradingClient for dependency injection.
             repository: Optional PositionRepository for risk checks.
+            order_events: Fill event hub (defaults to the process-wide hub).
+                Fills are awaited from events while a source is connected,
+                otherwise polled.
+            correlation_service: Rolling return correlations for the risk
+                engine's correlation gate (fed by Phase 1 bar fetches).
         """
         settings = get_settings()
         self.alpaca = trading_client if trading_client else get_trading_client()
+        self.order_events = order_events or get_order_event_hub()
+
+        # Fee activity ledger shared by this engine's consumers for the run
+        # (see get_activity_ledger())
+        self._activity_ledger: Optional[ActivityLedger] = None
+        self._activity_ledger_lock = threading.Lock()
 
         # Initialize Repo for Risk Engine
         self.repo = repository if repository else PositionRepository()
         self.reconciler = reconciler
         self.risk_engine = RiskEngine(
-            self.alpaca, self.repo, market_provider=market_provider
+            self.alpaca,
+            self.repo,
+            market_provider=market_provider,
+            correlation_service=correlation_service,
         )
 
         # Fetch Account ID for data joins (Issue #182)
@@ -134,17 +195,6 @@ class ExecutionEngine:
         Returns:
             Position: The created Position object if successful, None otherwise.
         """
-        settings = get_settings()
-
-        # === Execution Gating (SAFETY GUARD) ===
-        # If explicitly enabled in PROD, execute LIVE.
-        # If disabled OR not PROD, execute THEORETICAL (Simulated).
-        should_execute_live = (
-            settings.ENVIRONMENT == "PROD"
-            and getattr(settings, "ENABLE_EXECUTION", False)
-            and settings.is_paper_trading  # Always require paper=True for now (safety)
-        )
-
         # Validate required signal fields
         if not self._validate_signal(signal):
             return None
@@ -154,34 +204,124 @@ class ExecutionEngine:
         risk_result = self.risk_engine.validate_signal(signal)
 
         if not risk_result.passed:
-            logger.warning(f"RISK BLOCK: {signal.symbol} - {risk_result.reason}")
-
-            # Record Risk Metric
-            try:
-                # Calculate theoretical position size to estimate protected capital
-                qty = self._calculate_qty(signal)
-                capital_protected = qty * signal.entry_price
-                get_metrics_collector().record_risk_block(
-                    gate=risk_result.gate or "unknown",
-                    symbol=signal.symbol,
-                    amount=capital_protected,
-                )
-            except Exception:
-                logger.opt(exception=True).warning("Failed to record risk metrics")
-
-            # Create "Risk Blocked" Position for Shadow Tracking
-            return self._execute_risk_blocked_order(signal, risk_result.reason)
+            return self._handle_risk_block(signal, risk_result)
 
         # Route based on execution mode
-        if should_execute_live:
-            if signal.asset_class == AssetClass.CRYPTO:
-                return self._execute_crypto_signal(signal)
-            else:
-                return self._execute_bracket_order(signal)
+        if self._should_execute_live():
+            return self._execute_live_order(signal)
         else:
             # Theoretical execution (Simulated with slippage)
             return self._execute_theoretical_order(signal)
 
+    def execute_signals(self, signals: Sequence[Signal]) -> Dict[str, Optional[Position]]:
+        """
+        Execute a batch of approved signals with concurrent order submission.
+
+        Risk checks run in the given order against one RiskSnapshot, and each
+        approval is recorded on it so the gates of later signals count it as
+        exposure. The batch cannot jointly overcommit shared account limits,
+        and the risk pass costs one set of API calls in total. Approved
+        orders are then submitted concurrently (EXECUTION_MAX_WORKERS), paced
+        by the shared Alpaca rate limiter. Each order carries
+        ``client_order_id = signal_id``, so retries never duplicate an order.
+
+        Args:
+            signals: Signals to execute, in detection order.
+
+        Returns:
+            Dict mapping signal_id to the created Position (None if the signal
+            was invalid or its submission failed). Risk-blocked signals map to
+            their RISK_BLOCKED shadow Position, as in execute_signal().
+        """
+        settings = get_settings()
+        results: Dict[str, Optional[Position]] = {s.signal_id: None for s in signals}
+
+        # One account/positions/orders fetch for the whole batch
+        snapshot = self.risk_engine.snapshot()
+        approved: List[Signal] = []
+        for signal in signals:
+            if not self._validate_signal(signal):
+                continue
+            risk_result = self.risk_engine.validate_signal(signal, snapshot)
+            if not risk_result.passed:
+                results[signal.signal_id] = self._handle_risk_block(signal, risk_result)
+                continue
+            snapshot.record_approval(
+                signal, self._calculate_qty(signal) * signal.entry_price
+            )
+            approved.append(signal)
+
+        if not approved:
+            return results
+
+        if not self._should_execute_live():
+            for signal in approved:
+                results[signal.signal_id] = self._execute_theoretical_order(signal)
+            return results
+
+        workers = min(int(settings.EXECUTION_MAX_WORKERS), len(approved))
+        logger.info(
+            f"Submitting {len(approved)} orders with {workers} workers",
+            extra={"orders": len(approved), "workers": workers},
+        )
+
+        with TracedThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_signal = {
+                executor.submit(self._execute_live_order, s): s for s in approved
+            }
+            for future in as_completed(future_to_signal):
+                signal = future_to_signal[future]
+                try:
+                    results[signal.signal_id] = future.result()
+                except Exception as e:
+                    self._log_execution_failure(signal, e)
+
+        return results
+
+    def _should_execute_live(self) -> bool:
+        """
+        Execution Gating (SAFETY GUARD).
+
+        If explicitly enabled in PROD, execute LIVE.
+        If disabled OR not PROD, execute THEORETICAL (Simulated).
+        """
+        settings = get_settings()
+        return bool(
+            settings.ENVIRONMENT == "PROD"
+            and getattr(settings, "ENABLE_EXECUTION", False)
+            and settings.is_paper_trading  # Always require paper=True for now (safety)
+        )
+
+    def _execute_live_order(self, signal: Signal) -> Optional[Position]:
+        """Route a risk-approved signal to the broker order type for its asset."""
+        if signal.asset_class == AssetClass.CRYPTO:
+            return self._execute_crypto_signal(signal)
+        return self._execute_bracket_order(signal)
+
+    def _handle_risk_block(
+        self, signal: Signal, risk_result: RiskCheckResult
+    ) -> Position:
+        """Record a risk block and return its shadow Position."""
+        logger.warning(f"RISK BLOCK: {signal.symbol} - {risk_result.reason}")
+
+        # Record Risk Metric
+        try:
+            # Calculate theoretical position size to estimate protected capital
+            qty = self._calculate_qty(signal)
+            capital_protected = qty * signal.entry_price
+            get_metrics_collector().record_risk_block(
+                gate=risk_result.gate or "unknown",
+                symbol=signal.symbol,
+                amount=capital_protected,
+            )
+        except Exception:
+            logger.opt(exception=True).warning("Failed to record risk metrics")
+
+        # Create "Risk Blocked" Position for Shadow Tracking
+        return self._execute_risk_blocked_order(
+            signal, risk_result.reason or "Unknown Risk"
+        )
+
     def _execute_crypto_signal(self, signal: Signal) -> Optional[Position]:
         """
         Execute a crypto signal using a simple market order.
@@ -234,7 +374,7 @@ class ExecutionEngine:
                 },
             )
 
-            order = cast(Order, self.alpaca.submit_order(order_request))
+            order = self._submit_order(order_request)
 
             logger.info(
                 f"CRYPTO ORDER SUBMITTED: {signal.symbol}",
@@ -335,7 +475,7 @@ class ExecutionEngine:
                 },
             )
 
-            order = cast(Order, self.alpaca.submit_order(order_request))
+            order = self._submit_order(order_request)
 
             # Log success
             logger.info(
@@ -380,6 +520,68 @@ class ExecutionEngine:
             self._log_execution_failure(signal, e)
             return None
 
+    def _submit_order(self, order_request: MarketOrderRequest) -> Order:
+        """
+        Submit an order, retrying transient failures without duplicating it.
+
+        The request's client_order_id is the signal ID, so Alpaca accepts at most
+        one order per signal. When a submission fails in a way that may have
+        reached the broker (timeout, 5xx, duplicate client_order_id), the order
+        is looked up by client_order_id and returned if it exists; otherwise the
+        submission is retried up to ORDER_SUBMIT_MAX_RETRIES times.
+
+        Raises:
+            Exception: The last submission error if the order could not be placed.
+        """
+        settings = get_settings()
+        client_order_id = order_request.client_order_id
+        attempts = int(settings.ORDER_SUBMIT_MAX_RETRIES) + 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                with track_api_call("alpaca", "submit_order"):
+                    return cast(Order, self.alpaca.submit_order(order_request))
+            except Exception as e:
+                if not client_order_id or not _is_retryable_submit_error(e):
+                    raise
+
+                existing = self._get_order_by_client_id(client_order_id)
+                if existing is not None:
+                    logger.info(
+                        f"Recovered submitted order for {order_request.symbol} "
+                        "by client_order_id",
+                        extra={
+                            "client_order_id": client_order_id,
+                            "order_id": str(existing.id),
+                            "error": str(e),
+                        },
+                    )
+                    return existing
+
+                if _is_duplicate_client_order_id(e) or attempt == attempts:
+                    raise
+
+                logger.warning(
+                    f"Order submission for {order_request.symbol} failed "
+                    f"(attempt {attempt}/{attempts}). Retrying.",
+                    extra={"client_order_id": client_order_id, "error": str(e)},
+                )
+                sleep(_SUBMIT_RETRY_BACKOFF_SECONDS * attempt)
+
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def _get_order_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        """Look up an order by client_order_id. Returns None if not found."""
+        try:
+            with track_api_call("alpaca", "get_order_by_client_id"):
+                return cast(Order, self.alpaca.get_order_by_client_id(client_order_id))
+        except Exception as e:
+            logger.debug(
+                f"No order found for client_order_id {client_order_id}",
+                extra={"client_order_id": client_order_id, "error": str(e)},
+            )
+            return None
+
     def _execute_theoretical_order(self, signal: Signal) -> Position:
         """
         Create a simulated Position with synthetic slippage.
@@ -630,6 +832,26 @@ class ExecutionEngine:
     # CFEE RECONCILIATION METHODS (Issue #140 - T+1 Fee Settlement)
     # =========================================================================
 
+    def get_activity_ledger(self, start_date: date, end_date: date) -> ActivityLedger:
+        """
+        Return the shared activity ledger, covering at least [start_date, end_date].
+
+        The first call fetches the window; later calls only fetch days outside
+        the window already loaded. Trade archival and the fee patch share the
+        engine instance, and therefore the ledger.
+
+        Raises:
+            Exception: Propagates Alpaca API errors from the fetch.
+        """
+        with self._activity_ledger_lock:
+            if self._activity_ledger is None:
+                self._activity_ledger = fetch_activity_ledger(
+                    self.alpaca, start_date, end_date
+                )
+            elif not self._activity_ledger.covers(start_date, end_date):
+                self._activity_ledger.extend(self.alpaca, start_date, end_date)
+            return self._activity_ledger
+
     def get_crypto_fees_by_orders(
         self,
         order_ids: List[str],
@@ -660,15 +882,11 @@ class ExecutionEngine:
 
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                # Query CFEE activities via raw REST API (TradingClient v2)
-                params = {
-                    "activity_types": "CFEE",
-                    "date": start_date.isoformat(),
-                    "until": end_date.isoformat(),
-                    "direction": "asc",
-                }
-
-                activities_data = self.alpaca.get("/account/activities", params)
+                # CFEE activities for the window from the shared ledger
+                ledger = self.get_activity_ledger(start_date, end_date)
+                activities_data = ledger.for_symbol(
+                    symbol, start_date, end_date, activity_type="CFEE"
+                )
 
                 # Wrap dicts for object compatibility
                 activities = (
@@ -826,7 +1044,8 @@ class ExecutionEngine:
             Order object if found, None if not found or on error.
         """
         try:
-            order = cast(Order, self.alpaca.get_order_by_id(order_id))
+            with track_api_call("alpaca", "get_order_by_id"):
+                order = cast(Order, self.alpaca.get_order_by_id(order_id))
             logger.debug(
                 f"Retrieved order {order_id}: status={order.status}",
                 extra={"order_id": order_id, "status": str(order.status)},
@@ -855,7 +1074,9 @@ class ExecutionEngine:
         Retry fill price capture with configurable budget.
 
         Handles volatile markets where orders sit in "Accepted" or "Partially Filled" state.
-        Retries with exponential backoff until fill price is available or budget exhausted.
+        With an order event source connected, waits for the order's fill event
+        (up to FILL_WAIT_TIMEOUT_SECONDS); otherwise polls the order until the
+        fill price is available or the retry budget is exhausted.
 
         Args:
             order_id: Alpaca order ID to check
@@ -868,6 +1089,9 @@ class ExecutionEngine:
         """
         import time
 
+        if self.order_events.connected:
+            return self._await_fill_event(order_id, position_id)
+
         for attempt in range(1, max_retries + 1):
             time.sleep(retry_delay)
             try:
@@ -902,6 +1126,98 @@ class ExecutionEngine:
 
         return None
 
+    def _await_fill_event(
+        self, order_id: str, position_id: str
+    ) -> Optional[tuple[float, Optional[datetime]]]:
+        """
+        Event-driven fill capture: wait on the order's trade_updates future.
+
+        On timeout, one confirmation lookup covers events missed while the
+        stream was (re)connecting. A cancel/expire/reject ends the wait
+        without polling.
+
+        Returns:
+            Tuple of (fill_price, filled_at) if filled, None otherwise
+        """
+        timeout = get_settings().FILL_WAIT_TIMEOUT_SECONDS
+        event = self.order_events.wait_for_fill(order_id, timeout=timeout)
+
+        if event is not None and event.is_fill and event.filled_avg_price:
+            logger.info(
+                f"[EVENT] Captured fill price for {position_id}: ${event.filled_avg_price}",
+                extra={
+                    "position_id": position_id,
+                    "order_id": order_id,
+                    "event": event.event,
+                    "fill_price": event.filled_avg_price,
+                },
+            )
+            return (event.filled_avg_price, event.filled_at)
+
+        if event is not None and not event.is_fill:
+            logger.warning(
+                f"Order {order_id} for {position_id} {event.event} before filling.",
+                extra={"position_id": position_id, "order_id": order_id},
+            )
+            return None
+
+        order = self.get_order_details(order_id)
+        if order and order.filled_avg_price:
+            return (float(order.filled_avg_price), order.filled_at)
+        logger.debug(
+            f"No fill event for {order_id} within {timeout}s "
+            f"(status: {order.status if order else 'UNKNOWN'})"
+        )
+        return None
+
+    @contextmanager
+    def broker_snapshot(
+        self, positions: Sequence[Position]
+    ) -> Iterator[Optional[BrokerSnapshot]]:
+        """
+        Bulk sync mode: serve order/position lookups from one broker snapshot.
+
+        Fetches all orders (nested legs included) submitted since the oldest
+        position was opened plus all open positions in a few paginated calls.
+        While the context is active, sync_position_status() resolves lookups
+        from the in-memory index and only falls back to per-order API calls for
+        orders outside the snapshot window.
+
+        If the snapshot cannot be fetched, yields None and sync_position_status()
+        keeps its per-position behavior.
+
+        Args:
+            positions: Positions about to be synced (defines the order window).
+
+        Yields:
+            The active BrokerSnapshot, or None if unavailable.
+        """
+        created = [p.created_at for p in positions if getattr(p, "created_at", None)]
+        since = min(created) - _SNAPSHOT_LOOKBACK_MARGIN if created else None
+
+        snapshot: Optional[BrokerSnapshot] = None
+        try:
+            snapshot = fetch_broker_snapshot(self.alpaca, since=since)
+        except Exception as e:
+            logger.warning(
+                "Broker snapshot failed. Falling back to per-position sync.",
+                extra={"error": str(e)},
+            )
+
+        self._broker_snapshot = snapshot
+        try:
+            yield snapshot
+        finally:
+            self._broker_snapshot = None
+
+    def _get_order(self, order_id: str) -> Optional[Order]:
+        """Resolve an order from the active snapshot, else via the API."""
+        if self._broker_snapshot is not None:
+            order = self._broker_snapshot.get_order(order_id)
+            if order is not None:
+                return cast(Order, order)
+        return self.get_order_details(order_id)
+
     def sync_position_status(self, position: Position) -> Position:
         """
         Synchronize position with Alpaca broker state.
@@ -942,11 +1258,23 @@ class ExecutionEngine:
             and not position.exit_fill_price
         ):
             try:
-                exit_order = self.get_order_details(position.exit_order_id)
-                if exit_order and exit_order.filled_avg_price:
-                    position.exit_fill_price = float(exit_order.filled_avg_price)
-                    if exit_order.filled_at:
-                        position.exit_time = exit_order.filled_at
+                # A fill seen on the trade_updates stream needs no order lookup
+                fill_event = self.order_events.latest(position.exit_order_id)
+                if fill_event is not None and fill_event.event == "fill":
+                    fill_price = fill_event.filled_avg_price
+                    filled_at = fill_event.filled_at
+                else:
+                    exit_order = self._get_order(position.exit_order_id)
+                    fill_price = (
+                        float(exit_order.filled_avg_price)
+                        if exit_order and exit_order.filled_avg_price
+                        else None
+                    )
+                    filled_at = exit_order.filled_at if exit_order else None
+                if fill_price:
+                    position.exit_fill_price = fill_price
+                    if filled_at:
+                        position.exit_time = filled_at
                     logger.info(
                         f"[BACKFILL] Captured missing exit price for {position.position_id}: "
                         f"${position.exit_fill_price}",
@@ -970,7 +1298,7 @@ class ExecutionEngine:
 
         try:
             # Fetch parent order
-            order = self.get_order_details(position.alpaca_order_id)
+            order = self._get_order(position.alpaca_order_id)
             if not order:
                 position.failed_reason = "Parent order not found in Alpaca"
                 return position
@@ -1037,7 +1365,7 @@ class ExecutionEngine:
             # Check if TP or SL was filled (position closed externally)
             # Only check if leg IDs were successfully extracted to avoid unnecessary API calls
             if position.tp_order_id:
-                tp_order = self.get_order_details(position.tp_order_id)
+                tp_order = self._get_order(position.tp_order_id)
                 if tp_order and str(tp_order.status).lower() == "filled":
                     position.status = TradeStatus.CLOSED
                     # Capture exit details for PnL calculation
@@ -1051,7 +1379,7 @@ class ExecutionEngine:
                     logger.info(f"Position {position.position_id} closed via TP")
 
             if position.sl_order_id and position.status != TradeStatus.CLOSED:
-                sl_order = self.get_order_details(position.sl_order_id)
+                sl_order = self._get_order(position.sl_order_id)
                 if sl_order and str(sl_order.status).lower() == "filled":
                     position.status = TradeStatus.CLOSED
                     # Capture exit details for PnL calculation
@@ -1105,45 +1433,61 @@ class ExecutionEngine:
             # If position is still marked OPEN but TP/SL were not triggered,
             # verify if the position corresponds to actual broker state.
             if position.status == TradeStatus.OPEN:
-                try:
-                    # Check actual open position on Alpaca
-                    # get_open_position raises 404 if no position exists
-                    alpaca_pos = self.alpaca.get_open_position(
-                        normalize_alpaca_symbol(position.symbol)
-                    )
-
-                    # Authoritative Reconciliation: Sync current qty and avg entry price
-                    # from broker live state to ensure Firestore matches reality.
-                    if alpaca_pos:
-                        position.qty = float(alpaca_pos.qty)
-                        position.entry_fill_price = float(alpaca_pos.avg_entry_price)
+                position_missing = False
+                alpaca_pos = None
+                if self._broker_snapshot is not None:
+                    # Bulk sync: absence from the snapshot is the 404 equivalent
+                    alpaca_pos = self._broker_snapshot.get_position(position.symbol)
+                    position_missing = alpaca_pos is None
+                else:
+                    try:
+                        # Check actual open position on Alpaca
+                        # get_open_position raises 404 if no position exists
+                        alpaca_pos = self.alpaca.get_open_position(
+                            normalize_alpaca_symbol(position.symbol)
+                        )
+                    except Exception as e:
+                        # 404 means no position
+                        position_missing = "not found" in str(e).lower() or "404" in str(
+                            e
+                        )
 
-                except Exception as e:
-                    # 404 means no position -> BEFORE marking CLOSED, verify if a closing order exists
-                    if "not found" in str(e).lower() or "404" in str(e):
-                        # Race Condition Protection: Skip manual exit verification for young positions
-                        # This prevents false closures if sync runs immediately after opening.
-                        min_age_minutes = _MANUAL_EXIT_VERIFICATION_MIN_AGE_MINUTES
-                        if position.created_at:
-                            age = datetime.now(timezone.utc) - position.created_at
-                            if age < timedelta(minutes=min_age_minutes):
-                                logger.warning(
-                                    f"Skipping manual exit verification for young position {position.symbol}",
-                                    extra={
-                                        "symbol": position.symbol,
-                                        "age_seconds": age.total_seconds(),
-                                        "min_age_minutes": min_age_minutes,
-                                    },
-                                )
-                                return position
-
-                        if self.reconciler:
-                            self.reconciler.handle_manual_exit_verification(position)
-                        else:
+                # Authoritative Reconciliation: Sync current qty and avg entry price
+                # from broker live state to ensure Firestore matches reality.
+                if alpaca_pos:
+                    position.qty = float(alpaca_pos.qty)
+                    position.entry_fill_price = float(alpaca_pos.avg_entry_price)
+
+                # No position -> BEFORE marking CLOSED, verify if a closing order exists
+                if position_missing:
+                    # Race Condition Protection: Skip manual exit verification for young positions
+                    # This prevents false closures if sync runs immediately after opening.
+                    min_age_minutes = _MANUAL_EXIT_VERIFICATION_MIN_AGE_MINUTES
+                    if position.created_at:
+                        age = datetime.now(timezone.utc) - position.created_at
+                        if age < timedelta(minutes=min_age_minutes):
                             logger.warning(
-                                f"Position {position.position_id} missing on Alpaca. "
-                                "Verification skipped (no reconciler provided)."
+                                f"Skipping manual exit verification for young position {position.symbol}",
+                                extra={
+                                    "symbol": position.symbol,
+                                    "age_seconds": age.total_seconds(),
+                                    "min_age_minutes": min_age_minutes,
+                                },
                             )
+                            return position
+
+                    if self.reconciler and self._broker_snapshot is not None:
+                        # Verify against the shared order window (no extra API call)
+                        self.reconciler.handle_manual_exit_verification(
+                            position, snapshot=self._broker_snapshot
+                        )
+                    elif self.reconciler:
+                        self.reconciler.handle_manual_exit_verification(position)
+                    else:
+                        logger.warning(
+                            f"Position {position.position_id} missing on Alpaca. "
+                            "Verification skipped (no reconciler provided)."
+                        )
 
         except Exception as e:
             logger.error(
@@ -0,0 +1,411 @@
+"""
+Dependency-Aware Job Scheduler.
+
+Runs the startup maintenance jobs (reconciliation, archival pipelines, patches,
+snapshots, cleanup) as a small DAG on a bounded set of daemon worker threads,
+so independent I/O-bound jobs overlap with each other and with signal
+generation.
+
+Semantics:
+    - A task starts once every task in ``depends_on`` has SUCCEEDED and every
+      task in ``after`` (ordering only, e.g. serialized DML) is terminal.
+    - If a prerequisite fails, times out or is skipped, the task (and its own
+      dependents) is SKIPPED.
+    - Per-task timeouts are enforced whenever the caller waits. A timed-out task
+      is abandoned (Python threads cannot be killed): it frees its worker slot,
+      its dependents are skipped, and because tasks run on daemon threads it
+      does not hold up interpreter exit. The clock starts when the task starts.
+      ``abandoned()`` reports timed-out tasks whose function is still running.
+    - Once ``cancel_check()`` returns True (e.g. SIGTERM), no new task is
+      started. Pending and queued tasks are CANCELLED; running tasks finish.
+
+Example:
+    >>> scheduler = JobScheduler(max_workers=4)
+    >>> scheduler.add("reconcile", reconciler.reconcile, timeout=300)
+    >>> scheduler.add("trade_archival", archival.run, depends_on=["reconcile"])
+    >>> scheduler.start()
+    >>> scheduler.wait_for("reconcile")  # Critical path only
+    >>> ...  # Signal generation overlaps with archival
+    >>> scheduler.wait_all()
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from crypto_signals.tracing import get_tracer
+from loguru import logger
+
+
+class TaskState(str, Enum):
+    """Lifecycle state of a scheduled task."""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    TIMED_OUT = "TIMED_OUT"
+    SKIPPED = "SKIPPED"
+    CANCELLED = "CANCELLED"
+
+
+TERMINAL_STATES = frozenset(
+    {
+        TaskState.SUCCEEDED,
+        TaskState.FAILED,
+        TaskState.TIMED_OUT,
+        TaskState.SKIPPED,
+        TaskState.CANCELLED,
+    }
+)
+
+
+@dataclass
+class ScheduledTask:
+    """
+    A unit of work in the scheduler DAG.
+
+    Attributes:
+        name: Unique task name (used for dependencies and logging).
+        fn: Zero-argument callable. Raising marks the task FAILED.
+        depends_on: Names of tasks that must SUCCEED before this one starts.
+        after: Names of tasks that must finish (in any state) before this one
+            starts. Orders the tasks without gating on the outcome.
+        timeout: Max runtime in seconds (None = unbounded).
+        state: Current lifecycle state.
+        result: Return value of ``fn`` when SUCCEEDED.
+        error: Failure / skip reason.
+        started_at: Monotonic start time.
+        duration: Runtime in seconds once finished.
+    """
+
+    name: str
+    fn: Callable[[], Any]
+    depends_on: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    state: TaskState = TaskState.PENDING
+    result: Any = None
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    duration: Optional[float] = None
+    _context: Optional[contextvars.Context] = field(default=None, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, repr=False)
+
+    @property
+    def prerequisites(self) -> tuple[str, ...]:
+        """Every task that must finish first (``depends_on`` and ``after``)."""
+        return self.depends_on + tuple(a for a in self.after if a not in self.depends_on)
+
+
+class JobScheduler:
+    """Runs a DAG of tasks with bounded concurrency, timeouts and cancellation."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        poll_interval: float = 0.25,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_workers: Maximum number of tasks running at once.
+            cancel_check: Returns True once pending work should be abandoned
+                (e.g. shutdown requested).
+            poll_interval: How often waits re-check timeouts and cancellation.
+        """
+        self.max_workers = max_workers
+        self.cancel_check = cancel_check or (lambda: False)
+        self.poll_interval = poll_interval
+
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._cond = threading.Condition()
+        self._started = False
+        self._cancelled = False
+        # Submitted tasks waiting for a free worker slot
+        self._queue: Deque[ScheduledTask] = deque()
+        self._active = 0
+
+    # ------------------------------------------------------------------
+    # Definition
+    # ------------------------------------------------------------------
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        depends_on: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        after: Sequence[str] = (),
+    ) -> None:
+        """
+        Register a task. Must be called before start().
+
+        Raises:
+            ValueError: If the name is already registered or the scheduler started.
+        """
+        if self._started:
+            raise ValueError("Cannot add tasks after the scheduler has started")
+        if name in self._tasks:
+            raise ValueError(f"Duplicate task name: {name}")
+        self._tasks[name] = ScheduledTask(
+            name=name,
+            fn=fn,
+            depends_on=tuple(depends_on),
+            after=tuple(after),
+            timeout=timeout,
+        )
+
+    def _validate(self) -> None:
+        """Reject unknown dependencies and cycles."""
+        for task in self._tasks.values():
+            missing = [d for d in task.prerequisites if d not in self._tasks]
+            if missing:
+                raise ValueError(
+                    f"Task '{task.name}' depends on unknown task(s): {missing}"
+                )
+
+        # Kahn's algorithm: every task must be reachable in topological order
+        indegree = {name: len(t.prerequisites) for name, t in self._tasks.items()}
+        ready = [name for name, deg in indegree.items() if deg == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for task in self._tasks.values():
+                if current in task.prerequisites:
+                    indegree[task.name] -= 1
+                    if indegree[task.name] == 0:
+                        ready.append(task.name)
+        if visited != len(self._tasks):
+            raise ValueError("Task dependencies contain a cycle")
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Validate the DAG and start every task without prerequisites."""
+        self._validate()
+        self._started = True
+        logger.info(
+            f"Job scheduler started: {len(self._tasks)} task(s), "
+            f"{self.max_workers} worker(s)",
+            extra={"tasks": list(self._tasks)},
+        )
+        with self._cond:
+            self._schedule_ready()
+
+    def _schedule_ready(self) -> None:
+        """Submit runnable tasks and skip unreachable ones. Caller holds the lock."""
+        if not self._cancelled and self.cancel_check():
+            self._cancel_pending()
+            return
+
+        progressed = True
+        while progressed:
+            progressed = False
+            for task in self._tasks.values():
+                if task.state != TaskState.PENDING:
+                    continue
+                deps = [self._tasks[d] for d in task.depends_on]
+                blocked = [
+                    d for d in deps if d.state in TERMINAL_STATES - {TaskState.SUCCEEDED}
+                ]
+                if blocked:
+                    self._finish(
+                        task,
+                        TaskState.SKIPPED,
+                        error=f"prerequisite {blocked[0].name} {blocked[0].state.value}",
+                    )
+                    progressed = True
+                elif all(d.state == TaskState.SUCCEEDED for d in deps) and all(
+                    self._tasks[a].state in TERMINAL_STATES for a in task.after
+                ):
+                    self._submit(task)
+
+    def _submit(self, task: ScheduledTask) -> None:
+        """Queue a task for a worker slot. Caller holds the lock."""
+        task.state = TaskState.RUNNING
+        # Spans opened by the task become children of the submitter's span
+        task._context = contextvars.copy_context()
+        self._queue.append(task)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Start queued tasks while worker slots are free. Caller holds the lock."""
+        while self._queue and self._active < self.max_workers:
+            task = self._queue.popleft()
+            if task.state != TaskState.RUNNING:
+                continue  # Cancelled while queued
+            self._active += 1
+            # Timeout clock starts when the task starts, not on submit
+            task.started_at = time.monotonic()
+            # Daemon: an abandoned (timed-out) task must not block process exit,
+            # which would also delay the job lock release
+            assert task._context is not None
+            task._thread = threading.Thread(
+                target=task._context.run,
+                args=(self._run_task, task),
+                name=f"job-{task.name}",
+                daemon=True,
+            )
+            task._thread.start()
+
+    def _run_task(self, task: ScheduledTask) -> None:
+        """Worker body: run the task and schedule its dependents."""
+        logger.debug(f"Job started: {task.name}")
+        span = get_tracer().start_span(f"job.{task.name}")
+        try:
+            result = task.fn()
+            outcome, error = TaskState.SUCCEEDED, None
+        except Exception as e:
+            span.record_error(e)
+            result, outcome, error = None, TaskState.FAILED, str(e)
+        finally:
+            span.end()
+
+        with self._cond:
+            # A task abandoned after its timeout keeps TIMED_OUT and has
+            # already released its slot
+            if task.state == TaskState.RUNNING:
+                task.result = result
+                self._finish(task, outcome, error=error)
+                self._active -= 1
+            self._schedule_ready()
+            self._dispatch()
+
+    def _finish(
+        self, task: ScheduledTask, state: TaskState, error: Optional[str] = None
+    ) -> None:
+        """Record a terminal state and wake waiters. Caller holds the lock."""
+        task.state = state
+        task.error = error
+        if task.started_at is not None:
+            task.duration = time.monotonic() - task.started_at
+
+        if state == TaskState.SUCCEEDED:
+            logger.debug(f"Job succeeded: {task.name} ({task.duration:.2f}s)")
+        elif state in (TaskState.FAILED, TaskState.TIMED_OUT):
+            logger.error(
+                f"Job {state.value.lower()}: {task.name}: {error}",
+                extra={"task": task.name, "state": state.value, "error": error},
+            )
+        else:
+            logger.warning(
+                f"Job {state.value.lower()}: {task.name} ({error})",
+                extra={"task": task.name, "state": state.value},
+            )
+        self._cond.notify_all()
+
+    def _enforce_timeouts(self) -> None:
+        """Abandon running tasks past their timeout. Caller holds the lock."""
+        now = time.monotonic()
+        expired = [
+            t
+            for t in self._tasks.values()
+            if t.state == TaskState.RUNNING
+            and t.timeout is not None
+            and t.started_at is not None
+            and now - t.started_at > t.timeout
+        ]
+        for task in expired:
+            self._finish(task, TaskState.TIMED_OUT, error=f"exceeded {task.timeout}s")
+            self._active -= 1
+        if expired:
+            self._schedule_ready()
+            self._dispatch()
+
+    def _cancel_pending(self) -> None:
+        """Stop scheduling new work. Caller holds the lock."""
+        self._cancelled = True
+        for task in self._tasks.values():
+            queued = task.state == TaskState.RUNNING and task.started_at is None
+            if task.state == TaskState.PENDING or queued:
+                self._finish(task, TaskState.CANCELLED, error="shutdown requested")
+        self._queue.clear()
+
+    def cancel(self) -> None:
+        """Cancel every task that has not started yet."""
+        with self._cond:
+            self._cancel_pending()
+
+    # ------------------------------------------------------------------
+    # Waiting
+    # ------------------------------------------------------------------
+
+    def wait_for(self, *names: str) -> bool:
+        """
+        Block until the named tasks reach a terminal state.
+
+        Returns:
+            bool: True if every named task SUCCEEDED.
+        """
+        targets = [self._tasks[n] for n in names]
+        with self._cond:
+            while True:
+                self._enforce_timeouts()
+                if not self._cancelled and self.cancel_check():
+                    self._cancel_pending()
+                if all(t.state in TERMINAL_STATES for t in targets):
+                    return all(t.state == TaskState.SUCCEEDED for t in targets)
+                self._cond.wait(timeout=self.poll_interval)
+
+    def wait_all(self) -> Dict[str, ScheduledTask]:
+        """
+        Block until every task is terminal.
+
+        Running tasks that timed out are abandoned rather than joined; their
+        daemon threads do not keep the process alive.
+
+        Returns:
+            Dict of task name to ScheduledTask (with state, result, duration).
+        """
+        if self._tasks:
+            self.wait_for(*self._tasks)
+        self._log_summary()
+        return dict(self._tasks)
+
+    def abandoned(self, *names: str) -> List[str]:
+        """
+        Names of the given tasks that timed out but are still running.
+
+        A TIMED_OUT task only stops being waited on; its thread keeps going
+        until the function returns, so its side effects may still be pending.
+        """
+        return [
+            n
+            for n in names
+            if self._tasks[n].state == TaskState.TIMED_OUT
+            and self._tasks[n]._thread is not None
+            and self._tasks[n]._thread.is_alive()
+        ]
+
+    def state(self, name: str) -> TaskState:
+        """Current state of a task."""
+        return self._tasks[name].state
+
+    def _log_summary(self) -> None:
+        """Log one line per task with its final state and duration."""
+        summary: List[Dict[str, Any]] = [
+            {
+                "task": t.name,
+                "state": t.state.value,
+                "duration_seconds": round(t.duration, 3) if t.duration else None,
+            }
+            for t in self._tasks.values()
+        ]
+        counts: Dict[str, int] = {}
+        for t in self._tasks.values():
+            counts[t.state.value] = counts.get(t.state.value, 0) + 1
+        logger.info(
+            "Job scheduler finished: "
+            + ", ".join(f"{k.lower()}={v}" for k, v in sorted(counts.items())),
+            extra={"jobs": summary},
+        )
@@ -0,0 +1,446 @@
+"""
+Order Event Subsystem.
+
+Tracks order fills from Alpaca's ``trade_updates`` stream instead of polling
+``GET /v2/orders/{id}``. Sources (the live stream or a local replay of
+recorded events) publish ``OrderEvent``s into an ``OrderEventHub``; callers
+wait on a per-order future that resolves on fill, partial fill or a terminal
+cancel/expire/reject, with a timeout.
+
+Events are cached per order (bounded), so an event that arrives between
+``submit_order`` returning and the caller starting to wait still resolves the
+wait immediately.
+
+Usage:
+    >>> hub = get_order_event_hub()
+    >>> source = start_order_event_source(settings, hub)
+    >>> event = hub.wait_for_fill(str(order.id), timeout=10.0)
+    >>> if event and event.filled_avg_price: ...
+    >>> source.stop()
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from crypto_signals.metrics import ORDER_FILL_WAIT, get_metrics_registry
+from loguru import logger
+
+# trade_updates events that settle a fill wait
+FILL_EVENTS = frozenset({"fill", "partial_fill"})
+TERMINAL_EVENTS = frozenset({"canceled", "expired", "rejected"})
+RESOLVING_EVENTS = FILL_EVENTS | TERMINAL_EVENTS
+
+# Latest event kept per order; oldest orders are evicted first
+DEFAULT_MAX_CACHED_ORDERS = 10_000
+
+# Bounded wait for the stream thread when stopping
+STOP_JOIN_TIMEOUT_SECONDS = 5.0
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return str(getattr(value, "value", value)).lower()
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    """
+    One ``trade_updates`` event, reduced to what fill tracking needs.
+
+    Attributes:
+        event: Event type ("new", "fill", "partial_fill", "canceled", ...).
+        order_id: Alpaca order ID.
+        status: Order status after the event.
+        filled_avg_price: Average fill price so far (None before any fill).
+        filled_qty: Cumulative filled quantity.
+        filled_at: Fill timestamp reported on the order.
+        timestamp: Event time.
+        symbol: Order symbol.
+        client_order_id: Client order ID (signal/position ID for entries).
+    """
+
+    event: str
+    order_id: str
+    status: Optional[str] = None
+    filled_avg_price: Optional[float] = None
+    filled_qty: Optional[float] = None
+    filled_at: Optional[datetime] = None
+    timestamp: Optional[datetime] = None
+    symbol: Optional[str] = None
+    client_order_id: Optional[str] = None
+
+    @property
+    def is_fill(self) -> bool:
+        """True for fill and partial fill events."""
+        return self.event in FILL_EVENTS
+
+    @classmethod
+    def from_trade_update(cls, update: Any) -> "OrderEvent":
+        """Build from an alpaca-py ``TradeUpdate`` model."""
+        order = update.order
+        return cls(
+            event=_text(update.event) or "",
+            order_id=str(order.id),
+            status=_text(order.status),
+            filled_avg_price=_float(order.filled_avg_price),
+            filled_qty=_float(order.filled_qty),
+            filled_at=order.filled_at,
+            timestamp=update.timestamp,
+            symbol=order.symbol,
+            client_order_id=order.client_order_id,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OrderEvent":
+        """
+        Build from a raw ``trade_updates`` payload.
+
+        Accepts the websocket message (``{"stream": ..., "data": {...}}``) or
+        its ``data`` object, as recorded for replay.
+        """
+        data = data.get("data", data)
+        order = data.get("order") or {}
+        return cls(
+            event=_text(data.get("event")) or "",
+            order_id=str(order.get("id")),
+            status=_text(order.get("status")),
+            filled_avg_price=_float(order.get("filled_avg_price")),
+            filled_qty=_float(order.get("filled_qty")),
+            filled_at=_timestamp(order.get("filled_at")),
+            timestamp=_timestamp(data.get("timestamp")),
+            symbol=order.get("symbol"),
+            client_order_id=order.get("client_order_id"),
+        )
+
+
+class OrderEventHub:
+    """
+    Routes order events to per-order futures.
+
+    Thread-safe: sources publish from their own thread while execution
+    threads wait.
+    """
+
+    def __init__(self, max_cached_orders: int = DEFAULT_MAX_CACHED_ORDERS):
+        self.max_cached_orders = max_cached_orders
+        self._lock = threading.Lock()
+        self._latest: "OrderedDict[str, OrderEvent]" = OrderedDict()
+        # Resolving event per order, kept until evicted with the latest event
+        self._resolved: Dict[str, OrderEvent] = {}
+        self._waiters: Dict[str, List[Future]] = {}
+        self._connected = 0
+
+    @property
+    def connected(self) -> bool:
+        """True while at least one source feeds the hub."""
+        return self._connected > 0
+
+    def set_connected(self, connected: bool) -> None:
+        """Called by sources when they start and stop."""
+        with self._lock:
+            self._connected = max(0, self._connected + (1 if connected else -1))
+
+    def publish(self, event: OrderEvent) -> None:
+        """Record an event and resolve waiters if it settles the order."""
+        with self._lock:
+            self._latest[event.order_id] = event
+            self._latest.move_to_end(event.order_id)
+            while len(self._latest) > self.max_cached_orders:
+                evicted, _ = self._latest.popitem(last=False)
+                self._resolved.pop(evicted, None)
+            if event.event not in RESOLVING_EVENTS:
+                return
+            self._resolved[event.order_id] = event
+            waiters = self._waiters.pop(event.order_id, [])
+        for future in waiters:
+            if not future.done():
+                future.set_result(event)
+
+    def latest(self, order_id: str) -> Optional[OrderEvent]:
+        """Most recent event seen for an order, if still cached."""
+        with self._lock:
+            return self._latest.get(str(order_id))
+
+    def watch(self, order_id: str) -> "Future[OrderEvent]":
+        """
+        Future resolved by the order's next fill / partial fill / terminal event.
+
+        Already resolved if such an event was published before the call.
+        """
+        future: "Future[OrderEvent]" = Future()
+        order_id = str(order_id)
+        with self._lock:
+            event = self._resolved.get(order_id)
+            if event is None:
+                self._waiters.setdefault(order_id, []).append(future)
+                return future
+        future.set_result(event)
+        return future
+
+    def _unwatch(self, order_id: str, future: Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(order_id)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[order_id]
+
+    def wait_for_fill(self, order_id: str, timeout: float) -> Optional[OrderEvent]:
+        """
+        Block until the order fills (fully or partially) or settles.
+
+        Args:
+            order_id: Alpaca order ID.
+            timeout: Maximum seconds to wait.
+
+        Returns:
+            The resolving event (check ``is_fill``), or None on timeout.
+        """
+        order_id = str(order_id)
+        future = self.watch(order_id)
+        start = time.perf_counter()
+        try:
+            event: Optional[OrderEvent] = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self._unwatch(order_id, future)
+            event = None
+        get_metrics_registry().histogram(
+            ORDER_FILL_WAIT, "Time spent waiting for order fill events", ("outcome",)
+        ).labels(outcome=event.event if event else "timeout").observe(
+            time.perf_counter() - start
+        )
+        return event
+
+    def clear(self) -> None:
+        """Drop cached events and pending waiters (tests / new run)."""
+        with self._lock:
+            self._latest.clear()
+            self._resolved.clear()
+            self._waiters.clear()
+
+
+class TradeUpdatesStream:
+    """
+    Live source: Alpaca ``trade_updates`` websocket on a daemon thread.
+
+    The alpaca-py stream runs its own asyncio loop and reconnects on
+    websocket errors; each update is converted and published to the hub.
+    The hub counts the stream as connected only between a successful
+    connect/authenticate/listen and the next websocket close, so fill waits
+    fall back to polling while the stream is down.
+    """
+
+    def __init__(self, hub: OrderEventHub, stream: Any):
+        """
+        Args:
+            hub: Hub receiving the events.
+            stream: ``alpaca.trading.stream.TradingStream`` (see
+                ``config.get_trading_stream``).
+        """
+        self.hub = hub
+        self.stream = stream
+        self._thread: Optional[threading.Thread] = None
+        self._connected = False
+        self._connected_lock = threading.Lock()
+        self._track_connection()
+
+    def _set_connected(self, connected: bool) -> None:
+        """Report a connection change to the hub (once per transition)."""
+        with self._connected_lock:
+            if self._connected == connected:
+                return
+            self._connected = connected
+        self.hub.set_connected(connected)
+        logger.info(
+            "Trade updates stream connected"
+            if connected
+            else "Trade updates stream disconnected"
+        )
+
+    def _track_connection(self) -> None:
+        """
+        Hook the stream's connect and close coroutines.
+
+        alpaca-py exposes no connection callbacks: ``_start_ws`` returns once
+        the websocket is connected, authenticated and listening, and
+        ``close`` runs on every websocket error and on stop.
+        """
+        start_ws = getattr(self.stream, "_start_ws", None)
+        close = getattr(self.stream, "close", None)
+        if start_ws is None or close is None:
+            return
+
+        async def _start_ws() -> None:
+            await start_ws()
+            self._set_connected(True)
+
+        async def _close() -> None:
+            self._set_connected(False)
+            await close()
+
+        self.stream._start_ws = _start_ws
+        self.stream.close = _close
+
+    async def _on_update(self, update: Any) -> None:
+        try:
+            self.hub.publish(OrderEvent.from_trade_update(update))
+        except Exception as e:
+            logger.warning(f"Dropped malformed trade update: {e}")
+
+    def start(self) -> "TradeUpdatesStream":
+        """Subscribe and start consuming in the background."""
+        self.stream.subscribe_trade_updates(self._on_update)
+        self._thread = threading.Thread(
+            target=self.stream.run, name="trade-updates", daemon=True
+        )
+        self._thread.start()
+        logger.info("Trade updates stream started")
+        return self
+
+    def stop(self) -> None:
+        """Close the websocket and wait briefly for the thread."""
+        if self._thread is None:
+            return
+        self._set_connected(False)
+        try:
+            self.stream.stop()
+        except Exception as e:
+            # Stop before the event loop came up: the daemon thread dies with
+            # the process
+            logger.debug(f"Trade updates stream stop: {e}")
+        self._thread.join(timeout=STOP_JOIN_TIMEOUT_SECONDS)
+        self._thread = None
+
+
+class ReplayEventSource:
+    """
+    Local stand-in for the stream: replays recorded ``trade_updates`` events.
+
+    Events are published in order on a background thread. With ``speed`` > 0
+    the recorded spacing (by event timestamp) is reproduced, divided by
+    ``speed``; with 0 they are published back to back.
+    """
+
+    def __init__(
+        self,
+        hub: OrderEventHub,
+        events: Iterable[Union[OrderEvent, Dict[str, Any]]],
+        speed: float = 0.0,
+    ):
+        self.hub = hub
+        self.events = [
+            e if isinstance(e, OrderEvent) else OrderEvent.from_dict(e) for e in events
+        ]
+        self.speed = speed
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_file(
+        cls, hub: OrderEventHub, path: str, speed: float = 0.0
+    ) -> "ReplayEventSource":
+        """Load events from a JSONL file (one raw trade_updates payload per line)."""
+        with open(path, encoding="utf-8") as f:
+            events = [json.loads(line) for line in f if line.strip()]
+        return cls(hub, events, speed=speed)
+
+    def _delay(self, previous: OrderEvent, current: OrderEvent) -> float:
+        if self.speed <= 0 or not (previous.timestamp and current.timestamp):
+            return 0.0
+        gap = (current.timestamp - previous.timestamp).total_seconds()
+        return max(gap, 0.0) / self.speed
+
+    def _run(self) -> None:
+        previous: Optional[OrderEvent] = None
+        for event in self.events:
+            if previous is not None and self._stop.wait(self._delay(previous, event)):
+                return
+            if self._stop.is_set():
+                return
+            self.hub.publish(event)
+            previous = event
+
+    def start(self) -> "ReplayEventSource":
+        """Start replaying in the background."""
+        self._thread = threading.Thread(
+            target=self._run, name="trade-updates-replay", daemon=True
+        )
+        self._thread.start()
+        self.hub.set_connected(True)
+        logger.info(f"Replaying {len(self.events)} recorded trade updates")
+        return self
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the replay to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stop(self) -> None:
+        """Stop replaying."""
+        if self._thread is None:
+            return
+        self.hub.set_connected(False)
+        self._stop.set()
+        self._thread.join(timeout=STOP_JOIN_TIMEOUT_SECONDS)
+        self._thread = None
+
+
+OrderEventSource = Union[TradeUpdatesStream, ReplayEventSource]
+
+_hub = OrderEventHub()
+
+
+def get_order_event_hub() -> OrderEventHub:
+    """Get the process-wide order event hub."""
+    return _hub
+
+
+def start_order_event_source(
+    settings: Any, hub: Optional[OrderEventHub] = None
+) -> Optional[OrderEventSource]:
+    """
+    Start the configured event source, if any.
+
+    ``TRADE_UPDATES_REPLAY_FILE`` selects the local replay; otherwise
+    ``ENABLE_TRADE_UPDATES_STREAM`` connects to Alpaca. Failures are logged
+    and leave fill tracking on polling.
+
+    Returns:
+        The running source (call ``stop()`` at shutdown), or None.
+    """
+    hub = hub or _hub
+    try:
+        if settings.TRADE_UPDATES_REPLAY_FILE:
+            return ReplayEventSource.from_file(
+                hub, settings.TRADE_UPDATES_REPLAY_FILE
+            ).start()
+        if settings.ENABLE_TRADE_UPDATES_STREAM:
+            from crypto_signals.config import get_trading_stream
+
+            return TradeUpdatesStream(hub, get_trading_stream()).start()
+    except Exception as e:
+        logger.warning(
+            "Order event source failed to start. Falling back to fill polling.",
+            extra={"error": str(e)},
+        )
+    return None
@@ -21,8 +21,9 @@ Example:
 """
 
 import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Optional
 
 from alpaca.trading.client import TradingClient
 from alpaca.trading.models import Position as AlpacaPosition
@@ -33,22 +34,55 @@ from crypto_signals.domain.schemas import (
     ExitReason,
     Position,
     ReconciliationReport,
+    Signal,
     SignalStatus,
     TradeStatus,
     TradeType,
 )
+from crypto_signals.engine.broker_snapshot import BrokerSnapshot, fetch_broker_snapshot
 from crypto_signals.engine.reconciler_notifications import ReconcilerNotificationService
-from crypto_signals.repository.firestore import PositionRepository, SignalRepository
+from crypto_signals.repository.firestore import (
+    BatchWriteError,
+    PositionRepository,
+    SignalRepository,
+)
 from crypto_signals.utils.symbols import normalize_alpaca_symbol
 from loguru import logger
 
+# Extra lookback before the oldest zombie when fetching the order window
+_ORDER_WINDOW_MARGIN = timedelta(days=1)
+
+
+@dataclass
+class ReconciliationDiff:
+    """
+    Set-based diff between one broker snapshot and one Firestore snapshot.
+
+    Attributes:
+        zombies: Firestore OPEN positions with no broker position (by symbol).
+        orphans: Normalized symbols held at the broker but missing in Firestore.
+        reverse_orphans: Recently CLOSED Firestore positions still held at the broker.
+        waiting_signals: WAITING signals backed by an OPEN position (heal to ACTIVE).
+    """
+
+    zombies: list[Position] = field(default_factory=list)
+    orphans: list[str] = field(default_factory=list)
+    reverse_orphans: list[Position] = field(default_factory=list)
+    waiting_signals: list[Signal] = field(default_factory=list)
+
 
 class StateReconciler:
     """
     Detects and resolves synchronization gaps between Alpaca and Firestore.
     Handles Zombie Positions (Firestore OPEN, Alpaca CLOSED) and Orphans (Alpaca OPEN, Firestore MISSING).
+
+    All detectors run against a single broker snapshot and a single Firestore
+    snapshot, so API usage stays flat as the number of positions grows.
     """
 
+    # Broker snapshot active during reconcile() (orders for exit verification)
+    _broker_snapshot: Optional[BrokerSnapshot] = None
+
     def __init__(
         self,
         alpaca_client: TradingClient,
@@ -86,10 +120,11 @@ class StateReconciler:
         Execute full reconciliation between Alpaca and Firestore.
 
         Process:
-        1. Fetch open positions from Alpaca and Firestore.
-        2. Detect discrepancies (Zombies and Orphans).
-        3. Heal zombies (verify exit then close in DB).
-        4. Alert on orphans.
+        1. Snapshot Alpaca positions and Firestore positions/signals once.
+        2. Compute a set-based diff (zombies, orphans, reverse orphans, stale signals).
+        3. Heal zombies (verify exit against one order snapshot, batch-close in DB).
+        4. Alert on orphans and reverse orphans.
+        5. Batch-heal WAITING signals backed by OPEN positions.
 
         Args:
             min_age_minutes: Min age to consider for zombie healing (race condition guard).
@@ -116,34 +151,41 @@ class StateReconciler:
         orphans: list[str] = []
 
         try:
-            # 1. Fetch State
+            # 1. Snapshot State (one broker fetch + one Firestore fetch)
             alpaca_pos, firestore_pos, fetch_errors = self._fetch_provider_state()
             critical_issues.extend(fetch_errors)
+            closed_pos = self._fetch_recently_closed()
+            signals_by_id = self._fetch_signals(firestore_pos)
+
+            # 2. Set-based Diff
+            diff = self._compute_diff(
+                alpaca_pos, firestore_pos, closed_pos, signals_by_id
+            )
 
-            # 2. Detect Discrepancies
-            zombie_candidates, orphan_candidates = self._detect_discrepancies(
-                alpaca_pos, firestore_pos
+            # Orders are only needed to verify exits of mature zombies
+            self._broker_snapshot = self._fetch_order_snapshot(
+                alpaca_pos, diff.zombies, min_age_minutes
             )
 
             # 3. Heal Zombies
             zombies, healed_count, zombie_errors = self._heal_zombies(
-                zombie_candidates, firestore_pos, min_age_minutes
+                diff.zombies, min_age_minutes
             )
             reconciled_count += healed_count
             critical_issues.extend(zombie_errors)
 
             # 4. Handle Orphans
-            orphans, orphan_errors = self._handle_orphans(orphan_candidates)
+            orphans, orphan_errors = self._handle_orphans(diff.orphans)
             critical_issues.extend(orphan_errors)
 
             # 5. Check Reverse Orphans
-            reverse_orphan_errors = self._check_reverse_orphans()
+            reverse_orphan_errors = self._check_reverse_orphans(diff.reverse_orphans)
             critical_issues.extend(reverse_orphan_errors)
 
             # 6. TIER 2: Signal Status Healing (Auto-Healing)
             # Close the circuit between positions and signals
             signal_healing_count, signal_healing_errors = self._heal_signal_statuses(
-                firestore_pos
+                firestore_pos, diff.waiting_signals
             )
             reconciled_count += signal_healing_count
             critical_issues.extend(signal_healing_errors)
@@ -152,6 +194,8 @@ class StateReconciler:
             error_msg = f"Reconciliation execution failed: {e}"
             logger.error(error_msg)
             critical_issues.append(error_msg)
+        finally:
+            self._broker_snapshot = None
 
         # 6. Build report
         duration_seconds = time.time() - start_time
@@ -167,13 +211,21 @@ class StateReconciler:
         self._log_report_summary(report)
         return report
 
-    def handle_manual_exit_verification(self, position: Position) -> Optional[Position]:
+    def handle_manual_exit_verification(
+        self, position: Position, snapshot: Optional[BrokerSnapshot] = None
+    ) -> Optional[Position]:
         """
         Verify if a position that is missing from Alpaca has a corresponding manual exit order.
         If verified, it returns the updated Position object. If not, returns None.
 
         This logic is centralized here to unify state reconciliation strategies.
+
+        Args:
+            position: Position missing from the broker.
+            snapshot: Broker snapshot to search instead of querying order history.
+                Defaults to the snapshot active during reconcile(), if any.
         """
+        snapshot = snapshot or self._broker_snapshot
         logger.warning(
             f"Position {position.position_id} ({position.symbol}) not found on Alpaca. "
             "Verifying manual exit via order history..."
@@ -192,21 +244,33 @@ class StateReconciler:
             )
 
             # 2. Search recent filled orders for this symbol
-
-            from alpaca.trading.enums import QueryOrderStatus
-
-            request = GetOrdersRequest(
-                status=QueryOrderStatus.CLOSED,
-                symbols=[position.symbol],
-                limit=500,
-                side=close_side,
-            )
             from alpaca.trading.models import Order
 
-            recent_orders_result = self.alpaca.get_orders(filter=request)
-            recent_orders = (
-                recent_orders_result if isinstance(recent_orders_result, list) else []
-            )
+            recent_orders: list[Any]
+            if snapshot is not None and snapshot.orders_loaded:
+                # In-memory lookup against the shared order window
+                recent_orders = snapshot.orders_for_symbol(
+                    position.symbol, side=close_side.value, status="filled"
+                )
+            else:
+                from alpaca.trading.enums import QueryOrderStatus
+
+                request = GetOrdersRequest(
+                    status=QueryOrderStatus.CLOSED,
+                    symbols=[position.symbol],
+                    limit=500,
+                    side=close_side,
+                )
+                recent_orders_result = self.alpaca.get_orders(filter=request)
+                recent_orders = [
+                    o
+                    for o in (
+                        recent_orders_result
+                        if isinstance(recent_orders_result, list)
+                        else []
+                    )
+                    if isinstance(o, Order)
+                ]
 
             # 3. Find the most recent fill that is NOT our known TP or SL legs
             closing_order = None
@@ -218,20 +282,17 @@ class StateReconciler:
             }
 
             for o in recent_orders:
-                if isinstance(o, Order):
-                    # Check both Alpaca UUID and Client Order ID to prevent false MANUAL_EXIT
-                    order_id = str(o.id)
-                    client_id = getattr(o, "client_order_id", None)
-                    if client_id:
-                        client_id = str(client_id)
-
-                    if order_id in ignored_ids or (
-                        client_id and client_id in ignored_ids
-                    ):
-                        continue
+                # Check both Alpaca UUID and Client Order ID to prevent false MANUAL_EXIT
+                order_id = str(o.id)
+                client_id = getattr(o, "client_order_id", None)
+                if client_id:
+                    client_id = str(client_id)
+
+                if order_id in ignored_ids or (client_id and client_id in ignored_ids):
+                    continue
 
-                    closing_order = o
-                    break
+                closing_order = o
+                break
 
             # 4. If closing order found, heal the position state
             if closing_order:
@@ -329,61 +390,122 @@ class StateReconciler:
 
         return alpaca_positions_list, firestore_positions, errors
 
-    def _detect_discrepancies(
+    def _fetch_recently_closed(self, limit: int = 50) -> list[Position]:
+        """Fetch recently closed Firestore positions for reverse orphan detection."""
+        try:
+            return self.position_repo.get_closed_positions(limit=limit)
+        except Exception as e:
+            logger.warning("Reverse orphan detection failed.", extra={"error": str(e)})
+            return []
+
+    def _fetch_signals(self, firestore_positions: list[Position]) -> dict[str, Signal]:
+        """Batch-read the signals backing OPEN positions (one Firestore round-trip)."""
+        signal_ids = [
+            p.signal_id for p in firestore_positions if p.status == TradeStatus.OPEN
+        ]
+        if not signal_ids:
+            return {}
+        try:
+            signals = self.signal_repo.get_by_ids(signal_ids)
+            return signals if isinstance(signals, dict) else {}
+        except Exception as e:
+            logger.error(f"Failed to fetch signals for status healing: {e}")
+            return {}
+
+    def _fetch_order_snapshot(
         self,
         alpaca_positions: list[AlpacaPosition],
-        firestore_positions: list[Position],
-    ) -> tuple[list[str], list[str]]:
-        """Identify zombie and orphan candidates based on position sets."""
+        zombies: list[Position],
+        min_age_minutes: int,
+    ) -> Optional[BrokerSnapshot]:
+        """
+        Fetch the order window needed to verify zombie exits in one paginated pass.
+
+        Returns None when no zombie is old enough to be healed, or if the fetch
+        fails (verification then falls back to per-symbol order queries).
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=min_age_minutes)
+        mature = [z for z in zombies if not z.created_at or z.created_at <= cutoff]
+        if not mature:
+            return None
+
+        created = [z.created_at for z in mature if z.created_at]
+        since = min(created) - _ORDER_WINDOW_MARGIN if created else None
+        try:
+            snapshot = fetch_broker_snapshot(
+                self.alpaca, since=since, include_positions=False
+            )
+        except Exception as e:
+            logger.warning(
+                "Order snapshot failed. Falling back to per-symbol exit verification.",
+                extra={"error": str(e)},
+            )
+            return None
+
+        for p in alpaca_positions:
+            snapshot.positions_by_symbol[normalize_alpaca_symbol(p.symbol)] = p
+        return snapshot
 
-        # Normalize keys
+    def _compute_diff(
+        self,
+        alpaca_positions: list[AlpacaPosition],
+        firestore_positions: list[Position],
+        closed_positions: list[Position],
+        signals_by_id: dict[str, Signal],
+    ) -> ReconciliationDiff:
+        """Identify zombies, orphans, reverse orphans and stale signals with set operations."""
         alpaca_symbols = {normalize_alpaca_symbol(p.symbol) for p in alpaca_positions}
-        firestore_symbols_norm = {
-            normalize_alpaca_symbol(p.symbol) for p in firestore_positions
-        }
 
-        # Mapping for denormalization
-        norm_to_original = {
-            normalize_alpaca_symbol(p.symbol): p.symbol for p in firestore_positions
+        # Last position wins per symbol (one aggregate broker position per symbol)
+        firestore_by_symbol = {
+            normalize_alpaca_symbol(p.symbol): p for p in firestore_positions
         }
 
-        # Logic
-        zombie_symbols_norm = firestore_symbols_norm - alpaca_symbols
-        orphan_symbols_norm = alpaca_symbols - firestore_symbols_norm
+        diff = ReconciliationDiff(
+            zombies=[
+                pos
+                for sym, pos in firestore_by_symbol.items()
+                if sym not in alpaca_symbols
+            ],
+            orphans=sorted(alpaca_symbols - firestore_by_symbol.keys()),
+            reverse_orphans=[
+                p
+                for p in closed_positions
+                if normalize_alpaca_symbol(p.symbol) in alpaca_symbols
+            ],
+        )
 
-        # Map back to originals
-        zombies = [norm_to_original[s] for s in zombie_symbols_norm]
-        orphans = list(orphan_symbols_norm)  # Keep normalized, will be formatted later
+        for pos in firestore_positions:
+            if pos.status != TradeStatus.OPEN:
+                continue
+            sig = signals_by_id.get(pos.signal_id)
+            if sig is not None and sig.status == SignalStatus.WAITING:
+                diff.waiting_signals.append(sig)
 
         logger.info(
             "Reconciliation analysis complete",
             extra={
-                "zombies_detected": len(zombies),
-                "orphans_detected": len(orphans),
+                "zombies_detected": len(diff.zombies),
+                "orphans_detected": len(diff.orphans),
+                "reverse_orphans_detected": len(diff.reverse_orphans),
+                "signals_to_heal": len(diff.waiting_signals),
             },
         )
-        return zombies, orphans
+        return diff
 
     def _heal_zombies(
         self,
-        zombies: list[str],
-        firestore_positions: list[Position],
+        zombies: list[Position],
         min_age_minutes: int,
     ) -> tuple[list[str], int, list[str]]:
         """Attempt to heal zombie positions by checking for valid exits."""
-        healed_count = 0
         final_zombies = []
         errors = []
+        healed: list[Position] = []
 
-        # Fast lookup
-        symbol_to_position = {p.symbol: p for p in firestore_positions}
-
-        for symbol in zombies:
+        for pos in zombies:
+            symbol = pos.symbol
             try:
-                pos = symbol_to_position.get(symbol)
-                if not pos:
-                    continue
-
                 # Race Condition Protection
                 if pos.created_at:
                     age = datetime.now(timezone.utc) - pos.created_at
@@ -403,16 +525,7 @@ class StateReconciler:
                 # Heal
                 updated_pos = self.handle_manual_exit_verification(pos)
                 if updated_pos:
-                    self.position_repo.update_position(updated_pos)
-                    healed_count += 1
-                    logger.warning(
-                        f"Zombie healed: {symbol}",
-                        extra={
-                            "symbol": symbol,
-                            "position_id": updated_pos.position_id,
-                            "status": updated_pos.status,
-                        },
-                    )
+                    healed.append(updated_pos)
                 else:
                     # Verification failed
                     final_zombies.append(symbol)
@@ -433,7 +546,34 @@ class StateReconciler:
                 errors.append(error_msg)
                 final_zombies.append(symbol)
 
-        return final_zombies, healed_count, errors
+        if not healed:
+            return final_zombies, 0, errors
+
+        # Persist all verified exits in one batched write
+        try:
+            self.position_repo.update_positions_batch(healed)
+        except Exception as e:
+            # Chunks committed before the failure are healed
+            committed = e.committed if isinstance(e, BatchWriteError) else set()
+            for pos in healed:
+                if pos.position_id in committed:
+                    continue
+                error_msg = f"Failed to heal zombie {pos.symbol}: {e}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                final_zombies.append(pos.symbol)
+            healed = [pos for pos in healed if pos.position_id in committed]
+
+        for pos in healed:
+            logger.warning(
+                f"Zombie healed: {pos.symbol}",
+                extra={
+                    "symbol": pos.symbol,
+                    "position_id": pos.position_id,
+                    "status": pos.status,
+                },
+            )
+        return final_zombies, len(healed), errors
 
     def _handle_orphans(
         self, orphan_candidates: list[str]
@@ -464,99 +604,103 @@ class StateReconciler:
         return orphans, errors
 
     def _heal_signal_statuses(
-        self, firestore_positions: list[Position]
+        self,
+        firestore_positions: list[Position],
+        waiting_signals: Optional[list[Signal]] = None,
     ) -> tuple[int, list[str]]:
         """
         Heal WAITING signals to ACTIVE if an OPEN position exists.
         Protects against crashes during the 'Gap of Silence' between execution and persistence.
-        """
-        healed_count = 0
-        errors = []
 
+        Args:
+            firestore_positions: Firestore positions from the reconciliation snapshot.
+            waiting_signals: Pre-computed WAITING signals from the diff. If omitted,
+                the signals are batch-read from Firestore.
+        """
         logger.info(f"Checking {len(firestore_positions)} signals for status healing...")
 
-        for pos in firestore_positions:
-            if pos.status != TradeStatus.OPEN:
-                continue
+        if waiting_signals is None:
+            signals_by_id = self._fetch_signals(firestore_positions)
+            waiting_signals = [
+                sig
+                for pos in firestore_positions
+                if pos.status == TradeStatus.OPEN
+                and (sig := signals_by_id.get(pos.signal_id)) is not None
+                and sig.status == SignalStatus.WAITING
+            ]
+
+        if not waiting_signals:
+            return 0, []
+
+        for sig in waiting_signals:
+            logger.warning(
+                f"TIER 2 HEAL: Signal {sig.signal_id} ({sig.symbol}) is WAITING "
+                "but an OPEN position exists. Healing to ACTIVE.",
+                extra={"symbol": sig.symbol, "signal_id": sig.signal_id},
+            )
+
+        updates = {
+            sig.signal_id: {"status": SignalStatus.ACTIVE.value}
+            for sig in waiting_signals
+        }
+        committed = self.signal_repo.update_signals_batch(updates)
+        if len(committed) == len(updates):
+            return len(updates), []
 
+        # Batch failed: fall back to per-signal transactional updates for the
+        # signals whose chunk did not commit
+        healed_count = len(committed)
+        errors = []
+        for sig in waiting_signals:
+            if sig.signal_id in committed:
+                continue
             try:
-                sig = self.signal_repo.get_by_id(pos.signal_id)
-                if sig and sig.status == SignalStatus.WAITING:
-                    logger.warning(
-                        f"TIER 2 HEAL: Signal {sig.signal_id} ({sig.symbol}) is WAITING "
-                        "but an OPEN position exists. Healing to ACTIVE.",
-                        extra={
-                            "symbol": sig.symbol,
-                            "signal_id": sig.signal_id,
-                            "position_id": pos.position_id,
-                        },
-                    )
-                    success = self.signal_repo.update_signal_atomic(
-                        sig.signal_id, {"status": SignalStatus.ACTIVE.value}
+                if self.signal_repo.update_signal_atomic(
+                    sig.signal_id, {"status": SignalStatus.ACTIVE.value}
+                ):
+                    healed_count += 1
+                else:
+                    errors.append(
+                        f"Failed atomic heal for signal {sig.signal_id} ({sig.symbol})"
                     )
-                    if success:
-                        healed_count += 1
-                    else:
-                        errors.append(
-                            f"Failed atomic heal for signal {sig.signal_id} ({sig.symbol})"
-                        )
             except Exception as e:
-                error_msg = f"Error healing signal status for {pos.symbol}: {e}"
+                error_msg = f"Error healing signal status for {sig.symbol}: {e}"
                 logger.error(error_msg)
                 errors.append(error_msg)
 
         return healed_count, errors
 
-    def _check_reverse_orphans(self) -> list[str]:
-        """Check if recently closed positions in DB are still open in Alpaca."""
+    def _check_reverse_orphans(self, reverse_orphans: list[Position]) -> list[str]:
+        """Alert on recently closed DB positions that are still open in Alpaca."""
         logger.info("Checking for reverse orphans (CLOSED in DB, OPEN in Alpaca)...")
         errors = []
 
-        try:
-            closed_positions = self.position_repo.get_closed_positions(limit=50)
-            reverse_orphans = []
-
-            for closed_pos in closed_positions:
-                try:
-                    alpaca_pos = self.alpaca.get_open_position(
-                        normalize_alpaca_symbol(closed_pos.symbol)
-                    )
-                    if alpaca_pos:
-                        reverse_orphans.append(closed_pos.symbol)
-                        logger.critical(
-                            f"REVERSE ORPHAN DETECTED: {closed_pos.symbol}",
-                            extra={
-                                "symbol": closed_pos.symbol,
-                                "position_id": closed_pos.position_id,
-                                "impact": "Position closed in DB but STILL OPEN in Alpaca!",
-                            },
-                        )
-
-                        self.notifications.notify_reverse_orphan(
-                            closed_pos.symbol, closed_pos.position_id
-                        )
-
-                        errors.append(
-                            ReconciliationErrors.REVERSE_ORPHAN.format(
-                                symbol=closed_pos.symbol
-                            )
-                        )
-
-                except Exception as e:
-                    # 404/not found means correctly closed
-                    if "not found" not in str(e).lower() and "404" not in str(e):
-                        logger.warning(
-                            f"Error checking closed position {closed_pos.symbol}: {e}"
-                        )
-
-            if reverse_orphans:
+        for closed_pos in reverse_orphans:
+            logger.critical(
+                f"REVERSE ORPHAN DETECTED: {closed_pos.symbol}",
+                extra={
+                    "symbol": closed_pos.symbol,
+                    "position_id": closed_pos.position_id,
+                    "impact": "Position closed in DB but STILL OPEN in Alpaca!",
+                },
+            )
+            try:
+                self.notifications.notify_reverse_orphan(
+                    closed_pos.symbol, closed_pos.position_id
+                )
+            except Exception as e:
                 logger.warning(
-                    f"Found {len(reverse_orphans)} reverse orphans",
-                    extra={"symbols": reverse_orphans},
+                    f"Failed to notify reverse orphan {closed_pos.symbol}: {e}"
                 )
+            errors.append(
+                ReconciliationErrors.REVERSE_ORPHAN.format(symbol=closed_pos.symbol)
+            )
 
-        except Exception as e:
-            logger.warning("Reverse orphan detection failed.", extra={"error": str(e)})
+        if reverse_orphans:
+            logger.warning(
+                f"Found {len(reverse_orphans)} reverse orphans",
+                extra={"symbols": [p.symbol for p in reverse_orphans]},
+            )
 
         return errors
 
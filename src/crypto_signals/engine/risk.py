@@ -1,4 +1,6 @@
-from typing import NamedTuple, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, cast
 
 import pandas as pd
 from alpaca.trading.client import TradingClient
@@ -8,10 +10,14 @@ from alpaca.trading.models import TradeAccount
 from alpaca.trading.requests import GetOrdersRequest
 from crypto_signals.config import get_settings
 from crypto_signals.domain.schemas import AssetClass, Signal
+from crypto_signals.engine.correlation import CorrelationService
 from crypto_signals.market.data_provider import MarketDataProvider
 from crypto_signals.repository.firestore import PositionRepository
 from loguru import logger
 
+# Maximum daily log-return correlation with any open position
+CORRELATION_THRESHOLD = 0.8
+
 
 class RiskCheckResult(NamedTuple):
     passed: bool
@@ -22,6 +28,56 @@ class RiskCheckResult(NamedTuple):
         return self.passed
 
 
+@dataclass
+class RiskSnapshot:
+    """
+    Point-in-time account state for evaluating every risk gate in memory.
+
+    Built once per execution batch (RiskEngine.snapshot()). Approved signals
+    are recorded on the snapshot so the gates of later signals treat them as
+    open exposure before their orders reach the broker.
+
+    Attributes:
+        account: Alpaca account (drawdown and buying power gates).
+        broker_positions: Open Alpaca positions (sector cap).
+        open_orders: Open Alpaca orders; pending buys count towards sector caps.
+        open_positions: OPEN positions from Firestore (duplicate, correlation).
+        approved: Signals approved against this snapshot.
+        committed_notional: Estimated cost of approved orders by asset class,
+            deducted from the available buying power.
+        errors: Fetch errors by component. A gate that needs a failed
+            component fails safe, as it would on a live API error.
+        captured_at: When the snapshot was taken.
+    """
+
+    account: Optional[Any] = None
+    broker_positions: List[Any] = field(default_factory=list)
+    open_orders: List[Any] = field(default_factory=list)
+    open_positions: List[Any] = field(default_factory=list)
+    approved: List[Signal] = field(default_factory=list)
+    committed_notional: Dict[AssetClass, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    captured_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def require(self, component: str) -> None:
+        """Raise if ``component`` could not be fetched."""
+        if component in self.errors:
+            raise RuntimeError(f"{component} unavailable: {self.errors[component]}")
+
+    def record_approval(self, signal: Signal, notional: float = 0.0) -> None:
+        """
+        Count an approved signal as exposure for the remaining checks.
+
+        Args:
+            signal: The approved signal.
+            notional: Estimated order cost (qty * entry price).
+        """
+        self.approved.append(signal)
+        self.committed_notional[signal.asset_class] = (
+            self.committed_notional.get(signal.asset_class, 0.0) + notional
+        )
+
+
 class RiskEngine:
     """
     Capital Preservation Layer.
@@ -30,6 +86,9 @@ class RiskEngine:
     1. Buying Power Checks (Reg-T vs Cash)
     2. Sector Exposure Limits (Max Positions)
     3. Daily Account Drawdown Limits
+
+    Gates read account state from a RiskSnapshot (one fetch per batch) when
+    given one, otherwise from the live APIs.
     """
 
     def __init__(
@@ -37,10 +96,12 @@ class RiskEngine:
         trading_client: TradingClient,
         repository: PositionRepository,
         market_provider: Optional[MarketDataProvider] = None,
+        correlation_service: Optional[CorrelationService] = None,
     ):
         self.alpaca = trading_client
         self.repo = repository
         self.market_provider = market_provider
+        self.correlations = correlation_service or CorrelationService()
         self.settings = get_settings()
 
     ASSET_CLASS_MAP = {
@@ -48,48 +109,128 @@ class RiskEngine:
         AssetClass.EQUITY: AlpacaAssetClass.US_EQUITY,
     }
 
-    def validate_signal(self, signal: Signal) -> RiskCheckResult:
+    def snapshot(self) -> RiskSnapshot:
+        """
+        Fetch account, broker positions, open orders and Firestore positions once.
+
+        Each component is fetched independently; a failure is recorded on the
+        snapshot and only fails the gates that need that component.
+
+        Returns:
+            RiskSnapshot for validate_signal().
+        """
+        snapshot = RiskSnapshot()
+        fetchers = {
+            "account": lambda: self.alpaca.get_account(),
+            "broker_positions": lambda: list(self.alpaca.get_all_positions() or []),
+            "open_orders": lambda: list(
+                self.alpaca.get_orders(
+                    filter=GetOrdersRequest(status=QueryOrderStatus.OPEN)
+                )
+                or []
+            ),
+            "open_positions": lambda: list(self.repo.get_open_positions() or []),
+        }
+        for component, fetch in fetchers.items():
+            try:
+                setattr(snapshot, component, fetch())
+            except Exception as e:
+                snapshot.errors[component] = str(e)
+                logger.error(
+                    f"Risk snapshot: failed to fetch {component}.",
+                    extra={"component": component, "error": str(e)},
+                )
+
+        logger.debug(
+            f"Risk snapshot: {len(snapshot.broker_positions)} broker positions, "
+            f"{len(snapshot.open_orders)} open orders, "
+            f"{len(snapshot.open_positions)} open positions",
+            extra={"errors": snapshot.errors},
+        )
+        return snapshot
+
+    def validate_signal(
+        self, signal: Signal, snapshot: Optional[RiskSnapshot] = None
+    ) -> RiskCheckResult:
         """
         Orchestrate all risk checks for a signal.
         order matters: Fail fast on cheapest checks first.
+
+        Args:
+            signal: Candidate signal.
+            snapshot: Shared state for a batch of signals. Signals approved
+                against it count towards the duplicate, sector, correlation
+                and buying power gates of later signals. A fresh snapshot is
+                fetched when omitted.
         """
+        if snapshot is None:
+            snapshot = self.snapshot()
+
         # 1. Daily Drawdown
-        drawdown_check = self.check_daily_drawdown()
+        drawdown_check = self.check_daily_drawdown(snapshot)
         if not drawdown_check.passed:
             return drawdown_check
 
         # 2. Duplicate Symbol Check
-        duplicate_check = self.check_duplicate_symbol(signal)
+        duplicate_check = self.check_duplicate_symbol(signal, snapshot)
         if not duplicate_check.passed:
             return duplicate_check
 
         # 3. Sector Limits
-        sector_check = self.check_sector_limit(signal.asset_class)
+        sector_check = self.check_sector_limit(signal.asset_class, snapshot)
         if not sector_check.passed:
             return sector_check
 
         # 4. Correlation Risk
-        correlation_check = self.check_correlation(signal)
+        correlation_check = self.check_correlation(signal, snapshot)
         if not correlation_check.passed:
             return correlation_check
 
         # 5. Buying Power
         # Note: Using RISK_PER_TRADE as cost estimate since qty not yet calculated.
         bp_check = self.check_buying_power(
-            signal.asset_class, self.settings.MIN_ASSET_BP_USD
+            signal.asset_class, self.settings.MIN_ASSET_BP_USD, snapshot
         )
         if not bp_check.passed:
             return bp_check
 
         return RiskCheckResult(passed=True)
 
-    def check_daily_drawdown(self) -> RiskCheckResult:
+    def _account(self, snapshot: Optional[RiskSnapshot]) -> Any:
+        if snapshot is None:
+            return self.alpaca.get_account()
+        snapshot.require("account")
+        return snapshot.account
+
+    def _broker_positions(self, snapshot: Optional[RiskSnapshot]) -> List[Any]:
+        if snapshot is None:
+            return self.alpaca.get_all_positions()
+        snapshot.require("broker_positions")
+        return snapshot.broker_positions
+
+    def _open_orders(self, snapshot: Optional[RiskSnapshot]) -> List[Any]:
+        if snapshot is None:
+            orders_req = GetOrdersRequest(status=QueryOrderStatus.OPEN)
+            return self.alpaca.get_orders(filter=orders_req)
+        snapshot.require("open_orders")
+        return snapshot.open_orders
+
+    def _open_positions(self, snapshot: Optional[RiskSnapshot]) -> List[Any]:
+        """Firestore OPEN positions plus signals approved against the snapshot."""
+        if snapshot is None:
+            return self.repo.get_open_positions()
+        snapshot.require("open_positions")
+        return list(snapshot.open_positions) + list(snapshot.approved)
+
+    def check_daily_drawdown(
+        self, snapshot: Optional[RiskSnapshot] = None
+    ) -> RiskCheckResult:
         """
         Gate: Daily Account Drawdown.
         Formula: (Equity - LastEquity) / LastEquity
         """
         try:
-            account = self.alpaca.get_account()
+            account = self._account(snapshot)
             if not isinstance(account, TradeAccount):
                 logger.warning(
                     "Could not verify drawdown - account object is not a TradeAccount."
@@ -123,12 +264,23 @@ class RiskEngine:
                 passed=False, reason=f"Error checking drawdown: {e}", gate="drawdown"
             )
 
-    def check_duplicate_symbol(self, signal: Signal) -> RiskCheckResult:
+    def check_duplicate_symbol(
+        self, signal: Signal, snapshot: Optional[RiskSnapshot] = None
+    ) -> RiskCheckResult:
         """
         Gate: Prevent multiple positions for same symbol (Pyramiding).
         """
+        for other in snapshot.approved if snapshot else []:
+            if other.symbol == signal.symbol:
+                reason = (
+                    f"Duplicate Position: {signal.symbol} already approved in this "
+                    f"batch ({other.signal_id})"
+                )
+                logger.warning(reason)
+                return RiskCheckResult(passed=False, reason=reason, gate="duplicate")
+
         try:
-            open_positions = self.repo.get_open_positions()
+            open_positions = self._open_positions(snapshot)
             for pos in open_positions:
                 if pos.symbol == signal.symbol:
                     reason = f"Duplicate Position: {signal.symbol} is already open ({pos.position_id})"
@@ -143,11 +295,14 @@ class RiskEngine:
                 passed=False, reason=f"Error checking duplicate: {e}", gate="duplicate"
             )
 
-    def check_sector_limit(self, asset_class: AssetClass) -> RiskCheckResult:
+    def check_sector_limit(
+        self, asset_class: AssetClass, snapshot: Optional[RiskSnapshot] = None
+    ) -> RiskCheckResult:
         """
         Gate: Max Open Positions by Asset Class.
         Uses Alpaca API as source of truth to avoid stale Firestore data bypass.
         Counts both filled positions AND pending buy orders to prevent race conditions.
+        Signals approved against the snapshot count as pending too.
         """
         try:
             limit = (
@@ -168,7 +323,7 @@ class RiskEngine:
             target_alpaca_class = self.ASSET_CLASS_MAP[asset_class]
 
             # 1. Fetch Authoritative State (Filled Positions)
-            alpaca_positions = self.alpaca.get_all_positions()
+            alpaca_positions = self._broker_positions(snapshot)
             filled_count = sum(
                 1 for p in alpaca_positions if p.asset_class == target_alpaca_class
             )
@@ -176,8 +331,7 @@ class RiskEngine:
             # 2. Fetch Pending Orders (Race Condition Protection)
             # If we have 4 positions and 2 pending buys, effectively we have 6.
             # Only counting BUY side.
-            orders_req = GetOrdersRequest(status=QueryOrderStatus.OPEN)
-            open_orders = self.alpaca.get_orders(filter=orders_req)
+            open_orders = self._open_orders(snapshot)
 
             pending_buys = sum(
                 1
@@ -185,13 +339,20 @@ class RiskEngine:
                 if o.asset_class == target_alpaca_class and o.side == OrderSide.BUY
             )
 
-            total_exposure = filled_count + pending_buys
+            pending = (
+                sum(1 for sig in snapshot.approved if sig.asset_class == asset_class)
+                if snapshot
+                else 0
+            )
+            total_exposure = filled_count + pending_buys + pending
 
             if total_exposure >= limit:
                 reason = (
                     f"Max {asset_class.value} positions reached: "
                     f"{total_exposure}/{limit} "
-                    f"({filled_count} filled + {pending_buys} pending)"
+                    f"({filled_count} filled + {pending_buys} pending"
+                    + (f" + {pending} in batch" if pending else "")
+                    + ")"
                 )
                 logger.warning(reason)
                 return RiskCheckResult(passed=False, reason=reason, gate="sector_cap")
@@ -204,111 +365,55 @@ class RiskEngine:
                 passed=False, reason=f"Error checking sector cap: {e}", gate="sector_cap"
             )
 
-    def check_correlation(self, signal: Signal) -> RiskCheckResult:
+    def check_correlation(
+        self, signal: Signal, snapshot: Optional[RiskSnapshot] = None
+    ) -> RiskCheckResult:
         """
         Gate: Correlation Risk.
-        Rejects trade if highly correlated (>0.8) with any open position.
-        Optimized to fetch market data in batches per asset class.
+        Rejects trade if the daily log returns are highly correlated
+        (> CORRELATION_THRESHOLD) with any open position.
+
+        Correlations come from the rolling CorrelationService. Bars are only
+        fetched (batched per asset class) for symbols not yet in it.
         """
         if not self.market_provider:
             return RiskCheckResult(passed=True, reason="Skipped: No Market Provider")
 
         try:
-            open_positions = self.repo.get_open_positions()
+            open_positions = self._open_positions(snapshot)
             if not open_positions:
                 return RiskCheckResult(passed=True)
 
-            # Group symbols by Asset Class to batch requests
-            # We want to check correlation against ALL open positions.
-            # We also need the candidate signal's data.
-
-            # Map: AssetClass -> set(symbols)
-            symbols_by_class = {AssetClass.CRYPTO: set(), AssetClass.EQUITY: set()}
-
-            # Add candidate
-            symbols_by_class[signal.asset_class].add(signal.symbol)
-
-            # Add open positions (excluding self if somehow in list)
+            # Exclude self (re-entry) from the comparison set
             filtered_positions = [p for p in open_positions if p.symbol != signal.symbol]
             if not filtered_positions:
-                # If only open position is self (re-entry?), no correlation check needed against others
                 return RiskCheckResult(passed=True)
 
-            for pos in filtered_positions:
-                symbols_by_class[pos.asset_class].add(pos.symbol)
-
-            # Fetch Data Batches
-            # Map: symbol -> pd.Series (Close prices)
-            price_series_map = {}
+            # Map: AssetClass -> set(symbols) missing from the correlation matrix
+            symbols_by_class: Dict[AssetClass, set] = {
+                AssetClass.CRYPTO: set(),
+                AssetClass.EQUITY: set(),
+            }
+            for symbol, asset_class in [(signal.symbol, signal.asset_class)] + [
+                (p.symbol, p.asset_class) for p in filtered_positions
+            ]:
+                if not self.correlations.has(symbol):
+                    symbols_by_class[asset_class].add(symbol)
 
             for asset_class, symbols in symbols_by_class.items():
-                if not symbols:
-                    continue
-
-                symbol_list = list(symbols)
-                try:
-                    # Batch fetch
-                    bars_df = self.market_provider.get_daily_bars(
-                        symbol_list, asset_class, lookback_days=90
-                    )
-
-                    # Process response
-                    # If single symbol passed (list of length 1), it might return single-index DF depending on impl details,
-                    # but our updating logic says: "If list of symbols: MultiIndex DataFrame".
-                    # However, if we pass a list of length 1, let's be robust.
-
-                    if isinstance(bars_df.index, pd.MultiIndex):
-                        # MultiIndex: (symbol, timestamp)
-                        # We want to extract close price for each symbol
-                        # Efficient way: loop through unique symbols in index
-                        # distinct_symbols = bars_df.index.get_level_values(0).unique()
-                        # But better to just iterate over what we requested
-
-                        for sym in symbol_list:
-                            try:
-                                # xs is robust for selecting from MultiIndex
-                                # Check if symbol exists in index first to avoid KeyError
-                                if sym in bars_df.index.get_level_values(0):
-                                    sym_data = bars_df.xs(sym, level=0)
-                                    if "close" in sym_data.columns:
-                                        price_series_map[sym] = sym_data["close"]
-                            except KeyError:
-                                continue
-                    else:
-                        # Single index (timestamp) - implies only one symbol was returned/requested
-                        # OR the provider stripped the index.
-                        # Since we modified provider to keep MultiIndex if list is passed, this shouldn't happen
-                        # unless we passed a list of 1 and logic was ambiguous?
-                        # Actually, my change says: `if isinstance(symbol, str)`.
-                        # So if we pass `["BTC/USD"]`, it is NOT a str, so it should keep MultiIndex.
-                        # EXCEPT if the API returns a single-level DF naturally for some reason (which it usually doesn't for bars).
-                        # But let's handle the case if it somehow is single index:
-                        if len(symbol_list) == 1:
-                            if "close" in bars_df.columns:
-                                price_series_map[symbol_list[0]] = bars_df["close"]
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to fetch batch data for {asset_class.value}.",
-                        extra={"asset_class": asset_class.value, "error": str(e)},
-                    )
-                    # If we fail to get data for the CANDIDATE, we must fail.
-                    # If we fail to get data for a position, we normally block access.
-                    # Let's inspect what's missing later.
+                if symbols:
+                    self._load_correlation_bars(list(symbols), asset_class)
 
             # Check if we have candidate data
-            if signal.symbol not in price_series_map:
+            if not self.correlations.has(signal.symbol):
                 return RiskCheckResult(
                     passed=False,
                     reason=f"Market data missing for candidate {signal.symbol}",
                     gate="correlation",
                 )
 
-            candidate_series = price_series_map[signal.symbol]
-
-            # Compare against all open positions
             for pos in filtered_positions:
-                if pos.symbol not in price_series_map:
+                if not self.correlations.has(pos.symbol):
                     logger.warning(
                         f"Market data for existing position {pos.symbol} is missing. Blocking trade precautiously."
                     )
@@ -318,31 +423,17 @@ class RiskEngine:
                         gate="correlation",
                     )
 
-                pos_series = price_series_map[pos.symbol]
-
-                try:
-                    # Pandas corr handles alignment via index (dates)
-                    correlation = candidate_series.corr(pos_series)
-
-                    if correlation is not None and correlation > 0.8:
-                        reason = (
-                            f"Correlation Risk: {signal.symbol} is {correlation:.2f} "
-                            f"correlated with existing position {pos.symbol}"
-                        )
-                        logger.warning(reason)
-                        return RiskCheckResult(
-                            passed=False, reason=reason, gate="correlation"
-                        )
-                except Exception as e:
-                    logger.warning(
-                        f"Correlation calc error for {pos.symbol}.",
-                        extra={"symbol": pos.symbol, "error": str(e)},
-                    )
-                    return RiskCheckResult(
-                        passed=False,
-                        reason=f"Error calculating correlation with {pos.symbol}: {e}",
-                        gate="correlation",
-                    )
+            # One vectorized lookup against every open position
+            other, correlation = self.correlations.max_correlation(
+                signal.symbol, [p.symbol for p in filtered_positions]
+            )
+            if other is not None and correlation > CORRELATION_THRESHOLD:
+                reason = (
+                    f"Correlation Risk: {signal.symbol} is {correlation:.2f} "
+                    f"correlated with existing position {other}"
+                )
+                logger.warning(reason)
+                return RiskCheckResult(passed=False, reason=reason, gate="correlation")
 
             return RiskCheckResult(passed=True)
 
@@ -354,16 +445,47 @@ class RiskEngine:
                 gate="correlation",
             )
 
+    def _load_correlation_bars(self, symbols: List[str], asset_class: AssetClass) -> None:
+        """Fetch daily bars for symbols missing from the correlation matrix."""
+        market_provider = cast(MarketDataProvider, self.market_provider)
+        try:
+            bars_df = market_provider.get_daily_bars(
+                symbols, asset_class, lookback_days=self.correlations.window
+            )
+        except Exception as e:
+            # Symbols stay missing; the gate blocks on them
+            logger.warning(
+                f"Failed to fetch batch data for {asset_class.value}.",
+                extra={"asset_class": asset_class.value, "error": str(e)},
+            )
+            return
+
+        if isinstance(bars_df.index, pd.MultiIndex):
+            # MultiIndex: (symbol, timestamp)
+            fetched = bars_df.index.get_level_values(0)
+            for sym in symbols:
+                if sym in fetched:
+                    sym_data = bars_df.xs(sym, level=0)
+                    if "close" in sym_data.columns:
+                        self.correlations.update(sym, sym_data["close"])
+        elif len(symbols) == 1 and "close" in bars_df.columns:
+            # Single index (timestamp): only one symbol was requested
+            self.correlations.update(symbols[0], bars_df["close"])
+
     def check_buying_power(
-        self, asset_class: AssetClass, required_amount: float
+        self,
+        asset_class: AssetClass,
+        required_amount: float,
+        snapshot: Optional[RiskSnapshot] = None,
     ) -> RiskCheckResult:
         """
         Gate: Buying Power.
         Crypto -> non_marginable_buying_power (Cash)
         Equity -> regt_buying_power (Overnight hold safety)
+        Orders approved against the snapshot are deducted from the available amount.
         """
         try:
-            account = self.alpaca.get_account()
+            account = self._account(snapshot)
 
             if not isinstance(account, TradeAccount):
                 logger.warning(
@@ -377,6 +499,8 @@ class RiskEngine:
                 # Use Reg-T for safety against PDT/Overnight holds
                 available = float(account.regt_buying_power)
                 bp_type = "Reg-T Margin (Equity)"
+            if snapshot is not None:
+                available -= snapshot.committed_notional.get(asset_class, 0.0)
 
             if available < required_amount:
                 reason = (
@@ -1,7 +1,15 @@
 import datetime
+import hashlib
+import json
+import os
+import threading
+import time
 import typing
-from typing import Any, List, Optional, Type
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Type
 
+from crypto_signals.config import get_settings
 from google.api_core.exceptions import Conflict, GoogleAPICallError, NotFound
 from google.cloud import bigquery
 from loguru import logger
@@ -14,6 +22,130 @@ class SchemaMismatchError(Exception):
     pass
 
 
+def schema_fingerprint(schema: Sequence[bigquery.SchemaField]) -> str:
+    """Stable hash of a schema's names, types, modes and nested fields (order-free)."""
+
+    def canonical(fields: Sequence[bigquery.SchemaField]) -> List[Any]:
+        return sorted(
+            [f.name, f.field_type, f.mode or "NULLABLE", canonical(f.fields or ())]
+            for f in fields
+        )
+
+    payload = json.dumps(canonical(schema), separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+@dataclass
+class ValidatedSchema:
+    """
+    Last successful validation of a table against a model.
+
+    Attributes:
+        model_fingerprint: Fingerprint of the model's generated schema.
+        table_fingerprint: Fingerprint of the BigQuery table schema.
+        etag: Table metadata etag (changes on any schema/option update).
+        checks: Partitioning/clustering requirements that were enforced.
+        validated_at: Unix timestamp of the validation.
+    """
+
+    model_fingerprint: str
+    table_fingerprint: str
+    etag: Optional[str]
+    checks: str
+    validated_at: float
+
+
+class SchemaCache:
+    """
+    Thread-safe cache of validated table schemas, optionally persisted to JSON.
+
+    Entries are keyed by table ID. ``migrate_schema`` invalidates the table it
+    touches; anything else (out-of-band ALTERs) is caught by the etag check
+    once an entry is older than ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float = 0, path: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: How long an entry skips get_table entirely.
+            path: Optional JSON file to load from and persist to.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._entries: Dict[str, ValidatedSchema] = {}
+        self._lock = threading.Lock()
+        self._loaded = path is None
+
+    def _load(self) -> None:
+        """Read persisted entries once. Caller holds the lock."""
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                raw = json.load(f)
+            self._entries = {k: ValidatedSchema(**v) for k, v in raw.items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable schema cache {self.path}: {e}")
+
+    def _save(self) -> None:
+        """Persist entries (best effort). Caller holds the lock."""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({k: asdict(v) for k, v in self._entries.items()}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist schema cache {self.path}: {e}")
+
+    def get(self, table_id: str) -> Optional[ValidatedSchema]:
+        """Cached validation for a table, if any."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            return self._entries.get(table_id)
+
+    def is_fresh(self, entry: ValidatedSchema) -> bool:
+        """True if the entry may be trusted without a get_table call."""
+        return time.time() - entry.validated_at < self.ttl_seconds
+
+    def put(self, table_id: str, entry: ValidatedSchema) -> None:
+        """Record a successful validation."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._entries[table_id] = entry
+            self._save()
+
+    def invalidate(self, table_id: str) -> None:
+        """Forget a table (its schema is about to change)."""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if self._entries.pop(table_id, None) is not None:
+                self._save()
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (the persisted file is left as is)."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+
+
+@lru_cache()
+def get_schema_cache() -> SchemaCache:
+    """Process-wide SchemaCache configured from settings."""
+    settings = get_settings()
+    return SchemaCache(
+        ttl_seconds=settings.SCHEMA_CACHE_TTL_SECONDS, path=settings.SCHEMA_CACHE_PATH
+    )
+
+
 class SchemaGuardian:
     """
     Enforces schema parity between Pydantic Models (Source of Truth) and BigQuery Tables.
@@ -29,9 +161,31 @@ class SchemaGuardian:
         datetime.date: "DATE",
     }
 
-    def __init__(self, bq_client: bigquery.Client, strict_mode: bool = True):
+    # Generated schemas per model class (models are static for the process)
+    _schema_memo: Dict[Type[BaseModel], tuple] = {}
+
+    def __init__(
+        self,
+        bq_client: bigquery.Client,
+        strict_mode: bool = True,
+        cache: Optional[SchemaCache] = None,
+    ):
+        """
+        Initialize the guardian.
+
+        Args:
+            bq_client: BigQuery client.
+            strict_mode: Raise SchemaMismatchError on mismatch (else log only).
+            cache: Optional SchemaCache; validations of unchanged model/table
+                pairs are skipped when provided.
+        """
         self.client = bq_client
         self.strict_mode = strict_mode
+        self.cache = cache
+
+    def model_fingerprint(self, model: Type[BaseModel]) -> str:
+        """Stable fingerprint of the schema generated for a model."""
+        return schema_fingerprint(self.generate_schema(model))
 
     def validate_schema(
         self,
@@ -54,6 +208,19 @@ class SchemaGuardian:
               - missing_columns: List of (column_name, bq_type) tuples
               - type_mismatches: List of error message strings
         """
+        if self.cache is not None:
+            model_fp = self.model_fingerprint(model)
+            checks = f"partitioned={require_partitioning};clustering={clustering_fields}"
+            cached = self.cache.get(table_id)
+            if (
+                cached
+                and cached.model_fingerprint == model_fp
+                and cached.checks == checks
+                and self.cache.is_fresh(cached)
+            ):
+                logger.debug(f"Schema cache hit for {table_id}; skipping get_table.")
+                return [], []
+
         try:
             table = self.client.get_table(table_id)
         except NotFound:
@@ -66,6 +233,19 @@ class SchemaGuardian:
             )
             raise
 
+        if self.cache is not None and cached:
+            etag = getattr(table, "etag", None)
+            if (
+                cached.model_fingerprint == model_fp
+                and cached.checks == checks
+                and isinstance(etag, str)
+                and etag == cached.etag
+            ):
+                # Neither side changed since the last successful validation
+                cached.validated_at = time.time()
+                self.cache.put(table_id, cached)
+                return [], []
+
         missing_columns, type_mismatches = self._validate_fields(
             model.model_fields.items(), table.schema
         )
@@ -107,12 +287,32 @@ class SchemaGuardian:
             if self.strict_mode:
                 raise SchemaMismatchError(full_error)
 
+        elif self.cache is not None:
+            self.cache.put(
+                table_id,
+                ValidatedSchema(
+                    model_fingerprint=model_fp,
+                    table_fingerprint=schema_fingerprint(table.schema),
+                    etag=getattr(table, "etag", None),
+                    checks=checks,
+                    validated_at=time.time(),
+                ),
+            )
+
         return missing_columns, type_mismatches
 
     def generate_schema(self, model: Type[BaseModel]) -> List[bigquery.SchemaField]:
         """
-        Generates a BigQuery schema from a Pydantic model.
+        Generates a BigQuery schema from a Pydantic model (memoized per model).
         """
+        memo = self._schema_memo.get(model)
+        if memo is None:
+            memo = tuple(self._build_schema(model))
+            self._schema_memo[model] = memo
+        return list(memo)
+
+    def _build_schema(self, model: Type[BaseModel]) -> List[bigquery.SchemaField]:
+        """Walk the model's fields and map them to BigQuery SchemaFields."""
         schema = []
         for name, field_info in model.model_fields.items():
             # Skip excluded fields (Issue #149: scaled_out_prices, etc.)
@@ -179,6 +379,9 @@ class SchemaGuardian:
             partition_column: Optional column to use for TimePartitioning (Day)
             clustering_fields: Optional list of columns for clustering
         """
+        if self.cache is not None:
+            self.cache.invalidate(table_id)
+
         try:
             table = self.client.get_table(table_id)
         except (NotFound, GoogleAPICallError) as e:
@@ -39,6 +39,7 @@ class SignalGenerator:
         pattern_analyzer_cls: Type[PatternAnalyzer] = PatternAnalyzer,
         signal_repo: Optional[Any] = None,
         strategy_configs: Optional[List[StrategyConfig]] = None,
+        position_repo: Optional[Any] = None,
     ):
         """
         Initialize the SignalGenerator.
@@ -49,6 +50,8 @@ class SignalGenerator:
                 injection). Defaults to new TechnicalIndicators instance.
             pattern_analyzer_cls: Class for verifying patterns (dependency
                 injection).
+            position_repo: Repository for open-position lookups (dependency
+                injection). Defaults to a new PositionRepository.
         """
         self.market_provider = market_provider
         self.indicators = indicators or TechnicalIndicators()
@@ -64,10 +67,13 @@ class SignalGenerator:
 
             self.signal_repo = SignalRepository()
 
-        # Lazy init PositionRepository for Pyramiding Protection
-        from crypto_signals.repository.firestore import PositionRepository
+        if position_repo:
+            self.position_repo = position_repo
+        else:
+            # Lazy init PositionRepository for Pyramiding Protection
+            from crypto_signals.repository.firestore import PositionRepository
 
-        self.position_repo = PositionRepository()
+            self.position_repo = PositionRepository()
 
     def _resolve_strategy_config(
         self, symbol: str, asset_class: AssetClass, pattern_name: str
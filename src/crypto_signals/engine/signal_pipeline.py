@@ -0,0 +1,656 @@
+"""
+Staged Signal Processing Pipeline (Phase 3).
+
+Moves candidate signals through the persistence, notification and execution
+stages with bounded concurrency instead of one signal at a time.
+
+Guarantees:
+    - Per-symbol ordering: signals for the same symbol are processed sequentially
+      in the order they were detected (one "lane" per symbol).
+    - Two-phase commit: a signal is persisted (CREATED) before it is notified,
+      and is compensated (INVALIDATED / NOTIFICATION_FAILED) if notification fails.
+    - Bounded stages: each stage has its own concurrency limit so a burst of
+      signals cannot exceed Discord or Alpaca rate budgets.
+    - Batched execution: each notified signal is released to an execution
+      worker, which executes whatever is ready as one batch
+      (ExecutionEngine.execute_signals) in detection order. Orders are submitted
+      concurrently against one risk pass without waiting for other lanes.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, cast
+
+from crypto_signals.domain.schemas import (
+    AssetClass,
+    ExitReason,
+    NotificationPayload,
+    Signal,
+    SignalStatus,
+    TradeType,
+)
+from crypto_signals.observability import MetricsCollector
+from crypto_signals.tracing import TracedThreadPoolExecutor
+from crypto_signals.utils.symbols import normalize_alpaca_symbol
+from loguru import logger
+
+# (signal, asset_class, symbol_duration) as produced by Phase 1
+CandidateSignal = Tuple[Signal, AssetClass, float]
+# (signal, processing start) released for execution; None ends the run
+QueuedExecution = Tuple[Signal, float]
+
+
+class SignalProcessingPipeline:
+    """
+    Bounded-concurrency processor for Phase 3 candidate signals.
+
+    Independent symbols are processed concurrently by a worker pool, while the
+    persist and notify stages are gated by their own semaphores. A notified
+    signal is released to a single execution worker, which executes every
+    signal ready at that moment as one batch: the risk gates (sector caps,
+    duplicate guard) see all approvals of the batch before any order is
+    submitted, submissions overlap instead of taking one broker round-trip
+    each, and no order waits for another lane's notification.
+    """
+
+    def __init__(
+        self,
+        repo: Any,
+        rejected_repo: Any,
+        discord: Any,
+        position_repo: Any,
+        execution_engine: Optional[Any],
+        settings: Any,
+        metrics: MetricsCollector,
+    ):
+        """
+        Initialize the pipeline with its stage dependencies.
+
+        Args:
+            repo: SignalRepository for live signals
+            rejected_repo: RejectedSignalRepository for shadow signals
+            discord: DiscordClient for notifications
+            position_repo: PositionRepository for executed positions
+            execution_engine: ExecutionEngine (None when execution is disabled)
+            settings: Application settings
+            metrics: MetricsCollector for stage timings
+        """
+        self.repo = repo
+        self.rejected_repo = rejected_repo
+        self.discord = discord
+        self.position_repo = position_repo
+        self.execution_engine = execution_engine
+        self.settings = settings
+        self.metrics = metrics
+
+        self.max_workers = int(getattr(settings, "SIGNAL_PIPELINE_MAX_WORKERS", 4))
+        persist_limit = int(getattr(settings, "SIGNAL_PERSIST_CONCURRENCY", 2))
+        notify_limit = int(getattr(settings, "SIGNAL_NOTIFY_CONCURRENCY", 2))
+
+        self._stage_limits: Dict[str, threading.BoundedSemaphore] = {
+            "persist": threading.BoundedSemaphore(persist_limit),
+            "notify": threading.BoundedSemaphore(notify_limit),
+        }
+
+        # Notified signals awaiting execution (drained by _run_executions)
+        self._execution_queue: "queue.Queue[Optional[QueuedExecution]]" = queue.Queue()
+
+    @staticmethod
+    def group_by_symbol(
+        candidates: Sequence[CandidateSignal],
+    ) -> List[List[CandidateSignal]]:
+        """
+        Split candidates into per-symbol lanes, preserving detection order.
+
+        Args:
+            candidates: Candidate signals from Phase 1
+
+        Returns:
+            List of lanes, each containing the signals of a single symbol.
+        """
+        lanes: "OrderedDict[str, List[CandidateSignal]]" = OrderedDict()
+        for candidate in candidates:
+            lanes.setdefault(candidate[0].symbol, []).append(candidate)
+        return list(lanes.values())
+
+    def run(
+        self,
+        candidates: Sequence[CandidateSignal],
+        pattern_counts: Dict[str, int],
+        saturation_threshold: float,
+    ) -> int:
+        """
+        Process all candidate signals.
+
+        Args:
+            candidates: Candidate signals from Phase 1
+            pattern_counts: Per-pattern trigger counts (Phase 2 saturation input)
+            saturation_threshold: Count above which a pattern is saturated
+
+        Returns:
+            int: Number of live (non-shadow) signals found.
+        """
+        lanes = self.group_by_symbol(candidates)
+        if not lanes:
+            return 0
+
+        workers = min(self.max_workers, len(lanes))
+        logger.info(
+            f"Processing {len(candidates)} signals across {len(lanes)} symbols "
+            f"with {workers} workers..."
+        )
+
+        signals_found = 0
+        self._execution_queue = queue.Queue()
+        detection_order = {c[0].signal_id: i for i, c in enumerate(candidates)}
+        # One extra thread runs the execution worker alongside the lanes
+        with TracedThreadPoolExecutor(max_workers=workers + 1) as executor:
+            execution = executor.submit(self._run_executions, detection_order)
+            try:
+                future_to_symbol = {
+                    executor.submit(
+                        self._process_lane, lane, pattern_counts, saturation_threshold
+                    ): lane[0][0].symbol
+                    for lane in lanes
+                }
+                for future in as_completed(future_to_symbol):
+                    try:
+                        signals_found += future.result()
+                    except Exception as e:
+                        logger.error(
+                            f"Signal processing lane for {future_to_symbol[future]} "
+                            f"failed: {e}"
+                        )
+            finally:
+                # All lanes are done: the worker drains the rest and exits
+                self._execution_queue.put(None)
+            execution.result()
+        return signals_found
+
+    def _run_executions(self, detection_order: Dict[str, int]) -> None:
+        """
+        Execute released signals until the lanes finish.
+
+        Each iteration takes every signal released so far as one batch, sorted
+        by detection order so per-symbol ordering carries into the risk checks.
+
+        Args:
+            detection_order: signal_id -> position in the Phase 1 candidates.
+        """
+        finished = False
+        while not finished:
+            released = [self._execution_queue.get()]
+            while True:
+                try:
+                    released.append(self._execution_queue.get_nowait())
+                except queue.Empty:
+                    break
+            finished = None in released
+            batch = sorted(
+                (item for item in released if item is not None),
+                key=lambda item: detection_order.get(item[0].signal_id, 0),
+            )
+            if not batch:
+                continue
+            try:
+                self._execute_batch(batch)
+            except Exception as e:
+                logger.error(
+                    f"Execution of {len(batch)} signals failed: {e}",
+                    extra={"signals": len(batch), "error": str(e)},
+                )
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        """Hold the concurrency slot for a pipeline stage."""
+        with self._stage_limits[name]:
+            yield
+
+    def _process_lane(
+        self,
+        lane: List[CandidateSignal],
+        pattern_counts: Dict[str, int],
+        saturation_threshold: float,
+    ) -> int:
+        """Process one symbol's signals sequentially. Returns live signals found."""
+        found = 0
+        for trade_signal, asset_class, _symbol_duration in lane:
+            try:
+                if self._process_signal(
+                    trade_signal, asset_class, pattern_counts, saturation_threshold
+                ):
+                    found += 1
+            except Exception as e:
+                # Isolate failures so later signals in the lane still run
+                logger.error(
+                    f"Failed to process signal {trade_signal.signal_id}: {e}",
+                    extra={
+                        "signal_id": trade_signal.signal_id,
+                        "symbol": trade_signal.symbol,
+                        "error": str(e),
+                    },
+                )
+        return found
+
+    def _process_signal(
+        self,
+        trade_signal: Signal,
+        asset_class: AssetClass,
+        pattern_counts: Dict[str, int],
+        saturation_threshold: float,
+    ) -> bool:
+        """
+        Run a single signal through all stages.
+
+        Returns:
+            bool: True if the signal was a live signal (counted as found).
+        """
+        processing_start = time.time()
+        pattern_name = trade_signal.pattern_name
+
+        # Check for saturation
+        is_saturated = pattern_counts.get(pattern_name, 0) > saturation_threshold
+        if is_saturated and trade_signal.status != SignalStatus.REJECTED_BY_FILTER:
+            logger.warning(
+                f"SIGNAL SATURATION: Pattern {pattern_name} triggered on "
+                f"{pattern_counts[pattern_name]} symbols. Flagging as suspicious.",
+                extra={
+                    "pattern": pattern_name,
+                    "count": pattern_counts[pattern_name],
+                    "threshold": saturation_threshold,
+                },
+            )
+
+        # --- Handle Shadow Signals (rejected by quality gates) ---
+        if trade_signal.status == SignalStatus.REJECTED_BY_FILTER:
+            self._handle_shadow_signal(trade_signal)
+            return False
+
+        # Build Notification Payload (deferred past shadow check for efficiency)
+        notification_payload = NotificationPayload(
+            signal=trade_signal,
+            is_saturated=is_saturated,
+            saturation_count=pattern_counts.get(pattern_name, 0),
+        )
+
+        logger.info(
+            f"SIGNAL FOUND: {trade_signal.pattern_name} on {trade_signal.symbol}",
+            extra={
+                "symbol": trade_signal.symbol,
+                "pattern": trade_signal.pattern_name,
+                "stop_loss": trade_signal.suggested_stop,
+                "pattern_duration_days": trade_signal.pattern_duration_days,
+                "pattern_classification": trade_signal.pattern_classification,
+                "is_saturated": is_saturated,
+            },
+        )
+
+        if self._is_already_notified(trade_signal):
+            return True
+
+        # ============================================================
+        # TWO-PHASE COMMIT: Prevents "Zombie Signals"
+        # (notifications sent without database tracking)
+        # ============================================================
+        with self._stage("persist"):
+            persisted = self._persist_signal(trade_signal)
+        if not persisted:
+            # Skip notification - can't notify without tracking
+            return True
+
+        with self._stage("notify"):
+            self._notify_signal(trade_signal, asset_class, notification_payload)
+
+        # Release for execution if execution is enabled
+        # Safety: ExecutionEngine has built-in guards for:
+        #   1. ALPACA_PAPER_TRADING must be True
+        #   2. ENABLE_EXECUTION must be True
+        if self.settings.ENABLE_EXECUTION and self.execution_engine is not None:
+            self._execution_queue.put((trade_signal, processing_start))
+            return True
+
+        self.metrics.record_success("signal_processing", time.time() - processing_start)
+        return True
+
+    def _handle_shadow_signal(self, trade_signal: Signal) -> None:
+        """Persist a filter-rejected signal and post it to the shadow channel."""
+        symbol = trade_signal.symbol
+
+        # DEDUPLICATION: Skip shadow if active signal exists (avoid noise)
+        active_signals = self.repo.get_active_signals(symbol)
+        if active_signals:
+            logger.debug(
+                f"[SHADOW] Skipping {symbol} shadow signal - active signal exists",
+                extra={"symbol": symbol},
+            )
+            return
+
+        # Persist to rejected_signals collection for audit/analysis
+        try:
+            with self._stage("persist"):
+                self.rejected_repo.save(trade_signal)
+            # Send to shadow Discord channel (if configured)
+            with self._stage("notify"):
+                self.discord.send_shadow_signal(trade_signal)
+            logger.info(
+                f"[SHADOW] {trade_signal.symbol} {trade_signal.pattern_name}: "
+                f"{trade_signal.rejection_reason}",
+                extra={
+                    "symbol": trade_signal.symbol,
+                    "pattern": trade_signal.pattern_name,
+                    "rejection_reason": trade_signal.rejection_reason,
+                    "pattern_duration_days": trade_signal.pattern_duration_days,
+                    "pattern_classification": trade_signal.pattern_classification,
+                },
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to persist shadow signal: {e}",
+                extra={"symbol": trade_signal.symbol},
+            )
+
+    def _is_already_notified(self, trade_signal: Signal) -> bool:
+        """
+        IDEMPOTENCY GATE: Prevent redundant Discord alerts.
+
+        Returns:
+            bool: True if the signal already exists in WAITING with a thread.
+        """
+        existing_signal = self.repo.get_by_id(trade_signal.signal_id)
+        if not existing_signal:
+            return False
+
+        # Skip if signal exists in WAITING status with discord_thread_id
+        if (
+            existing_signal.status == SignalStatus.WAITING
+            and existing_signal.discord_thread_id
+        ):
+            logger.info(
+                f"[IDEMPOTENCY] Skip notified signal {trade_signal.signal_id}",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "symbol": trade_signal.symbol,
+                    "thread_id": existing_signal.discord_thread_id,
+                },
+            )
+            return True
+
+        # Self-heal: If exists but discord_thread_id is null, proceed to notification
+        if not existing_signal.discord_thread_id:
+            logger.info(
+                f"[IDEMPOTENCY] Self-healing signal {trade_signal.signal_id} - "
+                "missing discord_thread_id",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "symbol": trade_signal.symbol,
+                },
+            )
+        return False
+
+    def _persist_signal(self, trade_signal: Signal) -> bool:
+        """
+        PHASE 1: Persist with CREATED status (establishes tracking).
+
+        Returns:
+            bool: True if the signal was persisted.
+        """
+        trade_signal.status = SignalStatus.CREATED
+        persistence_start = time.time()
+        try:
+            self.repo.save(trade_signal)
+            persistence_duration = time.time() - persistence_start
+            logger.info(
+                f"Signal {trade_signal.signal_id} created in Firestore",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "symbol": trade_signal.symbol,
+                    "status": "CREATED",
+                    "duration_seconds": round(persistence_duration, 3),
+                },
+            )
+            self.metrics.record_success("signal_persistence", persistence_duration)
+            return True
+        except Exception as e:
+            persistence_duration = time.time() - persistence_start
+            logger.error(
+                f"Failed to persist signal {trade_signal.signal_id} - "
+                "skipping notification to prevent zombie signal",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "symbol": trade_signal.symbol,
+                    "error": str(e),
+                },
+            )
+            self.metrics.record_failure("signal_persistence", persistence_duration)
+            return False
+
+    def _notify_signal(
+        self,
+        trade_signal: Signal,
+        asset_class: AssetClass,
+        notification_payload: NotificationPayload,
+    ) -> None:
+        """PHASE 2/3: Notify Discord, then activate or compensate the signal."""
+        thread_id = None
+
+        # Self-healing: Check for existing thread (if missing in memory/DB)
+        if not trade_signal.discord_thread_id:
+            try:
+                thread_id = self.discord.find_thread_by_signal_id(
+                    trade_signal.signal_id,
+                    trade_signal.symbol,
+                    asset_class,
+                )
+            except Exception as e:
+                logger.warning(f"Thread recovery check failed: {e}")
+
+        if thread_id:
+            logger.info(
+                f"Self-healing: Recovered Discord thread {thread_id} "
+                f"for signal {trade_signal.signal_id}"
+            )
+        else:
+            # Standard execution: Create new thread (passing payload with saturation info)
+            thread_id = self.discord.send_signal(notification_payload)
+
+        # Update with thread_id and final status
+        if thread_id:
+            updates = {
+                "discord_thread_id": thread_id,
+                "status": SignalStatus.WAITING.value,
+            }
+            if self.repo.update_signal_atomic(trade_signal.signal_id, updates):
+                trade_signal.discord_thread_id = thread_id
+                trade_signal.status = SignalStatus.WAITING
+                logger.info(
+                    "Signal activated with Discord thread",
+                    extra={
+                        "signal_id": trade_signal.signal_id,
+                        "symbol": trade_signal.symbol,
+                        "thread_id": thread_id,
+                        "status": "WAITING",
+                    },
+                )
+            else:
+                logger.error(
+                    f"Failed to atomic update signal {trade_signal.signal_id} after Discord notification"
+                )
+            return
+
+        # Compensation: Mark as invalidated if notification failed
+        logger.warning(
+            f"Discord notification failed for {trade_signal.symbol} "
+            "- marking signal as invalidated",
+            extra={"symbol": trade_signal.symbol},
+        )
+        trade_signal.status = SignalStatus.INVALIDATED
+        trade_signal.exit_reason = ExitReason.NOTIFICATION_FAILED
+        try:
+            self.repo.update_signal_atomic(
+                trade_signal.signal_id,
+                {
+                    "status": SignalStatus.INVALIDATED.value,
+                    "exit_reason": ExitReason.NOTIFICATION_FAILED.value,
+                },
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to invalidate signal: {e}",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "error": str(e),
+                },
+            )
+
+    def _open_broker_positions(self) -> Dict[str, Any]:
+        """
+        ISSUE 275: Duplicate Symbol Guard (one positions fetch per batch).
+
+        Alpaca holds one aggregate position per symbol. Signals for symbols
+        with an open broker position are skipped to prevent the TP automation
+        race condition. On API errors the guard fails open (log & proceed) to
+        avoid blocking trades.
+
+        Returns:
+            Normalized Alpaca symbol -> qty of its open position.
+        """
+        engine = cast(Any, self.execution_engine)
+        try:
+            positions = engine.alpaca.get_all_positions() or []
+        except Exception as e:
+            logger.warning(
+                f"ISSUE 275: Pre-execution check failed-open due to API error: {e}",
+                extra={
+                    "error": str(e),
+                    "status_code": getattr(e, "status_code", "unknown"),
+                },
+            )
+            return {}
+        return {normalize_alpaca_symbol(str(p.symbol)): p.qty for p in positions}
+
+    def _execute_batch(self, batch: List[QueuedExecution]) -> None:
+        """
+        Submit the queued orders, persist positions and transition to ACTIVE.
+
+        Args:
+            batch: (signal, processing start time) pairs in detection order.
+        """
+        engine = cast(Any, self.execution_engine)
+        held = self._open_broker_positions()
+
+        pending: List[QueuedExecution] = []
+        for trade_signal, processing_start in batch:
+            alpaca_symbol = normalize_alpaca_symbol(trade_signal.symbol)
+            if alpaca_symbol in held:
+                logger.warning(
+                    f"ISSUE 275: Skipping execution for {trade_signal.symbol} — "
+                    f"Alpaca already has open position (qty={held[alpaca_symbol]})",
+                    extra={
+                        "symbol": trade_signal.symbol,
+                        "signal_id": trade_signal.signal_id,
+                        "existing_qty": str(held[alpaca_symbol]),
+                    },
+                )
+                continue
+            pending.append((trade_signal, processing_start))
+        if not pending:
+            return
+
+        execution_start = time.time()
+        try:
+            positions = engine.execute_signals([sig for sig, _ in pending])
+        except Exception as e:
+            execution_duration = time.time() - execution_start
+            logger.error(
+                f"Batch execution of {len(pending)} signals failed: {e}",
+                extra={"signals": len(pending), "error": str(e)},
+            )
+            for _ in pending:
+                self.metrics.record_failure("order_execution", execution_duration)
+            return
+        execution_duration = time.time() - execution_start
+
+        for trade_signal, processing_start in pending:
+            self._record_execution(
+                trade_signal,
+                positions.get(trade_signal.signal_id),
+                execution_duration,
+            )
+            self.metrics.record_success(
+                "signal_processing", time.time() - processing_start
+            )
+
+    def _record_execution(
+        self,
+        trade_signal: Signal,
+        position: Optional[Any],
+        execution_duration: float,
+    ) -> None:
+        """Persist an executed position and transition its signal to ACTIVE."""
+        try:
+            if not position:
+                # Execution was blocked by safety guards
+                logger.debug(
+                    f"Execution skipped for {trade_signal.symbol} "
+                    "(blocked by safety guards or validation)"
+                )
+                return
+
+            # CRITICAL: Persist position to Firestore for
+            # Position Sync Loop and TP Automation to work
+            self.position_repo.save(position)
+
+            # TIER 1: Immediate ACTIVE transition
+            # Stop the 24h reaper clock in real-time
+            if position.trade_type == TradeType.EXECUTED:
+                trade_signal.status = SignalStatus.ACTIVE
+                self.repo.update_signal_atomic(
+                    trade_signal.signal_id,
+                    {"status": SignalStatus.ACTIVE.value},
+                )
+                logger.info(
+                    f"SIGNAL ACTIVE: {trade_signal.symbol}",
+                    extra={
+                        "symbol": trade_signal.symbol,
+                        "signal_id": trade_signal.signal_id,
+                    },
+                )
+
+            # Log differentiation for Risk Blocked vs Executed
+            if position.trade_type == "RISK_BLOCKED":
+                logger.info(
+                    f"LIFECYCLE PERSISTED: {trade_signal.symbol} (Type: {position.trade_type})",
+                    extra={
+                        "signal_id": trade_signal.signal_id,
+                        "symbol": trade_signal.symbol,
+                        "position_id": position.position_id,
+                        "trade_type": position.trade_type,
+                        "qty": position.qty,
+                    },
+                )
+            else:
+                logger.info(
+                    f"ORDER EXECUTED: {trade_signal.symbol}",
+                    extra={
+                        "signal_id": trade_signal.signal_id,
+                        "symbol": trade_signal.symbol,
+                        "position_id": position.position_id,
+                        "qty": position.qty,
+                        "duration_seconds": round(execution_duration, 3),
+                    },
+                )
+            self.metrics.record_success("order_execution", execution_duration)
+        except Exception as e:
+            logger.error(
+                f"Failed to execute order for {trade_signal.symbol}: {e}",
+                extra={
+                    "signal_id": trade_signal.signal_id,
+                    "symbol": trade_signal.symbol,
+                    "error": str(e),
+                },
+            )
+            self.metrics.record_failure("order_execution", execution_duration)
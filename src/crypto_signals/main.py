@@ -5,12 +5,14 @@ This script executes the signal generation pipeline for a defined portfolio of a
 It orchestrates data fetching, pattern recognition, persistence, and notifications.
 """
 
-import atexit
+import importlib
 import signal
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from contextlib import nullcontext
 from datetime import date, datetime, timezone
+from functools import partial
 from typing import Any, Callable, Optional, Protocol, cast
 
 import typer
@@ -35,17 +37,26 @@ from crypto_signals.config import (
 from crypto_signals.domain.schemas import (
     AssetClass,
     ExitReason,
-    NotificationPayload,
     SignalStatus,
     TradeStatus,
-    TradeType,
 )
+from crypto_signals.engine.correlation import CorrelationService
 from crypto_signals.engine.execution import ExecutionEngine
+from crypto_signals.engine.job_scheduler import JobScheduler
+from crypto_signals.engine.order_events import start_order_event_source
 from crypto_signals.engine.reconciler import StateReconciler
 from crypto_signals.engine.reconciler_notifications import ReconcilerNotificationService
 from crypto_signals.engine.signal_generator import SignalGenerator
+from crypto_signals.engine.signal_pipeline import SignalProcessingPipeline
 from crypto_signals.market.asset_service import AssetValidationService
 from crypto_signals.market.data_provider import MarketDataProvider
+from crypto_signals.metrics import (
+    PHASE_DURATION,
+    SYMBOL_DURATION,
+    export_metrics,
+    get_metrics_registry,
+    start_metrics_server,
+)
 from crypto_signals.notifications.discord import DiscordClient
 from crypto_signals.observability import (
     MetricsCollector,
@@ -57,14 +68,7 @@ from crypto_signals.observability import (
     log_execution_time,
     setup_gcp_logging,
 )
-from crypto_signals.pipelines.account_snapshot import AccountSnapshotPipeline
-from crypto_signals.pipelines.backtest_archival import BacktestArchivalPipeline
-from crypto_signals.pipelines.expired_signal_archival import ExpiredSignalArchivalPipeline
-from crypto_signals.pipelines.fee_patch import FeePatchPipeline
-from crypto_signals.pipelines.price_patch import PricePatchPipeline
-from crypto_signals.pipelines.rejected_signal_archival import RejectedSignalArchival
-from crypto_signals.pipelines.strategy_sync import StrategySyncPipeline
-from crypto_signals.pipelines.trade_archival import TradeArchivalPipeline
+from crypto_signals.profiling import set_profile_phase, start_profiler, stop_profiler
 from crypto_signals.repository.firestore import (
     JobLockRepository,
     JobMetadataRepository,
@@ -74,14 +78,62 @@ from crypto_signals.repository.firestore import (
     StrategyRepository,
 )
 from crypto_signals.secrets_manager import init_secrets
+from crypto_signals.tracing import (
+    TracedThreadPoolExecutor,
+    annotate_span,
+    export_trace,
+    get_tracer,
+    start_trace,
+    traced,
+)
 from crypto_signals.utils.metadata import get_git_hash, get_job_context
 from crypto_signals.utils.symbols import normalize_alpaca_symbol
 
 # Configure logging with Rich integration
 configure_logging(level="INFO")
 
-# Pre-compile Numba JIT functions to avoid cold-start latency in live trading
-warmup_jit()
+
+class _LazyImport:
+    """
+    Callable stand-in for a class whose module is imported on first call.
+
+    The BigQuery pipelines pull in google-cloud-bigquery and run in background
+    jobs, so deferring their import keeps it off the cold-start path.
+    """
+
+    def __init__(self, module: str, attr: str):
+        self._module = module
+        self._attr = attr
+        self._target: Optional[Callable[..., Any]] = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._attr)
+        return self._target(*args, **kwargs)
+
+
+_PIPELINES = "crypto_signals.pipelines"
+AccountSnapshotPipeline = _LazyImport(
+    f"{_PIPELINES}.account_snapshot", "AccountSnapshotPipeline"
+)
+BacktestArchivalPipeline = _LazyImport(
+    f"{_PIPELINES}.backtest_archival", "BacktestArchivalPipeline"
+)
+ExpiredSignalArchivalPipeline = _LazyImport(
+    f"{_PIPELINES}.expired_signal_archival", "ExpiredSignalArchivalPipeline"
+)
+FeePatchPipeline = _LazyImport(f"{_PIPELINES}.fee_patch", "FeePatchPipeline")
+PricePatchPipeline = _LazyImport(f"{_PIPELINES}.price_patch", "PricePatchPipeline")
+RejectedSignalArchival = _LazyImport(
+    f"{_PIPELINES}.rejected_signal_archival", "RejectedSignalArchival"
+)
+StrategySyncPipeline = _LazyImport(f"{_PIPELINES}.strategy_sync", "StrategySyncPipeline")
+TradeArchivalPipeline = _LazyImport(
+    f"{_PIPELINES}.trade_archival", "TradeArchivalPipeline"
+)
+
+# Startup: max concurrent client initializations (I/O-bound credential/TLS setup)
+STARTUP_INIT_WORKERS = 8
 
 # Performance SLA Constants
 LATENCY_SLA_MS = 200  # 200ms (Strict check after warmup)
@@ -114,6 +166,10 @@ def _run_pipeline(
         name: The name of the pipeline for metrics/logging.
         success_log_fn: A callback that receives the result and logs success.
         metrics_collector: Optional metrics collector (fetches default if None).
+
+    Raises:
+        Exception: Re-raised after logging so the scheduler marks the job FAILED
+            and skips the jobs that depend on it.
     """
     logger.info(f"Running {name} Pipeline...")
     start_time = time.time()
@@ -128,6 +184,82 @@ def _run_pipeline(
     except Exception as e:
         logger.error(f"{name} Pipeline failed: {e}")
         metrics.record_failure(name, time.time() - start_time)
+        raise
+
+
+def _run_reconciliation(reconciler: StateReconciler, metrics: "MetricsCollector") -> None:
+    """
+    Run state reconciliation and log its report.
+
+    Raises:
+        Exception: Re-raised after logging so dependent jobs (archival, patches)
+            are skipped on potentially inconsistent state.
+    """
+    logger.info("Running state reconciliation...")
+    reconciliation_start_time = time.time()
+    try:
+        reconciliation_report = reconciler.reconcile()
+    except Exception as e:
+        logger.error(
+            f"Reconciliation failed: {e}",
+            extra={"error": str(e)},
+        )
+        metrics.record_failure("reconciliation", time.time() - reconciliation_start_time)
+        raise
+
+    if reconciliation_report.critical_issues:
+        logger.warning(
+            f"Reconciliation detected {len(reconciliation_report.critical_issues)} critical issue(s)",
+            extra={
+                "issues": reconciliation_report.critical_issues,
+                "zombies": len(reconciliation_report.zombies),
+                "orphans": len(reconciliation_report.orphans),
+            },
+        )
+    else:
+        logger.info(
+            f"Reconciliation complete: {reconciliation_report.reconciled_count} positions healed"
+        )
+
+
+def _run_daily_cleanup(
+    repo,
+    rejected_repo,
+    position_repo,
+    job_metadata_repo,
+    today_date: date,
+    git_hash: str,
+    environment: str,
+    metrics: "MetricsCollector",
+) -> None:
+    """
+    Delete expired Firestore documents once per day and record the run.
+
+    Raises:
+        Exception: Re-raised after logging so the job is reported FAILED.
+    """
+    logger.info("Running daily cleanup...")
+    start_time = time.time()
+    try:
+        deleted_signals = repo.cleanup_expired()
+        deleted_rejected = rejected_repo.cleanup_expired()
+        deleted_positions = position_repo.cleanup_expired()
+        logger.info(
+            f"Cleanup complete: {deleted_signals} signals, "
+            f"{deleted_rejected} rejected signals, {deleted_positions} positions."
+        )
+        job_metadata_repo.save_job_metadata(
+            "daily_cleanup",
+            {
+                "last_run_date": today_date,
+                "git_hash": git_hash,
+                "environment": environment,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Daily cleanup failed: {e}")
+        metrics.record_failure("daily_cleanup", time.time() - start_time)
+        raise
 
 
 def _log_pipeline_result(
@@ -214,13 +346,39 @@ def main(
                 "Continuing with Rich terminal logging only."
             )
 
+    registry = get_metrics_registry()
+    symbol_durations = registry.histogram(
+        SYMBOL_DURATION,
+        "Per-symbol fetch + signal generation time",
+        ("asset_class", "symbol"),
+    )
+    phase_durations = registry.gauge(
+        PHASE_DURATION, "Wall-clock duration of each run phase", ("phase",)
+    )
+    if settings.METRICS_HTTP_PORT:
+        try:
+            start_metrics_server(settings.METRICS_HTTP_PORT)
+        except Exception as e:
+            logger.warning(f"Failed to start metrics endpoint: {e}")
+
     logger.info("Starting Crypto Sentinel Signal Generator...")
     app_start_time = time.time()
+    if settings.PROFILE_DIR:
+        start_profiler(interval=settings.PROFILE_INTERVAL_MS / 1000)
+        set_profile_phase("startup")
+    tracer = get_tracer()
+    run_span = (
+        start_trace("signal_generator", environment=settings.ENVIRONMENT)
+        if settings.TRACE_EXPORT_DIR
+        else None
+    )
 
     # Capture Execution Context
     git_hash = get_git_hash()
     job_context = get_job_context(settings)
     logger.info(f"Execution Context: Git={git_hash}, Env={settings.ENVIRONMENT}")
+    order_event_source = None
+    release_job_lock: Optional[Callable[[], None]] = None
 
     try:
         # Initialize Secrets
@@ -304,52 +462,68 @@ def main(
         # Initialize Services
         logger.info("Initializing services...")
         with log_execution_time(logger, "initialize_services"):
-            stock_client = get_stock_data_client()
-            crypto_client = get_crypto_data_client()
-            market_provider = MarketDataProvider(stock_client, crypto_client)
-
-            # Load strategies for injection into SignalGenerator
-            strategy_repo = StrategyRepository()
-            try:
-                active_configs = strategy_repo.get_active_strategy_configs()
-            except (GoogleAPICallError, ValidationError) as e:
-                logger.warning(
-                    "Failed to load strategy configs. UUID injection disabled.",
-                    extra={"error": str(e)},
+            # Independent clients are created concurrently (each performs its
+            # own credential / connection setup); JIT warm-up overlaps with them.
+            def load_strategy_configs() -> list:
+                try:
+                    return StrategyRepository().get_active_strategy_configs()
+                except (GoogleAPICallError, ValidationError) as e:
+                    logger.warning(
+                        "Failed to load strategy configs. UUID injection disabled.",
+                        extra={"error": str(e)},
+                    )
+                    return []
+
+            with TracedThreadPoolExecutor(
+                max_workers=STARTUP_INIT_WORKERS, thread_name_prefix="init"
+            ) as init_pool:
+                jit_future = init_pool.submit(warmup_jit)
+                stock_client_future = init_pool.submit(get_stock_data_client)
+                crypto_client_future = init_pool.submit(get_crypto_data_client)
+                validator_client_future = init_pool.submit(get_trading_client)
+                reconciler_client_future = init_pool.submit(get_trading_client)
+                # Load strategies for injection into SignalGenerator
+                strategy_configs_future = init_pool.submit(load_strategy_configs)
+                repo_future = init_pool.submit(SignalRepository)
+                position_repo_future = init_pool.submit(PositionRepository)
+                discord_future = init_pool.submit(DiscordClient)
+                job_lock_repo_future = init_pool.submit(JobLockRepository)
+                # Shadow signal persistence
+                rejected_repo_future = init_pool.submit(RejectedSignalRepository)
+                job_metadata_repo_future = init_pool.submit(JobMetadataRepository)
+
+                market_provider = MarketDataProvider(
+                    stock_client_future.result(), crypto_client_future.result()
                 )
-                active_configs = []
-
-            generator = SignalGenerator(
-                market_provider=market_provider, strategy_configs=active_configs
-            )
-            repo = SignalRepository()
-            position_repo = PositionRepository()
-            discord = DiscordClient()
-            asset_validator = AssetValidationService(get_trading_client())
-
-            reconciler = StateReconciler(
-                alpaca_client=get_trading_client(),
-                position_repo=position_repo,
-                notification_service=ReconcilerNotificationService(discord),
-                settings=settings,
-                signal_repo=repo,
-            )
-            execution_engine = ExecutionEngine(
-                reconciler=reconciler, market_provider=market_provider
-            )
-            job_lock_repo = JobLockRepository()
-            rejected_repo = RejectedSignalRepository()  # Shadow signal persistence
-            job_metadata_repo = JobMetadataRepository()
-
-            # Pipeline Services
-            trade_archival = TradeArchivalPipeline(execution_engine=execution_engine)
-            rejected_archival = RejectedSignalArchival()
-            expired_archival = ExpiredSignalArchivalPipeline()
-            fee_patch = FeePatchPipeline(execution_engine=execution_engine)
-            price_patch = PricePatchPipeline(execution_engine=execution_engine)
-            account_snapshot = AccountSnapshotPipeline()
-            backtest_archival = BacktestArchivalPipeline()
-            strategy_sync = StrategySyncPipeline()
+                generator = SignalGenerator(
+                    market_provider=market_provider,
+                    strategy_configs=strategy_configs_future.result(),
+                )
+                repo = repo_future.result()
+                position_repo = position_repo_future.result()
+                discord = discord_future.result()
+                asset_validator = AssetValidationService(validator_client_future.result())
+
+                reconciler = StateReconciler(
+                    alpaca_client=reconciler_client_future.result(),
+                    position_repo=position_repo,
+                    notification_service=ReconcilerNotificationService(discord),
+                    settings=settings,
+                    signal_repo=repo,
+                )
+                # Fed with the Phase 1 bars; read by the correlation risk gate
+                correlation_service = CorrelationService(
+                    window=settings.CORRELATION_WINDOW_DAYS
+                )
+                execution_engine = ExecutionEngine(
+                    reconciler=reconciler,
+                    market_provider=market_provider,
+                    correlation_service=correlation_service,
+                )
+                job_lock_repo = job_lock_repo_future.result()
+                rejected_repo = rejected_repo_future.result()
+                job_metadata_repo = job_metadata_repo_future.result()
+                jit_future.result()
 
         # Job Locking
         job_id = "signal_generator_cron"
@@ -357,20 +531,60 @@ def main(
             logger.warning(f"Job lock held by another instance ({job_id}). Exiting.")
             sys.exit(0)
 
-        # Ensure lock is released on exit
-        atexit.register(job_lock_repo.release_lock, job_id)
+        # Released in the finally block below (not atexit): the process must
+        # not wait for abandoned background jobs before freeing the lock
+        release_job_lock = partial(job_lock_repo.release_lock, job_id)
+
+        # Fill tracking from trade_updates; connects while Phase 1 runs so
+        # Phase 3 executions await fill events instead of polling
+        order_event_source = start_order_event_source(settings)
+
+        # === STARTUP JOBS (dependency-aware, concurrent) ===
+        # Reconciliation is the only job on the critical path to signal
+        # generation; archival, patches and snapshots overlap with Phase 1.
+        # Overlapping Phase 1 is safe: trade archival only reads and deletes
+        # positions already CLOSED when it extracts, while Phase 1 only writes
+        # positions it read as OPEN; the engine calls the pipelines make (fee
+        # tier, activity ledger, order lookups) are stateless or locked.
+        # Phase 3 and position sync wait for position_jobs instead (see below).
+        scheduler = JobScheduler(
+            max_workers=settings.JOB_SCHEDULER_MAX_WORKERS,
+            cancel_check=lambda: shutdown_requested,
+        )
+        job_timeout = settings.JOB_TIMEOUT_SECONDS
+
+        def pipeline_job(
+            factory: Callable[[], Pipeline],
+            name: str,
+            success_log_fn: Callable[[Any], None],
+        ) -> Callable[[], None]:
+            """Build the pipeline inside its job so client setup stays off the critical path."""
+
+            def job() -> None:
+                try:
+                    pipeline = factory()
+                except Exception as e:
+                    logger.error(f"{name} Pipeline failed to initialize: {e}")
+                    metrics.record_failure(name, 0)
+                    raise
+                # Failures propagate so the scheduler skips dependent jobs
+                _run_pipeline(pipeline, name, success_log_fn, metrics_collector=metrics)
+
+            return job
 
         # === STRATEGY SYNC (SCD Type 2) ===
-        # === STRATEGY SYNC (SCD Type 2) ===
-        _run_pipeline(
-            strategy_sync,
+        scheduler.add(
             "strategy_sync",
-            lambda count: logger.info(
-                f"✅ Strategy Sync complete: {count} versions updated."
-                if count > 0
-                else "✅ Strategy Sync complete: No changes detected."
+            pipeline_job(
+                StrategySyncPipeline,
+                "strategy_sync",
+                lambda count: logger.info(
+                    f"✅ Strategy Sync complete: {count} versions updated."
+                    if count > 0
+                    else "✅ Strategy Sync complete: No changes detected."
+                ),
             ),
-            metrics_collector=metrics,
+            timeout=job_timeout,
         )
 
         # === ACCOUNT SNAPSHOT (New Independent Job) ===
@@ -378,160 +592,169 @@ def main(
         last_snapshot = job_metadata_repo.get_last_run_date("account_snapshot")
 
         if last_snapshot != today:
-            _run_pipeline(
-                account_snapshot,
+            scheduler.add(
                 "account_snapshot",
-                _create_account_snapshot_callback(
-                    job_metadata_repo, today, git_hash, settings.ENVIRONMENT
+                pipeline_job(
+                    AccountSnapshotPipeline,
+                    "account_snapshot",
+                    _create_account_snapshot_callback(
+                        job_metadata_repo, today, git_hash, settings.ENVIRONMENT
+                    ),
                 ),
-                metrics_collector=metrics,
+                timeout=job_timeout,
             )
         else:
             logger.info("Account Snapshot has already run today. Skipping.")
 
-        # === REJECTED SIGNAL ARCHIVAL (Issue #183) ===
-        # Archive "Ghost Trades" to BigQuery for analysis
-        # MUST run before daily cleanup deletes the source data
+        cleanup_prerequisites: list[str] = []
         if settings.USE_LEGACY_ARCHIVAL:
-            _run_pipeline(
-                rejected_archival,
+            # === REJECTED SIGNAL ARCHIVAL (Issue #183) ===
+            # Archive "Ghost Trades" to BigQuery for analysis
+            scheduler.add(
                 "rejected_archival",
-                lambda count: _log_pipeline_result(
-                    "Rejected signal archival", count, "signals", "archived"
+                pipeline_job(
+                    RejectedSignalArchival,
+                    "rejected_archival",
+                    lambda count: _log_pipeline_result(
+                        "Rejected signal archival", count, "signals", "archived"
+                    ),
                 ),
-                metrics_collector=metrics,
+                timeout=job_timeout,
             )
 
             # === EXPIRED SIGNAL ARCHIVAL (Issue #183) ===
             # Archive "Noise" to BigQuery for analysis
-            # MUST run before daily cleanup deletes the source data
-            _run_pipeline(
-                expired_archival,
+            scheduler.add(
                 "expired_archival",
-                lambda count: _log_pipeline_result(
-                    "Expired signal archival", count, "signals", "archived"
+                pipeline_job(
+                    ExpiredSignalArchivalPipeline,
+                    "expired_archival",
+                    lambda count: _log_pipeline_result(
+                        "Expired signal archival", count, "signals", "archived"
+                    ),
                 ),
-                metrics_collector=metrics,
+                timeout=job_timeout,
             )
+            # Both MUST run before daily cleanup deletes the source data
+            cleanup_prerequisites = ["rejected_archival", "expired_archival"]
 
         # === DAILY CLEANUP ===
         last_cleanup_date = job_metadata_repo.get_last_run_date("daily_cleanup")
+        backtest_after: list[str] = []
+        # Jobs that delete positions or share execution_engine with execution
+        position_jobs = ["trade_archival", "fee_patch", "price_patch"]
         if last_cleanup_date != today:
-            logger.info("Running daily cleanup...")
-            deleted_signals = repo.cleanup_expired()
-            deleted_rejected = rejected_repo.cleanup_expired()
-            deleted_positions = position_repo.cleanup_expired()
-            logger.info(
-                f"Cleanup complete: {deleted_signals} signals, "
-                f"{deleted_rejected} rejected signals, {deleted_positions} positions."
-            )
-            job_metadata_repo.save_job_metadata(
+            scheduler.add(
                 "daily_cleanup",
-                {
-                    "last_run_date": today,
-                    "git_hash": git_hash,
-                    "environment": settings.ENVIRONMENT,
-                },
+                lambda: _run_daily_cleanup(
+                    repo,
+                    rejected_repo,
+                    position_repo,
+                    job_metadata_repo,
+                    today,
+                    git_hash,
+                    settings.ENVIRONMENT,
+                    metrics,
+                ),
+                depends_on=cleanup_prerequisites,
+                timeout=job_timeout,
             )
+            backtest_after.append("daily_cleanup")
+            position_jobs.append("daily_cleanup")
         else:
             logger.info("Daily cleanup has already run today. Skipping.")
 
         # === STATE RECONCILIATION (Issue #113) ===
         # Detect and heal zombie/orphan positions before main loop
-        logger.info("Running state reconciliation...")
-        reconciliation_failed = False
-        reconciliation_start_time = time.time()
-        try:
-            reconciliation_report = reconciler.reconcile()
-
-            if reconciliation_report.critical_issues:
-                logger.warning(
-                    f"Reconciliation detected {len(reconciliation_report.critical_issues)} critical issue(s)",
-                    extra={
-                        "issues": reconciliation_report.critical_issues,
-                        "zombies": len(reconciliation_report.zombies),
-                        "orphans": len(reconciliation_report.orphans),
-                    },
-                )
-            else:
-                logger.info(
-                    f"Reconciliation complete: {reconciliation_report.reconciled_count} positions healed"
-                )
-        except Exception as e:
-            logger.error(
-                f"Reconciliation failed: {e}",
-                extra={"error": str(e)},
-            )
-            metrics.record_failure(
-                "reconciliation", time.time() - reconciliation_start_time
-            )
-            # Mark as failed to prevent archival of potentially inconsistent state
-            reconciliation_failed = True
+        scheduler.add(
+            "reconcile",
+            lambda: _run_reconciliation(reconciler, metrics),
+            timeout=job_timeout,
+        )
 
         # === TRADE ARCHIVAL (Issue #149) ===
         # Move Closed Positions -> BigQuery (Before Fee Patch!)
         # Must run AFTER reconciliation (so we archive what was just closed)
-        if not reconciliation_failed:
-            _run_pipeline(
-                trade_archival,
+        scheduler.add(
+            "trade_archival",
+            pipeline_job(
+                lambda: TradeArchivalPipeline(execution_engine=execution_engine),
                 "trade_archival",
                 lambda count: logger.info(
                     f"✅ Trade archival complete: {count} trades archived"
                     if count > 0
                     else "✅ Trade archival complete: No closed trades to archive"
                 ),
-                metrics_collector=metrics,
-            )
+            ),
+            depends_on=["reconcile"],
+            timeout=job_timeout,
+        )
 
-            # === BACKTEST ARCHIVAL (Issue #361) ===
-            # Unified pipeline: archives ALL terminal signals to fact_theoretical_signals
-            # Must run AFTER Trade Archival (Issue #368) so linked_trade_id FKs exist
-            _run_pipeline(
-                backtest_archival,
+        # === BACKTEST ARCHIVAL (Issue #361) ===
+        # Unified pipeline: archives ALL terminal signals to fact_theoretical_signals
+        # Must run AFTER Trade Archival (Issue #368) so linked_trade_id FKs exist
+        scheduler.add(
+            "backtest_archival",
+            pipeline_job(
+                BacktestArchivalPipeline,
                 "backtest_archival",
                 lambda count: _log_pipeline_result(
                     "Backtest archival", count, "signals", "archived"
                 ),
-                metrics_collector=metrics,
-            )
-
-        else:
-            logger.warning("⚠️ Skipping trade archival due to reconciliation failure.")
+            ),
+            depends_on=["trade_archival"],
+            after=backtest_after,
+            timeout=job_timeout,
+        )
 
         # === FEE RECONCILIATION (Issue #140) ===
-        # Patch estimated fees with actual CFEE data before generating new signals
-        # Runs T+1 reconciliation for trades older than 24 hours
-        if not reconciliation_failed:
-            _run_pipeline(
-                fee_patch,
+        # Patch estimated fees with actual CFEE data (T+1 for trades older than 24h)
+        # Only patches rows archived on earlier runs, so it does not need today's
+        # archival to succeed; serialized after it (whatever its outcome) to
+        # avoid concurrent DML on fact_trades
+        scheduler.add(
+            "fee_patch",
+            pipeline_job(
+                lambda: FeePatchPipeline(execution_engine=execution_engine),
                 "fee_patch",
                 lambda count: logger.info(
                     f"✅ Fee reconciliation complete: {count} trades updated"
                     if count > 0
                     else "✅ Fee reconciliation complete: No trades to update"
                 ),
-                metrics_collector=metrics,
-            )
-        else:
-            logger.warning("⚠️ Skipping fee reconciliation due to reconciliation failure.")
+            ),
+            depends_on=["reconcile"],
+            after=["trade_archival"],
+            timeout=job_timeout,
+        )
 
         # === EXIT PRICE RECONCILIATION (Issue #141) ===
         # Patch $0.00 exit prices with actual fill prices from Alpaca
-        # Runs for historical repair and daily reconciliation
-        if not reconciliation_failed:
-            _run_pipeline(
-                price_patch,
+        # Serialized after Fee Patch (whatever its outcome) to avoid concurrent
+        # DML on fact_trades
+        scheduler.add(
+            "price_patch",
+            pipeline_job(
+                lambda: PricePatchPipeline(execution_engine=execution_engine),
                 "price_patch",
                 lambda count: logger.info(
                     f"✅ Exit price reconciliation complete: {count} trades repaired"
                     if count > 0
                     else "✅ Exit price reconciliation complete: No trades to repair"
                 ),
-                metrics_collector=metrics,
-            )
-        else:
+            ),
+            depends_on=["reconcile"],
+            after=["fee_patch"],
+            timeout=job_timeout,
+        )
+
+        scheduler.start()
+
+        # Critical path: only reconciliation gates signal generation
+        if not scheduler.wait_for("reconcile"):
             logger.warning(
-                "⚠️ Skipping exit price reconciliation due to reconciliation failure."
+                "⚠️ Skipping trade archival, fee and exit price reconciliation "
+                "due to reconciliation failure."
             )
 
         # Define Portfolio
@@ -573,11 +796,13 @@ def main(
         candidate_signals = []  # To be processed in Phase 2 (Saturation Filter)
         symbols_processed = 0
 
+        @traced("symbol")
         def process_portfolio_item(
             item: tuple[str, AssetClass], progress: Any, task: Any, index: int = 0
         ) -> Optional[tuple[Any, AssetClass, float]]:
             """Process a single portfolio item: fetch data, generate signals, and check exits."""
             symbol, asset_class = item
+            annotate_span(symbol=symbol, asset_class=asset_class.value)
 
             # Check for shutdown signal
             if shutdown_requested:
@@ -590,7 +815,8 @@ def main(
             wait_time = target_start - time.time()
             if wait_time > 0:
                 logger.debug(f"Staggering {symbol} by {wait_time:.2f}s")
-                time.sleep(wait_time)
+                with tracer.span("stagger_sleep", seconds=round(wait_time, 3)):
+                    time.sleep(wait_time)
 
             symbol_start_time = time.time()
 
@@ -613,6 +839,12 @@ def main(
                     logger.warning(f"No data for {symbol}")
                     return None
 
+                # Keep the correlation matrix current without refetching bars
+                try:
+                    correlation_service.update(symbol, df["close"])
+                except Exception as e:
+                    logger.debug(f"Correlation update skipped for {symbol}: {e}")
+
                 # Generate Signals
                 trade_signal = generator.generate_signals(
                     symbol, asset_class, dataframe=df
@@ -620,6 +852,9 @@ def main(
 
                 # Track metrics
                 symbol_duration = time.time() - symbol_start_time
+                symbol_durations.labels(
+                    asset_class=asset_class.value, symbol=symbol
+                ).observe(symbol_duration)
 
                 if not trade_signal:
                     logger.debug(f"No signal for {symbol}.")
@@ -1014,7 +1249,9 @@ def main(
             max_workers = getattr(settings, "MAX_WORKERS", 3)
             logger.info(f"Parallelizing asset loop with {max_workers} workers...")
 
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            set_profile_phase("signal_generation")
+            executor = TracedThreadPoolExecutor(max_workers=max_workers)
+            with tracer.span("phase.signal_generation"), executor:
                 # Submit all tasks
                 future_to_symbol = {
                     executor.submit(
@@ -1039,6 +1276,7 @@ def main(
                         logger.error(f"Worker thread for {symbol} failed: {e}")
 
         phase1_duration = time.time() - phase1_start_time
+        phase_durations.labels(phase="signal_generation").set(phase1_duration)
         logger.info(
             f"✅ Phase 1 complete: Processed {symbols_processed} symbols in {phase1_duration:.2f}s "
             f"(Wall-clock time)"
@@ -1067,10 +1305,13 @@ def main(
         if live_signals:
             try:
                 diversity = generator.compute_diversity_metrics(live_signals)
+                # Positional fields: with kwargs loguru str.format()s the
+                # message, so the braces of a pre-rendered dict would break it
                 logger.info(
-                    f"DIVERSITY: {diversity['total_signals']} signals, "
-                    f"entropy={diversity['shannon_entropy']:.2f}, "
-                    f"patterns={diversity['pattern_distribution']}",
+                    "DIVERSITY: {} signals, entropy={:.2f}, patterns={}",
+                    diversity["total_signals"],
+                    diversity["shannon_entropy"],
+                    diversity["pattern_distribution"],
                     extra={
                         "diversity_metrics": diversity,
                         "shannon_entropy": diversity["shannon_entropy"],
@@ -1085,332 +1326,50 @@ def main(
                 # but logged as an error since a real signal should not fail metrics computation.
                 logger.error(f"Failed to compute diversity metrics: {e}")
 
-        # Phase 3: Signal Processing (Persistence, Notification, Execution)
-        for trade_signal, asset_class, _symbol_duration in candidate_signals:
-            processing_start = time.time()
-            symbol = trade_signal.symbol
-            pattern_name = trade_signal.pattern_name
-
-            # Check for saturation
-            is_saturated = pattern_counts.get(pattern_name, 0) > saturation_threshold
-            if is_saturated and trade_signal.status != SignalStatus.REJECTED_BY_FILTER:
-                logger.warning(
-                    f"SIGNAL SATURATION: Pattern {pattern_name} triggered on "
-                    f"{pattern_counts[pattern_name]} symbols. Flagging as suspicious.",
-                    extra={
-                        "pattern": pattern_name,
-                        "count": pattern_counts[pattern_name],
-                        "threshold": saturation_threshold,
-                    },
-                )
-
-            # --- Handle Shadow Signals (rejected by quality gates) ---
-            if trade_signal.status == SignalStatus.REJECTED_BY_FILTER:
-                # DEDUPLICATION: Skip shadow if active signal exists (avoid noise)
-                active_signals = repo.get_active_signals(symbol)
-                if active_signals:
-                    logger.debug(
-                        f"[SHADOW] Skipping {symbol} shadow signal - active signal exists",
-                        extra={"symbol": symbol},
-                    )
-                    continue
-
-                # Persist to rejected_signals collection for audit/analysis
-                try:
-                    rejected_repo.save(trade_signal)
-                    # Send to shadow Discord channel (if configured)
-                    discord.send_shadow_signal(trade_signal)
-                    logger.info(
-                        f"[SHADOW] {trade_signal.symbol} {trade_signal.pattern_name}: "
-                        f"{trade_signal.rejection_reason}",
-                        extra={
-                            "symbol": trade_signal.symbol,
-                            "pattern": trade_signal.pattern_name,
-                            "rejection_reason": trade_signal.rejection_reason,
-                            "pattern_duration_days": trade_signal.pattern_duration_days,
-                            "pattern_classification": trade_signal.pattern_classification,
-                        },
-                    )
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to persist shadow signal: {e}",
-                        extra={"symbol": trade_signal.symbol},
-                    )
-                # Shadow signals don't trigger live trading - continue to next symbol
-                continue
-
-            # Build Notification Payload (deferred past shadow check for efficiency)
-            notification_payload = NotificationPayload(
-                signal=trade_signal,
-                is_saturated=is_saturated,
-                saturation_count=pattern_counts.get(pattern_name, 0),
+        # Phase 3 and position sync close positions and rewrite whole position
+        # documents: a merge write racing archival's delete would resurrect the
+        # position. Keep the pre-scheduler ordering for them by waiting on the
+        # position jobs (bounded by JOB_TIMEOUT_SECONDS; usually already done).
+        with tracer.span("scheduler.wait_for", jobs=",".join(position_jobs)):
+            scheduler.wait_for(*position_jobs)
+
+        # A timed-out job is only abandoned, not stopped: while it may still be
+        # deleting positions, skip the position-writing phases for this run.
+        lingering_jobs = scheduler.abandoned(*position_jobs)
+        if lingering_jobs:
+            logger.error(
+                f"Position jobs still running after timeout: {lingering_jobs}. "
+                "Skipping signal processing and position sync this run.",
+                extra={"jobs": lingering_jobs},
             )
 
-            # --- Standard signal handling (WAITING status) ---
-            signals_found += 1
-            logger.info(
-                f"SIGNAL FOUND: {trade_signal.pattern_name} on {trade_signal.symbol}",
-                extra={
-                    "symbol": trade_signal.symbol,
-                    "pattern": trade_signal.pattern_name,
-                    "stop_loss": trade_signal.suggested_stop,
-                    "pattern_duration_days": trade_signal.pattern_duration_days,
-                    "pattern_classification": trade_signal.pattern_classification,
-                    "is_saturated": is_saturated,
-                },
+        # Phase 3: Signal Processing (Persistence, Notification, Execution)
+        # Independent symbols flow through bounded concurrent stages; signals for
+        # the same symbol stay ordered and keep the two-phase commit.
+        if not lingering_jobs:
+            signal_pipeline = SignalProcessingPipeline(
+                repo=repo,
+                rejected_repo=rejected_repo,
+                discord=discord,
+                position_repo=position_repo,
+                execution_engine=execution_engine,
+                settings=settings,
+                metrics=metrics,
             )
-
-            # ============================================================
-            # IDEMPOTENCY GATE: Prevent redundant Discord alerts
-            # ============================================================
-            existing_signal = repo.get_by_id(trade_signal.signal_id)
-            if existing_signal:
-                # Skip if signal exists in WAITING status with discord_thread_id
-                if (
-                    existing_signal.status == SignalStatus.WAITING
-                    and existing_signal.discord_thread_id
-                ):
-                    logger.info(
-                        f"[IDEMPOTENCY] Skip notified signal {trade_signal.signal_id}",
-                        extra={
-                            "signal_id": trade_signal.signal_id,
-                            "symbol": trade_signal.symbol,
-                            "thread_id": existing_signal.discord_thread_id,
-                        },
-                    )
-                    continue
-
-                # Self-heal: If exists but discord_thread_id is null, proceed to notification
-                if not existing_signal.discord_thread_id:
-                    logger.info(
-                        f"[IDEMPOTENCY] Self-healing signal {trade_signal.signal_id} - "
-                        "missing discord_thread_id",
-                        extra={
-                            "signal_id": trade_signal.signal_id,
-                            "symbol": trade_signal.symbol,
-                        },
-                    )
-                    # Continue to notification phase to fix the missing thread_id
-
-            # ============================================================
-            # TWO-PHASE COMMIT: Prevents "Zombie Signals"
-            # (notifications sent without database tracking)
-            # ============================================================
-
-            # PHASE 1: Persist with CREATED status (establishes tracking)
-            trade_signal.status = SignalStatus.CREATED
-            persistence_start = time.time()
-            try:
-                repo.save(trade_signal)
-                persistence_duration = time.time() - persistence_start
-                logger.info(
-                    f"Signal {trade_signal.signal_id} created in Firestore",
-                    extra={
-                        "signal_id": trade_signal.signal_id,
-                        "symbol": trade_signal.symbol,
-                        "status": "CREATED",
-                        "duration_seconds": round(persistence_duration, 3),
-                    },
-                )
-                metrics.record_success("signal_persistence", persistence_duration)
-            except Exception as e:
-                persistence_duration = time.time() - persistence_start
-                logger.error(
-                    f"Failed to persist signal {trade_signal.signal_id} - "
-                    "skipping notification to prevent zombie signal",
-                    extra={
-                        "signal_id": trade_signal.signal_id,
-                        "symbol": trade_signal.symbol,
-                        "error": str(e),
-                    },
-                )
-                metrics.record_failure("signal_persistence", persistence_duration)
-                # Skip notification - can't notify without tracking
-                continue
-
-            # PHASE 2: Notify Discord
-            thread_id = None
-
-            # Self-healing: Check for existing thread (if missing in memory/DB)
-            if not trade_signal.discord_thread_id:
-                try:
-                    thread_id = discord.find_thread_by_signal_id(
-                        trade_signal.signal_id,
-                        trade_signal.symbol,
-                        asset_class,
-                    )
-                except Exception as e:
-                    logger.warning(f"Thread recovery check failed: {e}")
-
-            if thread_id:
-                logger.info(
-                    f"Self-healing: Recovered Discord thread {thread_id} "
-                    f"for signal {trade_signal.signal_id}"
-                )
-            else:
-                # Standard execution: Create new thread (passing payload with saturation info)
-                thread_id = discord.send_signal(notification_payload)
-
-            # PHASE 3: Update with thread_id and final status
-            if thread_id:
-                updates = {
-                    "discord_thread_id": thread_id,
-                    "status": SignalStatus.WAITING.value,
-                }
-                if repo.update_signal_atomic(trade_signal.signal_id, updates):
-                    trade_signal.discord_thread_id = thread_id
-                    trade_signal.status = SignalStatus.WAITING
-                    logger.info(
-                        "Signal activated with Discord thread",
-                        extra={
-                            "signal_id": trade_signal.signal_id,
-                            "symbol": trade_signal.symbol,
-                            "thread_id": thread_id,
-                            "status": "WAITING",
-                        },
-                    )
-                else:
-                    logger.error(
-                        f"Failed to atomic update signal {trade_signal.signal_id} after Discord notification"
-                    )
-            else:
-                # Compensation: Mark as invalidated if notification failed
-                logger.warning(
-                    f"Discord notification failed for {trade_signal.symbol} "
-                    "- marking signal as invalidated",
-                    extra={"symbol": trade_signal.symbol},
+            phase3_start_time = time.time()
+            set_profile_phase("signal_processing")
+            with tracer.span(
+                "phase.signal_processing", candidates=len(candidate_signals)
+            ):
+                signals_found = signal_pipeline.run(
+                    candidate_signals, pattern_counts, saturation_threshold
                 )
-                trade_signal.status = SignalStatus.INVALIDATED
-                trade_signal.exit_reason = ExitReason.NOTIFICATION_FAILED
-                try:
-                    repo.update_signal_atomic(
-                        trade_signal.signal_id,
-                        {
-                            "status": SignalStatus.INVALIDATED.value,
-                            "exit_reason": ExitReason.NOTIFICATION_FAILED.value,
-                        },
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Failed to invalidate signal: {e}",
-                        extra={
-                            "signal_id": trade_signal.signal_id,
-                            "error": str(e),
-                        },
-                    )
-
-            # Execute trade if execution is enabled
-            # Safety: ExecutionEngine has built-in guards for:
-            #   1. ALPACA_PAPER_TRADING must be True
-            #   2. ENABLE_EXECUTION must be True
-            if settings.ENABLE_EXECUTION:
-                # === ISSUE 275 FIX: Duplicate Symbol Guard ===
-                # Alpaca holds one aggregate position per symbol.
-                # If we already have an open position, skip to
-                # prevent the TP automation race condition.
-                try:
-                    alpaca_symbol = normalize_alpaca_symbol(trade_signal.symbol)
-                    existing_alpaca_pos = execution_engine.alpaca.get_open_position(
-                        alpaca_symbol
-                    )
-                    if existing_alpaca_pos:
-                        logger.warning(
-                            f"ISSUE 275: Skipping execution for "
-                            f"{trade_signal.symbol} — Alpaca already "
-                            f"has open position (qty="
-                            f"{cast(Any, existing_alpaca_pos).qty})",
-                            extra={
-                                "symbol": trade_signal.symbol,
-                                "signal_id": trade_signal.signal_id,
-                                "existing_qty": str(cast(Any, existing_alpaca_pos).qty),
-                            },
-                        )
-                        continue
-                except APIError as e:
-                    # Position not found (404) is the expected "green path" for this check.
-                    if getattr(e, "status_code", None) == 404:
-                        logger.debug(
-                            f"Pre-execution check passed for {trade_signal.symbol}: No existing position found."
-                        )
-                    else:
-                        # Other API errors: fail-open (log & proceed) to avoid blocking trades.
-                        logger.warning(
-                            f"ISSUE 275: Pre-execution check failed-open for {trade_signal.symbol} due to API error: {e}",
-                            extra={
-                                "symbol": trade_signal.symbol,
-                                "error": str(e),
-                                "status_code": getattr(e, "status_code", "unknown"),
-                            },
-                        )
-
-                execution_start = time.time()
-                try:
-                    position = execution_engine.execute_signal(trade_signal)
-                    execution_duration = time.time() - execution_start
-                    if position:
-                        # CRITICAL: Persist position to Firestore for
-                        # Position Sync Loop and TP Automation to work
-                        position_repo.save(position)
-
-                        # TIER 1: Immediate ACTIVE transition
-                        # Stop the 24h reaper clock in real-time
-                        if position.trade_type == TradeType.EXECUTED:
-                            trade_signal.status = SignalStatus.ACTIVE
-                            repo.update_signal_atomic(
-                                trade_signal.signal_id,
-                                {"status": SignalStatus.ACTIVE.value},
-                            )
-                            logger.info(
-                                f"SIGNAL ACTIVE: {trade_signal.symbol}",
-                                extra={
-                                    "symbol": trade_signal.symbol,
-                                    "signal_id": trade_signal.signal_id,
-                                },
-                            )
-
-                        # Log differentiation for Risk Blocked vs Executed
-                        if position.trade_type == "RISK_BLOCKED":
-                            logger.info(
-                                f"LIFECYCLE PERSISTED: {trade_signal.symbol} (Type: {position.trade_type})",
-                                extra={
-                                    "signal_id": trade_signal.signal_id,
-                                    "symbol": trade_signal.symbol,
-                                    "position_id": position.position_id,
-                                    "trade_type": position.trade_type,
-                                    "qty": position.qty,
-                                },
-                            )
-                        else:
-                            logger.info(
-                                f"ORDER EXECUTED: {trade_signal.symbol}",
-                                extra={
-                                    "signal_id": trade_signal.signal_id,
-                                    "symbol": trade_signal.symbol,
-                                    "position_id": position.position_id,
-                                    "qty": position.qty,
-                                    "duration_seconds": round(execution_duration, 3),
-                                },
-                            )
-                        metrics.record_success("order_execution", execution_duration)
-                    else:
-                        # Execution was blocked by safety guards
-                        logger.debug(
-                            f"Execution skipped for {trade_signal.symbol} "
-                            "(blocked by safety guards or validation)"
-                        )
-                except Exception as e:
-                    execution_duration = time.time() - execution_start
-                    logger.error(
-                        f"Failed to execute order for {trade_signal.symbol}: {e}",
-                        extra={
-                            "signal_id": trade_signal.signal_id,
-                            "symbol": trade_signal.symbol,
-                            "error": str(e),
-                        },
-                    )
-                    metrics.record_failure("order_execution", execution_duration)
-
-            metrics.record_success("signal_processing", time.time() - processing_start)
+            phase3_duration = time.time() - phase3_start_time
+            phase_durations.labels(phase="signal_processing").set(phase3_duration)
+            logger.info(
+                f"✅ Phase 3 complete: Processed {len(candidate_signals)} signals in "
+                f"{phase3_duration:.2f}s"
+            )
 
         # =========================================================================
         # POSITION SYNC LOOP
@@ -1418,138 +1377,152 @@ def main(
         # This updates TP/SL leg IDs and detects externally closed positions.
         # =========================================================================
         slippage_values = []  # Track slippage for summary
-        if settings.ENABLE_EXECUTION:
+        if settings.ENABLE_EXECUTION and not lingering_jobs:
             logger.info("Syncing open positions with Alpaca...")
             sync_start = time.time()
+            set_profile_phase("position_sync")
+            sync_span = tracer.start_span("phase.position_sync")
             try:
                 open_positions = position_repo.get_open_positions()
                 synced_count = 0
                 closed_count = 0
 
-                for pos in open_positions:
-                    if shutdown_requested:
-                        logger.info("Shutdown requested. Stopping position sync...")
-                        break
-
-                    if rate_limit_delay:
-                        time.sleep(rate_limit_delay)
+                # Bulk sync: one paginated broker snapshot (orders + positions)
+                # replaces the per-position parent/leg/position round-trips.
+                snapshot_ctx = (
+                    execution_engine.broker_snapshot(open_positions)
+                    if settings.ENABLE_BULK_POSITION_SYNC and open_positions
+                    else nullcontext()
+                )
+                with snapshot_ctx as broker_snapshot:
+                    for pos in open_positions:
                         if shutdown_requested:
-                            logger.info(
-                                "Shutdown requested during position sync delay. Stopping..."
-                            )
+                            logger.info("Shutdown requested. Stopping position sync...")
                             break
 
-                    try:
-                        # Capture original state for change detection
-                        # Position is a Pydantic model; model_copy() allows detecting
-                        # in-place modifications made by sync_position_status()
-                        original_pos = pos.model_copy(deep=True)
-                        updated_pos = execution_engine.sync_position_status(pos)
-
-                        # Check if position was closed externally (TP/SL hit)
-                        if updated_pos.status != original_pos.status:
-                            position_repo.update_position(updated_pos)
-                            closed_count += 1
-                            logger.info(
-                                f"Position {updated_pos.position_id} closed: "
-                                f"{updated_pos.status.value}",
-                                extra={
-                                    "position_id": updated_pos.position_id,
-                                    "symbol": updated_pos.symbol,
-                                    "status": updated_pos.status.value,
-                                },
-                            )
+                        # Bulk mode serves lookups from memory - no per-call throttle
+                        if rate_limit_delay and broker_snapshot is None:
+                            time.sleep(rate_limit_delay)
+                            if shutdown_requested:
+                                logger.info(
+                                    "Shutdown requested during position sync delay. Stopping..."
+                                )
+                                break
+
+                        try:
+                            # Capture original state for change detection
+                            # Position is a Pydantic model; model_copy() allows detecting
+                            # in-place modifications made by sync_position_status()
+                            original_pos = pos.model_copy(deep=True)
+                            updated_pos = execution_engine.sync_position_status(pos)
+
+                            # Check if position was closed externally (TP/SL hit)
+                            if updated_pos.status != original_pos.status:
+                                position_repo.update_position(updated_pos)
+                                closed_count += 1
+                                logger.info(
+                                    f"Position {updated_pos.position_id} closed: "
+                                    f"{updated_pos.status.value}",
+                                    extra={
+                                        "position_id": updated_pos.position_id,
+                                        "symbol": updated_pos.symbol,
+                                        "status": updated_pos.status.value,
+                                    },
+                                )
 
-                            # Send trade close notification with PnL
-                            if (
-                                updated_pos.status == TradeStatus.CLOSED
-                                and updated_pos.exit_fill_price
-                            ):
-                                # Fetch associated signal for thread_id
-                                signal_for_pos = repo.get_by_id(updated_pos.signal_id)
-                                if signal_for_pos:
-                                    # Use pre-calculated PnL from sync_position_status()
-                                    pnl_usd = updated_pos.realized_pnl_usd
-                                    pnl_pct = updated_pos.realized_pnl_pct
-
-                                    # Format duration from pre-calculated seconds
-                                    duration_str = "N/A"
-                                    if updated_pos.trade_duration_seconds:
-                                        hours, remainder = divmod(
-                                            updated_pos.trade_duration_seconds, 3600
+                                # Send trade close notification with PnL
+                                if (
+                                    updated_pos.status == TradeStatus.CLOSED
+                                    and updated_pos.exit_fill_price
+                                ):
+                                    # Fetch associated signal for thread_id
+                                    signal_for_pos = repo.get_by_id(updated_pos.signal_id)
+                                    if signal_for_pos:
+                                        # Use pre-calculated PnL from sync_position_status()
+                                        pnl_usd = updated_pos.realized_pnl_usd
+                                        pnl_pct = updated_pos.realized_pnl_pct
+
+                                        # Format duration from pre-calculated seconds
+                                        duration_str = "N/A"
+                                        if updated_pos.trade_duration_seconds:
+                                            hours, remainder = divmod(
+                                                updated_pos.trade_duration_seconds, 3600
+                                            )
+                                            minutes = remainder // 60
+                                            duration_str = (
+                                                f"{int(hours)}h {int(minutes)}m"
+                                            )
+
+                                        # Use actual exit reason from broker sync
+                                        exit_reason = (
+                                            updated_pos.exit_reason.value
+                                            if updated_pos.exit_reason
+                                            else "Manual Exit"
                                         )
-                                        minutes = remainder // 60
-                                        duration_str = f"{int(hours)}h {int(minutes)}m"
-
-                                    # Use actual exit reason from broker sync
-                                    exit_reason = (
-                                        updated_pos.exit_reason.value
-                                        if updated_pos.exit_reason
-                                        else "Manual Exit"
-                                    )
 
-                                    discord.send_trade_close(
-                                        signal=signal_for_pos,
-                                        position=updated_pos,
-                                        pnl_usd=pnl_usd,
-                                        pnl_pct=pnl_pct,
-                                        duration_str=duration_str,
-                                        exit_reason=exit_reason,
+                                        discord.send_trade_close(
+                                            signal=signal_for_pos,
+                                            position=updated_pos,
+                                            pnl_usd=pnl_usd,
+                                            pnl_pct=pnl_pct,
+                                            duration_str=duration_str,
+                                            exit_reason=exit_reason,
+                                        )
+                            elif updated_pos != original_pos:
+                                # Any field changed (leg IDs, qty, entry_fill_price, etc.)
+                                position_repo.update_position(updated_pos)
+                                synced_count += 1
+
+                                # Log what changed for debugging
+                                changes = []
+                                if updated_pos.tp_order_id != pos.tp_order_id:
+                                    changes.append(f"TP={updated_pos.tp_order_id}")
+                                if updated_pos.sl_order_id != pos.sl_order_id:
+                                    changes.append(f"SL={updated_pos.sl_order_id}")
+                                if updated_pos.filled_at != pos.filled_at:
+                                    changes.append(f"filled_at={updated_pos.filled_at}")
+                                if updated_pos.entry_fill_price != pos.entry_fill_price:
+                                    changes.append(
+                                        f"entry_fill_price={updated_pos.entry_fill_price}"
+                                    )
+                                if updated_pos.failed_reason != pos.failed_reason:
+                                    changes.append(
+                                        f"failed_reason={updated_pos.failed_reason}"
                                     )
-                        elif updated_pos != original_pos:
-                            # Any field changed (leg IDs, qty, entry_fill_price, etc.)
-                            position_repo.update_position(updated_pos)
-                            synced_count += 1
-
-                            # Log what changed for debugging
-                            changes = []
-                            if updated_pos.tp_order_id != pos.tp_order_id:
-                                changes.append(f"TP={updated_pos.tp_order_id}")
-                            if updated_pos.sl_order_id != pos.sl_order_id:
-                                changes.append(f"SL={updated_pos.sl_order_id}")
-                            if updated_pos.filled_at != pos.filled_at:
-                                changes.append(f"filled_at={updated_pos.filled_at}")
-                            if updated_pos.entry_fill_price != pos.entry_fill_price:
-                                changes.append(
-                                    f"entry_fill_price={updated_pos.entry_fill_price}"
-                                )
-                            if updated_pos.failed_reason != pos.failed_reason:
-                                changes.append(
-                                    f"failed_reason={updated_pos.failed_reason}"
-                                )
-
-                            logger.info(
-                                f"Position {updated_pos.position_id} synced: "
-                                f"{', '.join(changes) if changes else 'fields updated'}",
-                                extra={
-                                    "position_id": updated_pos.position_id,
-                                    "symbol": updated_pos.symbol,
-                                },
-                            )
 
-                            # Log slippage and commission metrics
-                            if updated_pos.entry_slippage_pct is not None:
-                                slippage_values.append(updated_pos.entry_slippage_pct)
                                 logger.info(
-                                    f"Position {updated_pos.position_id} metrics: "
-                                    f"slippage={updated_pos.entry_slippage_pct:+.3f}%, "
-                                    f"commission=${updated_pos.commission:.2f}",
+                                    f"Position {updated_pos.position_id} synced: "
+                                    f"{', '.join(changes) if changes else 'fields updated'}",
                                     extra={
                                         "position_id": updated_pos.position_id,
                                         "symbol": updated_pos.symbol,
-                                        "entry_slippage_pct": updated_pos.entry_slippage_pct,
-                                        "commission": updated_pos.commission,
                                     },
                                 )
 
-                    except Exception as e:
-                        logger.warning(
-                            f"Failed to sync position {pos.position_id}: {e}",
-                            extra={"position_id": pos.position_id},
-                        )
-                        metrics.record_failure("position_sync_single", 0)
+                                # Log slippage and commission metrics
+                                if updated_pos.entry_slippage_pct is not None:
+                                    slippage_values.append(updated_pos.entry_slippage_pct)
+                                    logger.info(
+                                        f"Position {updated_pos.position_id} metrics: "
+                                        f"slippage={updated_pos.entry_slippage_pct:+.3f}%, "
+                                        f"commission=${updated_pos.commission:.2f}",
+                                        extra={
+                                            "position_id": updated_pos.position_id,
+                                            "symbol": updated_pos.symbol,
+                                            "entry_slippage_pct": updated_pos.entry_slippage_pct,
+                                            "commission": updated_pos.commission,
+                                        },
+                                    )
+
+                        except Exception as e:
+                            logger.warning(
+                                f"Failed to sync position {pos.position_id}: {e}",
+                                extra={"position_id": pos.position_id},
+                            )
+                            metrics.record_failure("position_sync_single", 0)
 
                 sync_duration = time.time() - sync_start
+                phase_durations.labels(phase="position_sync").set(sync_duration)
                 logger.info(
                     f"Position sync complete: {synced_count} updated, "
                     f"{closed_count} closed",
@@ -1560,11 +1533,20 @@ def main(
                     },
                 )
             except Exception as e:
+                sync_span.record_error(e)
                 logger.error(f"Position sync failed: {e}", exc_info=True)
                 metrics.record_failure("position_sync", time.time() - sync_start)
+            finally:
+                sync_span.end()
+
+        # Join background startup jobs before reporting
+        set_profile_phase("background_jobs")
+        with tracer.span("scheduler.wait_all"):
+            scheduler.wait_all()
 
         # Display Rich execution summary table
         total_duration = time.time() - app_start_time
+        phase_durations.labels(phase="total").set(total_duration)
         console.print()  # Empty line for spacing
 
         # Calculate average slippage from position sync (if available)
@@ -1584,6 +1566,10 @@ def main(
 
         # Log detailed metrics (also uses Rich table now)
         metrics.log_summary(logger)
+        export_metrics(
+            path=settings.METRICS_EXPORT_PATH,
+            log_series=bool(settings.ENABLE_GCP_LOGGING),
+        )
 
         if shutdown_requested:
             logger.info("Signal generation cycle interrupted by shutdown request.")
@@ -1606,7 +1592,25 @@ def main(
 
     except Exception as e:
         logger.critical(f"Fatal error in main application loop: {e}", exc_info=True)
+        if run_span is not None:
+            run_span.record_error(e)
         sys.exit(1)
+    finally:
+        if order_event_source is not None:
+            order_event_source.stop()
+        if release_job_lock is not None:
+            release_job_lock()
+        if settings.PROFILE_DIR:
+            stop_profiler(
+                settings.PROFILE_DIR, settings.PROFILE_FORMAT, "signal_generator"
+            )
+        if run_span is not None:
+            run_span.end()
+            export_trace(
+                settings.TRACE_EXPORT_DIR,
+                settings.TRACE_EXPORT_FORMAT,
+                "signal_generator",
+            )
 
 
 if __name__ == "__main__":
@@ -24,6 +24,7 @@ from alpaca.data.timeframe import TimeFrame
 from crypto_signals.config import get_settings
 from crypto_signals.domain.schemas import AssetClass
 from crypto_signals.market.exceptions import MarketDataError
+from crypto_signals.metrics import track_api_call
 from crypto_signals.observability import log_api_error
 
 # Configure joblib memory cache
@@ -186,13 +187,15 @@ class MarketDataProvider:
         try:
             if asset_class == AssetClass.CRYPTO:
                 crypto_req = CryptoLatestTradeRequest(symbol_or_symbols=symbol)
-                trade = self.crypto_client.get_crypto_latest_trade(crypto_req)
+                with track_api_call("alpaca", "get_crypto_latest_trade"):
+                    trade = self.crypto_client.get_crypto_latest_trade(crypto_req)
                 if trade and symbol in trade:
                     price = trade[symbol].price
 
             elif asset_class == AssetClass.EQUITY:
                 stock_req = StockLatestTradeRequest(symbol_or_symbols=symbol)
-                trade = self.stock_client.get_stock_latest_trade(stock_req)
+                with track_api_call("alpaca", "get_stock_latest_trade"):
+                    trade = self.stock_client.get_stock_latest_trade(stock_req)
                 if trade and symbol in trade:
                     price = trade[symbol].price
             else:
@@ -242,7 +245,8 @@ def _fetch_bars_core(
                 start=start_dt,
                 end=end_dt,
             )
-            bars = crypto_client.get_crypto_bars(crypto_req)
+            with track_api_call("alpaca", "get_crypto_bars"):
+                bars = crypto_client.get_crypto_bars(crypto_req)
         elif asset_class == AssetClass.EQUITY:
             # Stock Request
             stock_req = StockBarsRequest(
@@ -252,7 +256,8 @@ def _fetch_bars_core(
                 end=end_dt,
                 adjustment=Adjustment.SPLIT,  # Adjust for splits
             )
-            bars = stock_client.get_stock_bars(stock_req)
+            with track_api_call("alpaca", "get_stock_bars"):
+                bars = stock_client.get_stock_bars(stock_req)
         else:
             raise MarketDataError(f"Unsupported asset class: {asset_class}")
 
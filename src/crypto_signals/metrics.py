@@ -0,0 +1,574 @@
+"""
+Metrics Registry.
+
+Process-wide counters, gauges and latency histograms with labeled series
+(per symbol, phase, API endpoint), exported as OpenMetrics text (file or
+``/metrics`` endpoint) and as structured log entries for Cloud Monitoring
+log-based metrics.
+
+Recording is cheap enough for hot paths:
+- Counters and histograms are sharded per thread. Each thread updates its own
+  shard without locking; shards are only merged when the registry is read.
+- Histograms use log-linear (HDR-style) buckets: 16 sub-buckets per power of
+  two bound the relative error of p50/p95/p99 to ~4.4% with no per-sample
+  allocation and O(buckets) quantile queries at export time.
+
+Usage:
+    >>> registry = get_metrics_registry()
+    >>> fills = registry.counter("orders_filled", "Filled orders", ["asset_class"])
+    >>> fills.labels(asset_class="CRYPTO").inc()
+    >>> with track_api_call("alpaca", "get_order"):
+    ...     client.get_order_by_id(order_id)
+    >>> registry.write_openmetrics("metrics.prom")
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from crypto_signals.tracing import SPAN_KIND_CLIENT, get_tracer
+
+# Histogram resolution: sub-buckets per power of two and the smallest value
+# resolved (1 microsecond when observing seconds)
+HISTOGRAM_SUB_BUCKETS = 16
+HISTOGRAM_MIN_VALUE = 1e-6
+EXPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Standard series fed by observability helpers and API call sites
+OPERATION_DURATION = "operation_duration_seconds"
+API_CALL_DURATION = "api_call_duration_seconds"
+API_CALLS = "api_calls"
+RATE_LIMITER_WAIT = "rate_limiter_wait_seconds"
+SYMBOL_DURATION = "symbol_duration_seconds"
+PHASE_DURATION = "phase_duration_seconds"
+ORDER_FILL_WAIT = "order_fill_wait_seconds"
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+
+def _bucket_index(value: float) -> int:
+    """Log-linear bucket holding ``value`` (bucket 0 collects <= min value)."""
+    if value <= HISTOGRAM_MIN_VALUE:
+        return 0
+    return int(math.log2(value / HISTOGRAM_MIN_VALUE) * HISTOGRAM_SUB_BUCKETS) + 1
+
+
+def _bucket_upper_bound(index: int) -> float:
+    """Upper bound of a bucket returned by ``_bucket_index``."""
+    return HISTOGRAM_MIN_VALUE * 2 ** (index / HISTOGRAM_SUB_BUCKETS)
+
+
+class _Sharded:
+    """Per-thread shards merged on read; writers never contend on a lock."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Any] = []
+        self._shards_lock = threading.Lock()
+
+    def _new_shard(self) -> Any:
+        raise NotImplementedError
+
+    def _shard(self) -> Any:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._new_shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _all_shards(self) -> List[Any]:
+        with self._shards_lock:
+            return list(self._shards)
+
+
+class Counter(_Sharded):
+    """Monotonic counter series."""
+
+    def _new_shard(self) -> List[float]:
+        return [0.0]
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment by ``amount`` (must be non-negative)."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        self._shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        """Sum over all thread shards."""
+        return sum(shard[0] for shard in self._all_shards())
+
+
+class Gauge:
+    """Last-value series (set/inc/dec)."""
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def set(self, value: float) -> None:
+        """Set the current value."""
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the current value."""
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the current value."""
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        """Current value."""
+        return self._value
+
+
+class _HistogramShard:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: Dict[int, int] = {}
+
+
+@dataclass
+class HistogramSnapshot:
+    """Merged view of a histogram series."""
+
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    buckets: Dict[int, int] = field(default_factory=dict)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the ``q`` quantile (0-1) from the bucket counts.
+
+        Returns the upper bound of the bucket holding the rank, clamped to the
+        observed min/max, or None for an empty histogram.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(_bucket_upper_bound(index), self.min), self.max)
+        return self.max
+
+
+class Histogram(_Sharded):
+    """Latency/size distribution series with HDR-style buckets."""
+
+    def _new_shard(self) -> _HistogramShard:
+        return _HistogramShard()
+
+    def observe(self, value: float) -> None:
+        """Record one sample."""
+        shard = self._shard()
+        shard.count += 1
+        shard.total += value
+        if value < shard.min:
+            shard.min = value
+        if value > shard.max:
+            shard.max = value
+        index = _bucket_index(value)
+        shard.buckets[index] = shard.buckets.get(index, 0) + 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall-clock duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Merge all thread shards."""
+        merged = HistogramSnapshot()
+        for shard in self._all_shards():
+            # dict.copy() is atomic under the GIL; the owner may be writing
+            buckets = shard.buckets.copy()
+            merged.count += shard.count
+            merged.total += shard.total
+            merged.min = min(merged.min, shard.min)
+            merged.max = max(merged.max, shard.max)
+            for index, count in buckets.items():
+                merged.buckets[index] = merged.buckets.get(index, 0) + count
+        return merged
+
+
+_SERIES_TYPES = {COUNTER: Counter, GAUGE: Gauge, HISTOGRAM: Histogram}
+
+
+class MetricFamily:
+    """A named metric and its labeled series."""
+
+    def __init__(
+        self, name: str, documentation: str, kind: str, labelnames: Sequence[str]
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._series_type = _SERIES_TYPES[kind]
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: Any) -> Any:
+        """
+        Return the series for a label set, creating it on first use.
+
+        Raises:
+            ValueError: If the label names do not match the family's.
+        """
+        if len(labels) != len(self.labelnames) or set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {list(self.labelnames)}, "
+                f"got {sorted(labels)}"
+            )
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._series_type())
+        return child
+
+    def series(self) -> List[Tuple[Dict[str, str], Any]]:
+        """All (labels, series) pairs in creation order."""
+        with self._lock:
+            items = list(self._children.items())
+        return [(dict(zip(self.labelnames, key, strict=True)), s) for key, s in items]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    pairs = {**labels, **extra}
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs.items())
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Process-wide collection of metric families."""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str = "", labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        """Get or create a counter family (exported as ``<name>_total``)."""
+        return self._family(name, documentation, COUNTER, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str = "", labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        """Get or create a gauge family."""
+        return self._family(name, documentation, GAUGE, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str = "", labelnames: Sequence[str] = ()
+    ) -> MetricFamily:
+        """Get or create a histogram family (exported as a p50/p95/p99 summary)."""
+        return self._family(name, documentation, HISTOGRAM, labelnames)
+
+    def _family(
+        self, name: str, documentation: str, kind: str, labelnames: Sequence[str]
+    ) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.get(name)
+                if family is None:
+                    family = MetricFamily(name, documentation, kind, labelnames)
+                    self._families[name] = family
+        if family.kind != kind or family.labelnames != tuple(labelnames):
+            raise ValueError(
+                f"Metric {name} already registered as {family.kind} "
+                f"with labels {list(family.labelnames)}"
+            )
+        return family
+
+    def collect(self) -> List[MetricFamily]:
+        """Registered families sorted by name."""
+        with self._lock:
+            return sorted(self._families.values(), key=lambda f: f.name)
+
+    def reset(self) -> None:
+        """Drop every family (tests and per-job isolation)."""
+        with self._lock:
+            self._families.clear()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Flat, JSON-ready view of every series.
+
+        Histograms report count/sum/min/max and p50/p95/p99.
+        """
+        rows: List[Dict[str, Any]] = []
+        for family in self.collect():
+            for labels, series in family.series():
+                row: Dict[str, Any] = {
+                    "metric": family.name,
+                    "kind": family.kind,
+                    "labels": labels,
+                }
+                if family.kind == HISTOGRAM:
+                    snap = series.snapshot()
+                    if not snap.count:
+                        continue
+                    row.update(
+                        count=snap.count,
+                        sum=snap.total,
+                        min=snap.min,
+                        max=snap.max,
+                        **{
+                            f"p{round(q * 100)}": snap.quantile(q)
+                            for q in EXPORT_QUANTILES
+                        },
+                    )
+                else:
+                    row["value"] = series.value
+                rows.append(row)
+        return rows
+
+    def render_openmetrics(self) -> str:
+        """Render all families in the OpenMetrics text exposition format."""
+        lines: List[str] = []
+        for family in self.collect():
+            kind = "summary" if family.kind == HISTOGRAM else family.kind
+            lines.append(f"# TYPE {family.name} {kind}")
+            if family.documentation:
+                lines.append(f"# HELP {family.name} {family.documentation}")
+            for labels, series in family.series():
+                if family.kind == COUNTER:
+                    lines.append(
+                        f"{family.name}_total{_format_labels(labels)} "
+                        f"{_format_value(series.value)}"
+                    )
+                elif family.kind == GAUGE:
+                    lines.append(
+                        f"{family.name}{_format_labels(labels)} "
+                        f"{_format_value(series.value)}"
+                    )
+                else:
+                    snap = series.snapshot()
+                    for q in EXPORT_QUANTILES:
+                        value = snap.quantile(q)
+                        lines.append(
+                            f"{family.name}{_format_labels(labels, quantile=str(q))} "
+                            f"{_format_value(math.nan if value is None else value)}"
+                        )
+                    lines.append(
+                        f"{family.name}_sum{_format_labels(labels)} "
+                        f"{_format_value(snap.total)}"
+                    )
+                    lines.append(
+                        f"{family.name}_count{_format_labels(labels)} {snap.count}"
+                    )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_openmetrics(self, path: str) -> None:
+        """Atomically write the OpenMetrics text to ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render_openmetrics())
+        os.replace(tmp_path, path)
+
+    def log_snapshot(self, logger_instance: Any = logger) -> int:
+        """
+        Emit one structured log entry per series for Cloud Monitoring.
+
+        Entries carry ``metric_type: "metric_series"`` so log-based metrics can
+        extract the value (or percentiles) per metric name and label set.
+
+        Returns:
+            Number of series logged.
+        """
+        rows = self.snapshot()
+        for row in rows:
+            logger_instance.info(
+                f"Metric {row['metric']}",
+                extra={"metric_type": "metric_series", **row},
+            )
+        return len(rows)
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _registry
+
+
+# =============================================================================
+# STANDARD SERIES
+# =============================================================================
+
+
+def observe_operation(operation: str, duration: float, outcome: str = "success") -> None:
+    """Record a timed operation (fed by log_execution_time, timed, MetricsCollector)."""
+    _registry.histogram(
+        OPERATION_DURATION,
+        "Duration of timed operations",
+        ("operation", "outcome"),
+    ).labels(operation=operation, outcome=outcome).observe(duration)
+
+
+@contextmanager
+def track_api_call(service: str, endpoint: str) -> Iterator[None]:
+    """
+    Time one external API call into the per-endpoint latency histogram.
+
+    Also opens a client span ``<service>.<endpoint>`` when a trace is active.
+
+    Args:
+        service: API family (e.g. "alpaca", "firestore").
+        endpoint: Operation name within the service.
+    """
+    outcome = "success"
+    span = get_tracer().start_span(
+        f"{service}.{endpoint}", SPAN_KIND_CLIENT, service=service, endpoint=endpoint
+    )
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        outcome = "error"
+        span.record_error(e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        span.end()
+        _registry.histogram(
+            API_CALL_DURATION,
+            "Latency of external API calls",
+            ("service", "endpoint"),
+        ).labels(service=service, endpoint=endpoint).observe(elapsed)
+        _registry.counter(
+            API_CALLS,
+            "External API calls by outcome",
+            ("service", "endpoint", "outcome"),
+        ).labels(service=service, endpoint=endpoint, outcome=outcome).inc()
+
+
+def api_call(service: str, endpoint: Optional[str] = None) -> Callable[..., Any]:
+    """Decorator form of ``track_api_call`` (endpoint defaults to the qualified name)."""
+
+    def decorator(func):
+        name = endpoint or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_api_call(service, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+
+def export_metrics(path: Optional[str] = None, log_series: bool = False) -> None:
+    """
+    End-of-job export; failures are logged, never raised.
+
+    Args:
+        path: Write OpenMetrics text here if set.
+        log_series: Emit per-series log entries for Cloud Monitoring.
+    """
+    try:
+        if path:
+            _registry.write_openmetrics(path)
+            logger.info(f"Metrics written to {path}")
+        if log_series:
+            _registry.log_snapshot()
+    except Exception as e:
+        logger.warning(f"Metrics export failed: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = _registry
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render_openmetrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silence the default stderr access log."""
+        pass
+
+
+def start_metrics_server(
+    port: int, host: str = "0.0.0.0", registry: Optional[MetricsRegistry] = None
+) -> ThreadingHTTPServer:
+    """
+    Serve ``/metrics`` from a daemon thread for scraping during long runs.
+
+    Returns:
+        The running server (call ``shutdown()`` to stop it).
+    """
+    handler = type(
+        "MetricsHandler", (_MetricsHandler,), {"registry": registry or _registry}
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-http", daemon=True
+    ).start()
+    logger.info(
+        f"Metrics endpoint listening on http://{host}:{server.server_port}/metrics"
+    )
+    return server
@@ -17,6 +17,7 @@ from crypto_signals.domain.schemas import (
     Signal,
     TradeType,
 )
+from crypto_signals.metrics import api_call
 from loguru import logger
 
 # =============================================================================
@@ -183,6 +184,7 @@ class DiscordClient:
         pattern_display = signal.pattern_name.replace("_", " ").title()
         return f"{emoji} {signal.symbol} {pattern_display}"
 
+    @api_call("discord")
     def find_thread_by_signal_id(
         self, signal_id: str, symbol: str, asset_class: AssetClass
     ) -> str | None:
@@ -276,6 +278,7 @@ class DiscordClient:
             logger.error(f"Failed to search Discord threads: {e}")
             return None
 
+    @api_call("discord")
     def send_signal(
         self,
         payload_or_signal: Signal | NotificationPayload,
@@ -372,6 +375,7 @@ class DiscordClient:
             logger.error(f"Failed to send Discord notification: {str(e)}")
             return None
 
+    @api_call("discord")
     def send_message(
         self,
         content: str,
@@ -878,6 +882,7 @@ class DiscordClient:
     # SHADOW SIGNAL ROUTING
     # =========================================================================
 
+    @api_call("discord")
     def send_shadow_signal(self, signal: Signal) -> bool:
         """Send a rejected signal to the shadow signals Discord channel.
 
@@ -12,11 +12,15 @@ Key Features:
 - Structured tables for execution summaries
 """
 
+import atexit
+import os
+import signal
 import threading
 import time
+from collections import deque
 from contextlib import contextmanager
 from functools import wraps
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
 from loguru import logger
 from rich import traceback as rich_traceback
@@ -33,6 +37,9 @@ from rich.progress import (
 from rich.table import Table
 from rich.theme import Theme
 
+from crypto_signals.metrics import observe_operation
+from crypto_signals.tracing import get_tracer
+
 # =============================================================================
 # RICH CONFIGURATION
 # =============================================================================
@@ -180,6 +187,224 @@ def _sanitize_extra_context(extra: Dict[str, Any]) -> Dict[str, Any]:
     return {key: _serialize_for_json(value) for key, value in extra.items()}
 
 
+# Buffered sink defaults: ~2s or 500 entries per write, at most 10k buffered
+GCP_LOG_BUFFER_CAPACITY = 10_000
+GCP_LOG_BATCH_SIZE = 500
+GCP_LOG_FLUSH_INTERVAL_SECONDS = 2.0
+# Bounded so a stuck API call cannot hold up shutdown past Cloud Run's grace period
+GCP_LOG_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+
+
+class BufferedGcpSink:
+    """
+    Non-blocking Loguru sink that ships logs to GCP Cloud Logging in batches.
+
+    The logging call only snapshots the record into a bounded ring buffer;
+    payload sanitization and the API write happen on a background flusher
+    thread using ``Logger.batch()`` (one ``entries.write`` per batch).
+
+    - Flushes when ``batch_size`` entries are buffered or every
+      ``flush_interval`` seconds, whichever comes first.
+    - When the buffer is full the OLDEST entry is dropped (``dropped``).
+    - ``flush()``/``close()`` drain the buffer (wired to atexit and SIGTERM by
+      setup_gcp_logging).
+    - Write failures are counted (``failed``) and never raised to the caller.
+    """
+
+    def __init__(
+        self,
+        gcp_logger: Any,
+        capacity: int = GCP_LOG_BUFFER_CAPACITY,
+        batch_size: int = GCP_LOG_BATCH_SIZE,
+        flush_interval: float = GCP_LOG_FLUSH_INTERVAL_SECONDS,
+    ):
+        """
+        Start the background flusher.
+
+        Args:
+            gcp_logger: ``google.cloud.logging`` Logger to write to.
+            capacity: Maximum buffered entries before dropping the oldest.
+            batch_size: Entries per API write (also the size-based flush trigger).
+            flush_interval: Maximum seconds an entry waits before a flush.
+        """
+        self.gcp_logger = gcp_logger
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._buffer: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        # Reentrant: the SIGTERM handler flushes on the main thread, which may
+        # have been interrupted inside __call__ or flush() holding either lock
+        self._lock = threading.RLock()
+        self._flush_lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+        # Counters (read via stats())
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self.max_queue_delay_ms = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, name="gcp-log-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: Any) -> None:
+        """Loguru sink entry point: enqueue a snapshot of the record."""
+        record = message.record
+        entry = {
+            "message": record["message"],
+            "level": record["level"].name,
+            "time": record["time"],
+            "module": record["module"],
+            "function": record["function"],
+            "line": record["line"],
+            "extra": dict(record["extra"]) if record["extra"] else None,
+        }
+        with self._lock:
+            if len(self._buffer) >= self.capacity:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append((time.monotonic(), entry))
+            self.enqueued += 1
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    @staticmethod
+    def _build_payload(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Structured jsonPayload for one buffered record."""
+        payload = {
+            "message": entry["message"],
+            "level": entry["level"],
+            "timestamp": entry["time"].isoformat(),
+            "module": entry["module"],
+            "function": entry["function"],
+            "line": entry["line"],
+        }
+        # Merge sanitized extra context (symbol, qty, pnl_usd, asset_class, etc.)
+        # Sanitization ensures all values are JSON-serializable
+        if entry["extra"]:
+            payload.update(_sanitize_extra_context(entry["extra"]))
+        return payload
+
+    def _take_batch(self) -> List[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self, timeout: Optional[float] = None) -> int:
+        """
+        Write every buffered entry now.
+
+        Args:
+            timeout: Max seconds to wait for an in-progress flush (None = wait).
+
+        Returns:
+            int: Entries written successfully.
+        """
+        acquired = (
+            self._flush_lock.acquire()
+            if timeout is None
+            else self._flush_lock.acquire(timeout=timeout)
+        )
+        if not acquired:
+            return 0
+        written = 0
+        try:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return written
+                start = time.monotonic()
+                self.max_queue_delay_ms = max(
+                    self.max_queue_delay_ms, (start - batch[0][0]) * 1000
+                )
+                try:
+                    gcp_batch = self.gcp_logger.batch()
+                    for _, entry in batch:
+                        gcp_batch.log_struct(
+                            self._build_payload(entry),
+                            severity=LOGURU_TO_GCP_SEVERITY.get(
+                                entry["level"], "DEFAULT"
+                            ),
+                        )
+                    gcp_batch.commit()
+                except Exception:
+                    # Never raise into the app; the Rich sink still has these logs
+                    self.failed += len(batch)
+                    continue
+                finally:
+                    self.last_flush_ms = (time.monotonic() - start) * 1000
+                    self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+                self.batches += 1
+                self.sent += len(batch)
+                written += len(batch)
+        finally:
+            self._flush_lock.release()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            if self._stopped.is_set():
+                return
+
+    def close(self, timeout: float = GCP_LOG_SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Stop the flusher after a final drain (bounded by ``timeout``)."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Drop/latency counters for diagnostics."""
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+            "batches": self.batches,
+            "buffered": buffered,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+            "max_queue_delay_ms": self.max_queue_delay_ms,
+        }
+
+
+def _flush_on_sigterm(sink: BufferedGcpSink) -> None:
+    """
+    Flush the sink on SIGTERM, then defer to the previous handler.
+
+    The flusher keeps running (the app may log during graceful shutdown);
+    atexit performs the final close. Only possible from the main thread; the
+    sink's locks are reentrant because the interrupted frame may hold them.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handler(signum, frame):
+        sink.flush(timeout=GCP_LOG_SHUTDOWN_TIMEOUT_SECONDS)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+    signal.signal(signal.SIGTERM, handler)
+
+
 def setup_gcp_logging(log_name: str = "crypto-sentinel") -> bool:
     """
     Configure Google Cloud Logging sink for production environments.
@@ -199,9 +424,9 @@ def setup_gcp_logging(log_name: str = "crypto-sentinel") -> bool:
       logging failures from crashing the application.
 
     **Performance Note:**
-    The google-cloud-logging library uses background threads and batching
-    by default when using the Client() API. Log messages are queued and
-    sent asynchronously, minimizing impact on application latency.
+    ``Logger.log_struct`` is a synchronous API call, so records go through a
+    BufferedGcpSink: logging only enqueues, and a background thread writes
+    batches. The buffer is flushed on exit and on SIGTERM.
 
     Args:
         log_name: The log name in GCP Cloud Logging (default: "crypto-sentinel")
@@ -223,43 +448,12 @@ def setup_gcp_logging(log_name: str = "crypto-sentinel") -> bool:
         )
         return False
 
-    def gcp_sink(message) -> None:
-        """
-        Loguru sink that sends structured logs to GCP Cloud Logging.
-
-        Preserves all extra context fields as searchable jsonPayload fields.
-        Exceptions are caught to prevent logging failures from crashing the app.
-        """
-        try:
-            record = message.record
-            severity = LOGURU_TO_GCP_SEVERITY.get(record["level"].name, "DEFAULT")
-
-            # Build structured payload with core fields
-            payload = {
-                "message": record["message"],
-                "level": record["level"].name,
-                "timestamp": record["time"].isoformat(),
-                "module": record["module"],
-                "function": record["function"],
-                "line": record["line"],
-            }
-
-            # Merge sanitized extra context (symbol, qty, pnl_usd, asset_class, etc.)
-            # Sanitization ensures all values are JSON-serializable
-            if record["extra"]:
-                sanitized_extra = _sanitize_extra_context(record["extra"])
-                payload.update(sanitized_extra)
-
-            # Send to GCP Cloud Logging with mapped severity
-            # This uses the library's built-in background batching
-            gcp_logger.log_struct(payload, severity=severity)
-        except Exception:
-            # Silently ignore logging failures to prevent cascading errors
-            # The Rich terminal sink will still capture these logs
-            pass
+    sink = BufferedGcpSink(gcp_logger)
+    atexit.register(sink.close)
+    _flush_on_sigterm(sink)
 
     # Add GCP sink - this is ADDITIVE, does NOT remove Rich sink
-    logger.add(gcp_sink, format="{message}", level="DEBUG")
+    logger.add(sink, format="{message}", level="DEBUG")
     logger.info("GCP Cloud Logging sink initialized", extra={"log_name": log_name})
     return True
 
@@ -589,6 +783,7 @@ def log_execution_time(logger_instance: Any, operation: str, **context):
     context_str = " | ".join(f"{k}={v}" for k, v in context.items()) if context else ""
     full_context = f" | {context_str}" if context_str else ""
 
+    span = get_tracer().start_span(operation, **context)
     start_time = time.time()
     logger_instance.info(f"Starting: {operation}{full_context}")
 
@@ -596,6 +791,8 @@ def log_execution_time(logger_instance: Any, operation: str, **context):
         yield
     except Exception as e:
         elapsed = time.time() - start_time
+        span.record_error(e)
+        observe_operation(operation, elapsed, outcome="failure")
         msg = f"Failed: {operation} | duration={elapsed:.2f}s{full_context} | error={str(e)}"
 
         if hasattr(logger_instance, "opt"):  # Loguru
@@ -611,9 +808,12 @@ def log_execution_time(logger_instance: Any, operation: str, **context):
         raise
     else:
         elapsed = time.time() - start_time
+        observe_operation(operation, elapsed)
         logger_instance.info(
             f"Completed: {operation} | duration={elapsed:.2f}s{full_context}"
         )
+    finally:
+        span.end()
 
 
 def timed(operation_name: Optional[str] = None) -> Callable[..., Any]:
@@ -626,20 +826,26 @@ def timed(operation_name: Optional[str] = None) -> Callable[..., Any]:
 
         @wraps(func)
         def wrapper(*args, **kwargs):
+            span = get_tracer().start_span(op_name)
             start_time = time.time()
 
             try:
                 logger.info(f"Starting: {op_name}")
                 result = func(*args, **kwargs)
                 elapsed = time.time() - start_time
+                observe_operation(op_name, elapsed)
                 logger.info(f"Completed: {op_name} | duration={elapsed:.2f}s")
                 return result
             except Exception as e:
                 elapsed = time.time() - start_time
+                span.record_error(e)
+                observe_operation(op_name, elapsed, outcome="failure")
                 logger.opt(exception=True).error(
                     f"Failed: {op_name} | duration={elapsed:.2f}s | error={str(e)}"
                 )
                 raise
+            finally:
+                span.end()
 
         return wrapper
 
@@ -655,8 +861,9 @@ class MetricsCollector:
     """
     Simple metrics collector for tracking operation statistics.
 
-    This provides basic metrics tracking. For production, consider using
-    Prometheus client library or Cloud Monitoring.
+    Feeds the ``operation_duration_seconds`` histogram in the metrics registry
+    (percentiles, OpenMetrics export); this class keeps the per-run summary
+    rendered as a Rich table.
     """
 
     def __init__(self):
@@ -666,7 +873,7 @@ class MetricsCollector:
         self.risk_counts: Dict[str, int] = {}
         self.capital_protected: float = 0.0
         self.blocked_symbols: set[str] = set()
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
 
     def record_risk_block(self, gate: str, symbol: str, amount: float = 0.0):
         """
@@ -704,6 +911,7 @@ class MetricsCollector:
 
     def record_success(self, operation: str, duration: float):
         """Record successful operation."""
+        observe_operation(operation, duration)
         with self._lock:
             self._initialize_operation_metrics(operation)
             m = self.metrics[operation]
@@ -714,6 +922,7 @@ class MetricsCollector:
 
     def record_failure(self, operation: str, duration: float):
         """Record failed operation."""
+        observe_operation(operation, duration, outcome="failure")
         with self._lock:
             self._initialize_operation_metrics(operation)
             m = self.metrics[operation]
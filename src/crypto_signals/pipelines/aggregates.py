@@ -0,0 +1,573 @@
+"""
+Incremental Strategy Aggregates.
+
+Keeps ``agg_strategy_pattern_daily`` in sync with the fact tables without
+re-scanning history. After an archival pipeline merges a batch, only the
+(ds, strategy_id) groups present in that batch are recomputed from the fact
+table and upserted:
+
+    - The recompute reads only the batch's ds range (partition-pruned) and
+      the affected strategies, so its cost follows the batch size.
+    - Groups are recomputed from the fact rows (not incremented), so re-merging
+      the same records is idempotent.
+    - Rows of an affected group that no longer exist in the fact table
+      (e.g. a pattern re-label) are deleted by the same MERGE.
+    - Groups whose refresh failed are persisted (``job_metadata``) and retried
+      by the next refresh of the same source, so no group stays stale.
+
+Refresh triggers:
+    LIVE: trade_archival (new trades), fee_patch / price_patch (rewritten
+        pnl_usd / exit price) and backtest_archival (parent signals that link
+        a trade, which supply its pattern and R-multiple).
+    THEORETICAL: backtest_archival.
+
+Sources:
+    LIVE: fact_trades. Pattern and R-multiple come from the archived parent
+        signal (fact_theoretical_signals.linked_trade_id); trades without one
+        fall back to the strategy_id as pattern and a NULL R-multiple.
+    THEORETICAL: simulated P&L of fact_theoretical_signals.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from google.api_core.exceptions import NotFound
+from google.cloud import bigquery, firestore
+from loguru import logger
+
+from crypto_signals.config import get_settings
+from crypto_signals.domain.schemas import AggStrategyPatternDaily
+from crypto_signals.engine.schema_guardian import (
+    SchemaGuardian,
+    SchemaMismatchError,
+    get_schema_cache,
+)
+from crypto_signals.metrics import track_api_call
+
+AGG_TABLE_NAME = "agg_strategy_pattern_daily"
+AGG_CLUSTERING_FIELDS = ["source", "strategy_id", "pattern_name"]
+
+SOURCE_LIVE = "LIVE"
+SOURCE_THEORETICAL = "THEORETICAL"
+
+# How far before a trade's ds its parent signal may have been generated
+SIGNAL_LOOKBACK_DAYS = 90
+
+# Group filter on the source rows (alias ``f``) for keyed refreshes
+_GROUP_FILTER = (
+    "f.ds BETWEEN @ds_min AND @ds_max "
+    "AND CONCAT(CAST(f.ds AS STRING), '|', f.strategy_id) IN UNNEST(@group_keys)"
+)
+
+# Failed group keys, persisted per aggregate table and source
+PENDING_COLLECTION = "job_metadata"
+PENDING_FIELD = "pending_aggregate_groups"
+
+# Parent-signal partitions a keyed LIVE refresh may join against
+_SIGNAL_WINDOW = (
+    f"ds BETWEEN DATE_SUB(@ds_min, INTERVAL {SIGNAL_LOOKBACK_DAYS} DAY) AND @ds_max"
+)
+
+_LIVE_ROWS_SQL = """
+    SELECT
+        f.ds,
+        f.strategy_id,
+        COALESCE(sig.pattern_name, f.strategy_id) AS pattern_name,
+        f.pnl_usd,
+        f.pnl_pct,
+        SAFE_DIVIDE(
+            f.pnl_pct,
+            SAFE_DIVIDE(ABS(f.entry_price - sig.suggested_stop), f.entry_price) * 100
+        ) AS r_multiple,
+        SAFE_DIVIDE(f.max_favorable_excursion, f.entry_price) * 100 AS mfe_pct
+    FROM `{fact_table_id}` AS f
+    LEFT JOIN (
+        SELECT
+            linked_trade_id,
+            ANY_VALUE(pattern_name) AS pattern_name,
+            ANY_VALUE(suggested_stop) AS suggested_stop
+        FROM `{signals_table_id}`
+        WHERE linked_trade_id IS NOT NULL
+          AND {signal_window}
+        GROUP BY linked_trade_id
+    ) AS sig
+    ON sig.linked_trade_id = f.trade_id
+    WHERE {group_filter}
+"""
+
+_THEORETICAL_ROWS_SQL = """
+    SELECT
+        f.ds,
+        f.strategy_id,
+        f.pattern_name,
+        f.theoretical_pnl_usd AS pnl_usd,
+        f.theoretical_pnl_pct AS pnl_pct,
+        SAFE_DIVIDE(
+            f.theoretical_pnl_pct,
+            SAFE_DIVIDE(ABS(f.entry_price - f.suggested_stop), f.entry_price) * 100
+        ) AS r_multiple,
+        CAST(NULL AS FLOAT64) AS mfe_pct
+    FROM `{fact_table_id}` AS f
+    WHERE f.theoretical_pnl_usd IS NOT NULL
+      AND {group_filter}
+"""
+
+
+class PendingAggregateGroups:
+    """
+    Group keys whose refresh failed, stored in ``job_metadata/{table}``.
+
+    Keys are map entries (``pending_aggregate_groups.{source}.{key}``) written
+    with merge, so concurrent pipelines add and remove keys without a
+    read-modify-write race.
+    """
+
+    def __init__(self, firestore_client: Any, table_id: str):
+        """
+        Initialize the store.
+
+        Args:
+            firestore_client: Firestore client of the owning pipeline.
+            table_id: Full aggregate table ID (its table name is the document ID).
+        """
+        self.firestore_client = firestore_client
+        self.doc_id = table_id.rsplit(".", 1)[-1]
+
+    def _doc_ref(self) -> Any:
+        return self.firestore_client.collection(PENDING_COLLECTION).document(self.doc_id)
+
+    def load(self, source: str) -> List[str]:
+        """Pending keys of a source (empty if none or unreadable)."""
+        try:
+            snapshot = self._doc_ref().get()
+            data = snapshot.to_dict() if snapshot.exists else None
+            pending = ((data or {}).get(PENDING_FIELD) or {}).get(source) or {}
+        except Exception as e:
+            logger.warning(f"Could not load pending aggregate groups: {e}")
+            return []
+        return sorted(pending) if isinstance(pending, dict) else []
+
+    def add(self, source: str, keys: Sequence[str]) -> None:
+        """Record keys to retry."""
+        if keys:
+            self._write(source, {key: True for key in keys})
+
+    def remove(self, source: str, keys: Sequence[str]) -> None:
+        """Forget keys that have been refreshed."""
+        if keys:
+            self._write(source, {key: firestore.DELETE_FIELD for key in keys})
+
+    def _write(self, source: str, entries: Dict[str, Any]) -> None:
+        self._doc_ref().set({PENDING_FIELD: {source: entries}}, merge=True)
+
+
+class StrategyAggregateRefresher:
+    """Recomputes affected agg_strategy_pattern_daily groups from one fact table."""
+
+    def __init__(
+        self,
+        bq_client: bigquery.Client,
+        guardian: SchemaGuardian,
+        table_id: str,
+        source: str,
+        rows_sql: str,
+        auto_migrate: bool = True,
+        fact_table_id: Optional[str] = None,
+        link_column: Optional[str] = None,
+        pending: Optional[PendingAggregateGroups] = None,
+    ):
+        """
+        Initialize the refresher.
+
+        Args:
+            bq_client: BigQuery client of the owning pipeline.
+            guardian: SchemaGuardian used to create/validate the aggregate table.
+            table_id: Full aggregate table ID (project.dataset.table).
+            source: Source label stored on every row (LIVE / THEORETICAL).
+            rows_sql: Per-trade source query with ``{group_filter}`` (and
+                optionally ``{signal_window}``) placeholders; must select ds,
+                strategy_id, pattern_name, pnl_usd, pnl_pct, r_multiple and
+                mfe_pct from alias ``f``.
+            auto_migrate: Create/migrate the aggregate table when missing or
+                out of date (mirrors SCHEMA_MIGRATION_AUTO).
+            fact_table_id: Source fact table (``trade_id``, ``ds``,
+                ``strategy_id``); required with ``link_column``.
+            link_column: When set, refresh() rows are not fact rows but rows
+                referencing fact ``trade_id`` through this column; their groups
+                are looked up in the fact table.
+            pending: Store for failed group keys (None = failures only logged).
+        """
+        self.bq_client = bq_client
+        self.guardian = guardian
+        self.table_id = table_id
+        self.source = source
+        self.rows_sql = rows_sql
+        self.auto_migrate = auto_migrate
+        self.fact_table_id = fact_table_id
+        self.link_column = link_column
+        self.pending = pending
+        self._table_ready = False
+        # Pending keys are loaded once and retried with the first refresh
+        self._pending_loaded = False
+
+    @staticmethod
+    def group_keys(rows: Sequence[Dict[str, Any]]) -> List[str]:
+        """Sorted ``ds|strategy_id`` keys of the groups touched by a batch."""
+        return sorted(
+            {
+                f"{row['ds']}|{row['strategy_id']}"
+                for row in rows
+                if row.get("ds") and row.get("strategy_id")
+            }
+        )
+
+    def _ensure_table(self) -> None:
+        """Validate (or create/migrate) the aggregate table once per instance."""
+        if self._table_ready:
+            return
+        try:
+            self.guardian.validate_schema(
+                table_id=self.table_id,
+                model=AggStrategyPatternDaily,
+                require_partitioning=True,
+                clustering_fields=AGG_CLUSTERING_FIELDS,
+            )
+        except (SchemaMismatchError, NotFound):
+            if not self.auto_migrate:
+                raise
+            self.guardian.migrate_schema(
+                self.table_id,
+                AggStrategyPatternDaily,
+                partition_column="ds",
+                clustering_fields=AGG_CLUSTERING_FIELDS,
+            )
+        self._table_ready = True
+
+    def _get_merge_sql(self, keyed: bool = True) -> str:
+        """
+        Generate the MERGE that recomputes and upserts aggregate groups.
+
+        Args:
+            keyed: Restrict to ``@group_keys`` within ``@ds_min..@ds_max``.
+                False recomputes every group of this source (full rebuild).
+
+        Returns:
+            str: The full MERGE SQL statement.
+        """
+        columns = list(AggStrategyPatternDaily.model_fields)
+        update_clause = ", ".join(
+            f"T.{col} = S.{col}" for col in columns if col not in ("ds", "agg_id")
+        )
+        insert_cols = ", ".join(columns)
+        insert_vals = ", ".join(f"S.{col}" for col in columns)
+
+        rows_sql = self.rows_sql.format(
+            group_filter=_GROUP_FILTER if keyed else "TRUE",
+            signal_window=_SIGNAL_WINDOW if keyed else "TRUE",
+        )
+        target_filter = (
+            "T.ds BETWEEN @ds_min AND @ds_max "
+            "AND CONCAT(CAST(T.ds AS STRING), '|', T.strategy_id) IN UNNEST(@group_keys)"
+            if keyed
+            else "TRUE"
+        )
+
+        return f"""
+            MERGE `{self.table_id}` AS T
+            USING (
+                SELECT
+                    ds,
+                    CONCAT(
+                        CAST(ds AS STRING), '|', @source, '|',
+                        strategy_id, '|', pattern_name
+                    ) AS agg_id,
+                    @source AS source,
+                    strategy_id,
+                    pattern_name,
+                    COUNT(*) AS trade_count,
+                    COUNTIF(pnl_usd > 0) AS win_count,
+                    COUNTIF(pnl_usd < 0) AS loss_count,
+                    SUM(pnl_usd) AS total_pnl_usd,
+                    SUM(IF(pnl_usd > 0, pnl_usd, 0)) AS gross_win_usd,
+                    SUM(IF(pnl_usd < 0, pnl_usd, 0)) AS gross_loss_usd,
+                    IFNULL(SUM(pnl_pct), 0) AS sum_pnl_pct,
+                    SAFE_DIVIDE(COUNTIF(pnl_usd > 0), COUNT(*)) AS win_rate,
+                    AVG(pnl_usd) AS expectancy_usd,
+                    AVG(pnl_pct) AS avg_pnl_pct,
+                    COUNT(r_multiple) AS r_count,
+                    SUM(r_multiple) AS sum_r_multiple,
+                    AVG(r_multiple) AS avg_r_multiple,
+                    COUNT(mfe_pct) AS mfe_count,
+                    SUM(mfe_pct) AS sum_mfe_pct,
+                    AVG(mfe_pct) AS avg_mfe_pct,
+                    CURRENT_TIMESTAMP() AS updated_at
+                FROM ({rows_sql})
+                GROUP BY ds, strategy_id, pattern_name
+            ) AS S
+            ON {"T.ds BETWEEN @ds_min AND @ds_max AND " if keyed else ""}T.ds = S.ds
+            AND T.agg_id = S.agg_id
+            WHEN MATCHED THEN
+                UPDATE SET {update_clause}
+            WHEN NOT MATCHED THEN
+                INSERT ({insert_cols})
+                VALUES ({insert_vals})
+            WHEN NOT MATCHED BY SOURCE
+                AND T.source = @source
+                AND {target_filter}
+            THEN DELETE
+        """
+
+    def _linked_group_keys(self, rows: Sequence[Dict[str, Any]]) -> List[str]:
+        """Group keys of the fact rows referenced by ``link_column``."""
+        assert self.link_column and self.fact_table_id
+        ids = sorted({row[self.link_column] for row in rows if row.get(self.link_column)})
+        if not ids:
+            return []
+        # A trade is never dated before the row that links it
+        ds_min = min(str(row["ds"]) for row in rows if row.get(self.link_column))
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("ds_min", "DATE", ds_min),
+                bigquery.ArrayQueryParameter("ids", "STRING", ids),
+            ]
+        )
+        query = f"""
+            SELECT DISTINCT CONCAT(CAST(ds AS STRING), '|', strategy_id) AS group_key
+            FROM `{self.fact_table_id}`
+            WHERE ds >= @ds_min AND trade_id IN UNNEST(@ids)
+        """
+        with track_api_call("bigquery", "query"):
+            result = self.bq_client.query(query, job_config=job_config).result()
+        return sorted(row["group_key"] for row in result)
+
+    def refresh(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Recompute the aggregate groups touched by a merged batch.
+
+        Args:
+            rows: Rows that were merged into (or patched in) the fact table
+                (need ``ds`` and ``strategy_id``), or linking rows when
+                ``link_column`` is set.
+
+        Returns:
+            int: Number of groups refreshed.
+
+        Raises:
+            Exception: If the refresh fails; the groups are then persisted to
+                ``pending`` and retried by the next refresh.
+        """
+        keys = (
+            self._linked_group_keys(rows) if self.link_column else self.group_keys(rows)
+        )
+        return self.refresh_groups(keys)
+
+    def retry_pending(self) -> int:
+        """Refresh previously failed groups (no-op when there are none)."""
+        return self.refresh_groups([])
+
+    def refresh_groups(self, group_keys: Sequence[str]) -> int:
+        """
+        Recompute the given ``ds|strategy_id`` groups plus any pending ones.
+
+        Returns:
+            int: Number of groups refreshed.
+        """
+        retried: List[str] = []
+        if self.pending is not None and not self._pending_loaded:
+            self._pending_loaded = True
+            retried = self.pending.load(self.source)
+            if retried:
+                logger.info(
+                    f"Retrying {len(retried)} pending {self.source} aggregate groups"
+                )
+        keys = sorted(set(group_keys) | set(retried))
+        if not keys:
+            return 0
+
+        try:
+            self._merge_groups(keys)
+        except Exception:
+            if self.pending is not None:
+                try:
+                    self.pending.add(self.source, keys)
+                except Exception as e:
+                    logger.error(f"Could not persist pending aggregate groups: {e}")
+            raise
+
+        if retried and self.pending is not None:
+            self.pending.remove(self.source, retried)
+        return len(keys)
+
+    def _merge_groups(self, keys: List[str]) -> None:
+        """Run the keyed MERGE for ``keys``."""
+        self._ensure_table()
+
+        dates = [key.split("|", 1)[0] for key in keys]
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("source", "STRING", self.source),
+                bigquery.ScalarQueryParameter("ds_min", "DATE", min(dates)),
+                bigquery.ScalarQueryParameter("ds_max", "DATE", max(dates)),
+                bigquery.ArrayQueryParameter("group_keys", "STRING", keys),
+            ]
+        )
+        with track_api_call("bigquery", "aggregate_refresh"):
+            job = self.bq_client.query(
+                self._get_merge_sql(keyed=True), job_config=job_config
+            )
+            job.result()
+
+        logger.info(
+            f"Refreshed {len(keys)} {self.source} aggregate groups in {self.table_id}",
+            extra={
+                "metric_type": "aggregate_refresh",
+                "source": self.source,
+                "groups": len(keys),
+                "bytes_processed": job.total_bytes_processed,
+            },
+        )
+
+    def rebuild(self) -> None:
+        """Recompute every group of this source (backfill / repair)."""
+        self._ensure_table()
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("source", "STRING", self.source),
+            ]
+        )
+        with track_api_call("bigquery", "aggregate_rebuild"):
+            self.bq_client.query(
+                self._get_merge_sql(keyed=False), job_config=job_config
+            ).result()
+        logger.info(f"Rebuilt {self.source} aggregates in {self.table_id}")
+
+
+def _agg_table_id(project: str, env_suffix: str) -> str:
+    return f"{project}.crypto_analytics.{AGG_TABLE_NAME}{env_suffix}"
+
+
+def _pending_store(
+    firestore_client: Optional[Any], table_id: str
+) -> Optional[PendingAggregateGroups]:
+    if firestore_client is None:
+        return None
+    return PendingAggregateGroups(firestore_client, table_id)
+
+
+def live_trade_aggregates(
+    bq_client: bigquery.Client,
+    guardian: SchemaGuardian,
+    project: str,
+    env_suffix: str,
+    auto_migrate: bool = True,
+    firestore_client: Optional[Any] = None,
+    link_column: Optional[str] = None,
+) -> StrategyAggregateRefresher:
+    """
+    Refresher for LIVE groups, sourced from fact_trades.
+
+    Args:
+        firestore_client: Persists failed group keys for retry when given.
+        link_column: Column of the refreshed rows holding a ``trade_id``
+            (e.g. ``linked_trade_id`` for archived signals).
+    """
+    fact_table_id = f"{project}.crypto_analytics.fact_trades{env_suffix}"
+    table_id = _agg_table_id(project, env_suffix)
+    rows_sql = _LIVE_ROWS_SQL.format(
+        fact_table_id=fact_table_id,
+        signals_table_id=(
+            f"{project}.crypto_analytics.fact_theoretical_signals{env_suffix}"
+        ),
+        group_filter="{group_filter}",
+        signal_window="{signal_window}",
+    )
+    return StrategyAggregateRefresher(
+        bq_client,
+        guardian,
+        table_id,
+        SOURCE_LIVE,
+        rows_sql,
+        auto_migrate=auto_migrate,
+        fact_table_id=fact_table_id,
+        link_column=link_column,
+        pending=_pending_store(firestore_client, table_id),
+    )
+
+
+@lru_cache()
+def get_patch_trade_aggregates() -> StrategyAggregateRefresher:
+    """
+    Process-wide LIVE refresher for the patch pipelines.
+
+    fee_patch and price_patch share one refresher (and its BigQuery client,
+    Firestore client and SchemaGuardian) instead of building one each.
+    """
+    settings = get_settings()
+    bq_client = bigquery.Client(project=settings.GOOGLE_CLOUD_PROJECT)
+    return live_trade_aggregates(
+        bq_client,
+        SchemaGuardian(
+            bq_client,
+            strict_mode=settings.SCHEMA_GUARDIAN_STRICT_MODE,
+            cache=get_schema_cache(),
+        ),
+        settings.GOOGLE_CLOUD_PROJECT,
+        "" if settings.ENVIRONMENT == "PROD" else "_test",
+        auto_migrate=settings.SCHEMA_MIGRATION_AUTO,
+        firestore_client=firestore.Client(project=settings.GOOGLE_CLOUD_PROJECT),
+    )
+
+
+def refresh_patched_trades(
+    aggregates: StrategyAggregateRefresher,
+    trades: Sequence[Dict[str, Any]],
+    corrections: Sequence[Dict[str, Any]],
+    pipeline: str,
+) -> None:
+    """
+    Recompute the LIVE aggregate groups of the patched trades.
+
+    Failures are logged, not raised: the patch itself is committed, and
+    the refresher persists the failed groups for the next LIVE refresh.
+
+    Args:
+        trades: Queried fact_trades rows (with ds and strategy_id).
+        corrections: Applied corrections, keyed by ``trade_id``.
+        pipeline: Name of the patch pipeline, used as log prefix.
+    """
+    patched_ids = {c["trade_id"] for c in corrections}
+    patched = [t for t in trades if t["trade_id"] in patched_ids]
+    try:
+        aggregates.refresh(patched)
+    except Exception as e:
+        logger.error(
+            f"[{pipeline}] Aggregate refresh failed.",
+            extra={"group_keys": aggregates.group_keys(patched), "error": str(e)},
+        )
+
+
+def theoretical_signal_aggregates(
+    bq_client: bigquery.Client,
+    guardian: SchemaGuardian,
+    project: str,
+    env_suffix: str,
+    auto_migrate: bool = True,
+    firestore_client: Optional[Any] = None,
+) -> StrategyAggregateRefresher:
+    """Refresher for THEORETICAL groups, sourced from fact_theoretical_signals."""
+    table_id = _agg_table_id(project, env_suffix)
+    rows_sql = _THEORETICAL_ROWS_SQL.format(
+        fact_table_id=(
+            f"{project}.crypto_analytics.fact_theoretical_signals{env_suffix}"
+        ),
+        group_filter="{group_filter}",
+    )
+    return StrategyAggregateRefresher(
+        bq_client,
+        guardian,
+        table_id,
+        SOURCE_THEORETICAL,
+        rows_sql,
+        auto_migrate=auto_migrate,
+        pending=_pending_store(firestore_client, table_id),
+    )
@@ -16,14 +16,17 @@ Pattern: Extract → Transform → Load → Cleanup
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
 
+import numpy as np
 import pandas as pd
 from google.cloud import firestore
 from google.cloud.firestore import FieldFilter
 from loguru import logger
 from pydantic import BaseModel
 
+from crypto_signals.analysis.indicators import TechnicalIndicators
+from crypto_signals.analysis.trade_simulator import simulate_signals
 from crypto_signals.config import (
     get_crypto_data_client,
     get_stock_data_client,
@@ -35,13 +38,27 @@ from crypto_signals.domain.schemas import (
     SignalStatus,
 )
 from crypto_signals.market.data_provider import MarketDataProvider
+from crypto_signals.pipelines.aggregates import (
+    live_trade_aggregates,
+    theoretical_signal_aggregates,
+)
 from crypto_signals.pipelines.base import BigQueryPipelineBase
+from crypto_signals.pipelines.checkpoint import (
+    DOCUMENT_ID_FIELD,
+    ExtractionCheckpoint,
+    paginate,
+)
 
 # Validity window — only archive rejected signals older than 7 days
 VALIDITY_WINDOW_DAYS = 7
 
-# Maximum number of documents to extract per collection/status per run
-EXTRACTION_BATCH_LIMIT = 100
+# Page size for cursor-paginated extraction: each page is transformed, merged
+# and cleaned up as one micro-batch (bars are loaded once per symbol per page)
+EXTRACTION_BATCH_LIMIT = 1000
+
+# Extra history loaded before the oldest signal so the Chandelier Exit
+# (22-period ATR) is warmed up by the time a runner needs it
+SIMULATION_WARMUP_DAYS = 45
 
 # Terminal statuses to extract from live_signals
 _TERMINAL_LIVE_STATUSES = [
@@ -93,6 +110,27 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         self.firestore_client = firestore.Client(
             project=self.settings.GOOGLE_CLOUD_PROJECT
         )
+        self.aggregate_refreshers = [
+            theoretical_signal_aggregates(
+                self.bq_client,
+                self.guardian,
+                self.settings.GOOGLE_CLOUD_PROJECT,
+                env_suffix,
+                auto_migrate=self.settings.SCHEMA_MIGRATION_AUTO,
+                firestore_client=self.firestore_client,
+            ),
+            # Archived parents supply pattern_name/R-multiple of linked trades,
+            # whose LIVE groups were computed with the strategy_id fallback
+            live_trade_aggregates(
+                self.bq_client,
+                self.guardian,
+                self.settings.GOOGLE_CLOUD_PROJECT,
+                env_suffix,
+                auto_migrate=self.settings.SCHEMA_MIGRATION_AUTO,
+                firestore_client=self.firestore_client,
+                link_column="linked_trade_id",
+            ),
+        ]
         self.rejected_collection = (
             "rejected_signals"
             if self.settings.ENVIRONMENT == "PROD"
@@ -111,12 +149,67 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
     # Extract
     # ------------------------------------------------------------------
 
-    def extract(self) -> List[Any]:
+    def _extraction_streams(self) -> List[Tuple[str, Any, List[str], str]]:
         """
-        Extract terminal-state signals from two Firestore collections.
+        Paginated Firestore queries to drain.
 
-        1. rejected_signals — all docs older than 7 days
-        2. live_signals — filtered to terminal statuses
+        Returns:
+            (checkpoint key, filtered query, order fields, source collection) tuples:
+            1. rejected_signals — all docs older than 7 days
+            2. live_signals — one stream per terminal status
+        """
+        cutoff = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=VALIDITY_WINDOW_DAYS)
+
+        streams = [
+            (
+                self.rejected_collection,
+                self.firestore_client.collection(self.rejected_collection).where(
+                    filter=FieldFilter("created_at", "<", cutoff)
+                ),
+                ["created_at", DOCUMENT_ID_FIELD],
+                self.rejected_collection,
+            )
+        ]
+        for status in _TERMINAL_LIVE_STATUSES:
+            streams.append(
+                (
+                    f"{self.live_collection}:{status}",
+                    self.firestore_client.collection(self.live_collection).where(
+                        filter=FieldFilter("status", "==", status)
+                    ),
+                    [DOCUMENT_ID_FIELD],
+                    self.live_collection,
+                )
+            )
+        return streams
+
+    def _iter_batches(
+        self, checkpoint: Optional[ExtractionCheckpoint]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield one page of tagged records at a time across all streams."""
+        for stream, query, order_fields, collection in self._extraction_streams():
+            for docs in paginate(
+                query, order_fields, EXTRACTION_BATCH_LIMIT, checkpoint, stream
+            ):
+                batch = []
+                for doc in docs:
+                    data = doc.to_dict()
+                    if data:
+                        data["_doc_id"] = doc.id
+                        data["source_collection"] = collection
+                        batch.append(data)
+                logger.info(
+                    "Extracted batch",
+                    extra={"job": self.job_name, "stream": stream, "count": len(batch)},
+                )
+                if batch:
+                    yield batch
+
+    def extract_batches(self) -> Iterator[List[Any]]:
+        """
+        Drain terminal-state signals page by page with checkpointed cursors.
 
         Each record is tagged with ``_source_collection`` for cleanup routing
         and ``_doc_id`` for explicit document ID mapping (KB [2026-01-27]).
@@ -125,55 +218,19 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
             "Extracting terminal signals from Firestore",
             extra={"job": self.job_name},
         )
+        checkpoint = ExtractionCheckpoint(self.firestore_client, self.job_name)
+        yield from self._iter_batches(checkpoint)
 
-        raw_data: List[Dict[str, Any]] = []
-
-        # --- 1. Rejected signals ---
-        cutoff = datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) - timedelta(days=VALIDITY_WINDOW_DAYS)
-
-        rejected_docs = (
-            self.firestore_client.collection(self.rejected_collection)
-            .where(filter=FieldFilter("created_at", "<", cutoff))
-            .limit(EXTRACTION_BATCH_LIMIT)
-            .stream()
-        )
-
-        for doc in rejected_docs:
-            data = doc.to_dict()
-            if data:
-                data["_doc_id"] = doc.id
-                data["source_collection"] = self.rejected_collection
-                raw_data.append(data)
-
-        rejected_count = len(raw_data)
-
-        # --- 2. Live signals (terminal statuses) ---
-        for status in _TERMINAL_LIVE_STATUSES:
-            live_docs = (
-                self.firestore_client.collection(self.live_collection)
-                .where(filter=FieldFilter("status", "==", status))
-                .limit(EXTRACTION_BATCH_LIMIT)
-                .stream()
-            )
-            for doc in live_docs:
-                data = doc.to_dict()
-                if data:
-                    data["_doc_id"] = doc.id
-                    data["source_collection"] = self.live_collection
-                    raw_data.append(data)
-
-        live_count = len(raw_data) - rejected_count
+    def extract(self) -> List[Any]:
+        """
+        Extract every terminal-state signal into one list (no checkpointing).
 
+        run() uses extract_batches(); this is kept for ad-hoc inspection.
+        """
+        raw_data = [r for batch in self._iter_batches(None) for r in batch]
         logger.info(
             "Extraction complete",
-            extra={
-                "job": self.job_name,
-                "rejected_count": rejected_count,
-                "live_count": live_count,
-                "total": len(raw_data),
-            },
+            extra={"job": self.job_name, "total": len(raw_data)},
         )
         return raw_data
 
@@ -203,34 +260,54 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         if now is None:
             now = datetime.now(timezone.utc)
 
-        transformed: List[Dict[str, Any]] = []
+        simulations = self._simulate_all(raw_data, now=now)
 
-        for signal in raw_data:
+        # Map every signal first, then validate/dump the batch in one call each
+        records: List[Optional[Dict[str, Any]]] = []
+        errors: Dict[int, str] = {}
+        for idx, signal in enumerate(raw_data):
             try:
-                record = self._map_to_theoretical(signal, now=now)
-                model = FactTheoreticalSignal.model_validate(record)
-                transformed.append(model.model_dump(mode="json"))
+                records.append(
+                    self._map_to_theoretical(
+                        signal, now=now, simulation=simulations.get(idx)
+                    )
+                )
             except Exception as e:
-                logger.warning(
-                    "Failed to transform signal, using placeholder",
+                records.append(None)
+                errors[idx] = str(e)
+
+        mapped = [i for i, r in enumerate(records) if r is not None]
+        results = self.row_transformer.validate([records[i] for i in mapped])
+        models: Dict[int, BaseModel] = {}
+        for idx, result in zip(mapped, results, strict=True):
+            if isinstance(result, Exception):
+                errors[idx] = str(result)
+            else:
+                models[idx] = result
+
+        for idx, error in sorted(errors.items()):
+            signal = raw_data[idx]
+            logger.warning(
+                "Failed to transform signal, using placeholder",
+                extra={
+                    "signal_id": signal.get("signal_id"),
+                    "error": error,
+                },
+            )
+            try:
+                placeholder = self._make_placeholder(signal, error=error, now=now)
+                models[idx] = FactTheoreticalSignal.model_validate(placeholder)
+            except Exception as e2:
+                # Last resort — log and continue (record is truly broken)
+                logger.error(
+                    "Placeholder construction also failed",
                     extra={
                         "signal_id": signal.get("signal_id"),
-                        "error": str(e),
+                        "error": str(e2),
                     },
                 )
-                try:
-                    placeholder = self._make_placeholder(signal, error=str(e), now=now)
-                    model = FactTheoreticalSignal.model_validate(placeholder)
-                    transformed.append(model.model_dump(mode="json"))
-                except Exception as e2:
-                    # Last resort — log and continue (record is truly broken)
-                    logger.error(
-                        "Placeholder construction also failed",
-                        extra={
-                            "signal_id": signal.get("signal_id"),
-                            "error": str(e2),
-                        },
-                    )
+
+        transformed = self.row_transformer.dump([models[i] for i in sorted(models)])
 
         logger.info(
             "Transformation complete",
@@ -302,9 +379,18 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
     # ------------------------------------------------------------------
 
     def _map_to_theoretical(
-        self, signal: Dict[str, Any], *, now: datetime
+        self,
+        signal: Dict[str, Any],
+        *,
+        now: datetime,
+        simulation: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Map a Firestore signal doc to FactTheoreticalSignal fields."""
+        """
+        Map a Firestore signal doc to FactTheoreticalSignal fields.
+
+        ``simulation`` is this signal's entry from ``_simulate_all()``; the
+        signal is simulated on its own if it is not provided.
+        """
         status = signal.get("status", SignalStatus.REJECTED_BY_FILTER.value)
         created_at = signal.get("created_at")
         if created_at is None:
@@ -319,6 +405,9 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         # Classify trade type based on status
         trade_type = self._classify_trade_type(status, signal)
 
+        if simulation is None and self._needs_simulation(signal):
+            simulation = self._simulate_all([signal], now=now).get(0)
+
         # Calculate theoretical P&L (for non-executed signals)
         pnl = self._calculate_theoretical_pnl(
             symbol=symbol,
@@ -330,6 +419,7 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
             created_at=created_at,
             status=status,
             rejection_reason=signal.get("rejection_reason", ""),
+            simulation=simulation,
         )
 
         # Near-miss analysis for EXPIRED signals
@@ -410,6 +500,118 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
             return "THEORETICAL"
         return "UNKNOWN"
 
+    def _needs_simulation(self, signal: Dict[str, Any]) -> bool:
+        """True if the signal's theoretical P&L must be simulated on bars."""
+        if signal.get("status") in _EXECUTED_STATUSES:
+            return False
+        if "VALIDATION_FAILED" in (signal.get("rejection_reason") or ""):
+            return False
+        return all(
+            [
+                signal.get("symbol"),
+                float(signal.get("entry_price") or 0),
+                float(signal.get("suggested_stop") or 0),
+                float(signal.get("take_profit_1") or 0),
+            ]
+        )
+
+    def _simulate_all(
+        self, raw_data: List[Dict[str, Any]], *, now: datetime
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Simulate every signal that needs theoretical P&L, batched by symbol.
+
+        Each symbol's daily bars are loaded once (covering its oldest signal
+        plus Chandelier warm-up) and all of its signals are evaluated in one
+        ``simulate_signals`` pass.
+
+        Returns:
+            Dict of raw_data index to simulation result with keys exit_price,
+            exit_reason, exit_time and bars_df (bars from the signal's
+            creation day). A symbol whose bars failed to load maps to
+            ``{"error": Exception}`` so the signal becomes a placeholder.
+        """
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for idx, signal in enumerate(raw_data):
+            if self._needs_simulation(signal):
+                key = (signal["symbol"], signal.get("asset_class", "CRYPTO"))
+                groups.setdefault(key, []).append(idx)
+
+        results: Dict[int, Dict[str, Any]] = {}
+        for (symbol, asset_class), indices in groups.items():
+            signals = [raw_data[i] for i in indices]
+            entry_times = pd.to_datetime(
+                [s.get("created_at") or now for s in signals], utc=True
+            )
+
+            def levels(field: str, signals=signals) -> np.ndarray:
+                return np.array(
+                    [float(s.get(field) or np.nan) for s in signals], dtype=float
+                )
+
+            try:
+                age_days = (pd.to_datetime(now, utc=True) - entry_times.min()).days
+                bars_df = self.market_provider.get_daily_bars(
+                    symbol=symbol,
+                    asset_class=asset_class,
+                    lookback_days=max(age_days, 0) + SIMULATION_WARMUP_DAYS,
+                )
+                if bars_df.empty:
+                    for i in indices:
+                        results[i] = {"bars_df": bars_df}
+                    continue
+
+                bars_df = bars_df.sort_index()
+                sim = simulate_signals(
+                    TechnicalIndicators.add_chandelier_exit(bars_df.copy()),
+                    entry_times,
+                    entry_price=levels("entry_price"),
+                    stop_loss=levels("suggested_stop"),
+                    take_profit_1=levels("take_profit_1"),
+                    take_profit_2=levels("take_profit_2"),
+                    take_profit_3=levels("take_profit_3"),
+                    is_long=np.array(
+                        [
+                            s.get("side", OrderSide.BUY.value) == OrderSide.BUY.value
+                            for s in signals
+                        ]
+                    ),
+                )
+            except Exception as e:
+                logger.warning(
+                    "Theoretical simulation failed for symbol",
+                    extra={"job": self.job_name, "symbol": symbol, "error": str(e)},
+                )
+                for i in indices:
+                    results[i] = {"error": e}
+                continue
+
+            for pos, i in enumerate(indices):
+                entry_offset = int(sim["entry_offset"][pos])
+                exit_offset = int(sim["exit_offset"][pos])
+                results[i] = {
+                    "bars_df": bars_df.iloc[entry_offset:],
+                    "exit_price": (
+                        None
+                        if np.isnan(sim["exit_price"][pos])
+                        else float(sim["exit_price"][pos])
+                    ),
+                    "exit_reason": sim["exit_reason"][pos],
+                    "exit_time": (
+                        bars_df.index[exit_offset] if exit_offset >= 0 else None
+                    ),
+                }
+
+        logger.info(
+            "Theoretical simulation complete",
+            extra={
+                "job": self.job_name,
+                "symbols": len(groups),
+                "signals": sum(len(v) for v in groups.values()),
+            },
+        )
+        return results
+
     def _calculate_theoretical_pnl(
         self,
         *,
@@ -422,6 +624,7 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         created_at: Any,
         status: str,
         rejection_reason: str,
+        simulation: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Calculate theoretical P&L for a signal that was never executed.
@@ -429,6 +632,9 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         For EXECUTED (TP*_HIT) signals, P&L is already captured in
         fact_trades — we skip theoretical simulation and return zeros.
 
+        Args:
+            simulation: The signal's result from ``_simulate_all()``.
+
         Returns a dict with keys:
             exit_price, exit_reason, exit_time, pnl_net, pnl_pct,
             total_fees, bars_df
@@ -462,53 +668,16 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
             result["exit_reason"] = "MISSING_SIGNAL_PARAMS"
             return result
 
-        # Fetch market data
-        bars_df = self.market_provider.get_daily_bars(
-            symbol=symbol,
-            asset_class=asset_class,
-            lookback_days=30,
-        )
+        if simulation is not None and "error" in simulation:
+            raise simulation["error"]
 
-        if bars_df.empty:
+        # No bars at all, or none on/after the signal's creation day
+        if simulation is None or simulation.get("exit_price") is None:
             result["exit_reason"] = "NO_MARKET_DATA"
             return result
 
-        # Filter bars after signal creation
-        if created_at:
-            bars_df = bars_df[bars_df.index >= pd.Timestamp(created_at).floor("D")]
-            if bars_df.empty:
-                result["exit_reason"] = "NO_MARKET_DATA"
-                return result
-
-        result["bars_df"] = bars_df
-
-        # Vectorized TP/SL simulation
-        if side == OrderSide.BUY.value:
-            tp_mask = bars_df["high"] >= take_profit_1
-            sl_mask = bars_df["low"] <= stop_loss
-        else:
-            tp_mask = bars_df["low"] <= take_profit_1
-            sl_mask = bars_df["high"] >= stop_loss
-
-        hit_mask = tp_mask | sl_mask
-        exit_price = None
-        exit_reason = None
-        exit_time = None
-
-        if hit_mask.any():
-            exit_time = hit_mask.idxmax()
-            if tp_mask.loc[exit_time]:
-                exit_price = take_profit_1
-                exit_reason = "THEORETICAL_TP1"
-            else:
-                exit_price = stop_loss
-                exit_reason = "THEORETICAL_SL"
-
-        # Fallback — use latest close
-        if exit_price is None:
-            exit_price = float(bars_df.iloc[-1]["close"])
-            exit_reason = "THEORETICAL_OPEN"
-            exit_time = bars_df.index[-1]
+        result["bars_df"] = simulation["bars_df"]
+        exit_price = simulation["exit_price"]
 
         # Calculate P&L
         qty = 1.0  # Normalized unit
@@ -529,8 +698,8 @@ class BacktestArchivalPipeline(BigQueryPipelineBase):
         pnl_pct = (pnl_net / (entry_price * qty)) * 100 if entry_price else 0
 
         result["exit_price"] = exit_price
-        result["exit_reason"] = exit_reason
-        result["exit_time"] = exit_time
+        result["exit_reason"] = simulation["exit_reason"]
+        result["exit_time"] = simulation["exit_time"]
         result["pnl_net"] = pnl_net
         result["pnl_pct"] = pnl_pct
         result["total_fees"] = total_fees
@@ -9,8 +9,12 @@ It implements the strict "Truncate -> Load (Staging) -> Merge (Fact)" pattern
 to ensure idempotency and data consistency.
 """
 
+import io
+import json
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Type
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
 
 from google.api_core.exceptions import NotFound
 from google.cloud import bigquery
@@ -18,7 +22,23 @@ from loguru import logger
 from pydantic import BaseModel
 
 from crypto_signals.config import get_settings
-from crypto_signals.engine.schema_guardian import SchemaGuardian, SchemaMismatchError
+from crypto_signals.engine.schema_guardian import (
+    SchemaGuardian,
+    SchemaMismatchError,
+    get_schema_cache,
+)
+from crypto_signals.metrics import track_api_call
+from crypto_signals.pipelines.aggregates import StrategyAggregateRefresher
+from crypto_signals.pipelines.row_transformer import encode_ndjson, get_row_transformer
+
+# Partition column types the MERGE can prune on -> query parameter type
+PRUNABLE_PARTITION_TYPES = {
+    "DATE": "DATE",
+    "DATETIME": "DATETIME",
+    "TIMESTAMP": "TIMESTAMP",
+    "INTEGER": "INT64",
+    "INT64": "INT64",
+}
 
 
 class BigQueryPipelineBase(ABC):
@@ -39,6 +59,8 @@ class BigQueryPipelineBase(ABC):
     """
 
     STAGING_CLEANUP_DAYS = 7
+    # Safety net: staging tables expire even if the post-merge delete fails
+    STAGING_TTL_HOURS = 1
 
     def __init__(
         self,
@@ -64,6 +86,10 @@ class BigQueryPipelineBase(ABC):
         self.partition_column = partition_column
         self.schema_model = schema_model
         self.clustering_fields = clustering_fields
+        # Bytes scanned by MERGE jobs during the current run()
+        self.merge_bytes_processed = 0
+        # Batch validate/dump compiled once per schema model
+        self.row_transformer = get_row_transformer(schema_model)
 
         # Load settings once to ensure consistency and support patching in tests
         self.settings = get_settings()
@@ -74,10 +100,16 @@ class BigQueryPipelineBase(ABC):
 
         # Initialize Schema Guardian
         # Note: V1 enforces Strict Mode everywhere.
+        # The shared cache skips re-validating unchanged model/table pairs.
         self.guardian = SchemaGuardian(
-            self.bq_client, strict_mode=self.settings.SCHEMA_GUARDIAN_STRICT_MODE
+            self.bq_client,
+            strict_mode=self.settings.SCHEMA_GUARDIAN_STRICT_MODE,
+            cache=get_schema_cache(),
         )
 
+        # Derived aggregate tables refreshed for the groups each batch touches
+        self.aggregate_refreshers: List[StrategyAggregateRefresher] = []
+
     @abstractmethod
     def extract(self) -> List[Any]:
         """
@@ -87,6 +119,21 @@ class BigQueryPipelineBase(ABC):
             List of raw data objects (dicts or model instances).
         """
 
+    def extract_batches(self) -> Iterator[List[Any]]:
+        """
+        Extract data as bounded micro-batches.
+
+        run() transforms, merges and cleans up each batch before requesting the
+        next one. The default yields the whole extract() result as one batch;
+        paginated pipelines override this to keep memory flat.
+
+        Yields:
+            Lists of raw data objects.
+        """
+        raw_data = self.extract()
+        if raw_data:
+            yield raw_data
+
     @abstractmethod
     def cleanup(self, data: List[BaseModel]) -> None:
         """
@@ -107,12 +154,7 @@ class BigQueryPipelineBase(ABC):
             List of dictionaries ready for BigQuery insertion.
         """
         logger.info(f"[{self.job_name}] Transforming {len(raw_data)} records...")
-        transformed = []
-        for item in raw_data:
-            model = self.schema_model.model_validate(item)
-            transformed.append(model.model_dump(mode="json"))
-
-        return transformed
+        return self.row_transformer.transform(raw_data)
 
     def _check_table_exists(self, table_id: str) -> bool:
         """Check if a BigQuery table exists."""
@@ -122,222 +164,264 @@ class BigQueryPipelineBase(ABC):
         except NotFound:
             return False
 
-    def _get_merge_sql(self, source_table_id: str) -> str:
+    def _partition_range(
+        self, data: List[Dict[str, Any]], schema: List[bigquery.SchemaField]
+    ) -> Optional[Tuple[str, Any, Any]]:
+        """
+        Partition watermark of a batch: (BigQuery type, min value, max value).
+
+        Returns None when the partition column is missing from the load schema,
+        has an unsupported type, or is null in any row (the MERGE then scans all
+        partitions, as before).
+        """
+        field_type = next(
+            (f.field_type for f in schema if f.name == self.partition_column), None
+        )
+        if field_type not in PRUNABLE_PARTITION_TYPES:
+            return None
+
+        values = [row.get(self.partition_column) for row in data]
+        if not values or any(v is None for v in values):
+            return None
+        # JSON-mode dumps are ISO strings, so lexical order is chronological
+        return PRUNABLE_PARTITION_TYPES[field_type], min(values), max(values)
+
+    def _merge_join_columns(self) -> List[str]:
+        """
+        MERGE join keys: the partition column, then the ID.
+
+        Clustering fields are deliberately not join keys: they can change for
+        an ID (e.g. signal ``status`` TP1_HIT -> TP2_HIT), and a re-merge must
+        then UPDATE the row rather than INSERT a duplicate. Column-to-column
+        equality does not prune clustered blocks anyway; only the constant
+        partition range in the ON clause does.
+        """
+        columns = [self.partition_column]
+        if self.id_column != self.partition_column:
+            columns.append(self.id_column)
+        return columns
+
+    def _get_merge_sql(
+        self,
+        source_table_id: str,
+        partition_range: Optional[Tuple[str, Any, Any]] = None,
+    ) -> str:
         """
         Generate the MERGE statement to upsert data from Source to Fact.
 
         Args:
             source_table_id: The table ID to use as the source (S).
+            partition_range: Batch partition watermark from _partition_range().
+                When given, the target is pruned to
+                ``@partition_min..@partition_max`` (bound as query parameters).
 
         Returns:
             str: The full MERGE SQL statement.
         """
-        # 1. Get all column names from the model
-        columns = sorted(list(self.schema_model.model_fields.keys()))
+        # 1. Get all column names from the model (excluded fields are not persisted)
+        columns = sorted(
+            name
+            for name, field_info in self.schema_model.model_fields.items()
+            if not field_info.exclude
+        )
 
         # 2. Build UPDATE clause (T.col = S.col)
         # We generally update ALL columns on match to ensure consistency
+        join_columns = self._merge_join_columns()
         update_list = []
         for col in columns:
             # Skip updating join keys (usually harmless if they match)
-            if col not in [self.id_column, self.partition_column]:
+            if col not in join_columns:
                 update_list.append(f"T.{col} = S.{col}")
 
-        update_clause = ", ".join(update_list)
+        # Omitted when every column is a join key (matched rows are identical)
+        matched_clause = (
+            f"WHEN MATCHED THEN UPDATE SET {', '.join(update_list)}"
+            if update_list
+            else ""
+        )
 
         # 3. Build INSERT clause
         insert_cols = ", ".join(columns)
         insert_vals = ", ".join([f"S.{col}" for col in columns])
 
-        # 4. Construct the full MERGE query
+        # 4. Build ON clause: target partition pruning, then join keys
+        conditions = []
+        if partition_range:
+            conditions.append(
+                f"T.{self.partition_column} BETWEEN @partition_min AND @partition_max"
+            )
+        conditions.extend(f"T.{col} = S.{col}" for col in join_columns)
+        on_clause = "\n            AND ".join(conditions)
+
+        # 5. Construct the full MERGE query
         # Using `T` for Target (Fact) and `S` for Source (Staging)
         return f"""
             MERGE `{self.fact_table_id}` AS T
             USING `{source_table_id}` AS S
-            ON T.{self.id_column} = S.{self.id_column}
-            AND T.{self.partition_column} = S.{self.partition_column}
-            WHEN MATCHED THEN
-                UPDATE SET {update_clause}
+            ON {on_clause}
+            {matched_clause}
             WHEN NOT MATCHED THEN
                 INSERT ({insert_cols})
                 VALUES ({insert_vals})
         """
 
+    def _load_schema(self) -> List[bigquery.SchemaField]:
+        """BigQuery schema for the staging table, derived from ``schema_model``."""
+        return self.guardian.generate_schema(self.schema_model)
+
+    def _staging_table_ref(self) -> str:
+        """Unique staging table ID in the fact table's dataset."""
+        project, dataset, _ = self.fact_table_id.split(".")
+        return f"{project}.{dataset}._stg_{self.job_name}_{uuid.uuid4().hex[:12]}"
+
+    @staticmethod
+    def _encode_rows(
+        data: List[Dict[str, Any]], schema: List[bigquery.SchemaField]
+    ) -> List[Dict[str, Any]]:
+        """
+        Shape rows for a JSON load job against ``schema``.
+
+        Dict/list values bound to scalar STRING columns (e.g. ``Dict[str, Any]``
+        metadata) are serialized to JSON text; keys outside the schema are dropped.
+        """
+        columns = {f.name: f for f in schema}
+        json_columns = {
+            name
+            for name, f in columns.items()
+            if f.field_type == "STRING" and f.mode != "REPEATED"
+        }
+        rows = []
+        for row in data:
+            encoded = {}
+            for key, value in row.items():
+                if key not in columns:
+                    continue
+                if key in json_columns and isinstance(value, (dict, list)):
+                    value = json.dumps(value)
+                encoded[key] = value
+            rows.append(encoded)
+        return rows
+
     def _merge_via_temp_table(self, data: List[Dict[str, Any]]) -> None:
         """
-        Execute MERGE using an in-session BQ Temp Table.
+        Execute MERGE from a short-lived staging table filled by a load job.
 
-        Handles chunking for large datasets (> 10MB).
+        Rows are loaded in a single load job with an explicit schema derived from
+        ``schema_model`` (no query-parameter size cap, one NDJSON encoding pass),
+        then merged into the fact table with one MERGE. The staging table is
+        deleted afterwards and expires on its own if deletion fails.
 
         Args:
             data: List of dictionaries to merge.
         """
-        import json
-
         if not data:
             logger.info(f"[{self.job_name}] No data to merge.")
             return
 
-        # 10MB Chunking Logic
-        # Rough estimate: Each row as JSON string
-        MAX_CHUNK_SIZE = 10 * 1024 * 1024  # 10MB
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for row in data:
-            row_size = len(json.dumps(row))
-            if current_size + row_size > MAX_CHUNK_SIZE and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_size = 0
-            current_chunk.append(row)
-            current_size += row_size
+        schema = self._load_schema()
+        staging_table_id = self._staging_table_ref()
 
-        if current_chunk:
-            chunks.append(current_chunk)
+        staging_table = bigquery.Table(staging_table_id, schema=schema)
+        staging_table.expires = datetime.now(timezone.utc) + timedelta(
+            hours=self.STAGING_TTL_HOURS
+        )
 
         logger.info(
-            f"[{self.job_name}] Merging {len(data)} rows in {len(chunks)} chunks via temp tables..."
+            f"[{self.job_name}] Loading {len(data)} rows into {staging_table_id}..."
         )
+        try:
+            self.bq_client.create_table(staging_table)
 
-        for i, chunk in enumerate(chunks):
-            temp_table_name = f"_stg_{self.job_name}_{i}"
-            # Construct UNNEST query with parameters
-            # BigQuery UNNEST(ARRAY<STRUCT<...>>) requires explicit types or we use JSON_QUERY
-            # A simpler way is to use a single JSON string parameter and JSON_RELAXED_MODE
-            # OR better: use UNNEST of JSON array and then parse it.
-            # But wait, UNNEST with ArrayQueryParameter of structs is supported.
-            # However, we need to know the schema for StructQueryParameter.
-
-            # Alternative: Use a single JSON parameter for the chunk
-            json_data = json.dumps(chunk)
-
-            # Using BigQuery's JSON support:
-            # We can use UNNEST(JSON_QUERY_ARRAY(@json_data)) but we need to cast each field.
-            # Actually, standard way for high-perf is to use the generated schema.
-
-            # Let's use the schema we already have from SchemaGuardian or just inferred from model
-            # Actually, using a list of dicts with ArrayQueryParameter(..., sub_type="RECORD")
-            # requires us to specify the fields.
-
-            # Let's use a simpler approach that doesn't require complex param building:
-            # CREATE TEMP TABLE AS SELECT * FROM UNNEST(JSON_QUERY_ARRAY(@json_data))
-            # Wait, BigQuery has 'EXTERNAL_QUERY' or 'LOAD DATA' but those are for files.
-
-            # If we use `bigquery.Client.load_table_from_json`, it uses a temporary table if we don't provide a destination?
-            # No, it needs a destination.
-
-            # The issue suggested:
-            # CREATE TEMP TABLE _stg_{self.job_name} AS (
-            #     SELECT * FROM UNNEST(...)
-            # );
-            # I will use ArrayQueryParameter.
-
-            merge_sql = self._get_merge_sql(temp_table_name)
-
-            # We need to build the SELECT clause from UNNEST to match the schema
-            # SELECT CAST(json_extract_scalar(x, '$.id') AS STRING) as id, ... FROM UNNEST(JSON_QUERY_ARRAY(@json_data)) x
-            # This is too complex.
-
-            # Let's use the documented pattern for UNNEST with structs:
-            # query_params = [bigquery.ArrayQueryParameter("rows", "RECORD", [ ... ])]
-            # But "RECORD" needs sub_params.
-
-            # Let's try to use `load_table_from_json` to a TEMP table.
-            # Can we load to a TEMP table? Yes, if we use a table ID starting with `_` in a special way?
-            # Actually, `load_table_from_json` to a persistent table was the old way.
-
-            # Use JSON_VALUE/JSON_QUERY to extract fields from JSON
-            # But we need types.
-
-            # Let's reconsider `bigquery.ArrayQueryParameter` with `RECORD`.
-            # We can use `SchemaGuardian` to get the BQ types.
-            # But the requirement says "Use structural SQL assertion".
-
-            # Let's use a simpler SQL that uses JSON_VALUE for everything and casts.
-            # But wait, some fields are not strings.
+            job_config = bigquery.LoadJobConfig(
+                schema=schema,
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE,
+            )
+            payload = encode_ndjson(self._encode_rows(data, schema))
+            with track_api_call("bigquery", "load_table"):
+                self.bq_client.load_table_from_file(
+                    io.BytesIO(payload), staging_table_id, job_config=job_config
+                ).result()
+
+            partition_range = self._partition_range(data, schema)
+            query_parameters = []
+            if partition_range:
+                param_type, low, high = partition_range
+                query_parameters = [
+                    bigquery.ScalarQueryParameter("partition_min", param_type, low),
+                    bigquery.ScalarQueryParameter("partition_max", param_type, high),
+                ]
 
-            # Actually, the most robust way to create a temp table from data in Python is
-            # to use `bq_client.load_table_from_json` but how to make it a TEMP table?
-            # BigQuery `load_table_from_json` always creates a persistent table unless it's in a session.
-            # But we want it to be automatically dropped.
+            logger.info(f"[{self.job_name}] Executing MERGE into {self.fact_table_id}...")
+            with track_api_call("bigquery", "merge"):
+                merge_job = self.bq_client.query(
+                    self._get_merge_sql(staging_table_id, partition_range),
+                    job_config=bigquery.QueryJobConfig(query_parameters=query_parameters),
+                )
+                merge_job.result()
+        finally:
+            self.bq_client.delete_table(staging_table_id, not_found_ok=True)
 
-            # If I use `CREATE TEMP TABLE` with `SELECT * FROM UNNEST(...)`
-            # I need the `...` to be a valid array of structs.
+        bytes_processed = merge_job.total_bytes_processed
+        if isinstance(bytes_processed, int):
+            self.merge_bytes_processed += bytes_processed
+        logger.info(
+            f"[{self.job_name}] MERGE completed successfully.",
+            extra={
+                "metric_type": "merge_bytes_processed",
+                "fact_table": self.fact_table_id,
+                "bytes_processed": bytes_processed,
+                "rows": len(data),
+                "partition_min": partition_range[1] if partition_range else None,
+                "partition_max": partition_range[2] if partition_range else None,
+            },
+        )
 
-            # I'll use a single JSON string and `UNNEST(JSON_QUERY_ARRAY(@json_data))`
-            # and then I'll use the model schema to cast.
+    def _refresh_aggregates(self, data: List[Dict[str, Any]]) -> None:
+        """
+        Recompute the aggregate groups touched by a merged batch.
 
-            field_selects = []
-            for name, field_info in self.schema_model.model_fields.items():
-                if field_info.exclude:
-                    continue
-                # Determine BQ type
-                # Simple mapping for now, can be improved
-                from datetime import date, datetime
-
-                py_type = field_info.annotation
-                # Handle Optional
-                import typing
-
-                if typing.get_origin(py_type) is typing.Union:
-                    py_type = typing.get_args(py_type)[0]
-
-                if py_type == int:
-                    bq_type = "INT64"
-                elif py_type == float:
-                    bq_type = "FLOAT64"
-                elif py_type == bool:
-                    bq_type = "BOOL"
-                elif py_type == datetime:
-                    bq_type = "TIMESTAMP"
-                elif py_type == date:
-                    bq_type = "DATE"
+        An empty batch only retries groups that failed earlier. Failures are
+        logged, not raised: aggregates are derived data and the
+        fact MERGE already succeeded, so the batch still proceeds to cleanup.
+        Refreshers with a pending store persist the failed groups, and the next
+        refresh of that source retries them.
+        """
+        for refresher in self.aggregate_refreshers:
+            try:
+                if data:
+                    refresher.refresh(data)
                 else:
-                    bq_type = "STRING"
-
-                if bq_type == "STRING":
-                    field_selects.append(f"LAX_STRING(item.{name}) AS {name}")
-                elif bq_type == "INT64":
-                    field_selects.append(f"LAX_INT64(item.{name}) AS {name}")
-                elif bq_type == "FLOAT64":
-                    field_selects.append(f"LAX_FLOAT64(item.{name}) AS {name}")
-                elif bq_type == "BOOL":
-                    field_selects.append(f"LAX_BOOL(item.{name}) AS {name}")
-                elif bq_type == "TIMESTAMP":
-                    field_selects.append(f"TIMESTAMP(LAX_STRING(item.{name})) AS {name}")
-                elif bq_type == "DATE":
-                    field_selects.append(f"DATE(LAX_STRING(item.{name})) AS {name}")
-
-            unnest_sql = f"""
-                CREATE TEMP TABLE `{temp_table_name}` AS
-                SELECT
-                    {", ".join(field_selects)}
-                FROM UNNEST(JSON_QUERY_ARRAY(PARSE_JSON(@json_data))) AS item;
-            """
-
-            full_script = f"""
-                {unnest_sql}
-                {merge_sql}
-            """
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter("json_data", "STRING", json_data),
-                ]
-            )
+                    refresher.retry_pending()
+            except Exception as e:
+                logger.error(
+                    f"[{self.job_name}] Aggregate refresh failed for "
+                    f"{refresher.table_id} ({refresher.source}): {e}",
+                    extra={"group_keys": refresher.group_keys(data)},
+                )
+
+    def _process_batch(self, raw_data: List[Any]) -> int:
+        """Transform, merge and clean up one batch. Returns records merged."""
+        # 2. Transform
+        transformed_data = self.transform(raw_data)
 
-            logger.info(f"[{self.job_name}] Executing merge chunk {i+1}/{len(chunks)}...")
-            self.bq_client.query(full_script, job_config=job_config).result()
+        # 3. Execute Merge via Temp Table
+        self._merge_via_temp_table(transformed_data)
+        self._refresh_aggregates(transformed_data)
 
-        logger.info(f"[{self.job_name}] MERGE completed successfully.")
+        # 4. Cleanup - Re-validate for type safety (cheap vs BQ/Network ops)
+        # Use transformed_data to ensure all fields required by schema are present
+        cleanup_models = self.row_transformer.validate_all(transformed_data)
+        self.cleanup(cleanup_models)
+        return len(transformed_data)
 
     def run(self) -> int:
         """
         Orchestrate the full pipeline execution.
 
         Flow: Validate Schema -> Extract -> Transform -> Merge (via Temp Table) -> Cleanup
+        (steps after validation repeat for every batch from extract_batches()).
 
         Returns:
             int: Number of records processed.
@@ -386,27 +470,32 @@ class BigQueryPipelineBase(ABC):
                 else:
                     raise
 
-            # 1. Extract
-            raw_data = self.extract()
-            if not raw_data:
+            # 1-4. Extract -> Transform -> Merge -> Cleanup, one micro-batch at a time
+            total = 0
+            batches = 0
+            self.merge_bytes_processed = 0
+            for raw_data in self.extract_batches():
+                if not raw_data:
+                    continue
+                batches += 1
+                total += self._process_batch(raw_data)
+
+            if not batches:
+                # Groups that failed in an earlier run still need a refresh
+                self._refresh_aggregates([])
                 logger.info(f"[{self.job_name}] No data found. Exiting.")
                 return 0
 
-            # 2. Transform
-            transformed_data = self.transform(raw_data)
-
-            # 3. Execute Merge via Temp Table
-            self._merge_via_temp_table(transformed_data)
-
-            # 4. Cleanup - Re-validate for type safety (cheap vs BQ/Network ops)
-            # Use transformed_data to ensure all fields required by schema are present
-            cleanup_models = [
-                self.schema_model.model_validate(d) for d in transformed_data
-            ]
-            self.cleanup(cleanup_models)
-
-            logger.info(f"[{self.job_name}] Pipeline finished successfully.")
-            return len(transformed_data)
+            logger.info(
+                f"[{self.job_name}] Pipeline finished successfully.",
+                extra={
+                    "metric_type": "pipeline_run",
+                    "batches": batches,
+                    "records": total,
+                    "merge_bytes_processed": self.merge_bytes_processed,
+                },
+            )
+            return total
 
         except Exception as e:
             # Use structured logging to avoid f-string formatting issues with Loguru (Issue #149)
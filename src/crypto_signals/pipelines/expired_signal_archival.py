@@ -16,7 +16,7 @@ Pattern: "Extract-Transform-Load"
 
 import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
 from google.cloud import firestore
@@ -31,6 +31,14 @@ from crypto_signals.config import (
 from crypto_signals.domain.schemas import ExpiredSignal, OrderSide
 from crypto_signals.market.data_provider import MarketDataProvider
 from crypto_signals.pipelines.base import BigQueryPipelineBase
+from crypto_signals.pipelines.checkpoint import (
+    DOCUMENT_ID_FIELD,
+    ExtractionCheckpoint,
+    paginate,
+)
+
+# Page size for cursor-paginated extraction (one micro-batch per page)
+EXTRACTION_PAGE_SIZE = 100
 
 
 class ExpiredSignalArchivalPipeline(BigQueryPipelineBase):
@@ -63,30 +71,46 @@ class ExpiredSignalArchivalPipeline(BigQueryPipelineBase):
         crypto_client = get_crypto_data_client()
         self.market_provider = MarketDataProvider(stock_client, crypto_client)
 
-    def extract(self) -> List[Any]:
-        """Extract EXPIRED signals from Firestore older than 24 hours."""
-        logger.info(f"[{self.job_name}] extracting EXPIRED signals from Firestore...")
-
+    def _iter_batches(
+        self, checkpoint: Optional[ExtractionCheckpoint]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of EXPIRED signals that expired at least 24 hours ago."""
         # Only process signals that expired at least 24 hours ago
         # This prevents race conditions with the main signal processing loop
         cutoff = datetime.now(timezone.utc) - timedelta(days=1)
 
-        docs = (
+        query = (
             self.firestore_client.collection(self.source_collection)
             .where(filter=FieldFilter("status", "==", "EXPIRED"))
             .where(filter=FieldFilter("valid_until", "<", cutoff))
-            .stream()
         )
+        for docs in paginate(
+            query,
+            ["valid_until", DOCUMENT_ID_FIELD],
+            EXTRACTION_PAGE_SIZE,
+            checkpoint,
+            self.source_collection,
+        ):
+            raw_data = []
+            for doc in docs:
+                data = doc.to_dict()
+                if data:
+                    data["doc_id"] = doc.id  # Capture the actual document ID
+                    raw_data.append(data)
+
+            logger.info(f"[{self.job_name}] extracted {len(raw_data)} expired signals.")
+            if raw_data:
+                yield raw_data
+
+    def extract_batches(self) -> Iterator[List[Any]]:
+        """Drain EXPIRED signals older than 24 hours, one checkpointed page at a time."""
+        logger.info(f"[{self.job_name}] extracting EXPIRED signals from Firestore...")
+        checkpoint = ExtractionCheckpoint(self.firestore_client, self.job_name)
+        yield from self._iter_batches(checkpoint)
 
-        raw_data = []
-        for doc in docs:
-            data = doc.to_dict()
-            if data:
-                data["doc_id"] = doc.id  # Capture the actual document ID
-                raw_data.append(data)
-
-        logger.info(f"[{self.job_name}] extracted {len(raw_data)} expired signals.")
-        return raw_data
+    def extract(self) -> List[Any]:
+        """Extract all EXPIRED signals older than 24 hours (no checkpointing)."""
+        return [r for batch in self._iter_batches(None) for r in batch]
 
     def transform(self, raw_data: List[Any]) -> List[Dict[str, Any]]:
         """
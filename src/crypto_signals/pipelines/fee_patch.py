@@ -4,20 +4,26 @@ Fee Patch Pipeline (Issue #140).
 This pipeline reconciles estimated fees with actual CFEE data from Alpaca.
 Runs at the start of main.py to finalize fees for trades older than 24 hours.
 
-Pattern: "Query-Fetch-Update"
+Pattern: "Query-Fetch-Merge"
 1. Query: Get BigQuery rows where fee_finalized = FALSE and age > 24h
-2. Fetch: Call Alpaca Activities API for CFEE records
-3. Update: Patch BigQuery with actual fees and set fee_finalized = TRUE
+2. Fetch: Load CFEE records for all trades via the shared activity ledger
+3. Merge: Apply all corrections in one MERGE and set fee_finalized = TRUE
+4. Refresh: Recompute the LIVE strategy aggregates of the patched trades
 """
 
-from datetime import timedelta
-from typing import Any, Dict, List
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
 
 from google.cloud import bigquery
 from loguru import logger
 
 from crypto_signals.config import get_settings, get_trading_client
 from crypto_signals.engine.execution import ExecutionEngine
+from crypto_signals.metrics import track_api_call
+from crypto_signals.pipelines.aggregates import (
+    get_patch_trade_aggregates,
+    refresh_patched_trades,
+)
 
 
 class FeePatchPipeline:
@@ -29,7 +35,7 @@ class FeePatchPipeline:
 
     # Configuration Constants
     CFEE_SETTLEMENT_HOURS = 24  # Alpaca T+1 settlement window
-    MAX_TRADES_PER_RUN = 100  # Batch size for performance and rate limiting
+    MAX_TRADES_PER_RUN = 1000  # One ledger fetch + one MERGE regardless of size
 
     def __init__(self, execution_engine: Any | None = None):
         """Initialize the pipeline."""
@@ -41,6 +47,8 @@ class FeePatchPipeline:
         self.fact_table_id = (
             f"{settings.GOOGLE_CLOUD_PROJECT}.crypto_analytics.fact_trades{env_suffix}"
         )
+        # Patched pnl_usd / exit prices change the LIVE strategy aggregates
+        self.aggregates = get_patch_trade_aggregates()
 
         if execution_engine:
             self.execution_engine = execution_engine
@@ -65,11 +73,13 @@ class FeePatchPipeline:
 
         logger.info(f"[fee_patch] Found {len(unfinalized_trades)} trades to reconcile")
 
-        # Step 2: Fetch CFEE and update BigQuery
-        patched_count = 0
-        for trade in unfinalized_trades:
-            if self._patch_trade_fees(trade):
-                patched_count += 1
+        # Step 2: Fetch CFEE for every trade, then apply all corrections at once
+        corrections = self._collect_corrections(unfinalized_trades)
+        patched_count = self._apply_corrections(corrections)
+        if patched_count:
+            refresh_patched_trades(
+                self.aggregates, unfinalized_trades, corrections, "fee_patch"
+            )
 
         logger.info(
             f"[fee_patch] Reconciled {patched_count}/{len(unfinalized_trades)} trades"
@@ -89,6 +99,7 @@ class FeePatchPipeline:
         query = f"""
         SELECT
             trade_id,
+            strategy_id,
             symbol,
             asset_class,
             entry_time,
@@ -104,20 +115,56 @@ class FeePatchPipeline:
         LIMIT {self.MAX_TRADES_PER_RUN}
         """
 
-        query_job = self.bq_client.query(query)
-        results = query_job.result()
+        with track_api_call("bigquery", "query"):
+            results = self.bq_client.query(query).result()
 
         return [dict(row) for row in results]
 
-    def _patch_trade_fees(self, trade: Dict[str, Any]) -> bool:
+    def _collect_corrections(self, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Fetch actual CFEE and update BigQuery for a single trade.
+        Fetch fee corrections for all trades.
+
+        The activity ledger for the combined settlement window is loaded once
+        up front, so each per-trade lookup is served from memory.
+
+        Args:
+            trades: Trade dictionaries from BigQuery
+
+        Returns:
+            Correction rows for trades that could be reconciled
+        """
+        windows = [self._settlement_window(t) for t in trades]
+        try:
+            self.execution_engine.get_activity_ledger(
+                min(start for start, _ in windows), max(end for _, end in windows)
+            )
+        except Exception as e:
+            # Per-trade lookups retry the fetch with backoff
+            logger.warning(
+                "[fee_patch] Activity ledger prefetch failed.", extra={"error": str(e)}
+            )
+
+        corrections = [self._fetch_fee_correction(trade) for trade in trades]
+        return [c for c in corrections if c is not None]
+
+    @staticmethod
+    def _settlement_window(trade: Dict[str, Any]) -> tuple[date, date]:
+        """CFEE window: entry_time - 1 day to exit_time + 2 days (T+1 settlement)."""
+        return (
+            (trade["entry_time"] - timedelta(days=1)).date(),
+            (trade["exit_time"] + timedelta(days=2)).date(),
+        )
+
+    def _fetch_fee_correction(self, trade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch actual CFEE for a single trade.
 
         Args:
             trade: Trade dictionary from BigQuery
 
         Returns:
-            True if patched successfully
+            Correction row (trade_id, actual_fee_usd, fee_calculation_type,
+            fee_tier), or None if the trade cannot be reconciled
         """
         try:
             # Collect all order IDs for this trade
@@ -131,12 +178,10 @@ class FeePatchPipeline:
                 logger.warning(
                     f"[fee_patch] No order IDs for trade {trade['trade_id']}, skipping"
                 )
-                return False
+                return None
 
-            # Fetch CFEE from Alpaca
-            # Use entry_time - 1 day to exit_time + 2 days for settlement window
-            start_date = (trade["entry_time"] - timedelta(days=1)).date()
-            end_date = (trade["exit_time"] + timedelta(days=2)).date()
+            # Look up CFEE for the settlement window
+            start_date, end_date = self._settlement_window(trade)
 
             cfee_result = self.execution_engine.get_crypto_fees_by_orders(
                 order_ids=order_ids,
@@ -156,48 +201,90 @@ class FeePatchPipeline:
                 fee_calculation_type = "ESTIMATED"
                 actual_fee_usd = trade["estimated_fee_usd"]
 
-            # Update BigQuery
-            update_query = f"""
-            UPDATE `{self.fact_table_id}`
-            SET
-                fee_finalized = TRUE,
-                actual_fee_usd = @actual_fee_usd,
-                fee_calculation_type = @fee_calculation_type,
-                fee_tier = @fee_tier,
-                fee_reconciled_at = CURRENT_TIMESTAMP(),
-                fees_usd = @actual_fee_usd,
-                pnl_usd = pnl_usd + (fees_usd - @actual_fee_usd)
-            WHERE trade_id = @trade_id
-            """
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter(
-                        "actual_fee_usd", "FLOAT64", actual_fee_usd
-                    ),
-                    bigquery.ScalarQueryParameter(
-                        "fee_calculation_type", "STRING", fee_calculation_type
-                    ),
-                    bigquery.ScalarQueryParameter("fee_tier", "STRING", fee_tier),
-                    bigquery.ScalarQueryParameter(
-                        "trade_id", "STRING", trade["trade_id"]
-                    ),
-                ]
+            logger.debug(
+                f"[fee_patch] {trade['trade_id']}: "
+                f"${trade['estimated_fee_usd']:.2f} → ${actual_fee_usd:.2f} ({fee_calculation_type})"
             )
 
-            update_job = self.bq_client.query(update_query, job_config=job_config)
-            update_job.result()
+            return {
+                "trade_id": trade["trade_id"],
+                "actual_fee_usd": actual_fee_usd,
+                "fee_calculation_type": fee_calculation_type,
+                "fee_tier": fee_tier,
+            }
 
-            logger.info(
-                f"[fee_patch] Patched {trade['trade_id']}: "
-                f"${trade['estimated_fee_usd']:.2f} → ${actual_fee_usd:.2f} ({fee_calculation_type})"
+        except Exception as e:
+            logger.error(
+                f"[fee_patch] Failed to fetch fees for {trade['trade_id']}.",
+                extra={"trade_id": trade["trade_id"], "error": str(e)},
             )
+            return None
+
+    def _apply_corrections(self, corrections: List[Dict[str, Any]]) -> int:
+        """
+        Apply fee corrections to BigQuery in a single MERGE.
+
+        Args:
+            corrections: Rows from _fetch_fee_correction
+
+        Returns:
+            Number of trades patched (0 if the MERGE fails)
+        """
+        if not corrections:
+            return 0
 
-            return True
+        merge_query = f"""
+        MERGE `{self.fact_table_id}` AS T
+        USING (SELECT * FROM UNNEST(@corrections)) AS S
+        ON T.trade_id = S.trade_id
+        WHEN MATCHED THEN
+            UPDATE SET
+                fee_finalized = TRUE,
+                actual_fee_usd = S.actual_fee_usd,
+                fee_calculation_type = S.fee_calculation_type,
+                fee_tier = S.fee_tier,
+                fee_reconciled_at = CURRENT_TIMESTAMP(),
+                fees_usd = S.actual_fee_usd,
+                pnl_usd = T.pnl_usd + (T.fees_usd - S.actual_fee_usd)
+        """
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter(
+                    "corrections",
+                    "STRUCT",
+                    [
+                        bigquery.StructQueryParameter(
+                            None,
+                            bigquery.ScalarQueryParameter(
+                                "trade_id", "STRING", c["trade_id"]
+                            ),
+                            bigquery.ScalarQueryParameter(
+                                "actual_fee_usd", "FLOAT64", c["actual_fee_usd"]
+                            ),
+                            bigquery.ScalarQueryParameter(
+                                "fee_calculation_type",
+                                "STRING",
+                                c["fee_calculation_type"],
+                            ),
+                            bigquery.ScalarQueryParameter(
+                                "fee_tier", "STRING", c["fee_tier"]
+                            ),
+                        )
+                        for c in corrections
+                    ],
+                )
+            ]
+        )
 
+        try:
+            with track_api_call("bigquery", "merge"):
+                self.bq_client.query(merge_query, job_config=job_config).result()
         except Exception as e:
             logger.error(
-                f"[fee_patch] Failed to patch {trade['trade_id']}.",
-                extra={"trade_id": trade["trade_id"], "error": str(e)},
+                f"[fee_patch] MERGE of {len(corrections)} fee corrections failed.",
+                extra={"error": str(e)},
             )
-            return False
+            return 0
+
+        return len(corrections)
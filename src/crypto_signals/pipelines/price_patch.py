@@ -4,13 +4,14 @@ Price Patch Pipeline (Issue #141).
 This pipeline repairs historical BigQuery records with $0.00 exit prices.
 Runs once for historical repair, then daily for new records.
 
-Pattern: "Query-Fetch-Update" (same as FeePatchPipeline from Issue #140)
+Pattern: "Query-Fetch-Merge" (same as FeePatchPipeline from Issue #140)
 1. Query: Get BigQuery rows where exit_fill_price = 0.0 and exit_order_id IS NOT NULL
-2. Fetch: Call Alpaca Orders API for filled_avg_price
-3. Update: Patch BigQuery with actual exit price and set exit_price_finalized = TRUE
+2. Fetch: Call Alpaca Orders API for filled_avg_price (concurrently, rate-paced)
+3. Merge: Apply all corrections in one MERGE and set exit_price_finalized = TRUE
+4. Refresh: Recompute the LIVE strategy aggregates of the patched trades
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from alpaca.trading.models import Order
 from google.cloud import bigquery
@@ -18,6 +19,12 @@ from loguru import logger
 
 from crypto_signals.config import get_settings, get_trading_client
 from crypto_signals.engine.execution import ExecutionEngine
+from crypto_signals.metrics import track_api_call
+from crypto_signals.pipelines.aggregates import (
+    get_patch_trade_aggregates,
+    refresh_patched_trades,
+)
+from crypto_signals.tracing import TracedThreadPoolExecutor
 
 
 class PricePatchPipeline:
@@ -28,18 +35,21 @@ class PricePatchPipeline:
     """
 
     # Configuration Constants
-    MAX_TRADES_PER_RUN = 100  # Batch size for performance and rate limiting
+    MAX_TRADES_PER_RUN = 1000  # Bounded by the Alpaca rate budget, not BigQuery DML
 
     def __init__(self, execution_engine: Any | None = None):
         """Initialize the pipeline."""
         settings = get_settings()
         self.bq_client = bigquery.Client(project=settings.GOOGLE_CLOUD_PROJECT)
+        self.max_workers = settings.PATCH_MAX_WORKERS
 
         # Environment-aware table routing
         env_suffix = "" if settings.ENVIRONMENT == "PROD" else "_test"
         self.fact_table_id = (
             f"{settings.GOOGLE_CLOUD_PROJECT}.crypto_analytics.fact_trades{env_suffix}"
         )
+        # Patched pnl_usd / exit prices change the LIVE strategy aggregates
+        self.aggregates = get_patch_trade_aggregates()
 
         if execution_engine:
             self.execution_engine = execution_engine
@@ -64,14 +74,16 @@ class PricePatchPipeline:
 
         logger.info(f"[price_patch] Found {len(unfinalized_trades)} trades to repair")
 
-        patched_count = 0
-        total_value_restored_usd = 0.0
-
-        for trade in unfinalized_trades:
-            success, restored_val = self._patch_trade_price(trade)
-            if success:
-                patched_count += 1
-                total_value_restored_usd += restored_val
+        # Step 2: Fetch fill prices for every trade, then apply all corrections at once
+        corrections = self._collect_corrections(unfinalized_trades)
+        patched_count = self._apply_corrections(corrections)
+        if patched_count:
+            refresh_patched_trades(
+                self.aggregates, unfinalized_trades, corrections, "price_patch"
+            )
+        total_value_restored_usd = (
+            sum(c["pnl_usd"] for c in corrections) if patched_count else 0.0
+        )
 
         logger.info(
             f"[price_patch] Repaired {patched_count}/{len(unfinalized_trades)} trades. "
@@ -89,6 +101,7 @@ class PricePatchPipeline:
         query = f"""
         SELECT
             trade_id,
+            strategy_id,
             symbol,
             entry_time,
             exit_time,
@@ -103,20 +116,40 @@ class PricePatchPipeline:
         LIMIT {self.MAX_TRADES_PER_RUN}
         """
 
-        query_job = self.bq_client.query(query)
-        results = query_job.result()
+        with track_api_call("bigquery", "query"):
+            results = self.bq_client.query(query).result()
 
         return [dict(row) for row in results]
 
-    def _patch_trade_price(self, trade: Dict[str, Any]) -> tuple[bool, float]:
+    def _collect_corrections(self, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
-        Fetch actual exit price from Alpaca and update BigQuery.
+        Fetch exit price corrections for all trades concurrently.
+
+        Workers share the process-wide Alpaca rate limiter, so concurrency
+        shortens wall time without exceeding the API budget.
+
+        Args:
+            trades: Trade dictionaries from BigQuery
+
+        Returns:
+            Correction rows for trades with a confirmed fill price
+        """
+        with TracedThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="price_patch"
+        ) as pool:
+            results = list(pool.map(self._fetch_price_correction, trades))
+        return [c for c in results if c is not None]
+
+    def _fetch_price_correction(self, trade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the actual exit price for a single trade from Alpaca.
 
         Args:
             trade: Trade dictionary from BigQuery
 
         Returns:
-            Tuple (Success Boolean, Restored Dollar Value)
+            Correction row (trade_id, actual_exit_price, pnl_usd), or None if
+            the order has no fill price
         """
         try:
             exit_order_id = trade.get("exit_order_id")
@@ -124,14 +157,14 @@ class PricePatchPipeline:
                 logger.warning(
                     f"[price_patch] No exit_order_id for trade {trade['trade_id']}, skipping"
                 )
-                return (False, 0.0)
+                return None
 
             # Fetch order details from Alpaca
             exit_order = self.execution_engine.get_order_details(exit_order_id)
 
             if not isinstance(exit_order, Order):
                 logger.warning(f"[price_patch] Order {exit_order_id} not found in Alpaca")
-                return (False, 0.0)
+                return None
 
             # Extract exit fill price
             actual_exit_price = None
@@ -143,7 +176,7 @@ class PricePatchPipeline:
                     f"[price_patch] Order {exit_order_id} has no fill price "
                     f"(status: {exit_order.status})"
                 )
-                return (False, 0.0)
+                return None
 
             # Recalculate PnL with actual exit price
             # NOTE: entry_price/qty missing in some schema versions, defaulting PnL to 0.0
@@ -151,43 +184,82 @@ class PricePatchPipeline:
             # qty = trade.get("qty", 0.0)
             pnl_usd = 0.0
 
-            # Update BigQuery
-            update_query = f"""
-            UPDATE `{self.fact_table_id}`
-            SET
-                exit_price_finalized = TRUE,
-                exit_price = @actual_exit_price,
-                exit_price_reconciled_at = CURRENT_TIMESTAMP(),
-                pnl_usd = @pnl_usd
-            WHERE trade_id = @trade_id
-            """
-
-            job_config = bigquery.QueryJobConfig(
-                query_parameters=[
-                    bigquery.ScalarQueryParameter(
-                        "actual_exit_price", "FLOAT64", actual_exit_price
-                    ),
-                    bigquery.ScalarQueryParameter("pnl_usd", "FLOAT64", pnl_usd),
-                    bigquery.ScalarQueryParameter(
-                        "trade_id", "STRING", trade["trade_id"]
-                    ),
-                ]
-            )
-
-            update_job = self.bq_client.query(update_query, job_config=job_config)
-            update_job.result()
-
-            logger.info(
-                f"[price_patch] Patched {trade['trade_id']}: "
+            logger.debug(
+                f"[price_patch] {trade['trade_id']}: "
                 f"${trade['current_exit_price']:.2f} → ${actual_exit_price:.2f} "
                 f"(PnL: ${pnl_usd:.2f})"
             )
 
-            return (True, pnl_usd)  # Return PnL impact as restored value
+            return {
+                "trade_id": trade["trade_id"],
+                "actual_exit_price": actual_exit_price,
+                "pnl_usd": pnl_usd,
+            }
 
         except Exception as e:
             logger.error(
-                f"[price_patch] Failed to patch {trade['trade_id']}.",
+                f"[price_patch] Failed to fetch exit price for {trade['trade_id']}.",
                 extra={"trade_id": trade["trade_id"], "error": str(e)},
             )
-            return (False, 0.0)
+            return None
+
+    def _apply_corrections(self, corrections: List[Dict[str, Any]]) -> int:
+        """
+        Apply exit price corrections to BigQuery in a single MERGE.
+
+        Args:
+            corrections: Rows from _fetch_price_correction
+
+        Returns:
+            Number of trades patched (0 if the MERGE fails)
+        """
+        if not corrections:
+            return 0
+
+        merge_query = f"""
+        MERGE `{self.fact_table_id}` AS T
+        USING (SELECT * FROM UNNEST(@corrections)) AS S
+        ON T.trade_id = S.trade_id
+        WHEN MATCHED THEN
+            UPDATE SET
+                exit_price_finalized = TRUE,
+                exit_price = S.actual_exit_price,
+                exit_price_reconciled_at = CURRENT_TIMESTAMP(),
+                pnl_usd = S.pnl_usd
+        """
+
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ArrayQueryParameter(
+                    "corrections",
+                    "STRUCT",
+                    [
+                        bigquery.StructQueryParameter(
+                            None,
+                            bigquery.ScalarQueryParameter(
+                                "trade_id", "STRING", c["trade_id"]
+                            ),
+                            bigquery.ScalarQueryParameter(
+                                "actual_exit_price", "FLOAT64", c["actual_exit_price"]
+                            ),
+                            bigquery.ScalarQueryParameter(
+                                "pnl_usd", "FLOAT64", c["pnl_usd"]
+                            ),
+                        )
+                        for c in corrections
+                    ],
+                )
+            ]
+        )
+
+        try:
+            with track_api_call("bigquery", "merge"):
+                self.bq_client.query(merge_query, job_config=job_config).result()
+        except Exception as e:
+            logger.error(
+                f"[price_patch] MERGE of {len(corrections)} price corrections failed.",
+                extra={"error": str(e)},
+            )
+            return 0
+
+        return len(corrections)
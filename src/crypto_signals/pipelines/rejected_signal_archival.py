@@ -11,7 +11,7 @@ Pattern: Extract-Transform-Load
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
 from google.cloud import firestore
@@ -26,10 +26,18 @@ from crypto_signals.config import (
 from crypto_signals.domain.schemas import AssetClassFee, FactRejectedSignal, OrderSide
 from crypto_signals.market.data_provider import MarketDataProvider
 from crypto_signals.pipelines.base import BigQueryPipelineBase
+from crypto_signals.pipelines.checkpoint import (
+    DOCUMENT_ID_FIELD,
+    ExtractionCheckpoint,
+    paginate,
+)
 
 # Validity window for signals (7 days)
 VALIDITY_WINDOW_DAYS = 7
 
+# Page size for cursor-paginated extraction (one micro-batch per page)
+EXTRACTION_PAGE_SIZE = 100
+
 
 class RejectedSignalArchival(BigQueryPipelineBase):
     """
@@ -69,36 +77,50 @@ class RejectedSignalArchival(BigQueryPipelineBase):
         crypto_client = get_crypto_data_client()
         self.market_provider = MarketDataProvider(stock_client, crypto_client)
 
-    def extract(self) -> List[Any]:
-        """
-        Extract rejected signals ready for archival.
-
-        Only extracts signals older than 7 days to ensure enough market data
-        for theoretical P&L calculation.
-        """
-        logger.info(f"[{self.job_name}] extracting rejected signals from Firestore...")
-
+    def _iter_batches(
+        self, checkpoint: Optional[ExtractionCheckpoint]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield pages of rejected signals older than the validity window."""
         # Get signals older than 7 days
         cutoff = datetime.now(timezone.utc).replace(
             hour=0, minute=0, second=0, microsecond=0
         ) - timedelta(days=VALIDITY_WINDOW_DAYS)
 
-        docs = (
-            self.firestore_client.collection(self.source_collection)
-            .where(filter=FieldFilter("created_at", "<", cutoff))
-            .limit(100)  # Process in batches
-            .stream()
+        query = self.firestore_client.collection(self.source_collection).where(
+            filter=FieldFilter("created_at", "<", cutoff)
         )
+        for docs in paginate(
+            query,
+            ["created_at", DOCUMENT_ID_FIELD],
+            EXTRACTION_PAGE_SIZE,
+            checkpoint,
+            self.source_collection,
+        ):
+            raw_data = []
+            for doc in docs:
+                data = doc.to_dict()
+                if data:
+                    data["_doc_id"] = doc.id  # Preserve doc ID for cleanup
+                    raw_data.append(data)
+
+            logger.info(f"[{self.job_name}] extracted {len(raw_data)} rejected signals.")
+            if raw_data:
+                yield raw_data
+
+    def extract_batches(self) -> Iterator[List[Any]]:
+        """
+        Drain rejected signals ready for archival, one checkpointed page at a time.
 
-        raw_data = []
-        for doc in docs:
-            data = doc.to_dict()
-            if data:
-                data["_doc_id"] = doc.id  # Preserve doc ID for cleanup
-                raw_data.append(data)
+        Only extracts signals older than 7 days to ensure enough market data
+        for theoretical P&L calculation.
+        """
+        logger.info(f"[{self.job_name}] extracting rejected signals from Firestore...")
+        checkpoint = ExtractionCheckpoint(self.firestore_client, self.job_name)
+        yield from self._iter_batches(checkpoint)
 
-        logger.info(f"[{self.job_name}] extracted {len(raw_data)} rejected signals.")
-        return raw_data
+    def extract(self) -> List[Any]:
+        """Extract all rejected signals ready for archival (no checkpointing)."""
+        return [r for batch in self._iter_batches(None) for r in batch]
 
     def transform(self, raw_data: List[Any]) -> List[Dict[str, Any]]:
         """
@@ -110,7 +132,7 @@ class RejectedSignalArchival(BigQueryPipelineBase):
             f"[{self.job_name}] Calculating theoretical P&L for {len(raw_data)} signals..."
         )
 
-        transformed = []
+        records: List[Dict[str, Any]] = []
 
         for signal in raw_data:
             try:
@@ -287,8 +309,7 @@ class RejectedSignalArchival(BigQueryPipelineBase):
                     else str(created_at),
                 }
 
-                model = self.schema_model.model_validate(record)
-                transformed.append(model.model_dump(mode="json"))
+                records.append(record)
 
             except Exception as e:
                 logger.error(
@@ -296,6 +317,20 @@ class RejectedSignalArchival(BigQueryPipelineBase):
                 )
                 continue
 
+        # Validate and dump the whole batch in one call each
+        models = []
+        for record, result in zip(
+            records, self.row_transformer.validate(records), strict=True
+        ):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to transform rejected signal {record.get('signal_id')}: "
+                    f"{result}"
+                )
+                continue
+            models.append(result)
+        transformed = self.row_transformer.dump(models)
+
         logger.info(
             f"[{self.job_name}] transformed {len(transformed)} signals with theoretical P&L."
         )
@@ -0,0 +1,106 @@
+"""
+Compiled Row Transformers.
+
+Pipelines validate every record against their schema model and dump it to
+JSON-ready dicts for the BigQuery load job. Doing that per row
+(``model_validate`` + ``model_dump``) crosses the Python/pydantic-core
+boundary twice per record; a ``TypeAdapter`` over ``List[Model]`` validates and
+serializes a whole batch in one call each.
+
+Per-record error isolation is preserved: a failing batch is split into the
+failing indices (from the ValidationError locations) and the remaining
+records, which are re-validated in one more call.
+
+``encode_ndjson`` serializes load-ready rows with pydantic-core's JSON encoder
+(~3x faster than ``json.dumps`` per row, which ``load_table_from_json`` uses).
+
+Usage:
+    >>> transformer = get_row_transformer(FactTheoreticalSignal)
+    >>> results = transformer.validate(records)  # model or exception each
+    >>> rows = transformer.dump([r for r in results if not isinstance(r, Exception)])
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Type, Union
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
+
+
+class RowTransformer:
+    """Batch validator/serializer compiled once per schema model."""
+
+    def __init__(self, model: Type[BaseModel]):
+        """
+        Build the list adapters for a schema model.
+
+        Args:
+            model: Pydantic model describing one row.
+        """
+        self.model = model
+        self._adapter: TypeAdapter = TypeAdapter(List[model])  # type: ignore[valid-type]
+
+    def validate(self, records: Sequence[Any]) -> List[Union[BaseModel, Exception]]:
+        """
+        Validate records in one call, isolating failures per record.
+
+        Args:
+            records: Raw dicts (or model instances).
+
+        Returns:
+            List aligned with ``records``: the validated model, or the
+            exception (usually ValidationError) raised for that record.
+        """
+        records = list(records)
+        try:
+            return list(self._adapter.validate_python(records))
+        except ValidationError as e:
+            failed = {
+                err["loc"][0]
+                for err in e.errors()
+                if err.get("loc") and isinstance(err["loc"][0], int)
+            } or set(range(len(records)))
+        except Exception:
+            # Non-validation errors raised by model validators carry no index
+            failed = set(range(len(records)))
+
+        results: List[Union[BaseModel, Exception]] = [None] * len(records)  # type: ignore[list-item]
+        for idx in failed:
+            try:
+                results[idx] = self.model.model_validate(records[idx])
+            except Exception as err:
+                results[idx] = err
+
+        remaining = [i for i in range(len(records)) if i not in failed]
+        if remaining:
+            models = self._adapter.validate_python([records[i] for i in remaining])
+            for idx, model in zip(remaining, models, strict=True):
+                results[idx] = model
+        return results
+
+    def validate_all(self, records: Sequence[Any]) -> List[BaseModel]:
+        """Validate records in one call; raises on the first invalid batch."""
+        return list(self._adapter.validate_python(list(records)))
+
+    def dump(self, models: Sequence[BaseModel]) -> List[Dict[str, Any]]:
+        """Serialize validated models to JSON-ready dicts in one call."""
+        return self._adapter.dump_python(list(models), mode="json")
+
+    def transform(self, records: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Strict validate + dump (raises ValidationError on any invalid record)."""
+        return self.dump(self.validate_all(records))
+
+
+@lru_cache(maxsize=None)
+def get_row_transformer(model: Type[BaseModel]) -> RowTransformer:
+    """Shared RowTransformer for a schema model (adapters are built once)."""
+    return RowTransformer(model)
+
+
+def encode_ndjson(rows: Sequence[Dict[str, Any]]) -> bytes:
+    """
+    Encode rows as newline-delimited JSON for a BigQuery load job.
+
+    NaN/Infinity floats become null (BigQuery rejects them in JSON loads).
+    """
+    return b"\n".join(to_json(row, inf_nan_mode="null") for row in rows)
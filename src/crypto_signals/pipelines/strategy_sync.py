@@ -8,11 +8,12 @@ to BigQuery (dim_strategies), maintaining a full history of changes (SCD Type 2)
 import hashlib
 import json
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 
 from crypto_signals.domain.schemas import StagingStrategy
+from crypto_signals.metrics import track_api_call
 from crypto_signals.pipelines.base import BigQueryPipelineBase
 from crypto_signals.repository.firestore import StrategyRepository
 
@@ -77,7 +78,8 @@ class StrategySyncPipeline(BigQueryPipelineBase):
             WHERE valid_to IS NULL
         """
         try:
-            results = self.bq_client.query(query).result()
+            with track_api_call("bigquery", "query"):
+                results = self.bq_client.query(query).result()
             return {row.strategy_id: row.config_hash for row in results}
         except Exception as e:
             logger.warning(
@@ -166,7 +168,20 @@ class StrategySyncPipeline(BigQueryPipelineBase):
         """No-op for strategy sync (we don't delete source)."""
         pass
 
-    def _get_merge_sql(self, source_table_id: str) -> str:
+    def _partition_range(
+        self, data: List[Dict[str, Any]], schema: List[Any]
+    ) -> Optional[Tuple[str, Any, Any]]:
+        """
+        No partition pruning: the current version of a strategy can live in any
+        partition, so the SCD2 UPDATE cannot be limited to the batch's range.
+        """
+        return None
+
+    def _get_merge_sql(
+        self,
+        source_table_id: str,
+        partition_range: Optional[Tuple[str, Any, Any]] = None,
+    ) -> str:
         """
         Execute SCD Type 2 Merge.
         1. Close old records (Update valid_to)
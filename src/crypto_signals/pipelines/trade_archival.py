@@ -7,15 +7,16 @@ details (fees, fill times) from the Alpaca API.
 
 Pattern: "Enrich-Extract-Load"
 1. Extract: Get CLOSED positions from Firestore.
-2. Transform: Call Alpaca API for each position to get truth data (fees, times).
+2. Transform: Prefetch Alpaca orders, fee activities and daily bars concurrently,
+   then derive PnL, fees, slippage and MFE/MAE from the prefetched data.
 3. Load: Push to BigQuery via BasePipeline (Truncate->Staging->Merge).
 """
 
-import time
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from alpaca.common.exceptions import APIError
 from google.cloud import firestore
@@ -29,8 +30,71 @@ from crypto_signals.config import (
     get_trading_client,
 )
 from crypto_signals.domain.schemas import ExitReason, OrderSide, TradeExecution
+from crypto_signals.engine.activity_ledger import ActivityLedger
 from crypto_signals.market.data_provider import MarketDataProvider
+from crypto_signals.metrics import track_api_call
+from crypto_signals.pipelines.aggregates import live_trade_aggregates
 from crypto_signals.pipelines.base import BigQueryPipelineBase
+from crypto_signals.tracing import TracedThreadPoolExecutor
+
+
+def _parse_dt(val: Any, fallback_val: Any = None, position_id: Any = None) -> datetime:
+    """Firestore timestamp or ISO string -> datetime, else fallback, else now()."""
+    if isinstance(val, datetime):
+        return val
+
+    if val:
+        try:
+            # Parse ISO string
+            return datetime.fromisoformat(str(val))
+        except (ValueError, TypeError) as exc:
+            logger.warning(f"Failed to parse datetime value '{val}'; Error: {exc}")
+
+    # Fallback logic
+    if fallback_val:
+        return fallback_val
+
+    # Final resort: now()
+    # Only warn if we really have no data
+    logger.warning(
+        f"Missing timestamps and no fallback available for {position_id}. "
+        "Defaulting to NOW."
+    )
+    return datetime.now(timezone.utc)
+
+
+def _bars_key(pos: dict) -> Tuple[str, str]:
+    """Bar cache key for a position: (symbol, asset_class)."""
+    return (pos.get("symbol"), pos.get("asset_class", "CRYPTO"))
+
+
+def _align_tz(value: datetime, tz: Any) -> pd.Timestamp:
+    """Timestamp in the bars index timezone (naive values are assumed UTC)."""
+    ts = pd.Timestamp(value)
+    if tz is None:
+        return ts.tz_convert(None) if ts.tzinfo else ts
+    return (
+        ts.tz_localize("UTC").tz_convert(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+    )
+
+
+def _window_reduce(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, ufunc: np.ufunc
+) -> np.ndarray:
+    """
+    Reduce ``values[starts[i]:ends[i]]`` for every window in one pass.
+
+    Windows may overlap. Empty windows yield NaN. Use NaN-ignoring ufuncs
+    (``np.fmax`` / ``np.fmin``) so missing bar values are skipped.
+    """
+    # Sentinel so that end == len(values) is a valid reduceat index
+    padded = np.append(values, np.nan)
+    bounds = np.empty(2 * len(starts), dtype=np.intp)
+    bounds[0::2] = starts
+    bounds[1::2] = ends
+    # reduceat reduces [bounds[k], bounds[k + 1]); even slots are the windows
+    reduced = ufunc.reduceat(padded, bounds)[0::2]
+    return np.where(ends > starts, reduced, np.nan)
 
 
 class TradeArchivalPipeline(BigQueryPipelineBase):
@@ -40,6 +104,9 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
     Enriches Firestore data with precise execution details from Alpaca.
     """
 
+    # Fee activity window when no position carries an entry time
+    ACTIVITY_LOOKBACK_DAYS = 7
+
     def __init__(self, execution_engine: Any | None = None):
         """Initialize the pipeline with specific configuration."""
         # settings is available via self.settings after super().__init__
@@ -60,6 +127,16 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
         self.firestore_client = firestore.Client(
             project=self.settings.GOOGLE_CLOUD_PROJECT
         )
+        self.aggregate_refreshers = [
+            live_trade_aggregates(
+                self.bq_client,
+                self.guardian,
+                self.settings.GOOGLE_CLOUD_PROJECT,
+                env_suffix,
+                auto_migrate=self.settings.SCHEMA_MIGRATION_AUTO,
+                firestore_client=self.firestore_client,
+            )
+        ]
 
         # Environment-aware collection routing
         self.source_collection = (
@@ -67,6 +144,9 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
         )
 
         self.alpaca = get_trading_client()
+        # Prefetch concurrency; get_trading_client() paces every Alpaca request
+        # through the process-wide rate budget
+        self.max_workers = self.settings.ARCHIVAL_MAX_WORKERS
 
         # Initialize MarketDataProvider with required clients
         stock_client = get_stock_data_client()
@@ -82,16 +162,62 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
 
             self.execution_engine = ExecutionEngine()
 
+    def _get_activity_ledger(self, raw_data: List[Any]) -> Optional[ActivityLedger]:
+        """
+        Load the shared fee activity ledger covering every position in the batch.
+
+        The window starts the day before the earliest entry (or
+        ACTIVITY_LOOKBACK_DAYS ago if no entry time is known) and ends today.
+
+        Args:
+            raw_data: Position dictionaries from Firestore.
+
+        Returns:
+            ActivityLedger, or None if the fetch failed (fees are then estimated).
+        """
+        entry_dates = []
+        for pos in raw_data:
+            entry_time = pos.get("entry_time") if isinstance(pos, dict) else None
+            if isinstance(entry_time, datetime):
+                entry_dates.append(entry_time.date())
+            elif entry_time:
+                try:
+                    entry_dates.append(datetime.fromisoformat(str(entry_time)).date())
+                except ValueError:
+                    continue
+
+        today = datetime.now(timezone.utc).date()
+        start_date = (
+            min(entry_dates) - timedelta(days=1)
+            if entry_dates
+            else today - timedelta(days=self.ACTIVITY_LOOKBACK_DAYS)
+        )
+
+        try:
+            return self.execution_engine.get_activity_ledger(start_date, today)
+        except Exception as e:
+            logger.warning(
+                f"[{self.job_name}] Failed to load activity ledger. "
+                f"Falling back to estimated fees: {e}"
+            )
+            return None
+
     def _get_actual_fees(
-        self, alpaca_order_id: str | None, symbol: str, side: str
+        self,
+        alpaca_order_id: str | None,
+        symbol: str,
+        side: str,
+        ledger: Optional[ActivityLedger] = None,
     ) -> float | None:
         """
-        Fetch actual fees (CFEE) from Alpaca Activities API.
+        Sum actual fees (CSD/CFEE activities) linked to an order.
 
         Args:
             alpaca_order_id: The Alpaca Order ID (UUID).
             symbol: Trading pair symbol (e.g., "BTC/USD").
             side: Order side ("buy" or "sell").
+            ledger: Preloaded activity ledger. Loaded for the default lookback
+                window if not provided.
 
         Returns:
             float: Total fees in USD, or None if no activities found.
@@ -99,27 +225,13 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
         if not alpaca_order_id:
             return None
 
-        try:
-            # Fetch recent account activities (CFEE = Crypto Fee)
-            # Filter by date/type/direction via API parameters to optimize?
-            # alpaca-py `get_account_activities` supports `activity_types`.
-            # Note: We can't filter by order_id in the API call, must filter in client.
-            # Fetching last 100 CFEE activities should cover recent trades.
-
-            # Fetch recent account activities (CFEE = Crypto Fee)
-            # Use public .get() method which handles params correctly in most SDK versions
-            activities = self.alpaca.get(
-                "/account/activities", {"activity_types": "CSD,CFEE"}
-            )
+        if ledger is None:
+            ledger = self._get_activity_ledger([])
+            if ledger is None:
+                return None
 
-            # Filter for this specific order
-            # CFEE activities link to order_id (sometimes in 'id' or separate field depending on SDK version)
-            # Inspecting common pattern: activity.order_id should match.
-            related_activities = [
-                a
-                for a in activities
-                if isinstance(a, dict) and str(a.get("order_id")) == alpaca_order_id
-            ]
+        try:
+            related_activities = ledger.for_order(alpaca_order_id)
 
             if not related_activities:
                 return None
@@ -184,342 +296,407 @@ class TradeArchivalPipeline(BigQueryPipelineBase):
         logger.info(f"[{self.job_name}] extracted {len(raw_data)} closed positions.")
         return raw_data
 
-    def transform(self, raw_data: List[Any]) -> List[dict]:
+    def _fetch_entry_order(self, pos: dict) -> Any:
         """
-        Enrich raw Firestore positions with Alpaca execution details.
+        Fetch the entry order for a position from Alpaca.
+
+        The position_id in Firestore IS the Client Order ID from Alpaca
+        (idempotency key).
+
+        Args:
+            pos: Position dictionary from Firestore.
+
+        Returns:
+            The Alpaca Order, or a synthetic order built from Firestore data if
+            Alpaca does not know the order (theoretical/paper trade).
+
+        Raises:
+            APIError: For any Alpaca error other than "not found".
+        """
+        client_order_id = pos.get("position_id")
+
+        try:
+            # Fetch order by client_order_id to ensure we get the specific trade
+            with track_api_call("alpaca", "get_order_by_client_id"):
+                return self.alpaca.get_order_by_client_id(client_order_id)
+        except APIError as e:
+            # Specific handling for 404/Not Found
+            # In Alpaca, the HTTP status code may live on the nested
+            # http_error object.
+            status_code = getattr(getattr(e, "http_error", None), "status_code", None)
+            if status_code == 404 or "not found" in str(e).lower():
+                logger.warning(
+                    f"[{self.job_name}] Order {client_order_id} not found in Alpaca. "
+                    "Assuming Theoretical/Paper trade. Falling back to Firestore data."
+                )
+                # Create synthetic order from Firestore data
+                # Robustness: Ensure qty is handled if missing
+                qty_fallback = pos.get("qty", 0.0) or 0.0
+                return SimpleNamespace(
+                    id=None,
+                    filled_avg_price=pos.get("entry_fill_price") or 0.0,
+                    filled_qty=qty_fallback,
+                    side=pos.get("side", "buy").lower(),
+                )
+            raise
+
+    def _fetch_bars(self, key: Tuple[str, str]) -> Optional[pd.DataFrame]:
+        """Fetch full daily bar history for a (symbol, asset_class) key."""
+        symbol, asset_class = key
+        try:
+            return self.market_provider.get_daily_bars(
+                symbol=symbol,
+                asset_class=asset_class,
+                lookback_days=None,
+            )
+        except Exception as e:
+            logger.warning(f"[{self.job_name}] Failed to fetch bars for {symbol}: {e}")
+            return None
+
+    def _prefetch(
+        self, raw_data: List[Any]
+    ) -> Tuple[List[Any], Dict[Tuple[str, str], Optional[pd.DataFrame]]]:
+        """
+        I/O stage: fetch entry orders and daily bars for the whole batch.
+
+        Order lookups (one per position) and bar fetches (one per distinct
+        symbol) share one bounded worker pool, so a large backlog costs
+        roughly ``len(raw_data) / max_workers`` round trips instead of one
+        sequential round trip per position.
 
         Args:
             raw_data: List of position dictionaries from Firestore.
 
         Returns:
-            List[dict]: Enriched data matching TradeExecution schema (as dicts).
+            Tuple of (orders aligned with raw_data, each an order or the
+            exception raised fetching it; bars keyed by (symbol, asset_class)).
         """
+
+        def fetch_order(pos: dict) -> Any:
+            try:
+                return self._fetch_entry_order(pos)
+            except Exception as e:
+                return e
+
+        bar_keys = list(dict.fromkeys(_bars_key(pos) for pos in raw_data))
+
+        with TracedThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="trade_archival"
+        ) as pool:
+            bar_futures = {key: pool.submit(self._fetch_bars, key) for key in bar_keys}
+            orders = list(pool.map(fetch_order, raw_data))
+            bars = {key: future.result() for key, future in bar_futures.items()}
+
         logger.info(
-            f"[{self.job_name}] Enriching {len(raw_data)} trades with Alpaca data..."
+            f"[{self.job_name}] Prefetched {len(orders)} orders and "
+            f"{len(bars)} symbol bar histories",
+            extra={"orders": len(orders), "symbols": len(bars)},
         )
+        return orders, bars
+
+    def _build_trade_fields(
+        self,
+        pos: dict,
+        order: Any,
+        activity_ledger: Optional[ActivityLedger],
+        fee_tier_info: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        CPU stage: derive TradeExecution fields for one position.
 
-        transformed = []
+        Computes PnL, fees, slippage and timestamps. Excursions (MFE/MAE) are
+        filled in afterwards for the whole batch by ``_compute_excursions``.
 
-        # Symbol-based cache to prevent redundant API calls
-        # Key: f"{symbol}_{asset_class}", Value: DataFrame of daily bars
-        symbol_bars_cache: dict = {}
+        Args:
+            pos: Position dictionary from Firestore.
+            order: Prefetched entry order (real or synthetic).
+            activity_ledger: Preloaded fee activities, or None to estimate fees.
+            fee_tier_info: Current fee tier (used when fees are estimated).
 
-        for idx, pos in enumerate(raw_data):
-            # Rate Limit Safety: Sleep 100ms between requests
-            # (skip before first request)
-            if idx > 0:
-                time.sleep(0.1)
+        Returns:
+            Keyword arguments for TradeExecution.
+        """
+        # 1. Derived Metrics
+        # Note: Alpaca 'filled_avg_price' is the source of truth
+        # for execution price
+        entry_price_val = float(order.filled_avg_price) if order.filled_avg_price else 0.0
+        qty = float(order.filled_qty) if order.filled_qty else 0.0
+
+        # Target price from original Signal (stored in Firestore position)
+        # This is the price we *intended* to enter at
+        # Use target_entry_price if available, fallback to entry_fill_price for legacy
+        target_price = float(
+            pos.get("target_entry_price")
+            if pos.get("target_entry_price") is not None
+            else (pos.get("entry_fill_price") or 0.0)
+        )
 
-            try:
-                # 1. Fetch Order Details from Alpaca to get Fees and Exact Times
-                # The position_id in Firestore IS the Client Order ID from Alpaca
-                # (idempotency key)
-                client_order_id = pos.get("position_id")
+        # Source of Truth: Alpaca Order Side (Entry Order)
+        # Cast to string to handle Enum or str types robustly
+        alpaca_order_id = str(order.id) if order.id else None
+        order_side_str = str(order.side).lower()
+
+        # exit_price_val comes from final close
+        # Weighted average will be calculated by the TradeExecution model validator
+        exit_price_val = float(pos.get("exit_fill_price") or 0.0)
+
+        # Timestamps retrieval
+        # Extract Alpaca timestamp for fallback (filled_at or submitted_at)
+        # Handle both SimpleNamespace (paper/fallback) and real Order objects
+        alpaca_time = getattr(order, "filled_at", None)
+        if not alpaca_time:
+            alpaca_time = getattr(order, "submitted_at", None)
+
+        position_id = pos.get("position_id")
+
+        entry_time = _parse_dt(pos.get("entry_time"), alpaca_time, position_id)
+        # We only fetch the entry order, so for exit time the order's fill /
+        # update time is the best fallback: defaulting to 'entry' time is better
+        # than 'now' for historical trades ("which day" matters for ds).
+        exit_fallback = (
+            getattr(order, "filled_at", None)
+            or getattr(order, "updated_at", None)
+            or alpaca_time
+        )
+        exit_time = _parse_dt(pos.get("exit_time"), exit_fallback, position_id)
+
+        # 2. Fees: Try ACTUAL fees from Alpaca Activities (CFEE)
+        fees_usd = 0.0
+        fee_calculation_type = "ESTIMATED"
+        fee_tier = None
+        actual_fee_usd = None
+
+        if pos.get("asset_class") == "CRYPTO":
+            actual_fee_usd = (
+                self._get_actual_fees(
+                    alpaca_order_id,
+                    pos.get("symbol"),
+                    order_side_str,
+                    ledger=activity_ledger,
+                )
+                if activity_ledger is not None
+                else None
+            )
 
-                try:
-                    # Fetch order by client_order_id to ensure we get the specific trade
-                    order = self.alpaca.get_order_by_client_id(client_order_id)
-                except APIError as e:
-                    # Specific handling for 404/Not Found
-                    # In Alpaca, the HTTP status code may live on the nested
-                    # http_error object.
-                    status_code = getattr(
-                        getattr(e, "http_error", None), "status_code", None
-                    )
-                    if status_code == 404 or "not found" in str(e).lower():
-                        logger.warning(
-                            f"[{self.job_name}] Order {client_order_id} not found in Alpaca. "
-                            "Assuming Theoretical/Paper trade. Falling back to Firestore data."
-                        )
-                        # Create synthetic order from Firestore data
-                        # Robustness: Ensure qty is handled if missing
-                        qty_fallback = pos.get("qty", 0.0) or 0.0
-                        order = SimpleNamespace(
-                            id=None,
-                            filled_avg_price=pos.get("entry_fill_price") or 0.0,
-                            filled_qty=qty_fallback,
-                            side=pos.get("side", "buy").lower(),
-                        )
-                    else:
-                        raise e
-
-                # Cast order to Any to avoid MyPy 'dict' inference errors (Issue #114)
-                from typing import Any, cast
-
-                order = cast(Any, order)
-
-                # 2. Calculate Derived Metrics
-                # Note: Alpaca 'filled_avg_price' is the source of truth
-                # for execution price
-                if isinstance(order, SimpleNamespace):
-                    entry_price_val = float(order.filled_avg_price or 0.0)
-                    qty = float(order.filled_qty or 0.0)
-                else:
-                    entry_price_val = (
-                        float(order.filled_avg_price) if order.filled_avg_price else 0.0
-                    )
-                    qty = float(order.filled_qty) if order.filled_qty else 0.0
-
-                # Target price from original Signal (stored in Firestore position)
-                # This is the price we *intended* to enter at
-                # Use target_entry_price if available, fallback to entry_fill_price for legacy
-                target_price = float(
-                    pos.get("target_entry_price")
-                    if pos.get("target_entry_price") is not None
-                    else (pos.get("entry_fill_price") or 0.0)
+            if actual_fee_usd is not None:
+                fees_usd = actual_fee_usd
+                fee_calculation_type = "ACTUAL_CFEE"
+                logger.debug(
+                    f"Using ACTUAL fees for {pos.get('symbol')}: ${fees_usd:.2f}"
                 )
+            else:
+                # Fallback to Estimation
+                # Use taker fee (conservative, most trades are takers)
+                taker_fee_pct = fee_tier_info["taker_fee_pct"]
+                fee_tier = fee_tier_info["tier_name"]
+
+                # Fee = (Entry Value + Exit Value) * taker_fee_pct / 100
+                entry_val = entry_price_val * qty
+                exit_val = exit_price_val * qty
+                fees_usd = (entry_val + exit_val) * (taker_fee_pct / 100.0)
+
+                logger.debug(
+                    f"Using ESTIMATED fees for {pos.get('symbol')}: "
+                    f"${fees_usd:.2f} ({fee_tier})"
+                )
+
+        # 3. PnL using ALPACA entry price (Truth) vs Firestore Exit Price
+        pnl_gross = (exit_price_val - entry_price_val) * qty
+
+        if order_side_str == OrderSide.SELL.value:  # Short
+            pnl_gross = (entry_price_val - exit_price_val) * qty
 
-                # Source of Truth: Alpaca Order Side (Entry Order)
-                # Cast to string to handle Enum or str types robustly
-                # Cast order to Any to avoid MyPy 'dict' inference error
-                from typing import cast
+        pnl_usd = pnl_gross - fees_usd
 
-                order_any = cast(Any, order)
+        # PnL % should be a percentage value (e.g. 5.0 for 5%), not a ratio
+        cost_basis = entry_price_val * qty
+        pnl_pct = (pnl_usd / cost_basis * 100.0) if cost_basis else 0.0
 
-                alpaca_order_id = (
-                    str(order_any.id) if tuple([order_any.id]) and order_any.id else None
+        # 4. Slippage Calculation (Direction-Aware)
+        # For LONG: positive slippage = filled higher (unfavorable)
+        # For SHORT: positive slippage = filled lower (unfavorable)
+        if target_price:
+            if order_side_str == OrderSide.BUY.value:  # Long
+                slippage_pct = round(
+                    ((entry_price_val - target_price) / target_price * 100.0), 4
                 )
+            else:  # Short
+                # Inverted formula: (target - actual) / target
+                slippage_pct = round(
+                    ((target_price - entry_price_val) / target_price * 100.0), 4
+                )
+        else:
+            slippage_pct = 0.0
+
+        duration = int((exit_time - entry_time).total_seconds())
+
+        return dict(
+            ds=entry_time.date(),
+            trade_id=position_id,
+            account_id=pos.get("account_id"),
+            strategy_id=pos.get("strategy_id") or "UNKNOWN",
+            asset_class=pos.get("asset_class", "CRYPTO"),
+            symbol=pos.get("symbol"),
+            side=pos.get("side"),
+            qty=qty,  # Authenticated from Alpaca
+            entry_price=entry_price_val,  # Authenticated from Alpaca
+            exit_price=exit_price_val,  # Will be weighted-averaged by model!
+            entry_time=entry_time,
+            exit_time=exit_time,
+            pnl_usd=round(pnl_usd, 2),
+            pnl_pct=round(pnl_pct, 4),
+            fees_usd=round(fees_usd, 2),
+            slippage_pct=slippage_pct,
+            trade_duration=duration,
+            exit_reason=ExitReason(pos.get("exit_reason", ExitReason.TP1.value)),
+            # Propagate Discord thread_id for social context analytics
+            discord_thread_id=pos.get("discord_thread_id"),
+            # Propagate final trailing stop for Runner (TP3) exit analysis
+            trailing_stop_final=pos.get("trailing_stop_final"),
+            # New fields for slippage analysis and broker auditability
+            target_entry_price=target_price,
+            alpaca_order_id=alpaca_order_id,
+            # Exit order ID for reconciliation and fill tracking
+            exit_order_id=pos.get("exit_order_id"),
+            # CFEE Reconciliation Fields (Issue #140)
+            fee_finalized=(fee_calculation_type == "ACTUAL_CFEE"),
+            actual_fee_usd=actual_fee_usd,  # Populated if found
+            fee_calculation_type=fee_calculation_type,
+            fee_tier=fee_tier,  # e.g., "Tier 0"
+            entry_order_id=pos.get("entry_order_id"),  # For CFEE attribution
+            fee_reconciled_at=(
+                datetime.now(timezone.utc)
+                if fee_calculation_type == "ACTUAL_CFEE"
+                else None
+            ),
+            # PASS THROUGH FIELDS FOR MODEL LOGIC
+            scaled_out_prices=pos.get("scaled_out_prices", []),
+            original_qty=pos.get("original_qty"),
+        )
+
+    def _compute_excursions(
+        self,
+        trades: List[Tuple[Tuple[str, str], Dict[str, Any], bool]],
+        bars: Dict[Tuple[str, str], Optional[pd.DataFrame]],
+    ) -> None:
+        """
+        CPU stage: fill MFE/MAE for every trade, vectorized per symbol.
+
+        Each trade window is [entry day, exit day] (inclusive). Window bounds
+        for all trades of a symbol are located with one ``searchsorted`` and
+        the window highs/lows are reduced in one ``reduceat`` pass.
+
+        Args:
+            trades: (bars key, TradeExecution fields, is_long) per trade.
+                Fields are updated in place.
+            bars: Prefetched daily bars keyed by (symbol, asset_class).
+        """
+        by_key: Dict[Tuple[str, str], List[int]] = {}
+        for i, (key, _, _) in enumerate(trades):
+            by_key.setdefault(key, []).append(i)
 
-                order_side_str = str(order_any.side).lower()
-
-                # Get exit price from Firestore document, default to 0.0 if missing
-                exit_price_val = float(pos.get("exit_fill_price", 0.0))
-
-                # exit_price_val initially comes from final close
-                # exit_price_val initially comes from final close
-                # Weighted average will be calculated by the TradeExecution model validator
-                exit_price_val = float(pos.get("exit_fill_price") or 0.0)
-
-                # Timestamps retrieval
-                entry_time_str = pos.get("entry_time")
-                exit_time_str = pos.get("exit_time")
-
-                # Extract Alpaca timestamp for fallback (filled_at or submitted_at)
-                # Handle both SimpleNamespace (paper/fallback) and real Order objects
-                alpaca_time = getattr(order, "filled_at", None)
-                if not alpaca_time:
-                    alpaca_time = getattr(order, "submitted_at", None)
-
-                # Parse or default
-                position_id = pos.get("position_id")
-
-                def parse_dt(val, fallback_val=None, pid=position_id):
-                    if isinstance(val, datetime):
-                        return val
-
-                    if val:
-                        try:
-                            # Parse ISO string
-                            return datetime.fromisoformat(str(val))
-                        except (ValueError, TypeError) as exc:
-                            logger.warning(
-                                f"Failed to parse datetime value '{val}'; Error: {exc}"
-                            )
-
-                    # Fallback logic
-                    if fallback_val:
-                        # Log debug to track this correction
-                        # logger.debug(f"Using fallback time {fallback_val} for missing doc time.")
-                        return fallback_val
-
-                    # Final resort: now()
-                    # Only warn if we really have no data
-                    logger.warning(
-                        f"Missing timestamps and no fallback available for {pid}. Defaulting to NOW."
-                    )
-                    return datetime.now(timezone.utc)
-
-                entry_time = parse_dt(entry_time_str, fallback_val=alpaca_time)
-                # For exit, use the same alpaca_time (usually close enough for daily resolution)
-                # or updated_at if available?
-                # If it's a closed position, exit time is crucial.
-                # Usually filled_at of the order IS the entry time.
-                # But for exit_time, we might differ.
-                # However, defaulting to 'entry' time is better than 'now' for historical trades.
-                # Ideally we'd fetch the EXIT order too, but we only fetched one order (entry usually).
-                # Re-using alpaca_time (entry) is safer for "which day" than now().
-                exit_fallback = (
-                    getattr(order, "filled_at", None)
-                    or getattr(order, "updated_at", None)
-                    or alpaca_time
+        for key, indices in by_key.items():
+            bars_df = bars.get(key)
+            if bars_df is None or bars_df.empty:
+                continue
+            try:
+                if not bars_df.index.is_monotonic_increasing:
+                    bars_df = bars_df.sort_index()
+                index = pd.DatetimeIndex(bars_df.index)
+
+                fields = [trades[i][1] for i in indices]
+                window_start = pd.DatetimeIndex(
+                    [_align_tz(f["entry_time"], index.tz).floor("D") for f in fields]
                 )
-                exit_time = parse_dt(exit_time_str, fallback_val=exit_fallback)
-
-                # CALCULATIONS
-                # Fees: Try to fetch ACTUAL fees from Alpaca Activities (CFEE)
-                fees_usd = 0.0
-                fee_calculation_type = "ESTIMATED"
-                fee_tier = None
-                actual_fee_usd = None
-
-                is_crypto = pos.get("asset_class") == "CRYPTO"
-
-                if is_crypto:
-                    # 1. Try Actual CFEE Lookup
-                    actual_fee_usd = self._get_actual_fees(
-                        alpaca_order_id, pos.get("symbol"), order_side_str
-                    )
-
-                    if actual_fee_usd is not None:
-                        fees_usd = actual_fee_usd
-                        fee_calculation_type = "ACTUAL_CFEE"
-                        logger.debug(
-                            f"Using ACTUAL fees for {pos.get('symbol')}: ${fees_usd:.2f}"
-                        )
-                    else:
-                        # 2. Fallback to Estimation
-                        # Get current fee tier for accurate estimate
-                        tier_info = self.execution_engine.get_current_fee_tier()
-
-                        # Use taker fee (conservative, most trades are takers)
-                        taker_fee_pct = tier_info["taker_fee_pct"]
-                        fee_tier = tier_info["tier_name"]
-
-                        # Fee = (Entry Value + Exit Value) * taker_fee_pct / 100
-                        entry_val = entry_price_val * qty
-                        exit_val = exit_price_val * qty
-                        fees_usd = (entry_val + exit_val) * (taker_fee_pct / 100.0)
-
-                        logger.debug(
-                            f"Using ESTIMATED fees for {pos.get('symbol')}: ${fees_usd:.2f} ({fee_tier})"
-                        )
-
-                # PnL Calculation using ALPACA entry price (Truth) vs
-                # Firestore Exit Price
-                pnl_gross = (exit_price_val - entry_price_val) * qty
-
-                if order_side_str == OrderSide.SELL.value:  # Short
-                    pnl_gross = (entry_price_val - exit_price_val) * qty
-
-                # --- MFE Calculation ---
-                max_favorable_excursion = None
-                try:
-                    # Build cache key from symbol and asset class
-                    symbol = pos.get("symbol")
-                    asset_class = pos.get("asset_class", "CRYPTO")
-                    cache_key = f"{symbol}_{asset_class}"
-
-                    # Check cache before fetching
-                    if cache_key in symbol_bars_cache:
-                        bars_df = symbol_bars_cache[cache_key]
-                    else:
-                        # Fetch bars and store in cache
-                        bars_df = self.market_provider.get_daily_bars(
-                            symbol=symbol,
-                            asset_class=asset_class,
-                            lookback_days=None,
-                        )
-                        symbol_bars_cache[cache_key] = bars_df
-
-                    if not bars_df.empty:
-                        # Filter for trade window
-                        trade_window = bars_df[
-                            (bars_df.index >= pd.Timestamp(entry_time).floor("D"))
-                            & (bars_df.index <= pd.Timestamp(exit_time).ceil("D"))
-                        ]
-
-                        if not trade_window.empty:
-                            if order_side_str == OrderSide.BUY.value:
-                                highest_price = trade_window["high"].max()
-                                max_favorable_excursion = highest_price - entry_price_val
-                            else:  # Short
-                                lowest_price = trade_window["low"].min()
-                                mfe = entry_price_val - lowest_price
-                                max_favorable_excursion = mfe
-
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to calculate MFE for {pos.get('position_id')}: {e}"
-                    )
-
-                pnl_usd = pnl_gross - fees_usd
-
-                # PnL % should be a percentage value (e.g. 5.0 for 5%), not a ratio
-                cost_basis = entry_price_val * qty
-                pnl_pct = (pnl_usd / cost_basis * 100.0) if cost_basis else 0.0
-
-                # Slippage Calculation (Direction-Aware)
-                # For LONG: positive slippage = filled higher (unfavorable)
-                # For SHORT: positive slippage = filled lower (unfavorable)
-                if target_price:
-                    if order_side_str == OrderSide.BUY.value:  # Long
-                        # Long: filled higher than target = positive slippage (bad)
-                        slippage_pct = round(
-                            ((entry_price_val - target_price) / target_price * 100.0), 4
-                        )
-                    else:  # Short
-                        # Short: filled lower than target = positive slippage (bad)
-                        # Inverted formula: (target - actual) / target
-                        slippage_pct = round(
-                            ((target_price - entry_price_val) / target_price * 100.0), 4
-                        )
-                else:
-                    slippage_pct = 0.0
-
-                duration = int((exit_time - entry_time).total_seconds())
-
-                # Construct Model
-                trade = TradeExecution(
-                    ds=entry_time.date(),
-                    trade_id=pos.get("position_id"),
-                    account_id=pos.get("account_id"),
-                    strategy_id=pos.get("strategy_id") or "UNKNOWN",
-                    asset_class=pos.get("asset_class", "CRYPTO"),
-                    symbol=pos.get("symbol"),
-                    side=pos.get("side"),
-                    qty=qty,  # Authenticated from Alpaca
-                    entry_price=entry_price_val,  # Authenticated from Alpaca
-                    exit_price=exit_price_val,  # Will be weighted-averaged by model!
-                    entry_time=entry_time,
-                    exit_time=exit_time,
-                    pnl_usd=round(pnl_usd, 2),
-                    pnl_pct=round(pnl_pct, 4),
-                    fees_usd=round(fees_usd, 2),
-                    slippage_pct=slippage_pct,
-                    trade_duration=duration,
-                    exit_reason=ExitReason(pos.get("exit_reason", ExitReason.TP1.value)),
-                    max_favorable_excursion=max_favorable_excursion,
-                    # Propagate Discord thread_id for social context analytics
-                    discord_thread_id=pos.get("discord_thread_id"),
-                    # Propagate final trailing stop for Runner (TP3) exit analysis
-                    trailing_stop_final=pos.get("trailing_stop_final"),
-                    # New fields for slippage analysis and broker auditability
-                    target_entry_price=target_price,
-                    alpaca_order_id=alpaca_order_id,
-                    # Exit order ID for reconciliation and fill tracking
-                    exit_order_id=pos.get("exit_order_id"),
-                    # CFEE Reconciliation Fields (Issue #140)
-                    fee_finalized=(
-                        fee_calculation_type == "ACTUAL_CFEE"
-                    ),  # Finalized if we got actuals
-                    actual_fee_usd=actual_fee_usd,  # Populated if found
-                    fee_calculation_type=fee_calculation_type,
-                    fee_tier=fee_tier,  # e.g., "Tier 0"
-                    entry_order_id=pos.get("entry_order_id"),  # For CFEE attribution
-                    fee_reconciled_at=(
-                        datetime.now(timezone.utc)
-                        if fee_calculation_type == "ACTUAL_CFEE"
-                        else None
-                    ),
-                    # PASS THROUGH FIELDS FOR MODEL LOGIC
-                    scaled_out_prices=pos.get("scaled_out_prices", []),
-                    original_qty=pos.get("original_qty"),
+                window_end = pd.DatetimeIndex(
+                    [_align_tz(f["exit_time"], index.tz).ceil("D") for f in fields]
                 )
+                starts = index.searchsorted(window_start, side="left")
+                ends = index.searchsorted(window_end, side="right")
 
-                # Validate and Dump to JSON (BasePipeline expects dicts)
-                transformed.append(trade.model_dump(mode="json"))
+                highs = _window_reduce(
+                    bars_df["high"].to_numpy(dtype=float), starts, ends, np.fmax
+                )
+                lows = _window_reduce(
+                    bars_df["low"].to_numpy(dtype=float), starts, ends, np.fmin
+                )
+                entry = np.array([f["entry_price"] for f in fields], dtype=float)
+                is_long = np.array([trades[i][2] for i in indices], dtype=bool)
+
+                mfe = np.where(is_long, highs - entry, entry - lows)
+                mae = np.where(is_long, entry - lows, highs - entry)
+            except Exception as e:
+                logger.warning(
+                    f"[{self.job_name}] Failed to calculate MFE/MAE for {key[0]}: {e}"
+                )
+                continue
+
+            for f, fav, adv in zip(fields, mfe, mae, strict=True):
+                f["max_favorable_excursion"] = None if np.isnan(fav) else float(fav)
+                f["max_adverse_excursion"] = None if np.isnan(adv) else float(adv)
+
+    def transform(self, raw_data: List[Any]) -> List[dict]:
+        """
+        Enrich raw Firestore positions with Alpaca execution details.
+
+        Runs in two stages: a concurrent I/O prefetch (entry orders per
+        position, daily bars per distinct symbol, one fee activity ledger),
+        then a CPU-only stage that derives every trade's metrics from the
+        prefetched data.
+
+        Args:
+            raw_data: List of position dictionaries from Firestore.
 
+        Returns:
+            List[dict]: Enriched data matching TradeExecution schema (as dicts).
+        """
+        logger.info(
+            f"[{self.job_name}] Enriching {len(raw_data)} trades with Alpaca data..."
+        )
+        if not raw_data:
+            return []
+
+        # Stage 1: I/O
+        # One paginated activity fetch for the whole batch (fee lookups are local)
+        activity_ledger = self._get_activity_ledger(raw_data)
+        orders, bars = self._prefetch(raw_data)
+        fee_tier_info = self.execution_engine.get_current_fee_tier()
+
+        # Stage 2: CPU
+        trades: List[Tuple[Tuple[str, str], Dict[str, Any], bool]] = []
+        for pos, order in zip(raw_data, orders, strict=True):
+            try:
+                if isinstance(order, Exception):
+                    raise order
+                fields = self._build_trade_fields(
+                    pos, order, activity_ledger, fee_tier_info
+                )
+                is_long = str(order.side).lower() == OrderSide.BUY.value
+                trades.append((_bars_key(pos), fields, is_long))
             except Exception as e:
-                # Log error but don't stop the whole batch?
-                # For now, log and skip specific bad records to avoid blocking
-                # the pipeline.
+                # Log and skip specific bad records to avoid blocking the pipeline.
                 logger.error(
                     f"[{self.job_name}] Failed to transform position "
                     f"{pos.get('position_id')}: {e}"
                 )
+
+        self._compute_excursions(trades, bars)
+
+        # Validate and Dump to JSON in one call each (BasePipeline expects dicts)
+        records = [fields for _, fields, _ in trades]
+        valid = []
+        for fields, result in zip(
+            records, self.row_transformer.validate(records), strict=True
+        ):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"[{self.job_name}] Failed to transform position "
+                    f"{fields.get('trade_id')}: {result}"
+                )
                 continue
+            valid.append(result)
 
-        return transformed
+        return self.row_transformer.dump(valid)
 
     def cleanup(self, data: List[BaseModel]) -> None:
         """
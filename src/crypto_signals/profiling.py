@@ -0,0 +1,254 @@
+"""
+Sampling Profiler.
+
+Opt-in, low-overhead wall-clock profiler for a whole job run. A daemon thread
+snapshots every thread's Python stack (``sys._current_frames``) at a fixed
+interval and aggregates identical stacks, so the cost is one stack walk per
+thread per sample and memory grows with the number of *distinct* stacks.
+
+Samples are attributed to the run phase active at sampling time (see
+``set_profile_phase``) and written as:
+- collapsed stacks (``phase;thread;frame;...;frame count``) for flamegraph.pl,
+  inferno or speedscope;
+- a speedscope JSON file with one sampled profile per phase.
+
+Idle ThreadPoolExecutor workers are skipped so flame graphs show work and real
+waits (e.g. blocking API calls), not parked pool threads.
+
+Usage (enabled in main via the PROFILE_DIR env var):
+    >>> profiler = start_profiler(interval=0.01)
+    >>> set_profile_phase("signal_generation")
+    >>> ...
+    >>> stop_profiler(".gemini/profiles", "both", "signal_generator")
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+DEFAULT_SAMPLE_INTERVAL = 0.01  # 100 Hz
+MAX_STACK_DEPTH = 128
+IDLE_PHASE = "other"
+
+PROFILE_FORMAT_COLLAPSED = "collapsed"
+PROFILE_FORMAT_SPEEDSCOPE = "speedscope"
+PROFILE_FORMAT_BOTH = "both"
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# (filename, function, first line) for one stack frame
+FrameKey = Tuple[str, str, int]
+
+
+def _is_idle_worker(leaf: FrameKey) -> bool:
+    """A pool thread parked in ``_worker`` waiting on its (C-level) queue."""
+    filename, name, _ = leaf
+    return name == "_worker" and filename.endswith(
+        os.path.join("concurrent", "futures", "thread.py")
+    )
+
+
+class SamplingProfiler:
+    """Background stack sampler with per-phase aggregation."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            interval: Seconds between samples.
+        """
+        self.interval = interval
+        self.phase = IDLE_PHASE
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        # (phase, thread name, frames root->leaf) -> sample count
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling from a daemon thread."""
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.started_at is not None:
+            self.duration = time.monotonic() - self.started_at
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip_thread_id=own_id)
+
+    def sample(self, skip_thread_id: Optional[int] = None) -> None:
+        """Record one stack per thread (called by the sampler thread)."""
+        names = {t.ident: t.name for t in threading.enumerate()}
+        phase = self.phase
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == skip_thread_id:
+                continue
+            stack: List[FrameKey] = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            if not stack or _is_idle_worker(stack[0]):
+                continue
+            stack.reverse()
+            self._stacks[(phase, names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+        self.samples += 1
+
+    def phase_totals(self) -> Dict[str, int]:
+        """Thread-samples per phase."""
+        totals: Counter = Counter()
+        for (phase, _, _), count in self._stacks.items():
+            totals[phase] += count
+        return dict(totals)
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Leaf functions with the most self samples."""
+        leaves: Counter = Counter()
+        for (_, _, frames), count in self._stacks.items():
+            leaves[_frame_label(frames[-1])] += count
+        return leaves.most_common(limit)
+
+    def to_collapsed(self) -> str:
+        """Collapsed-stack lines: ``phase;thread;frames... count``."""
+        lines = []
+        for (phase, thread_name, frames), count in sorted(
+            self._stacks.items(), key=lambda item: -item[1]
+        ):
+            path = ";".join(
+                [f"phase:{phase}", f"thread:{thread_name}"]
+                + [_frame_label(f).replace(";", ":") for f in frames]
+            )
+            lines.append(f"{path} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> Dict:
+        """Speedscope file with one sampled profile per phase."""
+        frame_index: Dict[FrameKey, int] = {}
+        frames: List[Dict] = []
+        per_phase: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+
+        for (phase, _, stack), count in self._stacks.items():
+            indices = []
+            for key in stack:
+                if key not in frame_index:
+                    frame_index[key] = len(frames)
+                    frames.append({"name": key[1], "file": key[0], "line": key[2]})
+                indices.append(frame_index[key])
+            samples, weights = per_phase.setdefault(phase, ([], []))
+            samples.append(indices)
+            weights.append(count * self.interval)
+
+        profiles = [
+            {
+                "type": "sampled",
+                "name": phase,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }
+            for phase, (samples, weights) in sorted(per_phase.items())
+        ]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "crypto_signals.profiling",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def write(self, directory: str, fmt: str, job_name: str) -> List[str]:
+        """
+        Write profile files for this run.
+
+        Returns:
+            Paths written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        base = os.path.join(directory, f"{job_name}_{stamp}")
+        paths = []
+        if fmt in (PROFILE_FORMAT_COLLAPSED, PROFILE_FORMAT_BOTH):
+            path = f"{base}.collapsed.txt"
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.to_collapsed())
+            paths.append(path)
+        if fmt in (PROFILE_FORMAT_SPEEDSCOPE, PROFILE_FORMAT_BOTH):
+            path = f"{base}.speedscope.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_speedscope(job_name), f, separators=(",", ":"))
+            paths.append(path)
+        return paths
+
+
+def _frame_label(frame: FrameKey) -> str:
+    filename, name, line = frame
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+_active: Optional[SamplingProfiler] = None
+
+
+def start_profiler(interval: float = DEFAULT_SAMPLE_INTERVAL) -> SamplingProfiler:
+    """Start the process-wide profiler for this run."""
+    global _active
+    _active = SamplingProfiler(interval)
+    _active.start()
+    logger.info(f"Sampling profiler started ({1 / interval:.0f} Hz)")
+    return _active
+
+
+def set_profile_phase(phase: str) -> None:
+    """Attribute subsequent samples to ``phase`` (no-op when not profiling)."""
+    if _active is not None:
+        _active.phase = phase
+
+
+def stop_profiler(directory: str, fmt: str, job_name: str) -> List[str]:
+    """
+    Stop the active profiler and write its output; failures are logged.
+
+    Returns:
+        Paths written (empty if not profiling or on failure).
+    """
+    global _active
+    profiler, _active = _active, None
+    if profiler is None:
+        return []
+    profiler.stop()
+    try:
+        paths = profiler.write(directory, fmt, job_name)
+    except Exception as e:
+        logger.warning(f"Profile export failed: {e}")
+        return []
+    logger.info(
+        f"Profile written: {', '.join(paths)}",
+        extra={
+            "metric_type": "profile_summary",
+            "samples": profiler.samples,
+            "duration_seconds": round(profiler.duration, 3),
+            "samples_by_phase": profiler.phase_totals(),
+            "top_functions": profiler.top_functions(),
+        },
+    )
+    return paths
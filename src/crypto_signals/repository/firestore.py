@@ -10,7 +10,18 @@ Dev Note: Enable GCP native TTL policy with:
 """
 
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, Optional, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
 from crypto_signals.config import get_settings
 from crypto_signals.domain.schemas import (
@@ -21,12 +32,68 @@ from crypto_signals.domain.schemas import (
     StrategyConfig,
     TradeStatus,
 )
+from crypto_signals.metrics import api_call
 from crypto_signals.observability import log_validation_error
 from google.cloud import firestore
 from google.cloud.firestore import FieldFilter
 from loguru import logger
 from pydantic import ValidationError
 
+# Firestore allows 500 writes per batch; stay below for headroom (matches cleanup)
+BATCH_WRITE_SIZE = 400
+
+
+class BatchWriteError(Exception):
+    """A chunked batch write failed after some chunks had already committed."""
+
+    def __init__(self, message: str, committed: Set[str]):
+        """
+        Args:
+            message: Description of the failure.
+            committed: Document IDs whose chunk committed before the failure.
+        """
+        super().__init__(message)
+        self.committed = committed
+
+
+def _commit_in_chunks(
+    db: Any,
+    collection: Any,
+    items: Sequence[Tuple[str, Dict[str, Any]]],
+    write: Callable[[Any, Any, Dict[str, Any]], None],
+) -> None:
+    """
+    Write ``(doc_id, data)`` items in batches of BATCH_WRITE_SIZE.
+
+    Each chunk commits atomically, but chunks are independent: a failure
+    leaves earlier chunks committed.
+
+    Args:
+        db: Firestore client.
+        collection: Collection reference holding the documents.
+        items: Document IDs and their payloads.
+        write: Adds one write to a batch: ``write(batch, doc_ref, data)``.
+
+    Raises:
+        BatchWriteError: On the first failed chunk, carrying the IDs of the
+            chunks that committed before it.
+    """
+    committed: Set[str] = set()
+    for start in range(0, len(items), BATCH_WRITE_SIZE):
+        chunk = items[start : start + BATCH_WRITE_SIZE]
+        try:
+            batch = db.batch()
+            for doc_id, data in chunk:
+                write(batch, collection.document(doc_id), data)
+            batch.commit()
+        except Exception as e:
+            raise BatchWriteError(
+                f"Batch write failed after {len(committed)}/{len(items)} "
+                f"documents committed: {e}",
+                committed=committed,
+            ) from e
+        committed.update(doc_id for doc_id, _ in chunk)
+
 
 class JobLockRepository:
     """Repository for managing distributed job locks."""
@@ -104,6 +171,7 @@ class SignalRepository:
         else:
             self.collection_name = "test_signals"
 
+    @api_call("firestore")
     def save(self, signal: Signal) -> None:
         """Save a signal to Firestore.
 
@@ -115,6 +183,7 @@ class SignalRepository:
         doc_ref = self.db.collection(self.collection_name).document(signal.signal_id)
         doc_ref.set(data)
 
+    @api_call("firestore")
     def get_active_signals(self, symbol: str) -> list[Signal]:
         """
         Get all ACTIVE signals for a given symbol.
@@ -154,6 +223,7 @@ class SignalRepository:
 
         return results
 
+    @api_call("firestore")
     def update_signal(self, signal: Signal) -> None:
         """Update an existing signal in Firestore (merged update)."""
         doc_ref = self.db.collection(self.collection_name).document(signal.signal_id)
@@ -162,6 +232,7 @@ class SignalRepository:
             data["ds"] = data["ds"].isoformat()
         doc_ref.set(data, merge=True)
 
+    @api_call("firestore")
     def get_by_id(self, signal_id: str) -> Signal | None:
         """
         Get a signal by its ID.
@@ -187,6 +258,70 @@ class SignalRepository:
                 return None
         return None
 
+    @api_call("firestore")
+    def get_by_ids(self, signal_ids: Iterable[str]) -> Dict[str, Signal]:
+        """
+        Get multiple signals in a single batched read.
+
+        Args:
+            signal_ids: Signal identifiers to fetch (duplicates are ignored).
+
+        Returns:
+            Dict mapping signal_id to Signal for every document that exists
+            and validates.
+        """
+        unique_ids = list(dict.fromkeys(sid for sid in signal_ids if sid))
+        if not unique_ids:
+            return {}
+
+        collection = self.db.collection(self.collection_name)
+        refs = [collection.document(sid) for sid in unique_ids]
+
+        results: Dict[str, Signal] = {}
+        for doc in self.db.get_all(refs):
+            if not doc.exists:
+                continue
+            try:
+                results[doc.id] = Signal(**doc.to_dict())
+            except ValidationError as e:
+                log_validation_error(doc.id, e)
+        return results
+
+    @api_call("firestore")
+    def update_signals_batch(self, updates: Dict[str, Dict[str, Any]]) -> Set[str]:
+        """
+        Apply field updates to multiple signals using batched writes.
+
+        Unlike update_signal_atomic(), this is not transactional; use it for
+        idempotent healing writes where the caller already read current state.
+
+        Args:
+            updates: Mapping of signal_id to field updates.
+
+        Returns:
+            Set[str]: IDs of the signals whose batch committed (all of them
+            on success). Batches are committed in chunks, so a failure can
+            leave earlier chunks applied.
+        """
+        if not updates:
+            return set()
+
+        try:
+            _commit_in_chunks(
+                self.db,
+                self.db.collection(self.collection_name),
+                list(updates.items()),
+                lambda batch, ref, fields: batch.update(ref, fields),
+            )
+        except BatchWriteError as e:
+            failed = [signal_id for signal_id in updates if signal_id not in e.committed]
+            logger.error(
+                f"Batch update failed for {len(failed)}/{len(updates)} signals.",
+                extra={"signal_ids": failed, "error": str(e)},
+            )
+            return e.committed
+        return set(updates)
+
     def update_signal_atomic(self, signal_id: str, updates: Dict[str, Any]) -> bool:
         """
         Atomically update signal fields using Firestore transaction.
@@ -516,6 +651,7 @@ class PositionRepository:
         else:
             self.collection_name = "test_positions"
 
+    @api_call("firestore")
     def save(self, position: Position) -> None:
         """
         Save a position to Firestore.
@@ -553,6 +689,7 @@ class PositionRepository:
             },
         )
 
+    @api_call("firestore")
     def count_open_positions_by_class(self, asset_class: AssetClass) -> int:
         """
         Count number of OPEN positions for a specific asset class.
@@ -581,6 +718,7 @@ class PositionRepository:
             # Safety first -> block trading on DB error.
             return 9999
 
+    @api_call("firestore")
     def get_open_positions(self) -> list[Position]:
         """Get all OPEN positions."""
         query = self.db.collection(self.collection_name).where(
@@ -614,6 +752,7 @@ class PositionRepository:
 
         return None
 
+    @api_call("firestore")
     def get_open_position_by_symbol(self, symbol: str) -> Position | None:
         """
         Get the current OPEN position for a symbol.
@@ -634,6 +773,7 @@ class PositionRepository:
                 return None
         return None
 
+    @api_call("firestore")
     def update_position(self, position: Position) -> None:
         """Update an existing position in Firestore."""
         doc_ref = self.db.collection(self.collection_name).document(position.position_id)
@@ -643,6 +783,34 @@ class PositionRepository:
         data["updated_at"] = datetime.now(timezone.utc)
         doc_ref.set(data, merge=True)
 
+    @api_call("firestore")
+    def update_positions_batch(self, positions: list[Position]) -> None:
+        """
+        Update multiple positions using batched writes (merged, like update_position).
+
+        Raises:
+            BatchWriteError: If a chunk fails; ``committed`` holds the
+                position IDs of the chunks that were already applied.
+        """
+        if not positions:
+            return
+
+        collection = self.db.collection(self.collection_name)
+        now = datetime.now(timezone.utc)
+        items: List[Tuple[str, Dict[str, Any]]] = []
+        for position in positions:
+            data = position.model_dump(mode="python")
+            if "ds" in data and isinstance(data["ds"], date):
+                data["ds"] = data["ds"].isoformat()
+            data["updated_at"] = now
+            items.append((position.position_id, data))
+        _commit_in_chunks(
+            self.db,
+            collection,
+            items,
+            lambda batch, ref, data: batch.set(ref, data, merge=True),
+        )
+
     def get_closed_positions(self, limit: int = 50) -> list[Position]:
         """Get recently closed positions for orphan detection (Issue #139).
 
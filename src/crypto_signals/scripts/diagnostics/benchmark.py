@@ -0,0 +1,183 @@
+"""
+Analysis benchmark runner and regression gate.
+
+Examples:
+    # Record a baseline on the reference machine
+    python -m crypto_signals.scripts.diagnostics.benchmark run --save-baseline
+
+    # Re-run and fail (exit 1) on significant regressions or budget misses
+    python -m crypto_signals.scripts.diagnostics.benchmark compare
+
+    # Compare two stored runs without re-running
+    python -m crypto_signals.scripts.diagnostics.benchmark compare --current run.json
+"""
+
+import os
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import typer
+from loguru import logger
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from crypto_signals.benchmarks import (
+    DEFAULT_ALPHA,
+    DEFAULT_MAX_SAMPLES,
+    DEFAULT_MAX_TIME,
+    DEFAULT_MIN_SAMPLES,
+    DEFAULT_MIN_SLOWDOWN,
+    SUITE_QUICK,
+    BenchmarkResult,
+    ComparisonReport,
+    compare_results,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+app = typer.Typer(help="Indicator / pattern benchmark suite")
+console = Console()
+
+BENCHMARK_DIR = "temp/benchmarks"
+
+# Shared (and, being a list, not allowed as a call in argument defaults)
+ONLY_OPTION = typer.Option(
+    None, "--only", help="Run benchmarks whose key contains this (repeatable)"
+)
+
+
+def _baseline_path(suite: str) -> str:
+    return os.path.join(BENCHMARK_DIR, f"baseline_{suite}.json")
+
+
+def _run(
+    suite: str, only: Optional[List[str]], max_time: float, max_samples: int
+) -> List[BenchmarkResult]:
+    # Per-symbol DEBUG logging from the signal path would dominate the timings
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    results = run_suite(
+        suite,
+        only=only,
+        min_samples=min(DEFAULT_MIN_SAMPLES, max_samples),
+        max_samples=max_samples,
+        max_time=max_time,
+    )
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(BENCHMARK_DIR, f"{suite}_{stamp}.json")
+    save_results(results, path, suite)
+    console.print(f"Results written to {path}")
+    return results
+
+
+def _print_results(results: List[BenchmarkResult]) -> None:
+    table = Table(title="Benchmarks")
+    table.add_column("Benchmark")
+    table.add_column("Median (ms)", justify="right")
+    table.add_column("Min (ms)", justify="right")
+    table.add_column("Samples", justify="right")
+    for r in results:
+        table.add_row(
+            escape(r.key),
+            f"{r.median * 1e3:.3f}",
+            f"{min(r.samples) * 1e3:.3f}",
+            str(len(r.samples)),
+        )
+    console.print(table)
+
+
+def _print_report(report: ComparisonReport) -> None:
+    table = Table(title="Baseline comparison")
+    table.add_column("Benchmark")
+    table.add_column("Baseline (ms)", justify="right")
+    table.add_column("Current (ms)", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("p-value", justify="right")
+    for c in report.comparisons:
+        style = "red" if c.regressed else ("green" if c.ratio < 1 else "")
+        table.add_row(
+            escape(c.key),
+            f"{c.baseline_median * 1e3:.3f}",
+            f"{c.current_median * 1e3:.3f}",
+            f"[{style}]{(c.ratio - 1) * 100:+.1f}%[/{style}]" if style else "",
+            f"{c.p_value:.4f}",
+        )
+    console.print(table)
+
+    for check in report.budgets:
+        status = "[red]OVER[/red]" if check.exceeded else "[green]OK[/green]"
+        console.print(
+            f"Budget {escape(check.key)}: {check.median * 1e3:.3f}ms "
+            f"<= {check.limit * 1e3:.3f}ms {status} ({check.budget.claim})"
+        )
+    for key in report.missing:
+        console.print(f"[yellow]Not run: {escape(key)}[/yellow]")
+
+
+@app.command()
+def run(
+    suite: str = typer.Option(SUITE_QUICK, help="quick (CI) or full (up to 1M bars)"),
+    only: Optional[List[str]] = ONLY_OPTION,
+    max_time: float = typer.Option(DEFAULT_MAX_TIME, help="Sampling seconds per case"),
+    max_samples: int = typer.Option(DEFAULT_MAX_SAMPLES, help="Samples per case cap"),
+    save_baseline: bool = typer.Option(
+        False, "--save-baseline", help="Also store this run as the suite baseline"
+    ),
+):
+    """Run the suite and store the results as JSON."""
+    results = _run(suite, only, max_time, max_samples)
+    _print_results(results)
+    if save_baseline:
+        save_results(results, _baseline_path(suite), suite)
+        console.print(f"Baseline saved to {_baseline_path(suite)}")
+
+
+@app.command()
+def compare(
+    suite: str = typer.Option(SUITE_QUICK, help="quick (CI) or full (up to 1M bars)"),
+    baseline: Optional[str] = typer.Option(
+        None, help="Baseline JSON (default: temp/benchmarks/baseline_<suite>.json)"
+    ),
+    current: Optional[str] = typer.Option(
+        None, help="Compare this stored run instead of running the suite"
+    ),
+    only: Optional[List[str]] = ONLY_OPTION,
+    max_time: float = typer.Option(DEFAULT_MAX_TIME, help="Sampling seconds per case"),
+    max_samples: int = typer.Option(DEFAULT_MAX_SAMPLES, help="Samples per case cap"),
+    alpha: float = typer.Option(DEFAULT_ALPHA, help="Significance level"),
+    min_slowdown: float = typer.Option(
+        DEFAULT_MIN_SLOWDOWN, help="Smallest median slowdown that counts (0.1 = 10%)"
+    ),
+    budget_scale: float = typer.Option(
+        1.0, help="Scale absolute budgets for slower runners"
+    ),
+):
+    """Compare against the baseline; exit 1 on regressions or budget misses."""
+    baseline_results = load_results(baseline or _baseline_path(suite))
+    current_results = (
+        load_results(current) if current else _run(suite, only, max_time, max_samples)
+    )
+
+    report = compare_results(
+        baseline_results,
+        current_results,
+        alpha=alpha,
+        min_slowdown=min_slowdown,
+        budget_scale=budget_scale,
+    )
+    _print_report(report)
+
+    if not report.passed:
+        console.print(
+            f"[bold red]FAILED: {len(report.regressions)} regression(s), "
+            f"{len(report.budget_violations)} budget violation(s)[/bold red]"
+        )
+        raise typer.Exit(code=1)
+    console.print("[bold green]No significant regressions[/bold green]")
+
+
+if __name__ == "__main__":
+    app()
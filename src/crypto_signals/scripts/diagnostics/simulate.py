@@ -0,0 +1,139 @@
+"""
+End-to-end job simulation against in-memory external services.
+
+Runs the real job (startup, pipelines, signal generation, processing, sync)
+with simulated Alpaca, Firestore, BigQuery and Discord, and reports phase
+timings, API calls per service/method and peak RSS.
+
+Examples:
+    # 500 synthetic crypto symbols with production latency and rate limits
+    python -m crypto_signals.scripts.diagnostics.simulate --symbols 500
+
+    # CPU-bound profile of the flow at 5,000 symbols
+    python -m crypto_signals.scripts.diagnostics.simulate --symbols 5000 \\
+        --no-latency --no-rate-limits
+
+    # Replay recorded bars (BTC_USD.csv, AAPL.csv, ...)
+    python -m crypto_signals.scripts.diagnostics.simulate --bars-dir temp/bars
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+import typer
+from loguru import logger
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from crypto_signals.simulation.runner import (
+    SimulationConfig,
+    SimulationReport,
+    recorded_symbols,
+    run_simulation,
+    synthetic_symbols,
+)
+
+app = typer.Typer(help="End-to-end job simulator")
+console = Console()
+
+SIMULATION_DIR = "temp/simulations"
+
+
+def _print_report(report: SimulationReport) -> None:
+    phases = Table(title=f"Phases ({report.symbols} symbols)")
+    phases.add_column("Phase")
+    phases.add_column("Seconds", justify="right")
+    for phase, seconds in report.phases.items():
+        phases.add_row(escape(phase), f"{seconds:.3f}")
+    phases.add_row("[bold]wall clock[/bold]", f"{report.wall_seconds:.3f}")
+    console.print(phases)
+
+    calls = Table(title="API calls")
+    calls.add_column("Service")
+    calls.add_column("Method")
+    calls.add_column("Calls", justify="right")
+    calls.add_column("Throttled", justify="right")
+    calls.add_column("Throttle wait (s)", justify="right")
+    calls.add_column("Latency (s)", justify="right")
+    for (service, method), stats in sorted(report.api_calls.items()):
+        calls.add_row(
+            escape(service),
+            escape(method),
+            str(stats.calls),
+            str(stats.throttled),
+            f"{stats.throttle_wait_seconds:.2f}",
+            f"{stats.latency_seconds:.2f}",
+        )
+    console.print(calls)
+
+    rss = f"{report.peak_rss_mb:.1f} MB" if report.peak_rss_mb is not None else "n/a"
+    console.print(
+        f"Peak RSS: {rss} | Orders: {report.orders} | "
+        f"Open positions: {report.open_positions} | "
+        f"Discord messages: {report.discord_messages} | "
+        f"Firestore documents: {report.firestore_documents}"
+    )
+    for operation, count in sorted(report.failures.items()):
+        console.print(f"[yellow]Failed: {escape(operation)} x{count}[/yellow]")
+
+
+@app.command()
+def simulate(
+    symbols: int = typer.Option(100, help="Synthetic crypto symbols"),
+    equities: int = typer.Option(0, help="Synthetic equity symbols"),
+    bars_dir: Optional[str] = typer.Option(
+        None, help="Recorded bars (<SYMBOL>.csv, BASE_QUOTE.csv for crypto)"
+    ),
+    latency: bool = typer.Option(True, help="Apply simulated service latency"),
+    rate_limits: bool = typer.Option(True, help="Apply service rate limits"),
+    max_workers: Optional[int] = typer.Option(None, help="Phase 1 worker threads"),
+    stagger_delay: float = typer.Option(0.0, help="Per-symbol start stagger (s)"),
+    execution: bool = typer.Option(True, help="Submit orders for signals"),
+    seed: int = typer.Option(42, help="Synthetic data / jitter seed"),
+    output: Optional[str] = typer.Option(
+        None, help="Report JSON path (default: temp/simulations/<timestamp>.json)"
+    ),
+):
+    """Run the job once against simulated services and report the costs."""
+    if bars_dir:
+        crypto, equity = recorded_symbols(bars_dir)
+    else:
+        crypto = synthetic_symbols(symbols)
+        equity = synthetic_symbols(equities, asset_class="equity")
+
+    # Per-symbol DEBUG logging would dominate a large run
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+    report = run_simulation(
+        SimulationConfig(
+            crypto_symbols=crypto,
+            equity_symbols=equity,
+            bars_dir=bars_dir,
+            latency=latency,
+            rate_limits=rate_limits,
+            max_workers=max_workers,
+            stagger_delay=stagger_delay,
+            enable_execution=execution,
+            seed=seed,
+        )
+    )
+    _print_report(report)
+
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(SIMULATION_DIR, f"simulation_{stamp}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report.to_dict(), f, indent=2)
+    console.print(f"Report written to {output}")
+
+    if report.exit_code:
+        raise typer.Exit(code=report.exit_code)
+
+
+if __name__ == "__main__":
+    app()
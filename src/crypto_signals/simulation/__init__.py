@@ -0,0 +1 @@
+"""End-to-end job simulation with in-memory external services."""
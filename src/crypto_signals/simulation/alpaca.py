@@ -0,0 +1,571 @@
+"""
+In-memory Alpaca Stand-ins.
+
+``SimulatedMarket`` serves daily bars per symbol: recorded CSV files when a
+bars directory is given (``<SYMBOL>.csv`` with ``/`` replaced by ``_`` and
+timestamp/open/high/low/close/volume columns), otherwise a seeded synthetic
+random walk (``benchmarks.synthetic_ohlcv``) that is stable per symbol.
+
+``FakeMarketDataClient`` stands in for both historical data clients and
+``FakeTradingClient`` for the trading client. The broker is a paper account:
+market orders fill immediately at the last close, bracket orders keep their
+take-profit / stop-loss legs open, and positions, cash and order history
+follow the fills. Responses are real ``alpaca-py`` models, and missing orders
+or positions raise ``APIError`` with a 404 status, as the SDK does.
+"""
+
+import json
+import os
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+import requests  # type: ignore
+from alpaca.common.exceptions import APIError
+from alpaca.trading.enums import (
+    AssetClass,
+    AssetExchange,
+    AssetStatus,
+    OrderClass,
+    OrderSide,
+    OrderStatus,
+    OrderType,
+    QueryOrderStatus,
+)
+from alpaca.trading.models import Asset, Order, PortfolioHistory, Position, TradeAccount
+
+from crypto_signals.benchmarks import synthetic_ohlcv
+from crypto_signals.simulation.service import SimulatedService
+from crypto_signals.utils.symbols import normalize_alpaca_symbol
+
+DEFAULT_HISTORY_DAYS = 500
+DEFAULT_STARTING_CASH = 100_000.0
+
+OPEN_STATUSES = frozenset(
+    {
+        OrderStatus.NEW,
+        OrderStatus.ACCEPTED,
+        OrderStatus.HELD,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.PENDING_NEW,
+    }
+)
+
+
+def api_error(status_code: int, message: str) -> APIError:
+    """An ``APIError`` shaped like the SDK's (``status_code`` from the response)."""
+    response = requests.Response()
+    response.status_code = status_code
+    body = json.dumps({"code": status_code * 100_000 + 10_000, "message": message})
+    return APIError(body, requests.HTTPError(message, response=response))
+
+
+def _is_crypto(symbol: str) -> bool:
+    return "/" in symbol
+
+
+def _utc(value: datetime) -> pd.Timestamp:
+    # Request models strip the timezone after converting to UTC
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+class SimulatedMarket:
+    """Daily OHLCV history per symbol (recorded or synthetic)."""
+
+    def __init__(
+        self,
+        bars_dir: Optional[str] = None,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+        seed: int = 42,
+    ):
+        """
+        Args:
+            bars_dir: Directory of recorded per-symbol CSV files (optional).
+            history_days: Synthetic history length, ending today.
+            seed: Base seed; each symbol mixes in a hash of its name.
+        """
+        self.bars_dir = bars_dir
+        self.history_days = history_days
+        self.seed = seed
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """Full daily history of a symbol (cached)."""
+        key = normalize_alpaca_symbol(symbol)
+        with self._lock:
+            df = self._frames.get(key)
+        if df is None:
+            df = self._load(symbol)
+            with self._lock:
+                df = self._frames.setdefault(key, df)
+        return df
+
+    def _load(self, symbol: str) -> pd.DataFrame:
+        if self.bars_dir:
+            path = os.path.join(self.bars_dir, f"{symbol.replace('/', '_')}.csv")
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col="timestamp")
+                df.index = pd.to_datetime(df.index, utc=True)
+                return df[["open", "high", "low", "close", "volume"]].sort_index()
+
+        today = pd.Timestamp.now(tz="UTC").normalize()
+        start = today - pd.Timedelta(days=self.history_days - 1)
+        seed = self.seed ^ zlib.crc32(normalize_alpaca_symbol(symbol).encode())
+        return synthetic_ohlcv(
+            self.history_days, seed=seed, start=start.strftime("%Y-%m-%d")
+        )
+
+    def bars(
+        self, symbol: str, start: Optional[datetime], end: Optional[datetime]
+    ) -> pd.DataFrame:
+        """History of a symbol within [start, end]."""
+        df = self.frame(symbol)
+        if start is not None:
+            df = df[df.index >= _utc(start)]
+        if end is not None:
+            df = df[df.index <= _utc(end)]
+        return df
+
+    def last_price(self, symbol: str) -> float:
+        """Latest close, used as the fill and trade price."""
+        return float(self.frame(symbol)["close"].iloc[-1])
+
+
+class _BarsResponse:
+    """``BarSet`` stand-in: only ``.df`` (MultiIndex symbol, timestamp) is used."""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.df = (
+            pd.concat(frames, names=["symbol", "timestamp"])
+            if frames
+            else pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+        )
+
+
+class FakeMarketDataClient:
+    """Stand-in for ``StockHistoricalDataClient`` and ``CryptoHistoricalDataClient``."""
+
+    def __init__(self, market: SimulatedMarket, service: SimulatedService):
+        self.market = market
+        self.service = service
+
+    @staticmethod
+    def _symbols(request: Any) -> List[str]:
+        symbols = request.symbol_or_symbols
+        return [symbols] if isinstance(symbols, str) else list(symbols)
+
+    def _bars(self, method: str, request: Any) -> _BarsResponse:
+        self.service.call(method)
+        frames = {}
+        for symbol in self._symbols(request):
+            df = self.market.bars(symbol, request.start, request.end)
+            if not df.empty:
+                frames[symbol] = df
+        return _BarsResponse(frames)
+
+    def _latest_trades(self, method: str, request: Any) -> Dict[str, Any]:
+        self.service.call(method)
+        now = datetime.now(timezone.utc)
+        return {
+            symbol: SimpleNamespace(
+                symbol=symbol, price=self.market.last_price(symbol), timestamp=now
+            )
+            for symbol in self._symbols(request)
+        }
+
+    def get_crypto_bars(self, request_params: Any) -> _BarsResponse:
+        return self._bars("get_crypto_bars", request_params)
+
+    def get_stock_bars(self, request_params: Any) -> _BarsResponse:
+        return self._bars("get_stock_bars", request_params)
+
+    def get_crypto_latest_trade(self, request_params: Any) -> Dict[str, Any]:
+        return self._latest_trades("get_crypto_latest_trade", request_params)
+
+    def get_stock_latest_trade(self, request_params: Any) -> Dict[str, Any]:
+        return self._latest_trades("get_stock_latest_trade", request_params)
+
+
+class FakeTradingClient:
+    """Paper broker over ``SimulatedMarket`` prices."""
+
+    def __init__(
+        self,
+        market: SimulatedMarket,
+        service: SimulatedService,
+        crypto_symbols: Iterable[str] = (),
+        equity_symbols: Iterable[str] = (),
+        starting_cash: float = DEFAULT_STARTING_CASH,
+    ):
+        """
+        Args:
+            market: Price source for fills and positions.
+            service: Latency / rate-limit model ("alpaca_trading").
+            crypto_symbols: Tradable crypto assets (e.g. "BTC/USD").
+            equity_symbols: Tradable US equities.
+            starting_cash: Initial account cash and equity.
+        """
+        self.market = market
+        self.service = service
+        self.account_id = uuid.uuid4()
+        self.cash = starting_cash
+        self.starting_cash = starting_cash
+        self._lock = threading.RLock()
+        # Raw order dicts by ID; bracket legs are stored flat and linked by ID
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._legs: Dict[str, List[str]] = {}
+        # Normalized symbol -> {"symbol", "qty" (signed), "avg_price"}
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._assets = [self._asset(s, AssetClass.CRYPTO) for s in crypto_symbols] + [
+            self._asset(s, AssetClass.US_EQUITY) for s in equity_symbols
+        ]
+
+    # --- Account / assets -------------------------------------------------
+
+    @staticmethod
+    def _asset(symbol: str, asset_class: AssetClass) -> Asset:
+        crypto = asset_class == AssetClass.CRYPTO
+        return Asset.model_validate(
+            {
+                "id": uuid.uuid5(uuid.NAMESPACE_DNS, symbol),
+                "class": asset_class,  # Field alias of asset_class
+                "exchange": AssetExchange.CRYPTO if crypto else AssetExchange.NASDAQ,
+                "symbol": symbol,
+                "status": AssetStatus.ACTIVE,
+                "tradable": True,
+                "marginable": not crypto,
+                "shortable": not crypto,
+                "easy_to_borrow": not crypto,
+                "fractionable": True,
+            }
+        )
+
+    def _equity(self) -> float:
+        with self._lock:
+            return self.cash + sum(
+                p["qty"] * self.market.last_price(p["symbol"])
+                for p in self._positions.values()
+            )
+
+    def get_account(self) -> TradeAccount:
+        self.service.call("get_account")
+        equity = self._equity()
+        return TradeAccount(
+            id=self.account_id,
+            account_number="SIM000001",
+            status="ACTIVE",
+            crypto_status="ACTIVE",
+            currency="USD",
+            cash=str(self.cash),
+            equity=str(equity),
+            last_equity=str(self.starting_cash),
+            portfolio_value=str(equity),
+            buying_power=str(max(self.cash, 0.0) * 2),
+            regt_buying_power=str(max(self.cash, 0.0) * 2),
+            non_marginable_buying_power=str(max(self.cash, 0.0)),
+            trading_blocked=False,
+            account_blocked=False,
+            pattern_day_trader=False,
+        )
+
+    def get_all_assets(self, filter: Any = None) -> List[Asset]:
+        self.service.call("get_all_assets")
+        asset_class = getattr(filter, "asset_class", None)
+        return [
+            a for a in self._assets if asset_class is None or a.asset_class == asset_class
+        ]
+
+    def get_portfolio_history(self, history_filter: Any = None) -> PortfolioHistory:
+        self.service.call("get_portfolio_history")
+        equity = self._equity()
+        now = int(datetime.now(timezone.utc).timestamp())
+        days = 30
+        return PortfolioHistory(
+            timestamp=[now - (days - i) * 86_400 for i in range(days)],
+            equity=[self.starting_cash] * (days - 1) + [equity],
+            profit_loss=[0.0] * (days - 1) + [equity - self.starting_cash],
+            profit_loss_pct=[0.0] * (days - 1)
+            + [(equity - self.starting_cash) / self.starting_cash],
+            base_value=self.starting_cash,
+            timeframe="1D",
+        )
+
+    def get(self, path: str, data: Any = None, **kwargs: Any) -> List[Any]:
+        """Raw REST access (account activities): the simulated account has none."""
+        self.service.call(f"GET {path}")
+        return []
+
+    # --- Orders -----------------------------------------------------------
+
+    def _new_order(self, **fields: Any) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        order = {
+            "id": str(uuid.uuid4()),
+            "client_order_id": str(uuid.uuid4()),
+            "created_at": now,
+            "updated_at": now,
+            "submitted_at": now,
+            "order_class": OrderClass.SIMPLE,
+            "time_in_force": "gtc",
+            "status": OrderStatus.NEW,
+            "extended_hours": False,
+            "filled_qty": "0",
+            "legs": None,
+        }
+        order.update(fields)
+        self._orders[order["id"]] = order
+        return order
+
+    def _model(self, order_id: str, nested: bool = True) -> Order:
+        raw = dict(self._orders[order_id])
+        leg_ids = self._legs.get(order_id)
+        raw["legs"] = (
+            [self._model(leg_id) for leg_id in leg_ids] if leg_ids and nested else None
+        )
+        return Order(**raw)
+
+    def _fill(self, order: Dict[str, Any], price: float) -> None:
+        qty = float(order["qty"])
+        signed = qty if order["side"] == OrderSide.BUY else -qty
+        key = normalize_alpaca_symbol(order["symbol"])
+        position = self._positions.get(key)
+        if position is None:
+            position = self._positions[key] = {
+                "symbol": order["symbol"],
+                "qty": 0.0,
+                "avg_price": price,
+            }
+        new_qty = position["qty"] + signed
+        if position["qty"] == 0 or (position["qty"] > 0) == (signed > 0):
+            # Opening or adding: volume-weighted entry price
+            total = abs(position["qty"]) + qty
+            position["avg_price"] = (
+                position["avg_price"] * abs(position["qty"]) + price * qty
+            ) / total
+        position["qty"] = new_qty
+        if abs(new_qty) < 1e-12:
+            del self._positions[key]
+        self.cash -= signed * price
+
+        now = datetime.now(timezone.utc)
+        order.update(
+            status=OrderStatus.FILLED,
+            filled_qty=str(qty),
+            filled_avg_price=str(price),
+            filled_at=now,
+            updated_at=now,
+        )
+
+    def submit_order(self, order_data: Any) -> Order:
+        self.service.call("submit_order")
+        symbol = order_data.symbol
+        price = self.market.last_price(symbol)
+        qty = order_data.qty
+        if qty is None and order_data.notional:
+            qty = float(order_data.notional) / price
+        order_type = getattr(order_data, "type", None) or OrderType.MARKET
+        asset_class = AssetClass.CRYPTO if _is_crypto(symbol) else AssetClass.US_EQUITY
+
+        with self._lock:
+            client_order_id = order_data.client_order_id
+            if client_order_id and any(
+                o["client_order_id"] == client_order_id for o in self._orders.values()
+            ):
+                raise api_error(422, "client_order_id must be unique")
+
+            order = self._new_order(
+                client_order_id=client_order_id or str(uuid.uuid4()),
+                symbol=symbol,
+                asset_class=asset_class,
+                qty=str(qty),
+                side=order_data.side,
+                order_type=order_type,
+                type=order_type,
+                order_class=order_data.order_class or OrderClass.SIMPLE,
+                time_in_force=order_data.time_in_force,
+                limit_price=getattr(order_data, "limit_price", None),
+                stop_price=getattr(order_data, "stop_price", None),
+            )
+            if order_type == OrderType.MARKET:
+                self._fill(order, price)
+            else:
+                order["status"] = OrderStatus.ACCEPTED
+
+            if order["order_class"] == OrderClass.BRACKET:
+                exit_side = (
+                    OrderSide.SELL if order_data.side == OrderSide.BUY else OrderSide.BUY
+                )
+                legs = []
+                if order_data.take_profit is not None:
+                    legs.append(
+                        self._new_order(
+                            symbol=symbol,
+                            asset_class=asset_class,
+                            qty=str(qty),
+                            side=exit_side,
+                            order_type=OrderType.LIMIT,
+                            type=OrderType.LIMIT,
+                            order_class=OrderClass.BRACKET,
+                            time_in_force=order_data.time_in_force,
+                            limit_price=order_data.take_profit.limit_price,
+                        )
+                    )
+                if order_data.stop_loss is not None:
+                    legs.append(
+                        self._new_order(
+                            symbol=symbol,
+                            asset_class=asset_class,
+                            qty=str(qty),
+                            side=exit_side,
+                            order_type=OrderType.STOP,
+                            type=OrderType.STOP,
+                            order_class=OrderClass.BRACKET,
+                            time_in_force=order_data.time_in_force,
+                            stop_price=order_data.stop_loss.stop_price,
+                            status=OrderStatus.HELD,
+                        )
+                    )
+                self._legs[order["id"]] = [leg["id"] for leg in legs]
+            return self._model(order["id"])
+
+    def _find(self, order_id: Any) -> Dict[str, Any]:
+        order = self._orders.get(str(order_id))
+        if order is None:
+            raise api_error(404, "order not found")
+        return order
+
+    def get_order_by_id(self, order_id: Any, filter: Any = None) -> Order:
+        self.service.call("get_order_by_id")
+        with self._lock:
+            return self._model(self._find(order_id)["id"])
+
+    def get_order_by_client_id(self, client_id: str) -> Order:
+        self.service.call("get_order_by_client_id")
+        with self._lock:
+            for order in self._orders.values():
+                if order["client_order_id"] == client_id:
+                    return self._model(order["id"])
+        raise api_error(404, "order not found")
+
+    def get_orders(self, filter: Any = None) -> List[Order]:
+        self.service.call("get_orders")
+        status = getattr(filter, "status", None) or QueryOrderStatus.OPEN
+        limit = getattr(filter, "limit", None) or 50
+        after = getattr(filter, "after", None)
+        until = getattr(filter, "until", None)
+        symbols = getattr(filter, "symbols", None)
+        nested = bool(getattr(filter, "nested", False))
+        ascending = str(getattr(filter, "direction", "desc")).lower().endswith("asc")
+        wanted = {normalize_alpaca_symbol(s) for s in symbols} if symbols else None
+
+        with self._lock:
+            leg_ids = {leg for legs in self._legs.values() for leg in legs}
+            selected = []
+            for order in self._orders.values():
+                if nested and order["id"] in leg_ids:
+                    continue
+                is_open = order["status"] in OPEN_STATUSES
+                if status == QueryOrderStatus.OPEN and not is_open:
+                    continue
+                if status == QueryOrderStatus.CLOSED and is_open:
+                    continue
+                if after and order["submitted_at"] <= after:
+                    continue
+                if until and order["submitted_at"] >= until:
+                    continue
+                if wanted and normalize_alpaca_symbol(order["symbol"]) not in wanted:
+                    continue
+                selected.append(order)
+            selected.sort(key=lambda o: o["submitted_at"], reverse=not ascending)
+            return [self._model(o["id"], nested=nested) for o in selected[:limit]]
+
+    def cancel_order_by_id(self, order_id: Any) -> None:
+        self.service.call("cancel_order_by_id")
+        with self._lock:
+            order = self._find(order_id)
+            if order["status"] not in OPEN_STATUSES:
+                raise api_error(422, f"order is already {order['status'].value}")
+            order.update(
+                status=OrderStatus.CANCELED,
+                canceled_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
+            )
+
+    def replace_order_by_id(self, order_id: Any, order_data: Any = None) -> Order:
+        self.service.call("replace_order_by_id")
+        with self._lock:
+            old = self._find(order_id)
+            if old["status"] not in OPEN_STATUSES:
+                raise api_error(422, f"order is already {old['status'].value}")
+            fields = {
+                k: v
+                for k, v in old.items()
+                if k not in ("id", "client_order_id", "created_at", "submitted_at")
+            }
+            for name in ("qty", "limit_price", "stop_price", "time_in_force"):
+                value = getattr(order_data, name, None)
+                if value is not None:
+                    fields[name] = str(value) if name == "qty" else value
+            new = self._new_order(**{**fields, "replaces": old["id"]})
+            old.update(
+                status=OrderStatus.REPLACED,
+                replaced_by=new["id"],
+                replaced_at=datetime.now(timezone.utc),
+            )
+            for legs in self._legs.values():
+                if old["id"] in legs:
+                    legs[legs.index(old["id"])] = new["id"]
+            return self._model(new["id"])
+
+    # --- Positions --------------------------------------------------------
+
+    def _position_model(self, position: Dict[str, Any]) -> Position:
+        symbol = position["symbol"]
+        qty = position["qty"]
+        price = self.market.last_price(symbol)
+        crypto = _is_crypto(symbol)
+        return Position(
+            asset_id=uuid.uuid5(uuid.NAMESPACE_DNS, symbol),
+            symbol=normalize_alpaca_symbol(symbol),
+            exchange=AssetExchange.CRYPTO if crypto else AssetExchange.NASDAQ,
+            asset_class=AssetClass.CRYPTO if crypto else AssetClass.US_EQUITY,
+            avg_entry_price=str(position["avg_price"]),
+            qty=str(abs(qty)),
+            qty_available=str(abs(qty)),
+            side="long" if qty > 0 else "short",
+            cost_basis=str(abs(qty) * position["avg_price"]),
+            market_value=str(abs(qty) * price),
+            current_price=str(price),
+            unrealized_pl=str((price - position["avg_price"]) * qty),
+        )
+
+    def get_all_positions(self) -> List[Position]:
+        self.service.call("get_all_positions")
+        with self._lock:
+            return [self._position_model(p) for p in self._positions.values()]
+
+    def get_open_position(self, symbol_or_asset_id: Any) -> Position:
+        self.service.call("get_open_position")
+        with self._lock:
+            position = self._positions.get(
+                normalize_alpaca_symbol(str(symbol_or_asset_id))
+            )
+            if position is None:
+                raise api_error(404, "position not found")
+            return self._position_model(position)
+
+    def order_count(self) -> int:
+        """Orders (including bracket legs) submitted so far."""
+        with self._lock:
+            return len(self._orders)
+
+    def position_count(self) -> int:
+        """Open positions."""
+        with self._lock:
+            return len(self._positions)
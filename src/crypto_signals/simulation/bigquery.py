@@ -0,0 +1,157 @@
+"""
+In-memory BigQuery Stand-in.
+
+Covers the ``bigquery.Client`` surface of the pipelines and SchemaGuardian:
+table get/create/update/delete (real ``bigquery.Table`` objects with an etag
+that changes on every update), NDJSON load jobs into stored rows, and query
+jobs. Queries are recorded but not evaluated: SELECTs return no rows, and a
+``MERGE `target` ... USING `source``` copies the loaded staging rows into the
+target so rows written per table show up in the report.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+from google.api_core.exceptions import Conflict, NotFound
+from google.cloud import bigquery
+
+from crypto_signals.simulation.service import SimulatedService
+
+_MERGE_PATTERN = re.compile(
+    r"MERGE\s+`(?P<target>[^`]+)`.*?USING\s+`(?P<source>[^`]+)`",
+    re.IGNORECASE | re.DOTALL,
+)
+
+TableRef = Union[str, bigquery.Table, Any]
+
+
+def _table_id(table: TableRef) -> str:
+    if isinstance(table, str):
+        return table
+    if isinstance(table, bigquery.Table):
+        return f"{table.project}.{table.dataset_id}.{table.table_id}"
+    return str(table)
+
+
+class FakeQueryJob:
+    """Finished query or load job."""
+
+    def __init__(self, rows: Optional[List[Any]] = None, affected_rows: int = 0):
+        self._rows = rows or []
+        self.total_bytes_processed = 0
+        self.num_dml_affected_rows = affected_rows
+        self.output_rows = affected_rows
+        self.errors = None
+        self.state = "DONE"
+
+    def result(self, *args: Any, **kwargs: Any) -> List[Any]:
+        return list(self._rows)
+
+
+class FakeBigQueryClient:
+    """``bigquery.Client`` over in-memory tables."""
+
+    def __init__(self, service: SimulatedService, project: str = "simulation"):
+        self.service = service
+        self.project = project
+        self._lock = threading.Lock()
+        self._tables: Dict[str, bigquery.Table] = {}
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+        self.queries: List[str] = []
+
+    def _store_table(self, table_id: str, table: bigquery.Table) -> bigquery.Table:
+        version = self._versions.get(table_id, 0) + 1
+        self._versions[table_id] = version
+        table._properties["etag"] = f"etag-{version}"
+        self._tables[table_id] = table
+        return table
+
+    def get_table(self, table: TableRef, **kwargs: Any) -> bigquery.Table:
+        self.service.call("get_table")
+        table_id = _table_id(table)
+        with self._lock:
+            if table_id not in self._tables:
+                raise NotFound(f"Not found: Table {table_id}")
+            return self._tables[table_id]
+
+    def create_table(
+        self, table: TableRef, exists_ok: bool = False, **kwargs: Any
+    ) -> bigquery.Table:
+        self.service.call("create_table")
+        if isinstance(table, str):
+            table = bigquery.Table(table)
+        table_id = _table_id(table)
+        with self._lock:
+            if table_id in self._tables:
+                if exists_ok:
+                    return self._tables[table_id]
+                raise Conflict(f"Already Exists: Table {table_id}")
+            self._rows[table_id] = []
+            return self._store_table(table_id, table)
+
+    def update_table(
+        self, table: bigquery.Table, fields: List[str], **kwargs: Any
+    ) -> bigquery.Table:
+        self.service.call("update_table")
+        table_id = _table_id(table)
+        with self._lock:
+            if table_id not in self._tables:
+                raise NotFound(f"Not found: Table {table_id}")
+            return self._store_table(table_id, table)
+
+    def delete_table(self, table: TableRef, not_found_ok: bool = False, **kwargs: Any):
+        self.service.call("delete_table")
+        table_id = _table_id(table)
+        with self._lock:
+            if self._tables.pop(table_id, None) is None and not not_found_ok:
+                raise NotFound(f"Not found: Table {table_id}")
+            self._rows.pop(table_id, None)
+
+    def load_table_from_file(
+        self, file_obj: Any, destination: TableRef, job_config: Any = None, **kwargs: Any
+    ) -> FakeQueryJob:
+        self.service.call("load_table_from_file")
+        payload = file_obj.read()
+        if isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        rows = [json.loads(line) for line in payload.splitlines() if line.strip()]
+        table_id = _table_id(destination)
+        truncate = getattr(job_config, "write_disposition", None) == (
+            bigquery.WriteDisposition.WRITE_TRUNCATE
+        )
+        with self._lock:
+            if table_id not in self._tables:
+                raise NotFound(f"Not found: Table {table_id}")
+            stored = self._rows.setdefault(table_id, [])
+            if truncate:
+                stored.clear()
+            stored.extend(rows)
+        return FakeQueryJob(affected_rows=len(rows))
+
+    def query(self, query: str, job_config: Any = None, **kwargs: Any) -> FakeQueryJob:
+        self.service.call("query")
+        affected = 0
+        with self._lock:
+            self.queries.append(query)
+            merge = _MERGE_PATTERN.search(query)
+            if merge and merge.group("source") in self._rows:
+                source_rows = self._rows[merge.group("source")]
+                self._rows.setdefault(merge.group("target"), []).extend(source_rows)
+                affected = len(source_rows)
+        return FakeQueryJob(affected_rows=affected)
+
+    def close(self) -> None:
+        """No connections to release."""
+
+    def rows(self, table_id: str) -> List[Dict[str, Any]]:
+        """Rows stored in a table (loaded or merged)."""
+        with self._lock:
+            return list(self._rows.get(table_id, []))
+
+    def row_counts(self) -> Dict[str, int]:
+        """Stored rows per table, for tables that hold any."""
+        with self._lock:
+            return {t: len(rows) for t, rows in self._rows.items() if rows}
@@ -0,0 +1,72 @@
+"""
+In-memory Discord Stand-in.
+
+Replaces the ``requests`` module seen by ``notifications.discord``: webhook
+POSTs are recorded and answered like Discord does with ``?wait=true`` (a
+message object whose ID doubles as the forum thread ID); bot API GETs see an
+empty text channel. Everything else on the module (``RequestException``,
+``HTTPError``, ...) is the real ``requests`` attribute, so error handling in
+the client is unchanged.
+"""
+
+import itertools
+import threading
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests  # type: ignore
+
+from crypto_signals.simulation.service import SimulatedService
+
+
+class FakeResponse:
+    """Minimal ``requests.Response`` for a successful call."""
+
+    def __init__(self, payload: Any, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self) -> Any:
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        """Always 2xx."""
+
+
+class FakeDiscord:
+    """``requests`` look-alike that records Discord traffic."""
+
+    def __init__(self, service: SimulatedService):
+        self.service = service
+        self._lock = threading.Lock()
+        self._ids = itertools.count(10**17)
+        self.messages: List[Dict[str, Any]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+    def post(self, url: str, json: Optional[Dict[str, Any]] = None, **kwargs: Any):
+        self.service.call("post")
+        query = parse_qs(urlparse(url).query)
+        with self._lock:
+            message_id = str(next(self._ids))
+            self.messages.append(
+                {
+                    "id": message_id,
+                    "thread_id": query.get("thread_id", [None])[0],
+                    "payload": json or {},
+                }
+            )
+        return FakeResponse({"id": message_id, "channel_id": message_id})
+
+    def get(self, url: str, **kwargs: Any) -> FakeResponse:
+        self.service.call("get")
+        if url.rstrip("/").endswith("/threads/active"):
+            return FakeResponse({"threads": [], "members": []})
+        return FakeResponse({"id": url.rstrip("/").rsplit("/", 1)[-1], "type": 0})
+
+    def message_count(self) -> int:
+        """Messages posted so far."""
+        with self._lock:
+            return len(self.messages)
@@ -0,0 +1,534 @@
+"""
+In-memory Firestore Stand-in.
+
+Implements the subset of ``google.cloud.firestore.Client`` the repositories and
+pipelines use: documents (get/set/merge/update/delete), filtered and ordered
+queries with ``start_after`` cursors and ``limit``, count aggregations, write
+batches, transactions (via ``transactional``) and ``get_all``.
+
+Values are encoded the way the real client does on write (str/int enums become
+plain values, naive datetimes become UTC, ``date`` and other unsupported types
+raise ``TypeError``), so code that would fail against Firestore fails here too.
+Every RPC goes through a ``SimulatedService`` for latency and call counts.
+"""
+
+import copy
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+
+from crypto_signals.simulation.service import SimulatedService
+
+DOCUMENT_ID = "__name__"
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+
+# Firestore's cross-type ordering: null < bool < number < timestamp < string < bytes
+_TYPE_RANK = {type(None): 0, bool: 1, int: 2, float: 2, datetime: 3, str: 4, bytes: 5}
+
+_MISSING = object()
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a Python value to what Firestore would store (and return)."""
+    if value is None or value is firestore.DELETE_FIELD:
+        return value
+    if isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, bytes):
+        return bytes(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): encode_value(v) for k, v in value.items()}
+    raise TypeError(
+        f"Cannot convert to a Firestore Value: {value!r} ({type(value).__name__})"
+    )
+
+
+def _get_path(data: Dict[str, Any], field_path: str) -> Any:
+    current: Any = data
+    for part in field_path.split("."):
+        if not isinstance(current, dict) or part not in current:
+            return _MISSING
+        current = current[part]
+    return current
+
+
+def _set_path(data: Dict[str, Any], field_path: str, value: Any) -> None:
+    parts = field_path.split(".")
+    current = data
+    for part in parts[:-1]:
+        child = current.get(part)
+        if not isinstance(child, dict):
+            child = current[part] = {}
+        current = child
+    if value is firestore.DELETE_FIELD:
+        current.pop(parts[-1], None)
+    else:
+        current[parts[-1]] = value
+
+
+def _merge(target: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    for key, value in updates.items():
+        if value is firestore.DELETE_FIELD:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = _strip_deletes(value)
+
+
+def _strip_deletes(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            k: _strip_deletes(v)
+            for k, v in value.items()
+            if v is not firestore.DELETE_FIELD
+        }
+    return value
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    return (_TYPE_RANK.get(type(value), 6), value)
+
+
+def _compare(left: Any, right: Any) -> int:
+    a, b = _sort_key(left), _sort_key(right)
+    if a[0] != b[0]:
+        return -1 if a[0] < b[0] else 1
+    try:
+        return -1 if a[1] < b[1] else (1 if a[1] > b[1] else 0)
+    except TypeError:
+        return 0
+
+
+def _matches(value: Any, op: str, operand: Any) -> bool:
+    if value is _MISSING:
+        return False
+    if op == "==":
+        return bool(value == operand)
+    if op == "!=":
+        return value is not None and value != operand
+    if op == "in":
+        return value in operand
+    if op == "not-in":
+        return value is not None and value not in operand
+    if op == "array_contains":
+        return isinstance(value, list) and operand in value
+    if op == "array_contains_any":
+        return isinstance(value, list) and any(v in value for v in operand)
+    if _TYPE_RANK.get(type(value)) != _TYPE_RANK.get(type(operand)):
+        return False  # Range filters never match across types
+    cmp = _compare(value, operand)
+    return {"<": cmp < 0, "<=": cmp <= 0, ">": cmp > 0, ">=": cmp >= 0}[op]
+
+
+class _Store:
+    """Collections of documents keyed by collection path, then document ID."""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def read(self, path: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            data = self.collections.get(path, {}).get(doc_id)
+            return copy.deepcopy(data) if data is not None else None
+
+    def documents(
+        self,
+        path: str,
+        predicate: Optional[Callable[[str, Dict[str, Any]], bool]] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Copies of the documents in a collection (matching ``predicate``)."""
+        with self.lock:
+            return [
+                (doc_id, copy.deepcopy(data))
+                for doc_id, data in self.collections.get(path, {}).items()
+                if predicate is None or predicate(doc_id, data)
+            ]
+
+    def apply(self, writes: Sequence["_Write"]) -> None:
+        """Apply writes atomically (all-or-nothing, like a commit)."""
+        with self.lock:
+            for write in writes:
+                if write.op == "update" and self.read(write.path, write.doc_id) is None:
+                    raise NotFound(f"No document to update: {write.path}/{write.doc_id}")
+            for write in writes:
+                docs = self.collections.setdefault(write.path, {})
+                if write.op == "delete":
+                    docs.pop(write.doc_id, None)
+                elif write.op == "create":
+                    if write.doc_id in docs:
+                        raise ValueError(f"Document already exists: {write.doc_id}")
+                    docs[write.doc_id] = _strip_deletes(write.data)
+                elif write.op == "set" and not write.merge:
+                    docs[write.doc_id] = _strip_deletes(write.data)
+                elif write.op == "set":
+                    _merge(docs.setdefault(write.doc_id, {}), write.data)
+                else:
+                    doc = docs[write.doc_id]
+                    for field_path, value in write.data.items():
+                        _set_path(doc, field_path, value)
+
+
+class _Write:
+    def __init__(
+        self, op: str, ref: "FakeDocumentReference", data: Any = None, merge=False
+    ):
+        self.op = op
+        self.path = ref.collection_path
+        self.doc_id = ref.id
+        self.data = encode_value(data) if data is not None else None
+        self.merge = bool(merge)
+
+
+class FakeDocumentSnapshot:
+    """Point-in-time copy of one document."""
+
+    def __init__(self, reference: "FakeDocumentReference", data: Optional[Dict]):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> Any:
+        value = _get_path(self._data or {}, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class FakeDocumentReference:
+    """Reference to ``<collection_path>/<id>``."""
+
+    def __init__(self, client: "FakeFirestoreClient", collection_path: str, id: str):
+        self._client = client
+        self.collection_path = collection_path
+        self.id = id
+
+    @property
+    def path(self) -> str:
+        return f"{self.collection_path}/{self.id}"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FakeDocumentReference) and other.path == self.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def collection(self, name: str) -> "FakeCollectionReference":
+        return FakeCollectionReference(self._client, f"{self.path}/{name}")
+
+    def get(self, transaction: Any = None, **kwargs: Any) -> FakeDocumentSnapshot:
+        self._client.service.call("document.get")
+        return self._snapshot()
+
+    def _snapshot(self) -> FakeDocumentSnapshot:
+        return FakeDocumentSnapshot(
+            self, self._client.store.read(self.collection_path, self.id)
+        )
+
+    def set(self, document_data: Dict[str, Any], merge: bool = False) -> None:
+        self._client._commit([_Write("set", self, document_data, merge)], "document.set")
+
+    def create(self, document_data: Dict[str, Any]) -> None:
+        self._client._commit([_Write("create", self, document_data)], "document.create")
+
+    def update(self, field_updates: Dict[str, Any], **kwargs: Any) -> None:
+        self._client._commit([_Write("update", self, field_updates)], "document.update")
+
+    def delete(self, **kwargs: Any) -> None:
+        self._client._commit([_Write("delete", self)], "document.delete")
+
+
+class _AggregationResult:
+    def __init__(self, alias: str, value: int):
+        self.alias = alias
+        self.value = value
+
+
+class FakeAggregationQuery:
+    """``query.count()``; ``get()`` returns ``[[AggregationResult]]``."""
+
+    def __init__(self, query: "FakeQuery", alias: Optional[str]):
+        self._query = query
+        self._alias = alias or "field_1"
+
+    def get(
+        self, transaction: Any = None, **kwargs: Any
+    ) -> List[List[_AggregationResult]]:
+        self._query._client.service.call("query.count")
+        return [[_AggregationResult(self._alias, len(self._query._run()))]]
+
+
+class FakeQuery:
+    """Immutable query over one collection."""
+
+    def __init__(
+        self,
+        client: "FakeFirestoreClient",
+        collection_path: str,
+        filters: Tuple[Tuple[str, str, Any], ...] = (),
+        orders: Tuple[Tuple[str, str], ...] = (),
+        limit: Optional[int] = None,
+        cursor: Any = None,
+    ):
+        self._client = client
+        self._path = collection_path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit
+        self._cursor = cursor
+
+    def _copy(self, **changes: Any) -> "FakeQuery":
+        state = {
+            "filters": self._filters,
+            "orders": self._orders,
+            "limit": self._limit,
+            "cursor": self._cursor,
+        }
+        state.update(changes)
+        return FakeQuery(self._client, self._path, **state)
+
+    def where(
+        self,
+        field_path: Optional[str] = None,
+        op_string: Optional[str] = None,
+        value: Any = None,
+        *,
+        filter: Any = None,
+    ) -> "FakeQuery":
+        if filter is not None:
+            if not hasattr(filter, "op_string"):
+                raise NotImplementedError(
+                    f"Unsupported filter type: {type(filter).__name__}"
+                )
+            field_path, op_string, value = (
+                filter.field_path,
+                filter.op_string,
+                filter.value,
+            )
+        clause = (str(field_path), str(op_string), encode_value(value))
+        return self._copy(filters=self._filters + (clause,))
+
+    def order_by(self, field_path: str, direction: str = ASCENDING) -> "FakeQuery":
+        return self._copy(orders=self._orders + ((field_path, direction),))
+
+    def limit(self, count: int) -> "FakeQuery":
+        return self._copy(limit=count)
+
+    def start_after(self, document_fields_or_snapshot: Any) -> "FakeQuery":
+        return self._copy(cursor=document_fields_or_snapshot)
+
+    def count(self, alias: Optional[str] = None) -> FakeAggregationQuery:
+        return FakeAggregationQuery(self, alias)
+
+    def stream(
+        self, transaction: Any = None, **kwargs: Any
+    ) -> Iterator[FakeDocumentSnapshot]:
+        self._client.service.call("query.stream")
+        return iter(self._run())
+
+    def get(self, transaction: Any = None, **kwargs: Any) -> List[FakeDocumentSnapshot]:
+        return list(self.stream(transaction=transaction))
+
+    def _field(self, doc_id: str, data: Dict[str, Any], field_path: str) -> Any:
+        return doc_id if field_path == DOCUMENT_ID else _get_path(data, field_path)
+
+    def _run(self) -> List[FakeDocumentSnapshot]:
+        docs = self._client.store.documents(
+            self._path,
+            lambda doc_id, data: all(
+                _matches(self._field(doc_id, data, f), op, v)
+                for f, op, v in self._filters
+            ),
+        )
+
+        # Firestore orders by document ID last, in the direction of the last order
+        orders = list(self._orders)
+        if not orders or orders[-1][0] != DOCUMENT_ID:
+            orders.append((DOCUMENT_ID, orders[-1][1] if orders else ASCENDING))
+        docs = [
+            d for d in docs if all(self._field(*d, f) is not _MISSING for f, _ in orders)
+        ]
+        for field_path, direction in reversed(orders):
+            docs.sort(
+                key=lambda d, f=field_path: _sort_key(self._field(*d, f)),
+                reverse=direction == DESCENDING,
+            )
+
+        if self._cursor is not None:
+            cursor = self._cursor_values(orders)
+            docs = [d for d in docs if self._after(d, orders, cursor)]
+        if self._limit is not None:
+            docs = docs[: self._limit]
+        return [
+            FakeDocumentSnapshot(
+                FakeDocumentReference(self._client, self._path, doc_id), data
+            )
+            for doc_id, data in docs
+        ]
+
+    def _cursor_values(self, orders: List[Tuple[str, str]]) -> List[Any]:
+        cursor = self._cursor
+        if isinstance(cursor, FakeDocumentSnapshot):
+            data = cursor.to_dict() or {}
+            return [self._field(cursor.id, data, f) for f, _ in orders]
+        if isinstance(cursor, dict):
+            encoded = encode_value(cursor)
+            return [encoded.get(f, _MISSING) for f, _ in orders]
+        return [encode_value(v) for v in cursor]
+
+    def _after(
+        self, doc: Tuple[str, Dict], orders: List[Tuple[str, str]], cursor: List[Any]
+    ) -> bool:
+        for (field_path, direction), bound in zip(orders, cursor):
+            if bound is _MISSING:
+                break
+            cmp = _compare(self._field(*doc, field_path), bound)
+            if direction == DESCENDING:
+                cmp = -cmp
+            if cmp != 0:
+                return cmp > 0
+        return False
+
+
+class FakeCollectionReference(FakeQuery):
+    """A collection is also the unfiltered query over it."""
+
+    def __init__(self, client: "FakeFirestoreClient", path: str):
+        super().__init__(client, path)
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(
+            self._client, self._path, document_id or uuid.uuid4().hex[:20]
+        )
+
+    def add(self, document_data: Dict[str, Any]) -> Tuple[None, FakeDocumentReference]:
+        ref = self.document()
+        ref.create(document_data)
+        return None, ref
+
+    def list_documents(self) -> List[FakeDocumentReference]:
+        self._client.service.call("collection.list_documents")
+        return [
+            self.document(doc_id)
+            for doc_id, _ in self._client.store.documents(self._path)
+        ]
+
+
+class FakeWriteBatch:
+    """Buffered writes committed atomically in one RPC."""
+
+    _commit_method = "batch.commit"
+
+    def __init__(self, client: "FakeFirestoreClient"):
+        self._client = client
+        self._writes: List[_Write] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def set(self, reference: FakeDocumentReference, document_data: Dict, merge=False):
+        self._writes.append(_Write("set", reference, document_data, merge))
+
+    def create(self, reference: FakeDocumentReference, document_data: Dict):
+        self._writes.append(_Write("create", reference, document_data))
+
+    def update(self, reference: FakeDocumentReference, field_updates: Dict, **kwargs):
+        self._writes.append(_Write("update", reference, field_updates))
+
+    def delete(self, reference: FakeDocumentReference, **kwargs):
+        self._writes.append(_Write("delete", reference))
+
+    def commit(self, **kwargs: Any) -> List[None]:
+        writes, self._writes = self._writes, []
+        self._client._commit(writes, self._commit_method)
+        return [None] * len(writes)
+
+
+class FakeTransaction(FakeWriteBatch):
+    """Reads go straight to the store; writes commit when the function returns."""
+
+    _commit_method = "transaction.commit"
+
+    def get(self, ref_or_query: Any) -> Any:
+        if isinstance(ref_or_query, FakeDocumentReference):
+            return iter([ref_or_query.get(transaction=self)])
+        return ref_or_query.stream(transaction=self)
+
+
+def transactional(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Stand-in for ``firestore.transactional``: run once, then commit."""
+
+    def wrapper(transaction: FakeTransaction, *args: Any, **kwargs: Any) -> Any:
+        result = func(transaction, *args, **kwargs)
+        transaction.commit()
+        return result
+
+    return wrapper
+
+
+class FakeFirestoreClient:
+    """``firestore.Client`` backed by a shared in-memory store."""
+
+    def __init__(self, service: SimulatedService, store: Optional[_Store] = None):
+        self.service = service
+        self.store = store or _Store()
+        self.project = "simulation"
+
+    def collection(self, name: str) -> FakeCollectionReference:
+        return FakeCollectionReference(self, name)
+
+    def document(self, path: str) -> FakeDocumentReference:
+        collection_path, doc_id = path.rsplit("/", 1)
+        return FakeDocumentReference(self, collection_path, doc_id)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def transaction(self, **kwargs: Any) -> FakeTransaction:
+        return FakeTransaction(self)
+
+    def get_all(
+        self, references: Sequence[FakeDocumentReference], **kwargs: Any
+    ) -> Iterator[FakeDocumentSnapshot]:
+        self.service.call("get_all")
+        return iter([ref._snapshot() for ref in references])
+
+    def close(self) -> None:
+        """No connections to release."""
+
+    def _commit(self, writes: List[_Write], method: str) -> None:
+        self.service.call(method)
+        self.store.apply(writes)
+
+    def document_count(self, collection: Optional[str] = None) -> int:
+        """Documents stored in one collection, or in all of them."""
+        with self.store.lock:
+            if collection is not None:
+                return len(self.store.collections.get(collection, {}))
+            return sum(len(docs) for docs in self.store.collections.values())
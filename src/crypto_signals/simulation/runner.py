@@ -0,0 +1,354 @@
+"""
+End-to-end Job Simulator.
+
+Runs the real ``main`` flow (startup, background pipelines, signal generation,
+signal processing, position sync) against in-memory Alpaca, Firestore,
+BigQuery and Discord stand-ins, then reports wall-clock per phase, API calls
+per service/method (with rate-limit throttling) and peak RSS.
+
+The fakes are installed at the single place each SDK client is constructed
+(``config`` for Alpaca, ``google.cloud.firestore`` / ``google.cloud.bigquery``
+for the GCP clients, the ``requests`` module seen by ``notifications.discord``),
+so every repository, pipeline and engine runs unmodified.
+
+Usage (see ``crypto_signals.scripts.diagnostics.simulate`` for the CLI):
+    >>> config = SimulationConfig(crypto_symbols=synthetic_symbols(500))
+    >>> report = run_simulation(config)
+    >>> report.phases["signal_generation"], report.calls_by_service()
+"""
+
+import os
+import signal
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unittest import mock
+
+from loguru import logger
+
+from crypto_signals.metrics import (
+    OPERATION_DURATION,
+    PHASE_DURATION,
+    get_metrics_registry,
+)
+from crypto_signals.simulation.alpaca import (
+    DEFAULT_HISTORY_DAYS,
+    DEFAULT_STARTING_CASH,
+    FakeMarketDataClient,
+    FakeTradingClient,
+    SimulatedMarket,
+)
+from crypto_signals.simulation.bigquery import FakeBigQueryClient
+from crypto_signals.simulation.discord import FakeDiscord
+from crypto_signals.simulation.firestore import FakeFirestoreClient, transactional
+from crypto_signals.simulation.service import (
+    CallStats,
+    ServiceProfile,
+    SimulatedService,
+)
+
+ALPACA_TRADING = "alpaca_trading"
+ALPACA_DATA = "alpaca_data"
+FIRESTORE = "firestore"
+BIGQUERY = "bigquery"
+DISCORD = "discord"
+
+# Typical round trips from a Cloud Run job; Alpaca's 200 req/min per API and
+# Discord's per-webhook budget are the limits that shape a large run.
+DEFAULT_PROFILES: Dict[str, ServiceProfile] = {
+    ALPACA_TRADING: ServiceProfile(latency_ms=60, jitter_ms=20, requests_per_minute=200),
+    ALPACA_DATA: ServiceProfile(latency_ms=80, jitter_ms=30, requests_per_minute=200),
+    FIRESTORE: ServiceProfile(latency_ms=15, jitter_ms=5),
+    BIGQUERY: ServiceProfile(latency_ms=400, jitter_ms=100),
+    DISCORD: ServiceProfile(latency_ms=120, jitter_ms=40, requests_per_minute=30),
+}
+
+# Startup operations timed by log_execution_time, reported next to the phases
+STARTUP_OPERATIONS = ("load_secrets", "initialize_services", "asset_validation")
+
+
+def synthetic_symbols(count: int, asset_class: str = "crypto") -> List[str]:
+    """Portfolio of ``count`` made-up tickers ("SIM0001/USD" or "SIMQ0001")."""
+    if asset_class == "crypto":
+        return [f"SIM{i:04d}/USD" for i in range(1, count + 1)]
+    return [f"SIMQ{i:04d}" for i in range(1, count + 1)]
+
+
+def recorded_symbols(bars_dir: str) -> Tuple[List[str], List[str]]:
+    """
+    (crypto, equity) symbols with a recorded CSV in ``bars_dir``.
+
+    Crypto files are stored as ``BASE_QUOTE.csv`` (e.g. ``BTC_USD.csv``).
+    """
+    crypto, equity = [], []
+    for name in sorted(os.listdir(bars_dir)):
+        if not name.endswith(".csv"):
+            continue
+        symbol = name[: -len(".csv")]
+        if "_" in symbol:
+            crypto.append(symbol.replace("_", "/"))
+        else:
+            equity.append(symbol)
+    return crypto, equity
+
+
+@dataclass
+class SimulationConfig:
+    """
+    One simulated job run.
+
+    Attributes:
+        crypto_symbols: Crypto portfolio (CRYPTO_SYMBOLS).
+        equity_symbols: Equity portfolio (EQUITY_SYMBOLS; enables equities).
+        bars_dir: Recorded per-symbol CSV bars; others get synthetic bars.
+        history_days: Synthetic daily history per symbol.
+        profiles: Latency / rate-limit model per service.
+        latency: Apply the profiles' latencies (False = CPU-bound run).
+        rate_limits: Apply the profiles' rate limits.
+        max_workers: Phase 1 worker threads (MAX_WORKERS); app default if None.
+        stagger_delay: Per-symbol start stagger (RATE_LIMIT_DELAY). The fakes
+            enforce the real rate limits, so 0 measures the unthrottled flow.
+        enable_execution: Submit orders for signals (ENABLE_EXECUTION).
+        starting_cash: Paper account cash.
+        seed: Synthetic data and latency jitter seed.
+        env: Extra environment overrides (Settings fields).
+    """
+
+    crypto_symbols: List[str] = field(default_factory=lambda: synthetic_symbols(10))
+    equity_symbols: List[str] = field(default_factory=list)
+    bars_dir: Optional[str] = None
+    history_days: int = DEFAULT_HISTORY_DAYS
+    profiles: Dict[str, ServiceProfile] = field(
+        default_factory=lambda: dict(DEFAULT_PROFILES)
+    )
+    latency: bool = True
+    rate_limits: bool = True
+    max_workers: Optional[int] = None
+    stagger_delay: float = 0.0
+    enable_execution: bool = True
+    starting_cash: float = DEFAULT_STARTING_CASH
+    seed: int = 42
+    env: Dict[str, str] = field(default_factory=dict)
+
+    def profile(self, service: str) -> ServiceProfile:
+        """Effective profile of a service after the latency / rate-limit switches."""
+        profile = self.profiles.get(service, ServiceProfile())
+        if not self.latency:
+            profile = replace(profile, latency_ms=0.0, jitter_ms=0.0)
+        if not self.rate_limits:
+            profile = replace(profile, requests_per_minute=None)
+        return profile
+
+    def environment(self) -> Dict[str, str]:
+        """Settings environment for the simulated run."""
+        env = {
+            "GOOGLE_CLOUD_PROJECT": "crypto-signals-simulation",
+            # Production routing (live collections, broker orders, reconciliation);
+            # every side effect lands in the fakes
+            "ENVIRONMENT": "PROD",
+            "TEST_MODE": "true",
+            "DISABLE_SECRET_MANAGER": "true",
+            "ALPACA_API_KEY": "simulation",
+            "ALPACA_SECRET_KEY": "simulation",
+            "ALPACA_PAPER_TRADING": "true",
+            "TEST_DISCORD_WEBHOOK": "https://discord.com/api/webhooks/0/simulation",
+            "ENABLE_GCP_LOGGING": "false",
+            "ENABLE_MARKET_DATA_CACHE": "false",
+            "ENABLE_EXECUTION": str(self.enable_execution).lower(),
+            "ENABLE_EQUITIES": str(bool(self.equity_symbols)).lower(),
+            "CRYPTO_SYMBOLS": ",".join(self.crypto_symbols),
+            "EQUITY_SYMBOLS": ",".join(self.equity_symbols),
+            "RATE_LIMIT_DELAY": str(self.stagger_delay),
+        }
+        if self.max_workers is not None:
+            env["MAX_WORKERS"] = str(self.max_workers)
+        env.update(self.env)
+        return env
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of one simulated run."""
+
+    symbols: int
+    exit_code: int
+    wall_seconds: float
+    phases: Dict[str, float]
+    api_calls: Dict[Tuple[str, str], CallStats]
+    peak_rss_mb: Optional[float]
+    failures: Dict[str, int] = field(default_factory=dict)
+    orders: int = 0
+    open_positions: int = 0
+    discord_messages: int = 0
+    firestore_documents: int = 0
+    bigquery_rows: Dict[str, int] = field(default_factory=dict)
+
+    def calls_by_service(self) -> Dict[str, int]:
+        """Total calls per service."""
+        totals: Dict[str, int] = {}
+        for (service, _), stats in self.api_calls.items():
+            totals[service] = totals.get(service, 0) + stats.calls
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready view."""
+        data = asdict(self)
+        data["api_calls"] = [
+            {"service": service, "method": method, **asdict(stats)}
+            for (service, method), stats in sorted(self.api_calls.items())
+        ]
+        return data
+
+
+class SimulatedEnvironment:
+    """The fakes of one run, installed while the context is active."""
+
+    def __init__(self, config: SimulationConfig):
+        self.config = config
+        self.services = {
+            name: SimulatedService(name, config.profile(name), seed=config.seed)
+            for name in (ALPACA_TRADING, ALPACA_DATA, FIRESTORE, BIGQUERY, DISCORD)
+        }
+        self.market = SimulatedMarket(
+            config.bars_dir, history_days=config.history_days, seed=config.seed
+        )
+        self.trading = FakeTradingClient(
+            self.market,
+            self.services[ALPACA_TRADING],
+            crypto_symbols=config.crypto_symbols,
+            equity_symbols=config.equity_symbols,
+            starting_cash=config.starting_cash,
+        )
+        self.data = FakeMarketDataClient(self.market, self.services[ALPACA_DATA])
+        self.firestore = FakeFirestoreClient(self.services[FIRESTORE])
+        self.bigquery = FakeBigQueryClient(self.services[BIGQUERY])
+        self.discord = FakeDiscord(self.services[DISCORD])
+
+    def api_calls(self) -> Dict[Tuple[str, str], CallStats]:
+        """Per (service, method) call statistics."""
+        calls: Dict[Tuple[str, str], CallStats] = {}
+        for service in self.services.values():
+            calls.update(service.stats())
+        return calls
+
+
+@contextmanager
+def simulated_environment(config: SimulationConfig) -> Iterator[SimulatedEnvironment]:
+    """
+    Install the fakes and the simulation settings for the duration of the block.
+
+    Settings are re-read from the patched environment (``get_settings`` cache
+    cleared on entry and exit), so the real configuration is untouched.
+    Process-wide clients built from them are dropped the same way.
+    """
+    from google.cloud import bigquery, firestore
+
+    from crypto_signals.config import get_settings
+    from crypto_signals.pipelines.aggregates import get_patch_trade_aggregates
+
+    env = SimulatedEnvironment(config)
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, config.environment()))
+        get_settings.cache_clear()
+        stack.callback(get_settings.cache_clear)
+        get_patch_trade_aggregates.cache_clear()
+        stack.callback(get_patch_trade_aggregates.cache_clear)
+        # Imported once the environment is in place: modules read settings at
+        # import time
+        import crypto_signals.main  # noqa: F401
+
+        for name in ("StockHistoricalDataClient", "CryptoHistoricalDataClient"):
+            stack.enter_context(
+                mock.patch(f"crypto_signals.config.{name}", lambda *a, **k: env.data)
+            )
+        stack.enter_context(
+            mock.patch("crypto_signals.config.TradingClient", lambda *a, **k: env.trading)
+        )
+        stack.enter_context(
+            mock.patch.object(firestore, "Client", lambda *a, **k: env.firestore)
+        )
+        stack.enter_context(mock.patch.object(firestore, "transactional", transactional))
+        stack.enter_context(
+            mock.patch.object(bigquery, "Client", lambda *a, **k: env.bigquery)
+        )
+        stack.enter_context(
+            mock.patch("crypto_signals.notifications.discord.requests", env.discord)
+        )
+        yield env
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _collect_phases() -> Tuple[Dict[str, float], Dict[str, int]]:
+    """Phase gauges and startup operations of the run, plus failures by operation."""
+    phases: Dict[str, float] = {}
+    failures: Dict[str, int] = {}
+    for family in get_metrics_registry().collect():
+        if family.name == PHASE_DURATION:
+            for labels, gauge in family.series():
+                phases[labels["phase"]] = gauge.value
+        elif family.name == OPERATION_DURATION:
+            for labels, histogram in family.series():
+                snapshot = histogram.snapshot()
+                if labels["outcome"] == "failure":
+                    failures[labels["operation"]] = snapshot.count
+                elif labels["operation"] in STARTUP_OPERATIONS:
+                    phases[labels["operation"]] = snapshot.total
+    return phases, failures
+
+
+def run_simulation(config: SimulationConfig) -> SimulationReport:
+    """
+    Run the real job once against the simulated services.
+
+    Must be called from the main thread (the job installs signal handlers,
+    which are restored afterwards). The metrics registry is reset first so the
+    report covers this run only.
+
+    Returns:
+        SimulationReport for the run.
+    """
+    get_metrics_registry().reset()
+    handlers = {s: signal.getsignal(s) for s in (signal.SIGINT, signal.SIGTERM)}
+    symbols = len(config.crypto_symbols) + len(config.equity_symbols)
+    logger.info(f"Simulating job run over {symbols} symbols...")
+
+    with simulated_environment(config) as env:
+        import crypto_signals.main as main_module
+
+        exit_code = 0
+        start = time.perf_counter()
+        try:
+            main_module.main(smoke_test=False)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        finally:
+            wall_seconds = time.perf_counter() - start
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+
+        phases, failures = _collect_phases()
+        return SimulationReport(
+            symbols=symbols,
+            exit_code=exit_code,
+            wall_seconds=wall_seconds,
+            phases=phases,
+            api_calls=env.api_calls(),
+            peak_rss_mb=_peak_rss_mb(),
+            failures=failures,
+            orders=env.trading.order_count(),
+            open_positions=env.trading.position_count(),
+            discord_messages=env.discord.message_count(),
+            firestore_documents=env.firestore.document_count(),
+            bigquery_rows=env.bigquery.row_counts(),
+        )
@@ -0,0 +1,122 @@
+"""
+Simulated Service Behaviour.
+
+Every fake external service routes its calls through a ``SimulatedService``,
+which adds a configurable round-trip latency, enforces a token-bucket rate
+limit and records per-method call statistics for the simulation report.
+
+Over-budget calls block until a token is free (the server queues them), so a
+run shows how long the real limits stretch each phase; the number of
+throttled calls and the time spent waiting are reported per method.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ServiceProfile:
+    """
+    Latency and rate-limit model of one external service.
+
+    Attributes:
+        latency_ms: Mean round-trip time added to every call.
+        jitter_ms: Uniform +/- jitter around the mean.
+        requests_per_minute: Sustained rate limit (None = unlimited).
+        burst: Token-bucket capacity; defaults to one second of budget.
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    requests_per_minute: Optional[float] = None
+    burst: Optional[int] = None
+
+
+@dataclass
+class CallStats:
+    """Aggregated calls to one service method."""
+
+    calls: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+    latency_seconds: float = 0.0
+
+
+class SimulatedService:
+    """Latency, rate limit and call log shared by one fake service."""
+
+    def __init__(self, name: str, profile: ServiceProfile, seed: int = 0):
+        """
+        Args:
+            name: Service name used in the report (e.g. "alpaca_trading").
+            profile: Latency / rate-limit model.
+            seed: Jitter RNG seed.
+        """
+        self.name = name
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CallStats] = {}
+
+        rpm = profile.requests_per_minute
+        self._rate = rpm / 60.0 if rpm else None
+        self._capacity = float(
+            profile.burst if profile.burst is not None else max(1.0, (rpm or 60) / 60)
+        )
+        self._tokens = self._capacity
+        self._refilled_at = time.monotonic()
+
+    def call(self, method: str) -> None:
+        """Account for one request: wait for a rate-limit token, then the latency."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+        latency = self._latency()
+        if latency > 0:
+            time.sleep(latency)
+
+        with self._lock:
+            stats = self._stats.setdefault(method, CallStats())
+            stats.calls += 1
+            stats.latency_seconds += latency
+            if wait > 0:
+                stats.throttled += 1
+                stats.throttle_wait_seconds += wait
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt); return the seconds to wait."""
+        if self._rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._refilled_at) * self._rate
+            )
+            self._refilled_at = now
+            self._tokens -= 1
+            return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    def _latency(self) -> float:
+        profile = self.profile
+        if profile.latency_ms <= 0 and profile.jitter_ms <= 0:
+            return 0.0
+        with self._lock:
+            jitter = self._rng.uniform(-profile.jitter_ms, profile.jitter_ms)
+        return max(0.0, profile.latency_ms + jitter) / 1000
+
+    def stats(self) -> Dict[Tuple[str, str], CallStats]:
+        """Copy of the call statistics keyed by (service, method)."""
+        with self._lock:
+            return {
+                (self.name, method): CallStats(**vars(s))
+                for method, s in self._stats.items()
+            }
+
+    def total_calls(self) -> int:
+        """Calls made to any method of this service."""
+        with self._lock:
+            return sum(s.calls for s in self._stats.values())
@@ -0,0 +1,403 @@
+"""
+Run Tracing.
+
+A lightweight span tree for one job run: nested spans carried in a
+``contextvars`` context, propagated into ``TracedThreadPoolExecutor`` workers,
+and exported as a Chrome trace (``chrome://tracing`` / Perfetto) or OTLP JSON.
+
+External calls timed with ``crypto_signals.metrics.track_api_call`` (Alpaca,
+Firestore, BigQuery, Discord) become client spans automatically, and
+``log_execution_time`` / ``timed`` open a span per operation, so one trace
+shows the critical path, per-symbol workers and idle gaps such as stagger
+sleeps.
+
+Tracing is off until ``start_trace`` is called; spans are then near-free no-ops.
+
+Usage:
+    >>> root = start_trace("signal_generator")
+    >>> with get_tracer().span("phase.signal_generation"):
+    ...     with TracedThreadPoolExecutor(max_workers=4) as pool:
+    ...         pool.submit(process_symbol, "BTC/USD")
+    >>> root.end()
+    >>> export_trace(".gemini/traces", "chrome", "signal_generator")
+"""
+
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from loguru import logger
+
+# Bound memory for long runs; later spans are counted but not kept
+MAX_TRACE_SPANS = 50_000
+
+TRACE_FORMAT_CHROME = "chrome"
+TRACE_FORMAT_OTLP = "otlp"
+
+SPAN_KIND_INTERNAL = "internal"
+SPAN_KIND_CLIENT = "client"
+
+# OTLP enum values (opentelemetry-proto trace.proto)
+_OTLP_SPAN_KIND = {SPAN_KIND_INTERNAL: 1, SPAN_KIND_CLIENT: 3}
+_OTLP_STATUS_OK = 1
+_OTLP_STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    """One timed operation in the run's span tree."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "thread_id",
+        "thread_name",
+        "_tracer",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        tracer: Optional["Tracer"],
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: str,
+        attributes: Dict[str, Any],
+    ):
+        thread = threading.current_thread()
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.thread_id = thread.ident or 0
+        self.thread_name = thread.name
+        self._tracer = tracer
+        self._token: Optional[contextvars.Token] = None
+        self.end_ns: Optional[int] = None
+        self.start_ns = time.time_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a key/value to the span."""
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """Mark the span as failed."""
+        self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def end(self) -> None:
+        """Close the span and restore its parent as the current span."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Ended from another context (e.g. a different thread)
+                pass
+            self._token = None
+        if self._tracer is not None:
+            self._tracer._record(self)
+
+    @property
+    def duration_ns(self) -> int:
+        """Elapsed time (up to now while still open)."""
+        return (self.end_ns or time.time_ns()) - self.start_ns
+
+
+class _NoopSpan:
+    """Returned while tracing is disabled."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans for the current run."""
+
+    def __init__(self, max_spans: int = MAX_TRACE_SPANS):
+        self.max_spans = max_spans
+        self.enabled = False
+        self.trace_id = ""
+        self.dropped = 0
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def start_trace(self, name: str, **attributes: Any) -> Span:
+        """
+        Begin a new trace (dropping any previous spans) and open its root span.
+
+        Returns:
+            The root span; end it when the run completes.
+        """
+        with self._lock:
+            self._spans = []
+            self.dropped = 0
+            self.trace_id = secrets.token_hex(16)
+            self.enabled = True
+        _current_span.set(None)
+        return self.start_span(name, **attributes)  # type: ignore[return-value]
+
+    def stop(self) -> None:
+        """Stop recording; collected spans stay available for export."""
+        self.enabled = False
+
+    def start_span(self, name: str, kind: str = SPAN_KIND_INTERNAL, **attributes: Any):
+        """
+        Open a span as a child of the current one and make it current.
+
+        Prefer ``span()``; use this form where a ``with`` block would force
+        re-indenting a large body, and call ``end()`` in a ``finally``.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        span = Span(
+            self,
+            name,
+            self.trace_id,
+            parent.span_id if parent is not None else None,
+            kind,
+            attributes,
+        )
+        span._token = _current_span.set(span)
+        return span
+
+    @contextmanager
+    def span(
+        self, name: str, kind: str = SPAN_KIND_INTERNAL, **attributes: Any
+    ) -> Iterator[Any]:
+        """Context manager form of ``start_span``; exceptions mark the span failed."""
+        span = self.start_span(name, kind, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            if span.trace_id != self.trace_id:
+                return  # Finished after a new trace started
+            if len(self._spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    def spans(self) -> List[Span]:
+        """Finished spans in completion order."""
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome Trace Event format (complete events, one track per thread)."""
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = []
+        threads: Dict[int, str] = {}
+        for span in self.spans():
+            threads.setdefault(span.thread_id, span.thread_name)
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.kind,
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": _json_safe(args),
+                }
+            )
+        for tid, thread_name in threads.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"trace_id": self.trace_id, "dropped_spans": self.dropped},
+        }
+
+    def to_otlp_json(self, service_name: str = "crypto-sentinel") -> Dict[str, Any]:
+        """OTLP/JSON ``ExportTraceServiceRequest`` body (ids hex, times as strings)."""
+        spans = []
+        for span in self.spans():
+            attributes = {**span.attributes, "thread.name": span.thread_name}
+            otlp: Dict[str, Any] = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": _OTLP_SPAN_KIND.get(span.kind, 1),
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                "attributes": [_otlp_attribute(k, v) for k, v in attributes.items()],
+                "status": (
+                    {"code": _OTLP_STATUS_ERROR, "message": span.error}
+                    if span.error
+                    else {"code": _OTLP_STATUS_OK}
+                ),
+            }
+            if span.parent_id:
+                otlp["parentSpanId"] = span.parent_id
+            spans.append(otlp)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otlp_attribute("service.name", service_name)]
+                    },
+                    "scopeSpans": [{"scope": {"name": "crypto_signals"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def write(self, path: str, fmt: str = TRACE_FORMAT_CHROME) -> None:
+        """Write the trace as JSON in the given format."""
+        if fmt == TRACE_FORMAT_CHROME:
+            payload = self.to_chrome_trace()
+        elif fmt == TRACE_FORMAT_OTLP:
+            payload = self.to_otlp_json()
+        else:
+            raise ValueError(f"Unknown trace format: {fmt}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+
+
+def _json_safe(values: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: v if isinstance(v, (str, int, float, bool)) or v is None else str(v)
+        for k, v in values.items()
+    }
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    """The span active in this context, if tracing."""
+    return _current_span.get()
+
+
+def annotate_span(**attributes: Any) -> None:
+    """Attach attributes to the current span (no-op when not tracing)."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes.update(attributes)
+
+
+def start_trace(name: str, **attributes: Any) -> Span:
+    """Begin a trace on the process-wide tracer and return its root span."""
+    return _tracer.start_trace(name, **attributes)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[..., Any]:
+    """Decorator wrapping each call in a span (defaults to the qualified name)."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def export_trace(directory: str, fmt: str, job_name: str) -> Optional[str]:
+    """
+    Stop tracing and write ``<job>_<UTC timestamp>.<fmt>.json`` under ``directory``.
+
+    Failures are logged, never raised.
+
+    Returns:
+        The written path, or None on failure.
+    """
+    _tracer.stop()
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(directory, f"{job_name}_{stamp}.{fmt}.json")
+    try:
+        _tracer.write(path, fmt)
+    except Exception as e:
+        logger.warning(f"Trace export failed: {e}")
+        return None
+    logger.info(
+        f"Trace written to {path} ({len(_tracer.spans())} spans)",
+        extra={"trace_id": _tracer.trace_id, "dropped_spans": _tracer.dropped},
+    )
+    return path
+
+
+class TracedThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that runs each task in a copy of the submitter's context.
+
+    Spans opened in workers become children of the span active at submit time.
+    """
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
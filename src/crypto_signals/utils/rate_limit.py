@@ -0,0 +1,104 @@
+"""Thread-safe request pacing for shared API rate budgets."""
+
+import threading
+import time
+from typing import Any, Dict, TypeVar
+
+from crypto_signals.config import get_settings
+from crypto_signals.metrics import RATE_LIMITER_WAIT, get_metrics_registry
+
+ClientT = TypeVar("ClientT")
+
+
+class RateLimiter:
+    """Spaces calls at least ``60 / requests_per_minute`` seconds apart.
+
+    A single instance is shared by every worker thread that calls the same API,
+    so concurrent fan-out stays inside one rate budget. Every acquire records
+    its wait in the ``rate_limiter_wait_seconds`` histogram.
+
+    Example:
+        >>> limiter = RateLimiter(requests_per_minute=180)
+        >>> limiter.acquire()  # Blocks until this caller's slot
+        >>> client.get_order_by_id(order_id)
+    """
+
+    def __init__(self, requests_per_minute: float, name: str = "default"):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_minute: Maximum sustained request rate.
+            name: Label for the wait-time metric series.
+        """
+        self.min_interval = 60.0 / requests_per_minute
+        self.name = name
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._wait_metric = (
+            get_metrics_registry()
+            .histogram(
+                RATE_LIMITER_WAIT,
+                "Time spent waiting for a rate limit slot",
+                ("limiter",),
+            )
+            .labels(limiter=name)
+        )
+
+    def acquire(self) -> None:
+        """Block until the next request slot is available."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        wait = slot - now
+        self._wait_metric.observe(max(wait, 0.0))
+        if wait > 0:
+            time.sleep(wait)
+
+
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def _shared_limiter(name: str, requests_per_minute: float) -> RateLimiter:
+    with _shared_limiters_lock:
+        if name not in _shared_limiters:
+            _shared_limiters[name] = RateLimiter(requests_per_minute, name=name)
+        return _shared_limiters[name]
+
+
+def get_alpaca_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter for Alpaca Trading API calls."""
+    return _shared_limiter("alpaca", get_settings().ALPACA_REQUESTS_PER_MINUTE)
+
+
+def get_alpaca_data_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter for Alpaca Market Data API calls."""
+    return _shared_limiter("alpaca_data", get_settings().ALPACA_DATA_REQUESTS_PER_MINUTE)
+
+
+def rate_limited(client: ClientT, limiter: RateLimiter) -> ClientT:
+    """
+    Pace every HTTP request of an alpaca-py REST client through ``limiter``.
+
+    Hooks ``RESTClient._one_request``, which every endpoint method (and each
+    of alpaca-py's 429 retries) goes through. Clients without it (test and
+    simulation fakes) are returned unchanged.
+
+    Args:
+        client: TradingClient or historical data client.
+        limiter: Shared limiter of the API the client calls.
+
+    Returns:
+        The same client instance.
+    """
+    one_request = getattr(client, "_one_request", None)
+    if one_request is None:
+        return client
+
+    def paced_request(*args: Any, **kwargs: Any) -> Any:
+        limiter.acquire()
+        return one_request(*args, **kwargs)
+
+    client._one_request = paced_request  # type: ignore[attr-defined]
+    return client
@@ -0,0 +1,135 @@
+"""Unit tests for the vectorized theoretical trade simulator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from crypto_signals.analysis.trade_simulator import (
+    EXIT_OPEN,
+    EXIT_SL,
+    EXIT_TP1,
+    EXIT_TP3,
+    EXIT_TRAIL,
+    simulate_signal,
+    simulate_signals,
+)
+
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def _bars(highs, lows, closes, chandelier_long=None):
+    index = pd.date_range(START, periods=len(highs), freq="D")
+    df = pd.DataFrame({"high": highs, "low": lows, "close": closes}, index=index)
+    if chandelier_long is not None:
+        df["CHANDELIER_EXIT_LONG"] = chandelier_long
+    return df
+
+
+class TestExitLadder:
+    """Single-signal paths through the TP1/TP2/TP3/SL/trailing ladder."""
+
+    def test_tp1_closes_everything_without_tp2(self):
+        bars = _bars([105, 112, 108], [99, 104, 100], [104, 110, 101])
+
+        result = simulate_signal(bars, START, 100.0, 95.0, 110.0)
+
+        assert result["exit_price"] == 110.0
+        assert result["exit_reason"] == EXIT_TP1
+        assert result["exit_offset"] == 1
+
+    def test_full_ladder_blends_exit_price(self):
+        bars = _bars([111, 121, 131], [100, 109, 119], [110, 120, 130])
+
+        result = simulate_signal(bars, START, 100.0, 95.0, 110.0, 120.0, 130.0)
+
+        # 50% at TP1, 25% at TP2, 25% at TP3
+        assert result["exit_price"] == pytest.approx(0.5 * 110 + 0.25 * 120 + 0.25 * 130)
+        assert result["exit_reason"] == EXIT_TP3
+        assert result["exit_offset"] == 2
+
+    def test_breakeven_stop_after_tp1(self):
+        bars = _bars([111, 105], [101, 99], [110, 100])
+
+        result = simulate_signal(bars, START, 100.0, 95.0, 110.0, 120.0, 130.0)
+
+        # Half at TP1, half stopped at entry (breakeven)
+        assert result["exit_price"] == pytest.approx(105.0)
+        assert result["exit_reason"] == EXIT_TP1
+
+    def test_runner_exits_on_chandelier_close_cross(self):
+        bars = _bars(
+            [111, 115, 114],
+            [101, 108, 106],
+            [110, 112, 107],
+            chandelier_long=[np.nan, 105.0, 108.0],
+        )
+
+        result = simulate_signal(bars, START, 100.0, 95.0, 110.0, 120.0, 130.0)
+
+        assert result["exit_price"] == pytest.approx(0.5 * 110 + 0.5 * 107)
+        assert result["exit_reason"] == EXIT_TRAIL
+        assert result["exit_offset"] == 2
+
+    def test_short_stop_loss(self):
+        bars = _bars([102, 106], [98, 101], [100, 105])
+
+        result = simulate_signal(bars, START, 100.0, 105.0, 90.0, is_long=False)
+
+        assert result["exit_price"] == 105.0
+        assert result["exit_reason"] == EXIT_SL
+
+    def test_untriggered_signal_marks_to_last_close(self):
+        bars = _bars([104, 106], [97, 98], [101, 103])
+
+        result = simulate_signal(bars, START, 100.0, 95.0, 110.0)
+
+        assert result["exit_price"] == 103.0
+        assert result["exit_reason"] == EXIT_OPEN
+
+
+class TestBatchSimulation:
+    """Many signals evaluated in one pass."""
+
+    def test_batch_matches_individual_runs(self):
+        bars = _bars(
+            [105, 112, 108, 121, 99],
+            [99, 104, 100, 110, 90],
+            [104, 110, 101, 120, 92],
+        )
+        signals = [
+            # entry day offset, entry, stop, tp1, tp2, tp3, is_long
+            (0, 100.0, 95.0, 110.0, 120.0, 130.0, True),
+            (2, 100.0, 95.0, 110.0, np.nan, np.nan, True),
+            (1, 108.0, 113.0, 95.0, np.nan, np.nan, False),
+            (4, 100.0, 95.0, 110.0, 120.0, np.nan, True),
+        ]
+        entry_times = [START + pd.Timedelta(days=s[0], hours=9) for s in signals]
+        columns = list(zip(*signals, strict=True))
+
+        batch = simulate_signals(
+            bars,
+            entry_times,
+            *(np.array(col, dtype=float) for col in columns[1:6]),
+            np.array(columns[6]),
+        )
+
+        for i, signal in enumerate(signals):
+            single = simulate_signal(
+                bars,
+                entry_times[i],
+                *signal[1:4],
+                None if np.isnan(signal[4]) else signal[4],
+                None if np.isnan(signal[5]) else signal[5],
+                is_long=signal[6],
+            )
+            assert batch["exit_price"][i] == pytest.approx(single["exit_price"])
+            assert batch["exit_reason"][i] == single["exit_reason"]
+        assert batch["entry_offset"].tolist() == [0, 2, 1, 4]
+
+    def test_signal_after_last_bar_has_no_result(self):
+        bars = _bars([105], [99], [104])
+
+        result = simulate_signal(bars, START + pd.Timedelta(days=3), 100.0, 95.0, 110.0)
+
+        assert np.isnan(result["exit_price"])
+        assert result["exit_reason"] is None
+        assert result["exit_offset"] == -1
@@ -41,6 +41,16 @@ def mock_env_vars():
     os.environ["FIRESTORE_EMULATOR_HOST"] = "127.0.0.1:8080"
 
 
+@pytest.fixture(autouse=True)
+def reset_schema_cache():
+    """Validated-schema fingerprints are process-wide; isolate them per test."""
+    from crypto_signals.engine.schema_guardian import get_schema_cache
+
+    get_schema_cache().clear()
+    yield
+    get_schema_cache().clear()
+
+
 @pytest.fixture
 def mock_main_dependencies():
     with ExitStack() as stack:
@@ -112,9 +122,19 @@ def mock_main_dependencies():
         mock_settings.return_value.EQUITY_SYMBOLS = []
         mock_settings.return_value.RATE_LIMIT_DELAY = 0.0
         mock_settings.return_value.ENABLE_GCP_LOGGING = False
+        mock_settings.return_value.METRICS_EXPORT_PATH = None
+        mock_settings.return_value.METRICS_HTTP_PORT = None
+        mock_settings.return_value.TRACE_EXPORT_DIR = None
+        mock_settings.return_value.PROFILE_DIR = None
         mock_settings.return_value.ENABLE_EXECUTION = False
+        mock_settings.return_value.ENABLE_BULK_POSITION_SYNC = True
         mock_settings.return_value.SIGNAL_SATURATION_THRESHOLD_PCT = 0.5
         mock_settings.return_value.MAX_WORKERS = 3
+        mock_settings.return_value.SIGNAL_PIPELINE_MAX_WORKERS = 2
+        mock_settings.return_value.SIGNAL_PERSIST_CONCURRENCY = 2
+        mock_settings.return_value.SIGNAL_NOTIFY_CONCURRENCY = 2
+        mock_settings.return_value.JOB_SCHEDULER_MAX_WORKERS = 4
+        mock_settings.return_value.JOB_TIMEOUT_SECONDS = 60
         mock_settings.return_value.DISCORD_BOT_TOKEN = "test_token"
         mock_settings.return_value.DISCORD_CHANNEL_ID_CRYPTO = "123"
         mock_settings.return_value.DISCORD_CHANNEL_ID_STOCK = "456"
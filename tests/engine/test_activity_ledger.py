@@ -0,0 +1,132 @@
+"""Tests for the shared account activity ledger."""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crypto_signals.engine import activity_ledger as ledger_module
+from crypto_signals.engine.activity_ledger import ActivityLedger, fetch_activity_ledger
+from crypto_signals.engine.execution import ExecutionEngine
+
+
+def _activity(activity_id, order_id=None, symbol="BTCUSD", day="2025-01-16", kind="CFEE"):
+    return {
+        "id": activity_id,
+        "activity_type": kind,
+        "order_id": order_id,
+        "symbol": symbol,
+        "qty": "-0.0001",
+        "price": "50000.0",
+        "date": day,
+    }
+
+
+class TestFetchActivityLedger:
+    """Pagination and indexing."""
+
+    def test_paginates_with_page_token(self):
+        client = MagicMock()
+        page_1 = [_activity(f"a{i}") for i in range(3)]
+        page_2 = [_activity("a2"), _activity("a3")]
+        client.get.side_effect = [page_1, page_2]
+
+        with patch.object(ledger_module, "ACTIVITIES_PAGE_SIZE", 3):
+            ledger = fetch_activity_ledger(client, date(2025, 1, 15), date(2025, 1, 17))
+
+        assert client.get.call_count == 2
+        first_params = client.get.call_args_list[0].args[1]
+        assert first_params["activity_types"] == "CFEE,CSD"
+        assert first_params["after"] == "2025-01-14"
+        assert first_params["until"] == "2025-01-18"
+        assert "page_token" not in first_params
+        assert client.get.call_args_list[1].args[1]["page_token"] == "a2"
+        # Boundary activity a2 appears on both pages but is indexed once
+        assert len(ledger) == 4
+
+    def test_indexes_by_order_and_symbol(self):
+        client = MagicMock()
+        client.get.return_value = [
+            _activity("a1", order_id="order-1"),
+            _activity("a2", order_id="order-1", kind="CSD"),
+            _activity("a3", symbol="ETH/USD", day="2025-01-20"),
+            _activity("a4", day="2025-01-10"),
+        ]
+
+        ledger = fetch_activity_ledger(client, date(2025, 1, 1), date(2025, 1, 31))
+
+        assert [a["id"] for a in ledger.for_order("order-1")] == ["a1", "a2"]
+        assert ledger.for_order(None) == []
+        cfee = ledger.for_symbol(
+            "BTC/USD", date(2025, 1, 15), date(2025, 1, 17), activity_type="CFEE"
+        )
+        assert [a["id"] for a in cfee] == ["a1"]
+        assert [a["id"] for a in ledger.for_symbol("ETHUSD")] == ["a3"]
+
+
+class TestIncrementalLedger:
+    """Only days outside the loaded window are fetched."""
+
+    def test_extend_fetches_missing_days_only(self):
+        client = MagicMock()
+        client.get.return_value = []
+        ledger = ActivityLedger(start_date=date(2025, 1, 10), end_date=date(2025, 1, 20))
+
+        ledger.extend(client, date(2025, 1, 8), date(2025, 1, 22))
+
+        windows = [
+            (c.args[1]["after"], c.args[1]["until"]) for c in client.get.call_args_list
+        ]
+        assert windows == [("2025-01-07", "2025-01-10"), ("2025-01-20", "2025-01-23")]
+        assert ledger.covers(date(2025, 1, 8), date(2025, 1, 22))
+
+
+@pytest.fixture
+def engine():
+    settings = MagicMock()
+    settings.ENVIRONMENT = "PROD"
+    with (
+        patch("crypto_signals.engine.execution.get_settings", return_value=settings),
+        patch("crypto_signals.engine.execution.RiskEngine"),
+    ):
+        yield ExecutionEngine(trading_client=MagicMock(), repository=MagicMock())
+
+
+class TestEngineLedgerSharing:
+    """ExecutionEngine shares one ledger across fee consumers."""
+
+    def test_fee_lookups_reuse_one_fetch(self, engine):
+        engine.alpaca.get.return_value = [
+            _activity("a1", day="2025-01-16"),
+            _activity("a2", symbol="ETHUSD", day="2025-01-16"),
+        ]
+        engine.get_activity_ledger(date(2025, 1, 1), date(2025, 1, 31))
+
+        btc = engine.get_crypto_fees_by_orders(
+            ["o1"], "BTC/USD", date(2025, 1, 15), date(2025, 1, 17)
+        )
+        eth = engine.get_crypto_fees_by_orders(
+            ["o2"], "ETH/USD", date(2025, 1, 15), date(2025, 1, 17)
+        )
+
+        assert btc["total_fee_usd"] == 5.0
+        assert eth["total_fee_usd"] == 5.0
+        engine.alpaca.get.assert_called_once()
+
+    def test_wider_window_extends_ledger(self, engine):
+        engine.alpaca.get.return_value = []
+
+        first = engine.get_activity_ledger(date(2025, 1, 10), date(2025, 1, 20))
+        second = engine.get_activity_ledger(date(2025, 1, 12), date(2025, 1, 25))
+
+        assert second is first
+        assert engine.alpaca.get.call_count == 2
+        assert first.end_date == date(2025, 1, 25)
+
+    def test_engines_do_not_share_ledger_or_lock(self, engine):
+        other = ExecutionEngine(trading_client=MagicMock(), repository=MagicMock())
+        engine.alpaca.get.return_value = []
+
+        engine.get_activity_ledger(date(2025, 1, 10), date(2025, 1, 20))
+
+        assert other._activity_ledger is None
+        assert other._activity_ledger_lock is not engine._activity_ledger_lock
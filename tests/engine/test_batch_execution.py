@@ -0,0 +1,171 @@
+"""Unit tests for batch execution and idempotent order submission."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from alpaca.common.exceptions import APIError
+from crypto_signals.domain.schemas import AssetClass, TradeType
+from crypto_signals.engine.execution import ExecutionEngine
+from crypto_signals.engine.risk import RiskCheckResult, RiskSnapshot
+
+from tests.factories import SignalFactory
+
+
+def _api_error(status_code, message="error"):
+    return APIError(
+        message, http_error=MagicMock(response=MagicMock(status_code=status_code))
+    )
+
+
+@pytest.fixture
+def mock_settings():
+    mock = MagicMock()
+    mock.is_paper_trading = True
+    mock.ENABLE_EXECUTION = True
+    mock.ENVIRONMENT = "PROD"
+    mock.RISK_PER_TRADE = 100.0
+    mock.TTL_DAYS_POSITION = 90
+    mock.MIN_ORDER_NOTIONAL_USD = 15.0
+    mock.MAX_CRYPTO_POSITION_QTY = 1_000_000.0
+    mock.MAX_EQUITY_POSITION_QTY = 10_000.0
+    mock.EXECUTION_MAX_WORKERS = 4
+    mock.ORDER_SUBMIT_MAX_RETRIES = 2
+    return mock
+
+
+@pytest.fixture
+def engine(mock_settings):
+    with (
+        patch("crypto_signals.engine.execution.get_settings", return_value=mock_settings),
+        patch("crypto_signals.engine.execution.RiskEngine") as MockRiskEngine,
+        patch("crypto_signals.engine.execution.sleep"),
+    ):
+        MockRiskEngine.return_value.validate_signal.return_value = RiskCheckResult(
+            passed=True
+        )
+        engine = ExecutionEngine(trading_client=MagicMock(), repository=MagicMock())
+        engine.alpaca.submit_order.side_effect = lambda req: MagicMock(
+            id=f"order-{req.client_order_id}", client_order_id=req.client_order_id
+        )
+        yield engine
+
+
+def _signals(count):
+    return [
+        SignalFactory.build(signal_id=f"sig-{i}", symbol=f"SYM{i}/USD")
+        for i in range(count)
+    ]
+
+
+class TestExecuteSignals:
+    """Batch risk pass followed by concurrent submission."""
+
+    def test_orders_submitted_concurrently(self, engine):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def submit(req):
+            # Deadlocks (BrokenBarrierError) unless 3 submissions overlap
+            barrier.wait()
+            return MagicMock(id=f"order-{req.client_order_id}")
+
+        engine.alpaca.submit_order.side_effect = submit
+
+        results = engine.execute_signals(_signals(3))
+
+        assert list(results) == ["sig-0", "sig-1", "sig-2"]
+        assert all(p.alpaca_order_id == f"order-{sid}" for sid, p in results.items())
+
+    def test_risk_checks_see_earlier_approvals(self, engine):
+        engine.risk_engine.snapshot.return_value = RiskSnapshot()
+        seen = []
+
+        def validate(signal, snapshot):
+            seen.append([p.signal_id for p in snapshot.approved])
+            if signal.signal_id == "sig-1":
+                return RiskCheckResult(passed=False, reason="cap", gate="sector_cap")
+            return RiskCheckResult(passed=True)
+
+        engine.risk_engine.validate_signal.side_effect = validate
+
+        results = engine.execute_signals(_signals(3))
+
+        assert seen == [[], ["sig-0"], ["sig-0"]]
+        assert results["sig-1"].trade_type == TradeType.RISK_BLOCKED.value
+        assert engine.alpaca.submit_order.call_count == 2
+        engine.risk_engine.snapshot.assert_called_once()
+        assert (
+            engine.risk_engine.snapshot.return_value.committed_notional[AssetClass.CRYPTO]
+            > 0
+        )
+
+    def test_theoretical_mode_submits_nothing(self, engine, mock_settings):
+        mock_settings.ENVIRONMENT = "DEV"
+
+        results = engine.execute_signals(_signals(2))
+
+        engine.alpaca.submit_order.assert_not_called()
+        assert all(p.trade_type == TradeType.THEORETICAL.value for p in results.values())
+
+    def test_failed_submission_maps_to_none(self, engine):
+        engine.alpaca.submit_order.side_effect = ValueError("rejected")
+
+        results = engine.execute_signals(_signals(2))
+
+        assert results == {"sig-0": None, "sig-1": None}
+
+
+class TestIdempotentSubmit:
+    """Retries look the order up by client_order_id before resubmitting."""
+
+    @pytest.fixture
+    def signal(self):
+        return SignalFactory.build(signal_id="sig-1", asset_class=AssetClass.CRYPTO)
+
+    def test_timeout_recovers_accepted_order(self, engine, signal):
+        engine.alpaca.submit_order.side_effect = requests.exceptions.ReadTimeout()
+        engine.alpaca.get_order_by_client_id.return_value = MagicMock(id="order-1")
+
+        position = engine.execute_signal(signal)
+
+        assert position.alpaca_order_id == "order-1"
+        engine.alpaca.submit_order.assert_called_once()
+        engine.alpaca.get_order_by_client_id.assert_called_once_with("sig-1")
+
+    def test_transient_error_retried_when_order_missing(self, engine, signal):
+        engine.alpaca.submit_order.side_effect = [
+            _api_error(503),
+            MagicMock(id="order-2"),
+        ]
+        engine.alpaca.get_order_by_client_id.side_effect = _api_error(404)
+
+        position = engine.execute_signal(signal)
+
+        assert position.alpaca_order_id == "order-2"
+        assert engine.alpaca.submit_order.call_count == 2
+
+    def test_retries_exhausted(self, engine, signal):
+        engine.alpaca.submit_order.side_effect = _api_error(500)
+        engine.alpaca.get_order_by_client_id.side_effect = _api_error(404)
+
+        assert engine.execute_signal(signal) is None
+        assert engine.alpaca.submit_order.call_count == 3
+
+    def test_duplicate_client_order_id_returns_existing(self, engine, signal):
+        engine.alpaca.submit_order.side_effect = _api_error(
+            422, "client_order_id must be unique"
+        )
+        engine.alpaca.get_order_by_client_id.return_value = MagicMock(id="order-1")
+
+        position = engine.execute_signal(signal)
+
+        assert position.alpaca_order_id == "order-1"
+        engine.alpaca.submit_order.assert_called_once()
+
+    def test_rejection_not_retried(self, engine, signal):
+        engine.alpaca.submit_order.side_effect = _api_error(403, "insufficient funds")
+
+        assert engine.execute_signal(signal) is None
+        engine.alpaca.submit_order.assert_called_once()
+        engine.alpaca.get_order_by_client_id.assert_not_called()
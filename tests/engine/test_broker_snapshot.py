@@ -0,0 +1,207 @@
+"""Tests for BrokerSnapshot and bulk position sync."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crypto_signals.domain.schemas import TradeStatus
+from crypto_signals.engine import broker_snapshot as snapshot_module
+from crypto_signals.engine.broker_snapshot import BrokerSnapshot, fetch_broker_snapshot
+from crypto_signals.engine.execution import ExecutionEngine
+
+from tests.factories import PositionFactory
+
+BASE_TIME = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def _order(order_id, symbol="BTC/USD", status="filled", side="buy", minutes=0, legs=None):
+    order = MagicMock()
+    order.id = order_id
+    order.symbol = symbol
+    order.status = status
+    order.side = side
+    order.submitted_at = BASE_TIME - timedelta(minutes=minutes)
+    order.legs = legs or []
+    return order
+
+
+def _alpaca_position(symbol="BTCUSD", qty="0.5", avg_entry_price="50000"):
+    pos = MagicMock()
+    pos.symbol = symbol
+    pos.qty = qty
+    pos.avg_entry_price = avg_entry_price
+    return pos
+
+
+class TestFetchBrokerSnapshot:
+    """Pagination and indexing of broker state."""
+
+    def test_indexes_parents_legs_and_positions(self):
+        client = MagicMock()
+        tp_leg = _order("tp-1", status="new")
+        sl_leg = _order("sl-1", status="new")
+        client.get_orders.return_value = [_order("parent-1", legs=[tp_leg, sl_leg])]
+        client.get_all_positions.return_value = [_alpaca_position("BTCUSD")]
+
+        snapshot = fetch_broker_snapshot(client, since=BASE_TIME - timedelta(days=2))
+
+        assert set(snapshot.orders_by_id) == {"parent-1", "tp-1", "sl-1"}
+        assert snapshot.get_position("BTC/USD") is not None
+        assert snapshot.has_position("BTCUSD")
+        assert not snapshot.has_position("ETH/USD")
+        client.get_orders.assert_called_once()
+        request = client.get_orders.call_args.kwargs["filter"]
+        assert request.nested is True
+
+    def test_paginates_with_until_cursor(self):
+        client = MagicMock()
+        client.get_all_positions.return_value = []
+        page_1 = [_order(f"o{i}", minutes=i) for i in range(3)]
+        page_2 = [_order("o2", minutes=2), _order("o3", minutes=3)]
+        client.get_orders.side_effect = [page_1, page_2]
+
+        with patch.object(snapshot_module, "ORDERS_PAGE_SIZE", 3):
+            snapshot = fetch_broker_snapshot(client, since=None)
+
+        assert client.get_orders.call_count == 2
+        second_request = client.get_orders.call_args_list[1].kwargs["filter"]
+        assert second_request.until == BASE_TIME - timedelta(minutes=2)
+        # Boundary order o2 appears on both pages but is indexed once
+        assert set(snapshot.orders_by_id) == {"o0", "o1", "o2", "o3"}
+        assert [o.id for o in snapshot.orders_for_symbol("BTC/USD")] == [
+            "o0",
+            "o1",
+            "o2",
+            "o3",
+        ]
+
+    def test_stops_when_cursor_does_not_advance(self):
+        client = MagicMock()
+        client.get_all_positions.return_value = []
+        client.get_orders.return_value = [_order(f"o{i}") for i in range(3)]
+
+        with patch.object(snapshot_module, "ORDERS_PAGE_SIZE", 3):
+            fetch_broker_snapshot(client, since=None)
+
+        assert client.get_orders.call_count == 2
+
+    def test_orders_for_symbol_filters_and_sorts(self):
+        snapshot = BrokerSnapshot()
+        for order in (
+            _order("old-sell", side="sell", minutes=30),
+            _order("new-sell", side="sell", minutes=5),
+            _order("buy", side="buy", minutes=1),
+            _order("eth", symbol="ETHUSD", side="sell"),
+            _order("canceled", side="sell", status="canceled"),
+        ):
+            snapshot.add_order(order)
+
+        matches = snapshot.orders_for_symbol("BTC/USD", side="sell", status="filled")
+
+        assert [o.id for o in matches] == ["new-sell", "old-sell"]
+
+    def test_orders_for_symbol_reads_symbol_index(self):
+        snapshot = BrokerSnapshot()
+        for i in range(50):
+            snapshot.add_order(_order(f"eth-{i}", symbol="ETHUSD"))
+        snapshot.add_order(_order("btc", symbol="BTC/USD"))
+
+        with patch.object(
+            snapshot_module,
+            "normalize_alpaca_symbol",
+            wraps=snapshot_module.normalize_alpaca_symbol,
+        ) as normalize:
+            matches = snapshot.orders_for_symbol("BTC/USD")
+
+        # One normalization of the query, none per indexed order
+        assert [o.id for o in matches] == ["btc"]
+        normalize.assert_called_once_with("BTC/USD")
+
+
+@pytest.fixture
+def engine():
+    settings = MagicMock()
+    settings.ENVIRONMENT = "PROD"
+    with (
+        patch("crypto_signals.engine.execution.get_settings", return_value=settings),
+        patch("crypto_signals.engine.execution.RiskEngine"),
+    ):
+        yield ExecutionEngine(trading_client=MagicMock(), repository=MagicMock())
+
+
+class TestBulkPositionSync:
+    """sync_position_status resolves lookups from the active snapshot."""
+
+    def _position(self, **kwargs):
+        defaults = dict(
+            position_id="pos-1",
+            symbol="BTC/USD",
+            alpaca_order_id="parent-1",
+            status=TradeStatus.OPEN,
+            tp_order_id=None,
+            sl_order_id=None,
+            created_at=BASE_TIME - timedelta(days=1),
+        )
+        defaults.update(kwargs)
+        return PositionFactory.build(**defaults)
+
+    def test_sync_uses_snapshot_without_per_position_calls(self, engine):
+        tp_leg = _order("tp-1", status="new")
+        tp_leg.order_type = "limit"
+        sl_leg = _order("sl-1", status="new")
+        sl_leg.order_type = "stop"
+        parent = _order("parent-1", legs=[tp_leg, sl_leg])
+        parent.filled_at = BASE_TIME
+        parent.filled_avg_price = "50100"
+        engine.alpaca.get_orders.return_value = [parent]
+        engine.alpaca.get_all_positions.return_value = [
+            _alpaca_position("BTCUSD", qty="0.4", avg_entry_price="50100")
+        ]
+
+        positions = [self._position()]
+        with engine.broker_snapshot(positions) as snapshot:
+            assert snapshot is not None
+            updated = engine.sync_position_status(positions[0])
+
+        assert updated.tp_order_id == "tp-1"
+        assert updated.sl_order_id == "sl-1"
+        assert updated.qty == 0.4
+        engine.alpaca.get_order_by_id.assert_not_called()
+        engine.alpaca.get_open_position.assert_not_called()
+        assert engine._broker_snapshot is None
+
+    def test_missing_order_falls_back_to_api(self, engine):
+        engine.alpaca.get_orders.return_value = []
+        engine.alpaca.get_all_positions.return_value = [_alpaca_position("BTCUSD")]
+        fallback = _order("parent-1")
+        fallback.legs = []
+        engine.alpaca.get_order_by_id.return_value = fallback
+
+        positions = [self._position()]
+        with engine.broker_snapshot(positions):
+            engine.sync_position_status(positions[0])
+
+        engine.alpaca.get_order_by_id.assert_called_once_with("parent-1")
+
+    def test_absent_position_triggers_manual_exit_verification(self, engine):
+        engine.reconciler = MagicMock()
+        engine.alpaca.get_orders.return_value = [_order("parent-1")]
+        engine.alpaca.get_all_positions.return_value = []
+
+        positions = [
+            self._position(created_at=datetime.now(timezone.utc) - timedelta(days=1))
+        ]
+        with engine.broker_snapshot(positions):
+            engine.sync_position_status(positions[0])
+
+        engine.reconciler.handle_manual_exit_verification.assert_called_once()
+        call = engine.reconciler.handle_manual_exit_verification.call_args
+        assert call.args == (positions[0],)
+        assert call.kwargs["snapshot"].orders_loaded
+
+    def test_snapshot_failure_falls_back_to_per_position_mode(self, engine):
+        engine.alpaca.get_orders.side_effect = RuntimeError("rate limited")
+
+        with engine.broker_snapshot([self._position()]) as snapshot:
+            assert snapshot is None
+            assert engine._broker_snapshot is None
@@ -0,0 +1,153 @@
+"""Unit tests for the incrementally maintained rolling correlation matrix."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from crypto_signals.engine.correlation import CorrelationService
+from crypto_signals.engine.risk import RiskEngine
+from crypto_signals.market.data_provider import MarketDataProvider
+
+from tests.factories import PositionFactory, SignalFactory
+
+DATES = pd.date_range(end="2026-03-01", periods=200, freq="D", tz="UTC")
+
+
+def _prices(seed, days=200, base=None):
+    """Random-walk close prices; ``base`` mixes in a shared factor."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.02, days)
+    if base is not None:
+        returns = 0.9 * base + 0.1 * returns
+    return pd.Series(100 * np.exp(np.cumsum(returns)), index=DATES[-days:])
+
+
+def _expected(closes, window):
+    """Reference: pandas correlation of the last ``window`` daily log returns."""
+    returns = pd.DataFrame({s: np.log(c).diff() for s, c in closes.items()})
+    return returns.iloc[-window:].corr(min_periods=20)
+
+
+class TestCorrelationService:
+    """Incremental sums match a full recomputation."""
+
+    def test_matches_pandas_correlation(self):
+        factor = np.random.default_rng(0).normal(0, 0.02, 200)
+        closes = {
+            "BTC/USD": _prices(1, base=factor),
+            "ETH/USD": _prices(2, base=factor),
+            "SOL/USD": _prices(3),
+        }
+        # Gaps: missing days are excluded pairwise
+        closes["SOL/USD"] = closes["SOL/USD"].drop(DATES[150:160])
+        service = CorrelationService(window=90)
+
+        for symbol, series in closes.items():
+            service.update(symbol, series)
+
+        actual = service.correlation_matrix()
+        expected = _expected(closes, window=90).loc[actual.index, actual.columns]
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), atol=1e-10)
+
+    def test_new_day_rolls_window(self):
+        btc, eth = _prices(1), _prices(2)
+        service = CorrelationService(window=60)
+        service.update("BTC/USD", btc.iloc[:-10])
+        service.update("ETH/USD", eth.iloc[:-10])
+
+        # Ten newer bars for BTC only roll every column forward
+        service.update("BTC/USD", btc)
+        service.update("ETH/USD", eth)
+
+        expected = _expected({"BTC/USD": btc, "ETH/USD": eth}, window=60)
+        assert service.correlation_matrix().loc["BTC/USD", "ETH/USD"] == pytest.approx(
+            expected.loc["BTC/USD", "ETH/USD"]
+        )
+
+    def test_max_correlation_picks_most_correlated(self):
+        factor = np.random.default_rng(0).normal(0, 0.02, 200)
+        service = CorrelationService()
+        service.update("BTC/USD", _prices(1, base=factor))
+        service.update("ETH/USD", _prices(2, base=factor))
+        service.update("SOL/USD", _prices(3))
+
+        symbol, corr = service.max_correlation("BTC/USD", ["SOL/USD", "ETH/USD"])
+
+        assert symbol == "ETH/USD"
+        assert corr > 0.9
+
+    def test_undefined_without_enough_overlap(self):
+        service = CorrelationService(min_periods=20)
+        service.update("BTC/USD", _prices(1))
+        service.update("ETH/USD", _prices(2, days=10))
+
+        symbol, corr = service.max_correlation("BTC/USD", ["ETH/USD", "XRP/USD"])
+
+        assert symbol is None
+        assert np.isnan(corr)
+
+    def test_capacity_grows_with_universe(self):
+        service = CorrelationService()
+        for i in range(40):
+            service.update(f"SYM{i}", _prices(i))
+
+        assert len(service.symbols) == 40
+        assert service.correlation_matrix().shape == (40, 40)
+
+
+class TestCorrelationGate:
+    """RiskEngine.check_correlation reads the shared matrix."""
+
+    @pytest.fixture
+    def market(self):
+        return MagicMock(spec=MarketDataProvider)
+
+    @pytest.fixture
+    def service(self):
+        factor = np.random.default_rng(0).normal(0, 0.02, 200)
+        service = CorrelationService()
+        service.update("BTC/USD", _prices(1, base=factor))
+        service.update("ETH/USD", _prices(2, base=factor))
+        service.update("SOL/USD", _prices(3))
+        return service
+
+    @pytest.fixture
+    def risk(self, market, service):
+        with pytest.MonkeyPatch.context() as m:
+            m.setattr("crypto_signals.engine.risk.get_settings", MagicMock())
+            return RiskEngine(
+                MagicMock(),
+                MagicMock(),
+                market_provider=market,
+                correlation_service=service,
+            )
+
+    def _check(self, risk, candidate, held):
+        risk.repo.get_open_positions.return_value = [
+            PositionFactory.build(symbol=held, signal_id=f"sig-{held}")
+        ]
+        return risk.check_correlation(SignalFactory.build(symbol=candidate))
+
+    def test_blocks_correlated_without_fetching(self, risk, market):
+        result = self._check(risk, "BTC/USD", "ETH/USD")
+
+        assert result.passed is False
+        assert "ETH/USD" in result.reason
+        market.get_daily_bars.assert_not_called()
+
+    def test_passes_uncorrelated_without_fetching(self, risk, market):
+        result = self._check(risk, "BTC/USD", "SOL/USD")
+
+        assert result.passed is True
+        market.get_daily_bars.assert_not_called()
+
+    def test_fetches_only_unknown_symbols(self, risk, market):
+        market.get_daily_bars.return_value = pd.DataFrame(
+            {"close": _prices(4)}, index=DATES
+        )
+
+        result = self._check(risk, "BTC/USD", "XRP/USD")
+
+        assert result.passed is True
+        assert market.get_daily_bars.call_args[0][0] == ["XRP/USD"]
@@ -0,0 +1,205 @@
+"""Tests for the dependency-aware JobScheduler."""
+
+import threading
+import time
+
+import pytest
+from crypto_signals.engine.job_scheduler import JobScheduler, TaskState
+
+
+def _recorder(log, name, result=None, delay=0.0):
+    def fn():
+        if delay:
+            time.sleep(delay)
+        log.append(name)
+        return result
+
+    return fn
+
+
+class TestDefinition:
+    """DAG validation."""
+
+    def test_rejects_unknown_dependency(self):
+        scheduler = JobScheduler()
+        scheduler.add("a", lambda: None, depends_on=["missing"])
+
+        with pytest.raises(ValueError, match="unknown"):
+            scheduler.start()
+
+    def test_rejects_cycle(self):
+        scheduler = JobScheduler()
+        scheduler.add("a", lambda: None, depends_on=["b"])
+        scheduler.add("b", lambda: None, depends_on=["a"])
+
+        with pytest.raises(ValueError, match="cycle"):
+            scheduler.start()
+
+    def test_rejects_duplicate_name(self):
+        scheduler = JobScheduler()
+        scheduler.add("a", lambda: None)
+
+        with pytest.raises(ValueError, match="Duplicate"):
+            scheduler.add("a", lambda: None)
+
+
+class TestExecution:
+    """Ordering, concurrency and failure propagation."""
+
+    def test_dependencies_run_in_order(self):
+        log = []
+        scheduler = JobScheduler(max_workers=4)
+        scheduler.add("reconcile", _recorder(log, "reconcile", delay=0.02))
+        scheduler.add("archive", _recorder(log, "archive"), depends_on=["reconcile"])
+        scheduler.add("patch", _recorder(log, "patch", result=3), depends_on=["archive"])
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+
+        assert log == ["reconcile", "archive", "patch"]
+        assert all(t.state == TaskState.SUCCEEDED for t in tasks.values())
+        assert tasks["patch"].result == 3
+
+    def test_independent_tasks_overlap(self):
+        barrier = threading.Barrier(3, timeout=5)
+        scheduler = JobScheduler(max_workers=3)
+        for name in ("a", "b", "c"):
+            # Deadlocks (BrokenBarrierError -> FAILED) unless all three overlap
+            scheduler.add(name, barrier.wait)
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+
+        assert all(t.state == TaskState.SUCCEEDED for t in tasks.values())
+
+    def test_failure_skips_dependents_only(self):
+        log = []
+        scheduler = JobScheduler(max_workers=2)
+
+        def reconcile():
+            raise RuntimeError("boom")
+
+        scheduler.add("reconcile", reconcile)
+        scheduler.add("archive", _recorder(log, "archive"), depends_on=["reconcile"])
+        scheduler.add("patch", _recorder(log, "patch"), depends_on=["archive"])
+        scheduler.add("snapshot", _recorder(log, "snapshot"))
+
+        scheduler.start()
+
+        assert scheduler.wait_for("reconcile") is False
+        tasks = scheduler.wait_all()
+        assert tasks["reconcile"].state == TaskState.FAILED
+        assert tasks["reconcile"].error == "boom"
+        assert tasks["archive"].state == TaskState.SKIPPED
+        assert tasks["patch"].state == TaskState.SKIPPED
+        assert log == ["snapshot"]
+
+    def test_after_orders_without_gating(self):
+        log = []
+        scheduler = JobScheduler(max_workers=2)
+
+        def fee_patch():
+            raise RuntimeError("boom")
+
+        scheduler.add("fee_patch", fee_patch)
+        scheduler.add("price_patch", _recorder(log, "price_patch"), after=["fee_patch"])
+        scheduler.add("report", _recorder(log, "report"), depends_on=["price_patch"])
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+
+        assert tasks["fee_patch"].state == TaskState.FAILED
+        assert tasks["price_patch"].state == TaskState.SUCCEEDED
+        assert log == ["price_patch", "report"]
+
+    def test_rejects_cycle_through_after(self):
+        scheduler = JobScheduler()
+        scheduler.add("a", lambda: None, after=["b"])
+        scheduler.add("b", lambda: None, depends_on=["a"])
+
+        with pytest.raises(ValueError, match="cycle"):
+            scheduler.start()
+
+    def test_wait_for_returns_before_unrelated_tasks(self):
+        release = threading.Event()
+        scheduler = JobScheduler(max_workers=2)
+        scheduler.add("reconcile", lambda: None)
+        scheduler.add("slow_archival", lambda: release.wait(5))
+
+        scheduler.start()
+
+        assert scheduler.wait_for("reconcile") is True
+        assert scheduler.state("slow_archival") == TaskState.RUNNING
+        release.set()
+        scheduler.wait_all()
+        assert scheduler.state("slow_archival") == TaskState.SUCCEEDED
+
+
+class TestTimeoutsAndCancellation:
+    """Per-task timeouts and shutdown handling."""
+
+    def test_timeout_abandons_task_and_skips_dependents(self):
+        release = threading.Event()
+        scheduler = JobScheduler(max_workers=2, poll_interval=0.01)
+        scheduler.add("hung", lambda: release.wait(5), timeout=0.05)
+        scheduler.add("after", lambda: None, depends_on=["hung"])
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+        release.set()
+
+        assert tasks["hung"].state == TaskState.TIMED_OUT
+        assert tasks["after"].state == TaskState.SKIPPED
+
+    def test_timed_out_task_frees_slot_and_does_not_block_exit(self):
+        release = threading.Event()
+        threads = []
+
+        def hung():
+            threads.append(threading.current_thread())
+            release.wait(5)
+
+        scheduler = JobScheduler(max_workers=1, poll_interval=0.01)
+        scheduler.add("hung", hung, timeout=0.05)
+        scheduler.add("next", lambda: "ran")
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+        release.set()
+
+        assert tasks["hung"].state == TaskState.TIMED_OUT
+        assert tasks["next"].result == "ran"
+        assert threads[0].daemon
+
+    def test_abandoned_reports_timed_out_task_until_it_returns(self):
+        release = threading.Event()
+        scheduler = JobScheduler(max_workers=2, poll_interval=0.01)
+        scheduler.add("hung", lambda: release.wait(5), timeout=0.05)
+        scheduler.add("quick", lambda: None)
+
+        scheduler.start()
+        scheduler.wait_all()
+
+        assert scheduler.abandoned("hung", "quick") == ["hung"]
+        release.set()
+        scheduler._tasks["hung"]._thread.join(5)
+        assert scheduler.abandoned("hung", "quick") == []
+
+    def test_cancel_check_stops_pending_tasks(self):
+        shutdown = threading.Event()
+        log = []
+
+        def first():
+            log.append("first")
+            shutdown.set()  # SIGTERM arrives while the first job runs
+
+        scheduler = JobScheduler(max_workers=1, cancel_check=shutdown.is_set)
+        scheduler.add("first", first)
+        scheduler.add("second", _recorder(log, "second"), depends_on=["first"])
+
+        scheduler.start()
+        tasks = scheduler.wait_all()
+
+        assert log == ["first"]
+        assert tasks["first"].state == TaskState.SUCCEEDED
+        assert tasks["second"].state == TaskState.CANCELLED
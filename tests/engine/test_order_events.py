@@ -0,0 +1,289 @@
+"""Unit tests for event-driven order fill tracking."""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crypto_signals.domain.schemas import TradeStatus, TradeType
+from crypto_signals.engine.execution import ExecutionEngine
+from crypto_signals.engine.order_events import (
+    OrderEvent,
+    OrderEventHub,
+    ReplayEventSource,
+    TradeUpdatesStream,
+)
+
+from tests.factories import PositionFactory
+
+FILLED_AT = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _payload(event, order_id="order-1", price=None, status=None):
+    return {
+        "stream": "trade_updates",
+        "data": {
+            "event": event,
+            "timestamp": "2026-03-01T12:00:00Z",
+            "order": {
+                "id": order_id,
+                "symbol": "BTC/USD",
+                "status": status or event,
+                "filled_avg_price": price,
+                "filled_qty": "1" if price else "0",
+                "filled_at": "2026-03-01T12:00:00Z" if price else None,
+            },
+        },
+    }
+
+
+def _event(event, order_id="order-1", price=None):
+    return OrderEvent.from_dict(_payload(event, order_id, price))
+
+
+class TestOrderEvent:
+    """Parsing of trade_updates payloads."""
+
+    def test_from_dict_parses_fill(self):
+        event = _event("fill", price="50000.5")
+
+        assert event.order_id == "order-1"
+        assert event.is_fill
+        assert event.filled_avg_price == 50000.5
+        assert event.filled_at == FILLED_AT
+
+    def test_from_trade_update(self):
+        order = SimpleNamespace(
+            id="order-2",
+            status=SimpleNamespace(value="partially_filled"),
+            filled_avg_price="10.5",
+            filled_qty="0.5",
+            filled_at=FILLED_AT,
+            symbol="ETH/USD",
+            client_order_id="pos-2",
+        )
+        update = SimpleNamespace(
+            event=SimpleNamespace(value="partial_fill"), order=order, timestamp=FILLED_AT
+        )
+
+        event = OrderEvent.from_trade_update(update)
+
+        assert event.event == "partial_fill"
+        assert event.status == "partially_filled"
+        assert event.filled_qty == 0.5
+        assert event.client_order_id == "pos-2"
+
+
+class TestOrderEventHub:
+    """Per-order futures."""
+
+    def test_fill_resolves_waiter(self):
+        hub = OrderEventHub()
+        future = hub.watch("order-1")
+
+        hub.publish(_event("new"))
+        assert not future.done()
+
+        hub.publish(_event("fill", price="100"))
+        assert future.result(timeout=1).filled_avg_price == 100.0
+
+    def test_event_before_wait_resolves_immediately(self):
+        hub = OrderEventHub()
+        hub.publish(_event("fill", price="100"))
+
+        event = hub.wait_for_fill("order-1", timeout=0.01)
+
+        assert event is not None and event.is_fill
+
+    def test_cancel_resolves_without_fill(self):
+        hub = OrderEventHub()
+        hub.publish(_event("canceled"))
+
+        event = hub.wait_for_fill("order-1", timeout=0.01)
+
+        assert event.event == "canceled"
+        assert not event.is_fill
+
+    def test_timeout_returns_none_and_drops_waiter(self):
+        hub = OrderEventHub()
+
+        assert hub.wait_for_fill("order-1", timeout=0.01) is None
+        assert hub._waiters == {}
+
+    def test_wait_resolved_from_another_thread(self):
+        hub = OrderEventHub()
+        timer = threading.Timer(0.05, hub.publish, [_event("fill", price="7")])
+        timer.start()
+
+        event = hub.wait_for_fill("order-1", timeout=2)
+
+        timer.join()
+        assert event.filled_avg_price == 7.0
+
+    def test_cache_is_bounded(self):
+        hub = OrderEventHub(max_cached_orders=2)
+        for i in range(3):
+            hub.publish(_event("fill", order_id=f"order-{i}", price="1"))
+
+        assert hub.latest("order-0") is None
+        assert hub.wait_for_fill("order-0", timeout=0.01) is None
+        assert hub.latest("order-2").is_fill
+
+
+class TestSources:
+    """Replay stand-in and live stream adapter."""
+
+    def test_replay_publishes_recorded_events(self, tmp_path):
+        path = tmp_path / "updates.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps(p) for p in (_payload("new"), _payload("fill", price="42"))
+            )
+        )
+        hub = OrderEventHub()
+
+        source = ReplayEventSource.from_file(hub, str(path)).start()
+        assert hub.connected
+        event = hub.wait_for_fill("order-1", timeout=2)
+        source.stop()
+
+        assert event.filled_avg_price == 42.0
+        assert not hub.connected
+
+    def test_stream_publishes_trade_updates(self):
+        hub = OrderEventHub()
+        stream = MagicMock()
+        source = TradeUpdatesStream(hub, stream).start()
+        handler = stream.subscribe_trade_updates.call_args[0][0]
+        update = SimpleNamespace(
+            event="fill",
+            timestamp=FILLED_AT,
+            order=SimpleNamespace(
+                id="order-9",
+                status="filled",
+                filled_avg_price="5",
+                filled_qty="1",
+                filled_at=FILLED_AT,
+                symbol="BTC/USD",
+                client_order_id=None,
+            ),
+        )
+
+        asyncio.run(handler(update))
+        source.stop()
+
+        assert hub.latest("order-9").filled_avg_price == 5.0
+        stream.stop.assert_called_once()
+
+    def test_stream_connected_only_while_authenticated(self):
+        """The hub is connected after connect/auth and cleared on every close."""
+        hub = OrderEventHub()
+        websocket_up = threading.Event()
+        states = []
+
+        class FakeStream:
+            def subscribe_trade_updates(self, handler):
+                pass
+
+            async def _start_ws(self):
+                pass
+
+            async def close(self):
+                pass
+
+            def run(self):
+                async def run_forever():
+                    websocket_up.wait(timeout=5)
+                    for _ in range(2):  # initial connect, then a reconnect
+                        await self._start_ws()
+                        states.append(hub.connected)
+                        await self.close()
+                        states.append(hub.connected)
+
+                asyncio.run(run_forever())
+
+            def stop(self):
+                pass
+
+        source = TradeUpdatesStream(hub, FakeStream()).start()
+        assert not hub.connected  # websocket not up yet
+
+        websocket_up.set()
+        source._thread.join(timeout=5)
+        source.stop()
+
+        assert states == [True, False, True, False]
+        assert not hub.connected
+        hub.set_connected(True)
+        assert hub.connected  # counter never went negative
+
+
+@pytest.fixture
+def hub():
+    hub = OrderEventHub()
+    hub.set_connected(True)
+    return hub
+
+
+@pytest.fixture
+def engine(hub):
+    with patch("crypto_signals.engine.execution.get_settings") as settings:
+        settings.return_value.FILL_WAIT_TIMEOUT_SECONDS = 0.05
+        settings.return_value.ENVIRONMENT = "PROD"
+        engine = ExecutionEngine(
+            trading_client=MagicMock(), repository=MagicMock(), order_events=hub
+        )
+        engine.get_order_details = MagicMock(return_value=None)
+        yield engine
+
+
+class TestEngineFillCapture:
+    """ExecutionEngine awaits fill events instead of sleep polling."""
+
+    def test_fill_event_captured_without_polling(self, engine, hub):
+        hub.publish(_event("fill", price="51000"))
+
+        with patch("time.sleep") as sleep:
+            result = engine._retry_fill_price_capture("order-1", "pos-1")
+
+        assert result == (51000.0, FILLED_AT)
+        sleep.assert_not_called()
+        engine.get_order_details.assert_not_called()
+
+    def test_cancel_ends_wait_without_lookup(self, engine, hub):
+        hub.publish(_event("canceled"))
+
+        assert engine._retry_fill_price_capture("order-1", "pos-1") is None
+        engine.get_order_details.assert_not_called()
+
+    def test_timeout_confirms_with_single_lookup(self, engine):
+        engine.get_order_details.return_value = SimpleNamespace(
+            filled_avg_price="99", filled_at=FILLED_AT, status="filled"
+        )
+
+        result = engine._retry_fill_price_capture("order-1", "pos-1")
+
+        assert result == (99.0, FILLED_AT)
+        engine.get_order_details.assert_called_once_with("order-1")
+
+    def test_sync_backfills_exit_price_from_event(self, engine, hub):
+        hub.publish(_event("fill", order_id="exit-1", price="120"))
+        position = PositionFactory.build(
+            position_id="pos-1",
+            signal_id="sig-1",
+            alpaca_order_id="entry-1",
+            status=TradeStatus.CLOSED,
+            exit_order_id="exit-1",
+            exit_fill_price=None,
+            trade_type=TradeType.EXECUTED.value,
+        )
+        engine._get_order = MagicMock(return_value=None)
+
+        engine.sync_position_status(position)
+
+        assert position.exit_fill_price == 120.0
+        assert position.exit_time == FILLED_AT
+        assert all(call.args[0] != "exit-1" for call in engine._get_order.call_args_list)
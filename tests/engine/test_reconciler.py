@@ -207,7 +207,7 @@ class TestDetectZombies:
 
         # Assert
         # Young position should NOT be closed
-        mock_position_repo.update_position.assert_not_called()
+        mock_position_repo.update_positions_batch.assert_not_called()
 
     def test_reconcile_handles_multiple_zombies(
         self,
@@ -390,7 +390,7 @@ class TestHealingAndAlerts:
         )
 
         # Act
-        # Mock verification to succeed so that update_position is called
+        # Mock verification to succeed so that the healed position is persisted
         # We need to simulate the side effect of updating the position object
         def verify_side_effect(pos):
             pos.status = TradeStatus.CLOSED
@@ -403,10 +403,10 @@ class TestHealingAndAlerts:
             reconciler.reconcile()
 
         # Assert
-        mock_position_repo.update_position.assert_called()
+        mock_position_repo.update_positions_batch.assert_called()
 
         # Assert the position was marked CLOSED (reason is now MANUAL_EXIT due to verification)
-        called_position = mock_position_repo.update_position.call_args[0][0]
+        called_position = mock_position_repo.update_positions_batch.call_args[0][0][0]
         assert (
             called_position.status == TradeStatus.CLOSED
         ), f"Expected called_position.status == TradeStatus.CLOSED, got {called_position.status}"
@@ -467,7 +467,7 @@ class TestHealingAndAlerts:
 
             # Assert
             mock_verify.assert_called_once_with(pos)
-            mock_position_repo.update_position.assert_not_called()
+            mock_position_repo.update_positions_batch.assert_not_called()
             assert (
                 len(report.critical_issues) > 0
             ), f"Expected len(report.critical_issues) > 0, got {len(report.critical_issues)}"
@@ -502,7 +502,7 @@ class TestHealingAndAlerts:
 
             # Assert
             mock_verify.assert_called_once_with(pos)
-            mock_position_repo.update_position.assert_called_once_with(pos)
+            mock_position_repo.update_positions_batch.assert_called_once_with([pos])
 
 
 class TestReconciliationBehavior:
@@ -751,8 +751,10 @@ class TestReconcilerEdgeCases:
         mock_trading_client.get_all_positions.return_value = []
         mock_position_repo.get_open_positions.return_value = [sample_open_position]
 
-        # Fail on update_position, succeed on other calls
-        mock_position_repo.update_position.side_effect = Exception("DB Write Error")
+        # Fail on the batched position write, succeed on other calls
+        mock_position_repo.update_positions_batch.side_effect = Exception(
+            "DB Write Error"
+        )
 
         reconciler = StateReconciler(
             alpaca_client=mock_trading_client,
@@ -1013,7 +1015,7 @@ class TestSafetyMechanisms:
 
         # Assert
         # Should NOT be healed/closed
-        mock_position_repo.update_position.assert_not_called()
+        mock_position_repo.update_positions_batch.assert_not_called()
 
         # Should not be in critical issues (it's skipped intentionaly)
         assert (
@@ -1059,7 +1061,7 @@ class TestSafetyMechanisms:
 
         # Assert
         # CRITICAL: Database must NOT be updated (Position must remain OPEN)
-        mock_position_repo.update_position.assert_not_called()
+        mock_position_repo.update_positions_batch.assert_not_called()
 
         # Should log critical issue
         assert (
@@ -1113,7 +1115,7 @@ class TestReconcilerRaceConditions:
 
         # Assert
         # Should NOT be healed/closed
-        mock_position_repo.update_position.assert_not_called()
+        mock_position_repo.update_positions_batch.assert_not_called()
 
         # Should NOT be in critical issues (it's skipped intentionally)
         assert (
@@ -1159,7 +1161,7 @@ class TestReconcilerRaceConditions:
             # Assert
             mock_verify.assert_called_once()
             # And position was updated (closed)
-            mock_position_repo.update_position.assert_called()
+            mock_position_repo.update_positions_batch.assert_called()
 
 
 class TestTheoreticalPositions:
@@ -0,0 +1,267 @@
+"""Tests for the snapshot-based reconciliation diff."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from crypto_signals.domain.schemas import ExitReason, SignalStatus, TradeStatus
+from crypto_signals.engine.broker_snapshot import BrokerSnapshot
+from crypto_signals.engine.reconciler import StateReconciler
+from crypto_signals.engine.reconciler_notifications import ReconcilerNotificationService
+from crypto_signals.repository.firestore import (
+    BatchWriteError,
+    PositionRepository,
+    SignalRepository,
+)
+
+from tests.factories import PositionFactory, SignalFactory
+
+OLD = datetime.now(timezone.utc) - timedelta(days=2)
+
+
+def _alpaca_position(symbol):
+    pos = MagicMock()
+    pos.symbol = symbol
+    return pos
+
+
+def _order(order_id, symbol="BTC/USD", side="sell", status="filled", minutes=0):
+    order = MagicMock()
+    order.id = order_id
+    order.client_order_id = None
+    order.symbol = symbol
+    order.side = side
+    order.status = status
+    order.submitted_at = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+    order.filled_at = order.submitted_at
+    order.filled_avg_price = "51000"
+    order.filled_qty = "0.01"
+    order.legs = []
+    return order
+
+
+def _position(position_id, symbol, status=TradeStatus.OPEN, created_at=OLD):
+    return PositionFactory.build(
+        position_id=position_id,
+        signal_id=f"sig-{position_id}",
+        alpaca_order_id=f"entry-{position_id}",
+        tp_order_id=None,
+        sl_order_id=None,
+        symbol=symbol,
+        status=status,
+        created_at=created_at,
+        qty=0.01,
+    )
+
+
+@pytest.fixture
+def alpaca():
+    client = MagicMock()
+    client.get_all_positions.return_value = []
+    client.get_orders.return_value = []
+    return client
+
+
+@pytest.fixture
+def position_repo():
+    repo = MagicMock(spec=PositionRepository)
+    repo.get_open_positions.return_value = []
+    repo.get_closed_positions.return_value = []
+    return repo
+
+
+@pytest.fixture
+def signal_repo():
+    repo = MagicMock(spec=SignalRepository)
+    repo.get_by_ids.return_value = {}
+    repo.update_signals_batch.side_effect = set  # every ID commits
+    return repo
+
+
+@pytest.fixture
+def reconciler(alpaca, position_repo, signal_repo):
+    settings = MagicMock()
+    settings.ENVIRONMENT = "PROD"
+    settings.CRYPTO_SYMBOLS = ["BTC/USD", "ETH/USD", "SOL/USD"]
+    return StateReconciler(
+        alpaca_client=alpaca,
+        position_repo=position_repo,
+        notification_service=MagicMock(spec=ReconcilerNotificationService),
+        settings=settings,
+        signal_repo=signal_repo,
+    )
+
+
+class TestComputeDiff:
+    """Pure set-based diff over the two snapshots."""
+
+    def test_classifies_all_discrepancies(self, reconciler):
+        held = _position("p-btc", "BTC/USD")
+        zombie = _position("p-eth", "ETH/USD")
+        reverse = _position("p-old", "BTC/USD", status=TradeStatus.CLOSED)
+        closed_flat = _position("p-sol", "SOL/USD", status=TradeStatus.CLOSED)
+        waiting = SignalFactory.build(signal_id="sig-p-btc", status=SignalStatus.WAITING)
+        active = SignalFactory.build(signal_id="sig-p-eth", status=SignalStatus.ACTIVE)
+
+        diff = reconciler._compute_diff(
+            [_alpaca_position("BTCUSD"), _alpaca_position("XRPUSD")],
+            [held, zombie],
+            [reverse, closed_flat],
+            {"sig-p-btc": waiting, "sig-p-eth": active},
+        )
+
+        assert diff.zombies == [zombie]
+        assert diff.orphans == ["XRPUSD"]
+        assert diff.reverse_orphans == [reverse]
+        assert diff.waiting_signals == [waiting]
+
+
+class TestReconcileSnapshot:
+    """reconcile() issues a fixed number of broker calls regardless of size."""
+
+    def test_zombies_verified_from_one_order_fetch(
+        self, reconciler, alpaca, position_repo
+    ):
+        zombies = [
+            _position(f"p-{i}", sym) for i, sym in enumerate(["BTC/USD", "ETH/USD"])
+        ]
+        position_repo.get_open_positions.return_value = zombies
+        alpaca.get_orders.return_value = [
+            _order("exit-btc", "BTC/USD"),
+            _order("exit-eth", "ETH/USD"),
+        ]
+
+        report = reconciler.reconcile()
+
+        assert report.reconciled_count == 2
+        assert report.zombies == []
+        alpaca.get_orders.assert_called_once()
+        assert alpaca.get_orders.call_args.kwargs["filter"].nested is True
+        position_repo.update_positions_batch.assert_called_once_with(zombies)
+        assert all(z.exit_reason == ExitReason.MANUAL_EXIT for z in zombies)
+        assert reconciler._broker_snapshot is None
+
+    def test_partial_batch_failure_reports_only_uncommitted_zombies(
+        self, reconciler, alpaca, position_repo
+    ):
+        zombies = [
+            _position(f"p-{i}", sym) for i, sym in enumerate(["BTC/USD", "ETH/USD"])
+        ]
+        position_repo.get_open_positions.return_value = zombies
+        alpaca.get_orders.return_value = [
+            _order("exit-btc", "BTC/USD"),
+            _order("exit-eth", "ETH/USD"),
+        ]
+        position_repo.update_positions_batch.side_effect = BatchWriteError(
+            "quota", committed={"p-0"}
+        )
+
+        report = reconciler.reconcile()
+
+        assert report.reconciled_count == 1
+        assert report.zombies == ["ETH/USD"]
+
+    def test_young_zombies_skip_order_fetch(self, reconciler, alpaca, position_repo):
+        young = _position("p-1", "BTC/USD", created_at=datetime.now(timezone.utc))
+        position_repo.get_open_positions.return_value = [young]
+
+        report = reconciler.reconcile()
+
+        assert report.zombies == ["BTC/USD"]
+        alpaca.get_orders.assert_not_called()
+        position_repo.update_positions_batch.assert_not_called()
+
+    def test_reverse_orphans_use_position_snapshot(
+        self, reconciler, alpaca, position_repo
+    ):
+        alpaca.get_all_positions.return_value = [_alpaca_position("BTCUSD")]
+        position_repo.get_open_positions.return_value = [_position("p-1", "BTC/USD")]
+        position_repo.get_closed_positions.return_value = [
+            _position(f"c-{i}", "BTC/USD", status=TradeStatus.CLOSED) for i in range(3)
+        ]
+
+        report = reconciler.reconcile()
+
+        alpaca.get_open_position.assert_not_called()
+        assert reconciler.notifications.notify_reverse_orphan.call_count == 3
+        assert len(report.critical_issues) == 3
+
+    def test_waiting_signals_healed_in_one_batch(
+        self, reconciler, alpaca, position_repo, signal_repo
+    ):
+        alpaca.get_all_positions.return_value = [
+            _alpaca_position("BTCUSD"),
+            _alpaca_position("ETHUSD"),
+        ]
+        position_repo.get_open_positions.return_value = [
+            _position("p-1", "BTC/USD"),
+            _position("p-2", "ETH/USD"),
+        ]
+        signal_repo.get_by_ids.return_value = {
+            sid: SignalFactory.build(signal_id=sid, status=SignalStatus.WAITING)
+            for sid in ("sig-p-1", "sig-p-2")
+        }
+
+        report = reconciler.reconcile()
+
+        assert report.reconciled_count == 2
+        signal_repo.get_by_ids.assert_called_once_with(["sig-p-1", "sig-p-2"])
+        signal_repo.update_signals_batch.assert_called_once()
+        signal_repo.get_by_id.assert_not_called()
+
+    def test_partial_signal_batch_falls_back_for_the_rest(
+        self, reconciler, alpaca, position_repo, signal_repo
+    ):
+        alpaca.get_all_positions.return_value = [
+            _alpaca_position("BTCUSD"),
+            _alpaca_position("ETHUSD"),
+        ]
+        position_repo.get_open_positions.return_value = [
+            _position("p-1", "BTC/USD"),
+            _position("p-2", "ETH/USD"),
+        ]
+        signal_repo.get_by_ids.return_value = {
+            sid: SignalFactory.build(signal_id=sid, status=SignalStatus.WAITING)
+            for sid in ("sig-p-1", "sig-p-2")
+        }
+        signal_repo.update_signals_batch.side_effect = None
+        signal_repo.update_signals_batch.return_value = {"sig-p-1"}
+        signal_repo.update_signal_atomic.return_value = True
+
+        report = reconciler.reconcile()
+
+        assert report.reconciled_count == 2
+        signal_repo.update_signal_atomic.assert_called_once_with(
+            "sig-p-2", {"status": SignalStatus.ACTIVE.value}
+        )
+
+
+class TestManualExitVerificationSnapshot:
+    """handle_manual_exit_verification() searches an explicit snapshot."""
+
+    def test_snapshot_lookup_skips_known_legs(self, reconciler, alpaca):
+        position = _position("p-1", "BTC/USD")
+        snapshot = BrokerSnapshot(orders_loaded=True)
+        for order in (
+            _order(position.alpaca_order_id, minutes=1),
+            _order("manual-exit", minutes=5),
+            _order("buy-order", side="buy"),
+        ):
+            snapshot.add_order(order)
+
+        result = reconciler.handle_manual_exit_verification(position, snapshot=snapshot)
+
+        assert result is position
+        assert position.status == TradeStatus.CLOSED
+        assert position.exit_order_id == "manual-exit"
+        alpaca.get_orders.assert_not_called()
+
+    def test_positions_only_snapshot_falls_back_to_api(self, reconciler, alpaca):
+        position = _position("p-1", "BTC/USD")
+
+        result = reconciler.handle_manual_exit_verification(
+            position, snapshot=BrokerSnapshot()
+        )
+
+        assert result is None
+        alpaca.get_orders.assert_called_once()
@@ -175,9 +175,9 @@ class TestSignalStatusHealing:
             signal_id=signal_id, symbol="BTC/USD", status=SignalStatus.WAITING
         )
 
-        # 2. Configure mock signal repo
-        mock_signal_repo.get_by_id.return_value = waiting_signal
-        mock_signal_repo.update_signal_atomic.return_value = True
+        # 2. Configure mock signal repo (batched read + batched write)
+        mock_signal_repo.get_by_ids.return_value = {signal_id: waiting_signal}
+        mock_signal_repo.update_signals_batch.side_effect = set
 
         # 3. Execute Healing (directly or via reconcile)
         healed_count, errors = reconciler._heal_signal_statuses([open_position])
@@ -185,6 +185,32 @@ class TestSignalStatusHealing:
         # 4. Verification
         assert healed_count == 1
         assert len(errors) == 0
-        mock_signal_repo.update_signal_atomic.assert_called_with(
-            signal_id, {"status": SignalStatus.ACTIVE.value}
+        mock_signal_repo.get_by_ids.assert_called_once_with([signal_id])
+        mock_signal_repo.update_signals_batch.assert_called_once_with(
+            {signal_id: {"status": SignalStatus.ACTIVE.value}}
+        )
+        mock_signal_repo.get_by_id.assert_not_called()
+
+    def test_heal_signal_status_falls_back_when_batch_fails(
+        self, reconciler, mock_signal_repo
+    ):
+        """A failed batch write falls back to per-signal atomic updates."""
+        from tests.factories import SignalFactory
+
+        open_position = PositionFactory.build(
+            signal_id="sig-1", symbol="BTC/USD", status=TradeStatus.OPEN
+        )
+        waiting_signal = SignalFactory.build(
+            signal_id="sig-1", symbol="BTC/USD", status=SignalStatus.WAITING
+        )
+        mock_signal_repo.get_by_ids.return_value = {"sig-1": waiting_signal}
+        mock_signal_repo.update_signals_batch.return_value = set()
+        mock_signal_repo.update_signal_atomic.return_value = True
+
+        healed_count, errors = reconciler._heal_signal_statuses([open_position])
+
+        assert healed_count == 1
+        assert errors == []
+        mock_signal_repo.update_signal_atomic.assert_called_once_with(
+            "sig-1", {"status": SignalStatus.ACTIVE.value}
         )
@@ -8,7 +8,7 @@ from alpaca.trading.enums import OrderSide
 from alpaca.trading.models import Order, TradeAccount
 from crypto_signals.config import Settings
 from crypto_signals.domain.schemas import AssetClass
-from crypto_signals.engine.risk import RiskEngine
+from crypto_signals.engine.risk import RiskEngine, RiskSnapshot
 from crypto_signals.market.data_provider import MarketDataProvider
 from crypto_signals.repository.firestore import PositionRepository
 
@@ -172,3 +172,114 @@ class TestRiskEngine:
         assert (
             "Duplicate Position" in result.reason
         ), 'Assertion condition not met: "Duplicate Position" in result.reason'
+
+
+class TestRiskSnapshot:
+    """All gates evaluate against one fetch and see earlier approvals."""
+
+    @pytest.fixture
+    def mock_settings(self):
+        settings = MagicMock(spec=Settings)
+        settings.MAX_CRYPTO_POSITIONS = 5
+        settings.MAX_EQUITY_POSITIONS = 5
+        settings.MAX_DAILY_DRAWDOWN_PCT = 0.05
+        settings.MIN_ASSET_BP_USD = 100.0
+        return settings
+
+    @pytest.fixture
+    def mock_client(self):
+        client = MagicMock()
+        account = MagicMock(spec=TradeAccount)
+        account.regt_buying_power = "20000.00"
+        account.non_marginable_buying_power = "5000.00"
+        account.equity = "10000.00"
+        account.last_equity = "10000.00"
+        client.get_account.return_value = account
+        position = MagicMock(asset_class=AlpacaAssetClass.CRYPTO)
+        client.get_all_positions.return_value = [position] * 3
+        client.get_orders.return_value = []
+        return client
+
+    @pytest.fixture
+    def mock_repo(self):
+        repo = MagicMock(spec=PositionRepository)
+        repo.get_open_positions.return_value = []
+        return repo
+
+    @pytest.fixture
+    def risk_engine(self, mock_client, mock_repo, mock_settings):
+        with pytest.MonkeyPatch.context() as m:
+            m.setattr("crypto_signals.engine.risk.get_settings", lambda: mock_settings)
+            yield RiskEngine(trading_client=mock_client, repository=mock_repo)
+
+    @staticmethod
+    def _signal(symbol, signal_id="sig", asset_class=CRYPTO):
+        from crypto_signals.domain.schemas import Signal
+
+        return MagicMock(
+            spec=Signal, symbol=symbol, signal_id=signal_id, asset_class=asset_class
+        )
+
+    def test_gates_use_one_fetch(self, risk_engine, mock_client, mock_repo):
+        snapshot = risk_engine.snapshot()
+        for i in range(3):
+            assert risk_engine.validate_signal(self._signal(f"S{i}/USD"), snapshot)
+
+        mock_client.get_account.assert_called_once()
+        mock_client.get_all_positions.assert_called_once()
+        mock_client.get_orders.assert_called_once()
+        mock_repo.get_open_positions.assert_called_once()
+
+    def test_approvals_count_towards_sector_cap(self, risk_engine):
+        snapshot = risk_engine.snapshot()
+        snapshot.record_approval(self._signal("A/USD", "a"))
+        assert risk_engine.check_sector_limit(CRYPTO, snapshot).passed
+
+        snapshot.record_approval(self._signal("B/USD", "b"))
+        result = risk_engine.check_sector_limit(CRYPTO, snapshot)
+
+        assert result.passed is False
+        assert "2 in batch" in result.reason
+
+    def test_approval_blocks_duplicate_symbol(self, risk_engine):
+        snapshot = risk_engine.snapshot()
+        snapshot.record_approval(self._signal("BTC/USD", "sig_1"))
+
+        result = risk_engine.check_duplicate_symbol(self._signal("BTC/USD"), snapshot)
+
+        assert result.passed is False
+        assert "already approved in this batch" in result.reason
+
+    def test_committed_notional_reduces_buying_power(self, risk_engine):
+        snapshot = risk_engine.snapshot()
+        snapshot.record_approval(self._signal("A/USD", "a"), notional=4950.0)
+
+        assert risk_engine.check_buying_power(EQUITY, 100.0, snapshot).passed
+        result = risk_engine.check_buying_power(CRYPTO, 100.0, snapshot)
+
+        assert result.passed is False
+        assert "Insufficient Buying Power" in result.reason
+
+    def test_fetch_failure_fails_only_dependent_gates(self, risk_engine, mock_client):
+        mock_client.get_orders.side_effect = RuntimeError("API down")
+
+        snapshot = risk_engine.snapshot()
+
+        assert "open_orders" in snapshot.errors
+        assert risk_engine.check_daily_drawdown(snapshot).passed
+        result = risk_engine.check_sector_limit(CRYPTO, snapshot)
+        assert result.passed is False
+        assert result.gate == "sector_cap"
+
+    def test_validate_without_snapshot_fetches_one(self, risk_engine, mock_client):
+        assert risk_engine.validate_signal(self._signal("BTC/USD"))
+
+        mock_client.get_account.assert_called_once()
+
+    def test_record_approval_accumulates(self):
+        snapshot = RiskSnapshot()
+        snapshot.record_approval(self._signal("A/USD", "a"), notional=10.0)
+        snapshot.record_approval(self._signal("B/USD", "b"), notional=5.0)
+
+        assert [s.signal_id for s in snapshot.approved] == ["a", "b"]
+        assert snapshot.committed_notional == {CRYPTO: 15.0}
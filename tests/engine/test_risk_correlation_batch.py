@@ -75,8 +75,10 @@ class TestRiskCorrelationBatching:
         iterables = [["BTC/USD", "ETH/USD"], dates]
         index = pd.MultiIndex.from_product(iterables, names=["symbol", "timestamp"])
 
-        # Use different patterns for each symbol to avoid constant-data warnings
-        data = np.concatenate([np.linspace(100, 110, 90), np.linspace(110, 100, 90)])
+        # Uncorrelated daily returns: steady trend vs. day-to-day oscillation
+        data = np.concatenate(
+            [np.linspace(100, 110, 90), 110 + np.where(np.arange(90) % 2, 1.0, -1.0)]
+        )
         df = pd.DataFrame({"close": data}, index=index)
         mock_market.get_daily_bars.return_value = df
 
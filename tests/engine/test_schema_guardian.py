@@ -1,9 +1,14 @@
 from datetime import date
 from typing import Optional
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
-from crypto_signals.engine.schema_guardian import SchemaGuardian, SchemaMismatchError
+from crypto_signals.engine.schema_guardian import (
+    SchemaCache,
+    SchemaGuardian,
+    SchemaMismatchError,
+    schema_fingerprint,
+)
 from google.api_core.exceptions import Conflict
 from google.cloud import bigquery
 from pydantic import BaseModel, Field
@@ -368,3 +373,104 @@ def test_create_table_with_clustering(guardian, mock_bq_client):
     assert isinstance(table_arg, bigquery.Table)
     assert table_arg.clustering_fields == clustering_fields
     assert table_arg.time_partitioning.field == "ds"
+
+
+# --- Fingerprint cache ---
+
+
+def _simple_table(etag="etag-1"):
+    table = MagicMock()
+    table.etag = etag
+    table.schema = [
+        bigquery.SchemaField("name", "STRING"),
+        bigquery.SchemaField("age", "INTEGER"),
+        bigquery.SchemaField("score", "FLOAT"),
+        bigquery.SchemaField("is_active", "BOOLEAN"),
+    ]
+    return table
+
+
+def test_schema_fingerprint_is_order_independent():
+    a = [bigquery.SchemaField("x", "STRING"), bigquery.SchemaField("y", "INTEGER")]
+    b = list(reversed(a))
+
+    assert schema_fingerprint(a) == schema_fingerprint(b)
+    assert schema_fingerprint(a) != schema_fingerprint(
+        [bigquery.SchemaField("x", "STRING"), bigquery.SchemaField("y", "FLOAT")]
+    )
+
+
+def test_cache_hit_skips_get_table(mock_bq_client):
+    guardian = SchemaGuardian(mock_bq_client, cache=SchemaCache(ttl_seconds=60))
+    mock_bq_client.get_table.return_value = _simple_table()
+
+    guardian.validate_schema("project.dataset.table", SimpleModel)
+    guardian.validate_schema("project.dataset.table", SimpleModel)
+
+    mock_bq_client.get_table.assert_called_once()
+
+
+def test_unchanged_etag_skips_field_walk(mock_bq_client):
+    guardian = SchemaGuardian(mock_bq_client, cache=SchemaCache(ttl_seconds=0))
+    mock_bq_client.get_table.return_value = _simple_table()
+    guardian.validate_schema("project.dataset.table", SimpleModel)
+
+    with patch.object(guardian, "_validate_fields") as walk:
+        guardian.validate_schema("project.dataset.table", SimpleModel)
+
+    assert mock_bq_client.get_table.call_count == 2
+    walk.assert_not_called()
+
+
+def test_changed_etag_revalidates(mock_bq_client):
+    guardian = SchemaGuardian(mock_bq_client, cache=SchemaCache(ttl_seconds=0))
+    mock_bq_client.get_table.return_value = _simple_table()
+    guardian.validate_schema("project.dataset.table", SimpleModel)
+
+    altered = _simple_table(etag="etag-2")
+    altered.schema = altered.schema[:2]  # Columns dropped out-of-band
+    mock_bq_client.get_table.return_value = altered
+
+    with pytest.raises(SchemaMismatchError):
+        guardian.validate_schema("project.dataset.table", SimpleModel)
+
+
+def test_model_change_or_migration_invalidates(mock_bq_client):
+    cache = SchemaCache(ttl_seconds=60)
+    guardian = SchemaGuardian(mock_bq_client, cache=cache)
+    mock_bq_client.get_table.return_value = _simple_table()
+    guardian.validate_schema("project.dataset.table", SimpleModel)
+
+    # Different model for the same table -> fingerprint differs -> re-fetch
+    with pytest.raises(SchemaMismatchError):
+        guardian.validate_schema("project.dataset.table", PartitionModel)
+
+    guardian.migrate_schema("project.dataset.table", SimpleModel)
+    assert cache.get("project.dataset.table") is None
+
+
+def test_cache_persists_to_file(mock_bq_client, tmp_path):
+    path = str(tmp_path / "schema_cache.json")
+    mock_bq_client.get_table.return_value = _simple_table()
+    SchemaGuardian(
+        mock_bq_client, cache=SchemaCache(ttl_seconds=60, path=path)
+    ).validate_schema("project.dataset.table", SimpleModel)
+
+    fresh_client = MagicMock(spec=bigquery.Client)
+    SchemaGuardian(
+        fresh_client, cache=SchemaCache(ttl_seconds=60, path=path)
+    ).validate_schema("project.dataset.table", SimpleModel)
+
+    fresh_client.get_table.assert_not_called()
+
+
+def test_generate_schema_returns_independent_copies(guardian):
+    first = guardian.generate_schema(SimpleModel)
+    first.append(bigquery.SchemaField("extra", "STRING"))
+
+    assert [f.name for f in guardian.generate_schema(SimpleModel)] == [
+        "name",
+        "age",
+        "score",
+        "is_active",
+    ]
@@ -0,0 +1,316 @@
+"""Tests for the staged Phase 3 SignalProcessingPipeline."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from crypto_signals.domain.schemas import (
+    AssetClass,
+    ExitReason,
+    SignalStatus,
+    TradeType,
+)
+from crypto_signals.engine.signal_pipeline import SignalProcessingPipeline
+
+from tests.factories import SignalFactory
+
+
+def _make_signal(signal_id, symbol="BTC/USD", status=SignalStatus.WAITING):
+    """Helper: create a Signal object using SignalFactory."""
+    return SignalFactory.build(
+        signal_id=signal_id,
+        symbol=symbol,
+        status=status,
+        pattern_name="BULLISH_ENGULFING",
+        discord_thread_id=None,
+    )
+
+
+def _make_pipeline(
+    enable_execution=False, max_workers=4, notify_concurrency=2, persist_concurrency=2
+):
+    """Helper: build a pipeline with mocked collaborators."""
+    settings = MagicMock()
+    settings.ENABLE_EXECUTION = enable_execution
+    settings.SIGNAL_PIPELINE_MAX_WORKERS = max_workers
+    settings.SIGNAL_PERSIST_CONCURRENCY = persist_concurrency
+    settings.SIGNAL_NOTIFY_CONCURRENCY = notify_concurrency
+
+    repo = MagicMock()
+    repo.get_by_id.return_value = None
+    repo.update_signal_atomic.return_value = True
+    discord = MagicMock()
+    discord.find_thread_by_signal_id.return_value = None
+    discord.send_signal.return_value = "thread_123"
+
+    return SignalProcessingPipeline(
+        repo=repo,
+        rejected_repo=MagicMock(),
+        discord=discord,
+        position_repo=MagicMock(),
+        execution_engine=MagicMock(),
+        settings=settings,
+        metrics=MagicMock(),
+    )
+
+
+def _candidates(*signals):
+    return [(sig, AssetClass.CRYPTO, 0.1) for sig in signals]
+
+
+class TestGrouping:
+    """Per-symbol lanes preserve detection order."""
+
+    def test_group_by_symbol_preserves_order(self):
+        a1 = _make_signal("a1", "BTC/USD")
+        b1 = _make_signal("b1", "ETH/USD")
+        a2 = _make_signal("a2", "BTC/USD")
+
+        lanes = SignalProcessingPipeline.group_by_symbol(_candidates(a1, b1, a2))
+
+        assert [[c[0].signal_id for c in lane] for lane in lanes] == [
+            ["a1", "a2"],
+            ["b1"],
+        ]
+
+    def test_empty_candidates(self):
+        pipeline = _make_pipeline()
+        assert pipeline.run([], {}, 1.0) == 0
+
+
+class TestTwoPhaseCommit:
+    """Persist-before-notify and compensation are preserved per signal."""
+
+    def test_persist_before_notify(self):
+        pipeline = _make_pipeline()
+        call_order = []
+        pipeline.repo.save.side_effect = lambda s: call_order.append("save")
+        pipeline.discord.send_signal.side_effect = lambda p: (
+            call_order.append("send") or "thread_1"
+        )
+        pipeline.repo.update_signal_atomic.side_effect = lambda sid, u: (
+            call_order.append("update") or True
+        )
+
+        found = pipeline.run(_candidates(_make_signal("s1")), {}, 10.0)
+
+        assert found == 1
+        assert call_order == ["save", "send", "update"]
+
+    def test_persist_failure_skips_notification(self):
+        pipeline = _make_pipeline()
+        pipeline.repo.save.side_effect = RuntimeError("Firestore Unavailable")
+
+        pipeline.run(_candidates(_make_signal("s1")), {}, 10.0)
+
+        pipeline.discord.send_signal.assert_not_called()
+        assert pipeline.metrics.record_failure.call_args[0][0] == "signal_persistence"
+
+    def test_notification_failure_compensates(self):
+        pipeline = _make_pipeline()
+        pipeline.discord.send_signal.return_value = None
+        sig = _make_signal("s1")
+
+        pipeline.run(_candidates(sig), {}, 10.0)
+
+        assert sig.status == SignalStatus.INVALIDATED
+        pipeline.repo.update_signal_atomic.assert_called_once_with(
+            "s1",
+            {
+                "status": SignalStatus.INVALIDATED.value,
+                "exit_reason": ExitReason.NOTIFICATION_FAILED.value,
+            },
+        )
+
+    def test_idempotency_skips_notified_signal(self):
+        pipeline = _make_pipeline()
+        existing = MagicMock(status=SignalStatus.WAITING, discord_thread_id="t1")
+        pipeline.repo.get_by_id.return_value = existing
+
+        found = pipeline.run(_candidates(_make_signal("s1")), {}, 10.0)
+
+        assert found == 1
+        pipeline.repo.save.assert_not_called()
+        pipeline.discord.send_signal.assert_not_called()
+
+    def test_shadow_signal_not_counted(self):
+        pipeline = _make_pipeline()
+        pipeline.repo.get_active_signals.return_value = []
+        shadow = _make_signal("s1", status=SignalStatus.REJECTED_BY_FILTER)
+
+        found = pipeline.run(_candidates(shadow), {}, 10.0)
+
+        assert found == 0
+        pipeline.rejected_repo.save.assert_called_once_with(shadow)
+        pipeline.discord.send_shadow_signal.assert_called_once_with(shadow)
+        pipeline.repo.save.assert_not_called()
+
+
+class TestConcurrency:
+    """Independent symbols overlap; same-symbol signals stay sequential."""
+
+    def test_independent_symbols_run_concurrently(self):
+        pipeline = _make_pipeline(max_workers=4, notify_concurrency=4)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def send(payload):
+            # Deadlocks (BrokenBarrierError) unless 3 notifications overlap
+            barrier.wait()
+            return f"thread_{payload.signal.signal_id}"
+
+        pipeline.discord.send_signal.side_effect = send
+        signals = [_make_signal(f"s{i}", f"SYM{i}/USD") for i in range(3)]
+
+        found = pipeline.run(_candidates(*signals), {}, 10.0)
+
+        assert found == 3
+        assert all(s.status == SignalStatus.WAITING for s in signals)
+
+    def test_persist_stage_is_bounded_below_workers(self):
+        pipeline = _make_pipeline(max_workers=4, persist_concurrency=1)
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def save(sig):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+        pipeline.repo.save.side_effect = save
+        signals = [_make_signal(f"s{i}", f"SYM{i}/USD") for i in range(4)]
+
+        assert pipeline.run(_candidates(*signals), {}, 10.0) == 4
+        assert peak[0] == 1
+
+    def test_same_symbol_signals_are_ordered(self):
+        pipeline = _make_pipeline(max_workers=4)
+        seen = []
+
+        def save(sig):
+            seen.append(sig.signal_id)
+            time.sleep(0.01)
+
+        pipeline.repo.save.side_effect = save
+        signals = [_make_signal(f"s{i}", "BTC/USD") for i in range(5)]
+
+        pipeline.run(_candidates(*signals), {}, 10.0)
+
+        assert seen == ["s0", "s1", "s2", "s3", "s4"]
+
+    def test_lane_failure_does_not_stop_other_lanes(self):
+        pipeline = _make_pipeline()
+
+        def get_by_id(signal_id):
+            if signal_id == "bad":
+                raise RuntimeError("boom")
+            return None
+
+        pipeline.repo.get_by_id.side_effect = get_by_id
+        signals = [_make_signal("bad", "BAD/USD"), _make_signal("ok", "OK/USD")]
+
+        found = pipeline.run(_candidates(*signals), {}, 10.0)
+
+        assert found == 1
+        assert signals[1].status == SignalStatus.WAITING
+
+
+class TestBatchExecution:
+    """Notified signals are released to batched execution as they become ready."""
+
+    def test_signals_executed_once_in_detection_order(self):
+        pipeline = _make_pipeline(enable_execution=True, max_workers=4)
+        pipeline.execution_engine.alpaca.get_all_positions.return_value = []
+        pipeline.execution_engine.execute_signals.side_effect = lambda sigs: {
+            s.signal_id: MagicMock(trade_type=TradeType.EXECUTED) for s in sigs
+        }
+        signals = [_make_signal(f"s{i}", f"SYM{i}/USD") for i in range(4)]
+
+        pipeline.run(_candidates(*signals), {}, 10.0)
+
+        executed = [
+            s.signal_id
+            for call in pipeline.execution_engine.execute_signals.call_args_list
+            for s in call[0][0]
+        ]
+        assert sorted(executed) == ["s0", "s1", "s2", "s3"]
+        for call in pipeline.execution_engine.execute_signals.call_args_list:
+            batch_ids = [s.signal_id for s in call[0][0]]
+            assert batch_ids == sorted(batch_ids)
+        pipeline.execution_engine.execute_signal.assert_not_called()
+        assert pipeline.position_repo.save.call_count == 4
+        assert all(s.status == SignalStatus.ACTIVE for s in signals)
+
+    def test_execution_does_not_wait_for_other_lanes(self):
+        pipeline = _make_pipeline(
+            enable_execution=True, max_workers=2, notify_concurrency=2
+        )
+        pipeline.execution_engine.alpaca.get_all_positions.return_value = []
+        fast_executed = threading.Event()
+        pipeline.execution_engine.execute_signals.side_effect = lambda sigs: (
+            fast_executed.set() or {s.signal_id: None for s in sigs}
+        )
+        overlapped = []
+
+        def send(payload):
+            if payload.signal.signal_id == "slow":
+                # Times out unless "fast" executes while this notification runs
+                overlapped.append(fast_executed.wait(timeout=5))
+            return f"thread_{payload.signal.signal_id}"
+
+        pipeline.discord.send_signal.side_effect = send
+        signals = [_make_signal("slow", "BTC/USD"), _make_signal("fast", "ETH/USD")]
+
+        pipeline.run(_candidates(*signals), {}, 10.0)
+
+        assert overlapped == [True]
+
+    def test_open_broker_position_skips_signal(self):
+        pipeline = _make_pipeline(enable_execution=True, max_workers=1)
+        pipeline.execution_engine.alpaca.get_all_positions.return_value = [
+            MagicMock(symbol="BTCUSD", qty="0.5")
+        ]
+        pipeline.execution_engine.execute_signals.return_value = {}
+        signals = [_make_signal("held", "BTC/USD"), _make_signal("new", "ETH/USD")]
+
+        with patch("crypto_signals.engine.signal_pipeline.logger") as mock_logger:
+            pipeline.run(_candidates(*signals), {}, 10.0)
+
+        executed = [
+            s.signal_id
+            for call in pipeline.execution_engine.execute_signals.call_args_list
+            for s in call[0][0]
+        ]
+        assert executed == ["new"]
+        pipeline.execution_engine.alpaca.get_open_position.assert_not_called()
+        (warning,) = [
+            c
+            for c in mock_logger.warning.call_args_list
+            if c[0][0].startswith("ISSUE 275")
+        ]
+        assert "qty=0.5" in warning[0][0]
+        assert warning[1]["extra"]["existing_qty"] == "0.5"
+
+    def test_positions_fetch_failure_fails_open(self):
+        pipeline = _make_pipeline(enable_execution=True)
+        pipeline.execution_engine.alpaca.get_all_positions.side_effect = RuntimeError(
+            "API down"
+        )
+        pipeline.execution_engine.execute_signals.return_value = {}
+
+        pipeline.run(_candidates(_make_signal("s1")), {}, 10.0)
+
+        pipeline.execution_engine.execute_signals.assert_called_once()
+
+    def test_blocked_signal_not_persisted(self):
+        pipeline = _make_pipeline(enable_execution=True)
+        pipeline.execution_engine.alpaca.get_all_positions.return_value = []
+        pipeline.execution_engine.execute_signals.return_value = {"s1": None}
+        sig = _make_signal("s1")
+
+        pipeline.run(_candidates(sig), {}, 10.0)
+
+        pipeline.position_repo.save.assert_not_called()
+        assert sig.status == SignalStatus.WAITING
@@ -0,0 +1,282 @@
+"""Tests for incrementally maintained strategy aggregates."""
+
+from datetime import date
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlglot
+from crypto_signals.domain.schemas import AggStrategyPatternDaily
+from crypto_signals.pipelines.aggregates import (
+    AGG_CLUSTERING_FIELDS,
+    PENDING_FIELD,
+    SOURCE_LIVE,
+    PendingAggregateGroups,
+    StrategyAggregateRefresher,
+    get_patch_trade_aggregates,
+    live_trade_aggregates,
+    refresh_patched_trades,
+    theoretical_signal_aggregates,
+)
+from crypto_signals.pipelines.base import BigQueryPipelineBase
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+from pydantic import BaseModel
+from sqlglot import exp
+
+ROWS = [
+    {"ds": "2024-01-03", "strategy_id": "s1", "trade_id": "t1"},
+    {"ds": "2024-01-01", "strategy_id": "s2", "trade_id": "t2"},
+    {"ds": "2024-01-03", "strategy_id": "s1", "trade_id": "t3"},
+]
+
+
+@pytest.fixture
+def refresher():
+    return live_trade_aggregates(MagicMock(), MagicMock(), "proj", "_test")
+
+
+def _params(bq_client):
+    job_config = bq_client.query.call_args[1]["job_config"]
+    return {p.name: p for p in job_config.query_parameters}
+
+
+class TestRefresh:
+    """Keyed refreshes only recompute the groups a batch touched."""
+
+    def test_group_keys_are_unique_and_sorted(self):
+        keys = StrategyAggregateRefresher.group_keys(ROWS + [{"ds": None}])
+
+        assert keys == ["2024-01-01|s2", "2024-01-03|s1"]
+
+    def test_refresh_binds_affected_groups_and_ds_range(self, refresher):
+        assert refresher.refresh(ROWS) == 2
+
+        params = _params(refresher.bq_client)
+        assert params["group_keys"].values == ["2024-01-01|s2", "2024-01-03|s1"]
+        assert params["ds_min"].value == date(2024, 1, 1)
+        assert params["ds_max"].value == date(2024, 1, 3)
+        assert params["source"].value == SOURCE_LIVE
+        assert (
+            refresher.table_id == "proj.crypto_analytics.agg_strategy_pattern_daily_test"
+        )
+
+    def test_refresh_without_groups_runs_no_query(self, refresher):
+        assert refresher.refresh([]) == 0
+
+        refresher.bq_client.query.assert_not_called()
+        refresher.guardian.validate_schema.assert_not_called()
+
+    def test_missing_table_is_created_once(self, refresher):
+        refresher.guardian.validate_schema.side_effect = NotFound("missing")
+
+        refresher.refresh(ROWS)
+        refresher.refresh(ROWS)
+
+        refresher.guardian.migrate_schema.assert_called_once_with(
+            refresher.table_id,
+            AggStrategyPatternDaily,
+            partition_column="ds",
+            clustering_fields=AGG_CLUSTERING_FIELDS,
+        )
+        assert refresher.bq_client.query.call_count == 2
+
+
+class TestPendingGroups:
+    """Failed groups are persisted and retried by the next refresh."""
+
+    @pytest.fixture
+    def pending(self):
+        pending = MagicMock(spec=PendingAggregateGroups)
+        pending.load.return_value = []
+        return pending
+
+    def test_failed_refresh_persists_groups(self, refresher, pending):
+        refresher.pending = pending
+        refresher.bq_client.query.side_effect = RuntimeError("quota")
+
+        with pytest.raises(RuntimeError):
+            refresher.refresh(ROWS)
+
+        pending.add.assert_called_once_with(
+            SOURCE_LIVE, ["2024-01-01|s2", "2024-01-03|s1"]
+        )
+
+    def test_next_refresh_retries_and_clears_pending(self, refresher, pending):
+        refresher.pending = pending
+        pending.load.return_value = ["2023-12-31|s9"]
+
+        assert refresher.refresh(ROWS[:1]) == 2
+        assert refresher.retry_pending() == 0
+
+        assert _params(refresher.bq_client)["group_keys"].values == [
+            "2023-12-31|s9",
+            "2024-01-03|s1",
+        ]
+        pending.load.assert_called_once_with(SOURCE_LIVE)
+        pending.remove.assert_called_once_with(SOURCE_LIVE, ["2023-12-31|s9"])
+
+    def test_store_writes_map_entries_with_merge(self):
+        client = MagicMock()
+        store = PendingAggregateGroups(client, "proj.crypto_analytics.agg_test")
+
+        store.add(SOURCE_LIVE, ["2024-01-01|s1"])
+        store.remove(SOURCE_LIVE, ["2024-01-01|s1"])
+
+        client.collection.return_value.document.assert_called_with("agg_test")
+        doc = client.collection.return_value.document.return_value
+        assert doc.set.call_args_list[0].args == (
+            {PENDING_FIELD: {SOURCE_LIVE: {"2024-01-01|s1": True}}},
+        )
+        assert doc.set.call_args_list[1].args == (
+            {PENDING_FIELD: {SOURCE_LIVE: {"2024-01-01|s1": firestore.DELETE_FIELD}}},
+        )
+        assert all(c.kwargs == {"merge": True} for c in doc.set.call_args_list)
+
+
+def test_linked_rows_refresh_groups_of_their_trades():
+    """Archived signals refresh the LIVE groups of the trades they link."""
+    bq_client = MagicMock()
+    bq_client.query.return_value.result.return_value = [{"group_key": "2024-01-05|s1"}]
+    refresher = live_trade_aggregates(
+        bq_client, MagicMock(), "proj", "", link_column="linked_trade_id"
+    )
+
+    count = refresher.refresh(
+        [
+            {"ds": "2024-01-04", "strategy_id": "s1", "linked_trade_id": "t1"},
+            {"ds": "2024-01-02", "strategy_id": "s1", "linked_trade_id": None},
+        ]
+    )
+
+    assert count == 1
+    lookup_call, merge_call = bq_client.query.call_args_list
+    assert "proj.crypto_analytics.fact_trades" in lookup_call.args[0]
+    lookup_params = {p.name: p for p in lookup_call.kwargs["job_config"].query_parameters}
+    assert lookup_params["ids"].values == ["t1"]
+    assert lookup_params["ds_min"].value == date(2024, 1, 4)
+    merge_params = {p.name: p for p in merge_call.kwargs["job_config"].query_parameters}
+    assert merge_params["group_keys"].values == ["2024-01-05|s1"]
+
+
+class TestPatchAggregates:
+    """Shared LIVE refresher of the fee and price patch pipelines."""
+
+    def test_built_once_per_process(self):
+        get_patch_trade_aggregates.cache_clear()
+        with (
+            patch("crypto_signals.pipelines.aggregates.get_settings"),
+            patch("crypto_signals.pipelines.aggregates.bigquery.Client") as bq_class,
+            patch("crypto_signals.pipelines.aggregates.firestore.Client") as fs_class,
+        ):
+            try:
+                assert get_patch_trade_aggregates() is get_patch_trade_aggregates()
+            finally:
+                get_patch_trade_aggregates.cache_clear()
+
+        bq_class.assert_called_once()
+        fs_class.assert_called_once()
+
+    def test_refreshes_only_patched_trades(self):
+        aggregates = MagicMock()
+        aggregates.refresh.side_effect = RuntimeError("quota")
+
+        # A failed refresh is logged, not raised: the patch is committed
+        refresh_patched_trades(aggregates, ROWS, [{"trade_id": "t2"}], "fee_patch")
+
+        aggregates.refresh.assert_called_once_with([ROWS[1]])
+        aggregates.group_keys.assert_called_once_with([ROWS[1]])
+
+
+@pytest.mark.parametrize(
+    "factory", [live_trade_aggregates, theoretical_signal_aggregates]
+)
+class TestMergeSql:
+    """The generated MERGE is valid BigQuery and upserts every model column."""
+
+    def test_keyed_merge_prunes_and_deletes_stale_groups(self, factory):
+        sql = factory(MagicMock(), MagicMock(), "proj", "")._get_merge_sql(keyed=True)
+
+        merge = sqlglot.parse_one(sql, read="bigquery")
+        assert isinstance(merge, exp.Merge)
+        assert "T.ds BETWEEN @ds_min AND @ds_max" in sql
+        assert "IN UNNEST(@group_keys)" in sql
+        assert "THEN DELETE" in sql
+        insert = next(
+            w.args["then"] for w in merge.args["whens"] if not w.args.get("matched")
+        )
+        assert [c.name for c in insert.this.expressions] == list(
+            AggStrategyPatternDaily.model_fields
+        )
+
+    def test_rebuild_merge_has_no_group_filter(self, factory):
+        sql = factory(MagicMock(), MagicMock(), "proj", "")._get_merge_sql(keyed=False)
+
+        sqlglot.parse_one(sql, read="bigquery")
+        assert "@group_keys" not in sql
+        assert "@ds_min" not in sql
+
+
+class _Row(BaseModel):
+    id: str
+    ds: date
+    strategy_id: str
+
+
+class _AggregatedPipeline(BigQueryPipelineBase):
+    def __init__(self, refresher):
+        super().__init__(
+            job_name="agg",
+            staging_table_id=None,
+            fact_table_id="p.d.fact",
+            id_column="id",
+            partition_column="ds",
+            schema_model=_Row,
+        )
+        self.aggregate_refreshers = [refresher]
+        self.cleaned: List[str] = []
+
+    def extract(self) -> List[Any]:
+        return [{"id": "1", "ds": date(2024, 1, 1), "strategy_id": "s1"}]
+
+    def _merge_via_temp_table(self, data):
+        pass
+
+    def cleanup(self, data: List[BaseModel]) -> None:
+        self.cleaned.extend(row.id for row in data)
+
+
+def test_failed_refresh_does_not_block_cleanup():
+    """Aggregates are derived: a refresh failure is logged and the batch completes."""
+    refresher = MagicMock(table_id="p.d.agg", source=SOURCE_LIVE)
+    refresher.refresh.side_effect = RuntimeError("quota")
+
+    with (
+        patch("crypto_signals.pipelines.base.get_settings"),
+        patch("crypto_signals.pipelines.base.bigquery.Client"),
+        patch("crypto_signals.pipelines.base.SchemaGuardian"),
+    ):
+        pipeline = _AggregatedPipeline(refresher)
+
+    assert pipeline.run() == 1
+    refresher.refresh.assert_called_once_with(
+        [{"id": "1", "ds": "2024-01-01", "strategy_id": "s1"}]
+    )
+    assert pipeline.cleaned == ["1"]
+
+
+def test_empty_run_retries_pending_groups():
+    """A run without new data still retries groups that failed before."""
+    refresher = MagicMock(table_id="p.d.agg", source=SOURCE_LIVE)
+
+    with (
+        patch("crypto_signals.pipelines.base.get_settings"),
+        patch("crypto_signals.pipelines.base.bigquery.Client"),
+        patch("crypto_signals.pipelines.base.SchemaGuardian"),
+    ):
+        pipeline = _AggregatedPipeline(refresher)
+    pipeline.extract = lambda: []
+
+    assert pipeline.run() == 0
+    refresher.retry_pending.assert_called_once_with()
+    refresher.refresh.assert_not_called()
@@ -36,6 +36,7 @@ class TestArchivalDatetimeLogic(unittest.TestCase):
         """
         # Setup Pipeline
         mock_trading_client = mock_get_trading.return_value
+        mock_get_settings.return_value.ARCHIVAL_MAX_WORKERS = 4
 
         pipeline = TradeArchivalPipeline()
 
@@ -1,6 +1,8 @@
+from datetime import date
 from unittest.mock import MagicMock, patch
 
 from alpaca.trading.client import TradingClient
+from crypto_signals.engine.activity_ledger import fetch_activity_ledger
 from crypto_signals.pipelines.trade_archival import TradeArchivalPipeline
 
 
@@ -24,6 +26,7 @@ def test_get_actual_fees_uses_public_api(
     # Setup
     mock_settings.return_value.ENVIRONMENT = "PROD"
     mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
+    mock_settings.return_value.ARCHIVAL_MAX_WORKERS = 4
 
     # Mock Alpaca Client
     mock_alpaca = MagicMock(spec=TradingClient)
@@ -35,10 +38,6 @@ def test_get_actual_fees_uses_public_api(
     # Initialize functionality
     pipeline = TradeArchivalPipeline()
 
-    # Execute
-    # Execute
-    # We want to trigger _get_actual_fees which constructs a list of activities.
-
     # Mocking the return of get (list of activities)
     mock_activity_dict = {
         "order_id": "test-order-id",
@@ -49,16 +48,18 @@ def test_get_actual_fees_uses_public_api(
 
     # Mock public .get()
     mock_alpaca.get.return_value = [mock_activity_dict]
+    ledger = fetch_activity_ledger(mock_alpaca, date(2025, 1, 1), date(2025, 1, 3))
 
     # Trigger method - should pass now
-    pipeline._get_actual_fees("test-order-id", "BTC/USD", "buy")
+    fees = pipeline._get_actual_fees("test-order-id", "BTC/USD", "buy", ledger=ledger)
 
     # Assertions
+    assert fees == 0.5
     mock_alpaca.get.assert_called_once()
     args, kwargs = mock_alpaca.get.call_args
     # Verify positional args (path) and dict params
     assert args[0] == "/account/activities"
-    assert args[1] == {"activity_types": "CSD,CFEE"}
+    assert args[1]["activity_types"] == "CFEE,CSD"
 
     # Ensure legacy private method is NOT called
     mock_alpaca._request.assert_not_called()
@@ -73,6 +73,7 @@ def pipeline(mock_firestore, mock_market_provider):
         pipe.market_provider = mock_market_provider
         pipe.bq_client = mock_bq.return_value
         pipe.guardian = mock_guardian.return_value
+        pipe.guardian.generate_schema.return_value = []
 
         return pipe
 
@@ -166,15 +167,15 @@ class TestExtract:
         # Configure mock to return different docs per collection
         def collection_side_effect(name):
             mock_coll = MagicMock()
+            ordered = mock_coll.where.return_value.order_by.return_value
             if name == "rejected_signals":
-                mock_coll.where.return_value.limit.return_value.stream.return_value = [
+                # Ordered by (created_at, __name__)
+                ordered.order_by.return_value.limit.return_value.stream.return_value = [
                     rejected_doc
                 ]
             else:
-                # live_signals — each status query returns the same doc
-                mock_coll.where.return_value.limit.return_value.stream.return_value = [
-                    live_doc
-                ]
+                # live_signals (ordered by __name__) — each status returns the same doc
+                ordered.limit.return_value.stream.return_value = [live_doc]
             return mock_coll
 
         mock_firestore.collection.side_effect = collection_side_effect
@@ -193,7 +194,9 @@ class TestExtract:
     def test_extract_empty_collections(self, pipeline, mock_firestore):
         """Extract returns empty list when no terminal signals exist."""
         mock_coll = MagicMock()
-        mock_coll.where.return_value.limit.return_value.stream.return_value = []
+        ordered = mock_coll.where.return_value.order_by.return_value
+        ordered.limit.return_value.stream.return_value = []
+        ordered.order_by.return_value.limit.return_value.stream.return_value = []
         mock_firestore.collection.return_value = mock_coll
 
         raw_data = pipeline.extract()
@@ -483,6 +486,46 @@ class TestTransform:
             f"got {record['theoretical_fees_usd']}"
         )
 
+    def test_transform_loads_bars_once_per_symbol(self, pipeline, mock_market_provider):
+        """Signals sharing a symbol are simulated from a single bar fetch."""
+        created_at = datetime.now(timezone.utc) - timedelta(days=8)
+        raw = [
+            _make_raw_signal(signal_id="sig_tp1", created_at=created_at),
+            _make_raw_signal(
+                signal_id="sig_ladder",
+                created_at=created_at,
+                take_profit_2=57000.0,
+                status=SignalStatus.EXPIRED.value,
+                source_collection="live_signals",
+            ),
+            _make_raw_signal(
+                signal_id="sig_sl",
+                created_at=created_at + timedelta(days=3),
+                suggested_stop=51500.0,
+            ),
+        ]
+        mock_market_provider.get_daily_bars.return_value = _make_bars_df(
+            created_at,
+            highs=[51000.0, 56000.0, 58000.0, 52000.0],
+            lows=[49000.0, 50500.0, 51000.0, 51000.0],
+            closes=[50500.0, 54000.0, 57500.0, 51500.0],
+        )
+
+        transformed = {r["signal_id"]: r for r in pipeline.transform(raw)}
+
+        mock_market_provider.get_daily_bars.assert_called_once()
+        assert mock_market_provider.get_daily_bars.call_args.kwargs["lookback_days"] >= 8
+        assert transformed["sig_tp1"]["theoretical_exit_price"] == 55000.0
+        # 50% at TP1, 25% at TP2, runner stopped at TP1 on the last bar
+        ladder = transformed["sig_ladder"]
+        assert ladder["theoretical_exit_reason"] == "THEORETICAL_TP2"
+        assert ladder["theoretical_exit_price"] == pytest.approx(
+            0.5 * 55000.0 + 0.25 * 57000.0 + 0.25 * 55000.0
+        )
+        assert ladder["distance_to_trigger_pct"] is not None
+        assert transformed["sig_sl"]["theoretical_exit_reason"] == "THEORETICAL_SL"
+        assert transformed["sig_sl"]["theoretical_exit_price"] == 51500.0
+
 
 # =====================================================================
 # Cleanup Tests
@@ -589,13 +632,19 @@ class TestRunLifecycle:
     def test_run_calls_schema_guardian(self, pipeline):
         """Pipeline run() invokes SchemaGuardian for validation."""
         sample = FactTheoreticalSignalFactory.build()
-        pipeline.extract = MagicMock(return_value=[{"signal_id": "sig_1"}])
+        pipeline.extract_batches = MagicMock(
+            return_value=iter([[{"signal_id": "sig_1"}]])
+        )
         pipeline.transform = MagicMock(return_value=[sample.model_dump(mode="json")])
         pipeline.cleanup = MagicMock()
 
         pipeline.run()
 
-        assert pipeline.guardian.validate_schema.call_count == 1, (
-            f"Expected 1 schema validation call, "
-            f"got {pipeline.guardian.validate_schema.call_count}"
-        )
+        fact_calls = [
+            c
+            for c in pipeline.guardian.validate_schema.call_args_list
+            if c.kwargs.get("table_id") == pipeline.fact_table_id
+        ]
+        assert (
+            len(fact_calls) == 1
+        ), f"Expected 1 fact table schema validation call, got {len(fact_calls)}"
@@ -112,8 +112,8 @@ def test_pipeline_migrates_schema_and_succeeds(mock_bq_client, mock_settings):
         # 2. bq_client.query called (via _merge_via_temp_table)
         assert mock_bq_client.query.called
         called_sql = mock_bq_client.query.call_args[0][0]
-        assert "CREATE TEMP TABLE" in called_sql
         assert "MERGE" in called_sql
+        mock_bq_client.load_table_from_file.assert_called_once()
 
         # 3. Check that schema was updated on the mock table
         # The code does: table.schema = updated_schema
@@ -50,7 +50,9 @@ class TestExpiredSignalArchivalPipeline(unittest.TestCase):
         """
         mock_collection = MagicMock()
         self.pipeline.firestore_client.collection.return_value = mock_collection
-        mock_collection.where.return_value.where.return_value.stream.return_value = [
+        query = mock_collection.where.return_value.where.return_value
+        ordered = query.order_by.return_value.order_by.return_value
+        ordered.limit.return_value.stream.return_value = [
             MagicMock(id="doc_1", to_dict=lambda: {"signal_id": "1"}),
             MagicMock(id="doc_2", to_dict=lambda: {"signal_id": "2"}),
         ]
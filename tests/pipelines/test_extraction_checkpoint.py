@@ -0,0 +1,213 @@
+"""Tests for cursor-paginated extraction with persisted checkpoints."""
+
+from datetime import date
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+from crypto_signals.pipelines.base import BigQueryPipelineBase
+from crypto_signals.pipelines.checkpoint import (
+    CHECKPOINT_FIELD,
+    DOCUMENT_ID_FIELD,
+    ExtractionCheckpoint,
+    paginate,
+)
+from google.cloud import firestore
+from pydantic import BaseModel
+
+
+class _Doc:
+    """Minimal DocumentSnapshot stand-in."""
+
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class _Query:
+    """In-memory query supporting order_by / start_after / limit / stream."""
+
+    def __init__(self, docs, orders=(), cursor=None, limit=None):
+        self.docs = docs
+        self.orders = tuple(orders)
+        self.cursor = cursor
+        self._limit = limit
+        self.cursors_seen: List[Any] = []
+
+    def _key(self, values):
+        return tuple(values[f] for f in self.orders)
+
+    def order_by(self, field):
+        return self._copy(orders=self.orders + (field,))
+
+    def start_after(self, cursor):
+        self.cursors_seen.append(cursor)
+        return self._copy(cursor=cursor)
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def _copy(self, **changes):
+        query = _Query(
+            self.docs,
+            changes.get("orders", self.orders),
+            changes.get("cursor", self.cursor),
+            changes.get("limit", self._limit),
+        )
+        query.cursors_seen = self.cursors_seen
+        return query
+
+    def stream(self):
+        def values(doc):
+            data = doc.to_dict()
+            data[DOCUMENT_ID_FIELD] = doc.id
+            return data
+
+        rows = sorted(self.docs, key=lambda d: self._key(values(d)))
+        if self.cursor:
+            rows = [d for d in rows if self._key(values(d)) > self._key(self.cursor)]
+        return iter(rows[: self._limit])
+
+
+class _Store:
+    """Firestore client stand-in for the job_metadata checkpoint document."""
+
+    def __init__(self, cursors=None):
+        self.data = {CHECKPOINT_FIELD: dict(cursors or {})}
+        self.doc = MagicMock()
+        self.doc.get.return_value = MagicMock(
+            exists=True,
+            to_dict=lambda: {CHECKPOINT_FIELD: dict(self.data[CHECKPOINT_FIELD])},
+        )
+        self.doc.set.side_effect = self._set
+
+    def _set(self, payload, merge=False):
+        for stream, cursor in payload[CHECKPOINT_FIELD].items():
+            if cursor is firestore.DELETE_FIELD:
+                self.data[CHECKPOINT_FIELD].pop(stream, None)
+            else:
+                self.data[CHECKPOINT_FIELD][stream] = cursor
+
+    def collection(self, name):
+        coll = MagicMock()
+        coll.document.return_value = self.doc
+        return coll
+
+
+def _docs(count):
+    return [_Doc(f"doc_{i:02d}", {"seq": i}) for i in range(count)]
+
+
+class TestPaginate:
+    """Page iteration and checkpoint commits."""
+
+    def test_pages_through_all_docs_with_cursors(self):
+        query = _Query(_docs(7))
+
+        pages = list(paginate(query, ["seq", DOCUMENT_ID_FIELD], page_size=3))
+
+        assert [len(p) for p in pages] == [3, 3, 1]
+        assert [d.id for p in pages for d in p] == [f"doc_{i:02d}" for i in range(7)]
+        assert query.cursors_seen == [
+            {"seq": 2, DOCUMENT_ID_FIELD: "doc_02"},
+            {"seq": 5, DOCUMENT_ID_FIELD: "doc_05"},
+        ]
+
+    def test_cursor_committed_only_after_page_is_processed(self):
+        store = _Store()
+        checkpoint = ExtractionCheckpoint(store, "job")
+        pages = paginate(_Query(_docs(7)), [DOCUMENT_ID_FIELD], 3, checkpoint, "s")
+
+        next(pages)
+        assert store.data[CHECKPOINT_FIELD] == {}
+
+        next(pages)  # First page done
+        assert store.data[CHECKPOINT_FIELD] == {"s": {DOCUMENT_ID_FIELD: "doc_02"}}
+
+    def test_resumes_from_checkpoint_and_clears_when_drained(self):
+        store = _Store({"s": {DOCUMENT_ID_FIELD: "doc_04"}})
+        checkpoint = ExtractionCheckpoint(store, "job")
+
+        pages = list(paginate(_Query(_docs(7)), [DOCUMENT_ID_FIELD], 3, checkpoint, "s"))
+
+        assert [d.id for p in pages for d in p] == ["doc_05", "doc_06"]
+        assert store.data[CHECKPOINT_FIELD] == {}
+
+
+class _Row(BaseModel):
+    id: str
+    ds: date
+
+
+class _PagedPipeline(BigQueryPipelineBase):
+    """Pipeline draining an in-memory query through the checkpoint helpers."""
+
+    def __init__(self, store, docs, fail_on_batch=None):
+        super().__init__(
+            job_name="paged",
+            staging_table_id=None,
+            fact_table_id="p.d.fact",
+            id_column="id",
+            partition_column="ds",
+            schema_model=_Row,
+        )
+        self.store = store
+        self.query = _Query(docs)
+        self.fail_on_batch = fail_on_batch
+        self.merged: List[List[str]] = []
+        self.cleaned: List[str] = []
+
+    def extract(self) -> List[Any]:
+        return []
+
+    def extract_batches(self):
+        checkpoint = ExtractionCheckpoint(self.store, self.job_name)
+        for docs in paginate(self.query, [DOCUMENT_ID_FIELD], 3, checkpoint, "s"):
+            yield [{"id": d.id, "ds": date(2024, 1, 1)} for d in docs]
+
+    def _merge_via_temp_table(self, data):
+        if len(self.merged) == self.fail_on_batch:
+            raise RuntimeError("merge failed")
+        self.merged.append([row["id"] for row in data])
+
+    def cleanup(self, data: List[BaseModel]) -> None:
+        self.cleaned.extend(row.id for row in data)
+
+
+@pytest.fixture
+def patched_base():
+    with (
+        patch("crypto_signals.pipelines.base.get_settings"),
+        patch("crypto_signals.pipelines.base.bigquery.Client"),
+        patch("crypto_signals.pipelines.base.SchemaGuardian"),
+    ):
+        yield
+
+
+class TestRunMicroBatches:
+    """run() drains every page in one invocation and resumes after failures."""
+
+    def test_run_processes_each_page_as_a_batch(self, patched_base):
+        store = _Store()
+        pipeline = _PagedPipeline(store, _docs(7))
+
+        assert pipeline.run() == 7
+        assert [len(b) for b in pipeline.merged] == [3, 3, 1]
+        assert len(pipeline.cleaned) == 7
+        assert store.data[CHECKPOINT_FIELD] == {}
+
+    def test_failed_batch_resumes_from_last_committed_page(self, patched_base):
+        store = _Store()
+        docs = _docs(7)
+
+        with pytest.raises(RuntimeError):
+            _PagedPipeline(store, docs, fail_on_batch=1).run()
+        assert store.data[CHECKPOINT_FIELD] == {"s": {DOCUMENT_ID_FIELD: "doc_02"}}
+
+        retry = _PagedPipeline(store, docs)
+        assert retry.run() == 4
+        assert retry.merged[0][0] == "doc_03"
+        assert store.data[CHECKPOINT_FIELD] == {}
@@ -23,6 +23,7 @@ class TestFeePatchPipeline:
             patch(
                 "crypto_signals.pipelines.fee_patch.ExecutionEngine"
             ) as mock_engine_class,
+            patch("crypto_signals.pipelines.fee_patch.get_patch_trade_aggregates"),
         ):
             mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
             mock_settings.return_value.ENVIRONMENT = "PROD"
@@ -95,19 +96,17 @@ class TestFeePatchPipeline:
         }
 
         # Act
-        success = pipeline._patch_trade_fees(trade)
+        correction = pipeline._fetch_fee_correction(trade)
 
         # Assert
-        assert success is True
         mock_engine.get_crypto_fees_by_orders.assert_called_once()
-
-        # Verify BQ update
-        update_call = mock_bq_client.query.call_args
-        job_config = update_call[1]["job_config"]
-        params = {p.name: p.value for p in job_config.query_parameters}
-        assert params["actual_fee_usd"] == 0.0
-        assert params["fee_calculation_type"] == "ESTIMATED"
-        assert params["fee_tier"] is None
+        mock_bq_client.query.assert_not_called()
+        assert correction == {
+            "trade_id": "equity-trade",
+            "actual_fee_usd": 0.0,
+            "fee_calculation_type": "ESTIMATED",
+            "fee_tier": None,
+        }
 
     def test_patch_trade_fees_crypto(self, mock_pipeline_components):
         """Test patching a CRYPTO trade (should use ACTUAL_CFEE if fees > 0)."""
@@ -130,15 +129,115 @@ class TestFeePatchPipeline:
         }
 
         # Act
-        success = pipeline._patch_trade_fees(trade)
+        correction = pipeline._fetch_fee_correction(trade)
 
         # Assert
-        assert success is True
-
-        # Verify BQ update
-        update_call = mock_bq_client.query.call_args
-        job_config = update_call[1]["job_config"]
-        params = {p.name: p.value for p in job_config.query_parameters}
-        assert params["actual_fee_usd"] == 1.25
-        assert params["fee_calculation_type"] == "ACTUAL_CFEE"
-        assert params["fee_tier"] == "Tier 0: 0.25%"
+        assert correction["actual_fee_usd"] == 1.25
+        assert correction["fee_calculation_type"] == "ACTUAL_CFEE"
+        assert correction["fee_tier"] == "Tier 0: 0.25%"
+
+    def test_run_applies_all_corrections_in_one_merge(self, mock_pipeline_components):
+        """All trades are fetched first, then patched with a single MERGE."""
+        pipeline, mock_bq_client, mock_engine = mock_pipeline_components
+
+        mock_engine.get_crypto_fees_by_orders.return_value = {
+            "total_fee_usd": 0.5,
+            "fee_tier": "Tier 0: 0.25%",
+        }
+        trades = [
+            {
+                "trade_id": f"trade-{i}",
+                "symbol": "BTC/USD",
+                "entry_time": datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+                "exit_time": datetime(2023, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+                "entry_order_id": f"entry-{i}",
+                "exit_order_id": None if i == 2 else f"exit-{i}",
+                "estimated_fee_usd": 1.0,
+            }
+            for i in range(3)
+        ]
+        # A trade without any order IDs is skipped before the Alpaca call
+        trades.append(
+            {
+                **trades[0],
+                "trade_id": "no-orders",
+                "entry_order_id": None,
+                "exit_order_id": None,
+            }
+        )
+        pipeline._query_unfinalized_trades = MagicMock(return_value=trades)
+
+        patched = pipeline.run()
+
+        assert patched == 3
+        assert mock_engine.get_crypto_fees_by_orders.call_count == 3
+        # Ledger loaded once for the combined settlement window
+        mock_engine.get_activity_ledger.assert_called_once()
+        mock_bq_client.query.assert_called_once()
+        merge_sql = mock_bq_client.query.call_args[0][0]
+        assert "MERGE" in merge_sql
+        assert "UNNEST(@corrections)" in merge_sql
+        job_config = mock_bq_client.query.call_args[1]["job_config"]
+        (param,) = job_config.query_parameters
+        trade_ids = [row.struct_values["trade_id"] for row in param.values]
+        assert trade_ids == ["trade-0", "trade-1", "trade-2"]
+
+    def test_run_refreshes_aggregates_of_patched_trades(self, mock_pipeline_components):
+        """Patched pnl_usd is propagated to the LIVE strategy aggregates."""
+        pipeline, _, mock_engine = mock_pipeline_components
+
+        mock_engine.get_crypto_fees_by_orders.return_value = {
+            "total_fee_usd": 0.5,
+            "fee_tier": None,
+        }
+        patched_trade = {
+            "trade_id": "trade-1",
+            "strategy_id": "s1",
+            "symbol": "BTC/USD",
+            "entry_time": datetime(2023, 1, 1, tzinfo=timezone.utc),
+            "exit_time": datetime(2023, 1, 1, tzinfo=timezone.utc),
+            "entry_order_id": "entry-1",
+            "exit_order_id": "exit-1",
+            "estimated_fee_usd": 1.0,
+            "ds": datetime(2023, 1, 1).date(),
+        }
+        skipped_trade = {
+            **patched_trade,
+            "trade_id": "no-orders",
+            "entry_order_id": None,
+            "exit_order_id": None,
+        }
+        pipeline._query_unfinalized_trades = MagicMock(
+            return_value=[patched_trade, skipped_trade]
+        )
+        pipeline.aggregates = MagicMock()
+        pipeline.aggregates.refresh.side_effect = RuntimeError("quota")
+
+        # A failed refresh does not fail the committed patch
+        assert pipeline.run() == 1
+        pipeline.aggregates.refresh.assert_called_once_with([patched_trade])
+
+    def test_run_reports_zero_when_merge_fails(self, mock_pipeline_components):
+        """A failed MERGE leaves every trade unfinalized for the next run."""
+        pipeline, mock_bq_client, mock_engine = mock_pipeline_components
+
+        mock_engine.get_crypto_fees_by_orders.return_value = {
+            "total_fee_usd": 0.5,
+            "fee_tier": None,
+        }
+        mock_bq_client.query.return_value.result.side_effect = RuntimeError("quota")
+        pipeline._query_unfinalized_trades = MagicMock(
+            return_value=[
+                {
+                    "trade_id": "trade-1",
+                    "symbol": "BTC/USD",
+                    "entry_time": datetime(2023, 1, 1, tzinfo=timezone.utc),
+                    "exit_time": datetime(2023, 1, 1, tzinfo=timezone.utc),
+                    "entry_order_id": "entry-1",
+                    "exit_order_id": "exit-1",
+                    "estimated_fee_usd": 1.0,
+                }
+            ]
+        )
+
+        assert pipeline.run() == 0
@@ -22,6 +22,7 @@ class TestPricePatchPipeline:
             patch("crypto_signals.config.get_settings") as mock_settings,
             patch("crypto_signals.pipelines.price_patch.bigquery.Client"),
             patch("crypto_signals.pipelines.price_patch.ExecutionEngine"),
+            patch("crypto_signals.pipelines.price_patch.get_patch_trade_aggregates"),
         ):
             mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
             mock_settings.return_value.ENVIRONMENT = "PROD"
@@ -66,6 +67,7 @@ class TestPricePatchPipeline:
             patch("crypto_signals.config.get_settings") as mock_settings,
             patch("crypto_signals.pipelines.price_patch.bigquery.Client"),
             patch("crypto_signals.pipelines.price_patch.ExecutionEngine"),
+            patch("crypto_signals.pipelines.price_patch.get_patch_trade_aggregates"),
         ):
             mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
             mock_settings.return_value.ENVIRONMENT = "PROD"
@@ -86,11 +88,6 @@ class TestPricePatchPipeline:
             mock_order.status = "filled"
             mock_engine.get_order_details.return_value = mock_order
 
-            # Mock BigQuery update
-            mock_update_job = MagicMock()
-            mock_update_job.result.return_value = None
-            mock_bq_client.query.return_value = mock_update_job
-
             trade = {
                 "trade_id": "trade-123",
                 "symbol": "BTC/USD",
@@ -101,21 +98,28 @@ class TestPricePatchPipeline:
             }
 
             # Act
-            result = pipeline._patch_trade_price(trade)
+            correction = pipeline._fetch_price_correction(trade)
+            patched = pipeline._apply_corrections([correction])
 
             # Assert
-            assert result == (True, 0.0)
+            assert correction == {
+                "trade_id": "trade-123",
+                "actual_exit_price": 51000.0,
+                "pnl_usd": 0.0,
+            }
+            assert patched == 1
             mock_engine.get_order_details.assert_called_once_with("order-abc")
             mock_bq_client.query.assert_called_once()
 
-            # Verify query parameters
+            # Verify the MERGE source rows
             call_args = mock_bq_client.query.call_args
+            assert "MERGE" in call_args[0][0]
             job_config = call_args[1]["job_config"]
-            params = {p.name: p.value for p in job_config.query_parameters}
-
-            assert params["actual_exit_price"] == 51000.0
-            assert params["trade_id"] == "trade-123"
-            assert params["pnl_usd"] == 0.0
+            (param,) = job_config.query_parameters
+            row = param.values[0].struct_values
+            assert row["actual_exit_price"] == 51000.0
+            assert row["trade_id"] == "trade-123"
+            assert row["pnl_usd"] == 0.0
 
     def test_price_patch_full_pipeline(self):
         """Test full price patch pipeline execution."""
@@ -124,6 +128,7 @@ class TestPricePatchPipeline:
             patch("crypto_signals.config.get_settings") as mock_settings,
             patch("crypto_signals.pipelines.price_patch.bigquery.Client"),
             patch("crypto_signals.pipelines.price_patch.ExecutionEngine"),
+            patch("crypto_signals.pipelines.price_patch.get_patch_trade_aggregates"),
         ):
             mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
             mock_settings.return_value.ENVIRONMENT = "PROD"
@@ -138,14 +143,24 @@ class TestPricePatchPipeline:
                 ]
             )
 
-            # Mock patch to succeed for first (restored $100), fail for second
-            pipeline._patch_trade_price = MagicMock(
-                side_effect=[(True, 100.0), (False, 0.0)]
+            # Mock fetch to succeed for first, fail for second
+            pipeline._fetch_price_correction = MagicMock(
+                side_effect=[
+                    {"trade_id": "trade-1", "actual_exit_price": 100.0, "pnl_usd": 0.0},
+                    None,
+                ]
             )
+            pipeline.bq_client = MagicMock()
+            pipeline.aggregates = MagicMock()
 
             # Act
             patched_count = pipeline.run()
 
             # Assert
             assert patched_count == 1  # Only first succeeded
-            assert pipeline._patch_trade_price.call_count == 2
+            assert pipeline._fetch_price_correction.call_count == 2
+            pipeline.bq_client.query.assert_called_once()
+            # Only the repaired trade's LIVE aggregates are recomputed
+            pipeline.aggregates.refresh.assert_called_once_with(
+                [{"trade_id": "trade-1", "exit_order_id": "order-1"}]
+            )
@@ -86,6 +86,7 @@ def pipeline(mock_firestore, mock_market_provider):
         pipe.market_provider = mock_market_provider
         pipe.bq_client = mock_bq.return_value
         pipe.guardian = mock_guardian.return_value
+        pipe.guardian.generate_schema.return_value = []
 
         return pipe
 
@@ -100,9 +101,8 @@ def test_extract(pipeline, mock_firestore):
         "created_at": datetime.now(timezone.utc) - timedelta(days=8),
     }
 
-    mock_query = (
-        mock_firestore.collection.return_value.where.return_value.limit.return_value
-    )
+    ordered = mock_firestore.collection.return_value.where.return_value
+    mock_query = ordered.order_by.return_value.order_by.return_value.limit.return_value
     mock_query.stream.return_value = [mock_doc]
 
     raw_data = pipeline.extract()
@@ -371,8 +371,8 @@ def test_cleanup(pipeline, mock_firestore, sample_fact_rejected_signal):
 
 def test_run_calls_schema_guardian(pipeline, mock_firestore, sample_fact_rejected_signal):
     """Test that the pipeline's run method calls SchemaGuardian."""
-    # Mock the extract method to return some data
-    pipeline.extract = MagicMock(return_value=[{"signal_id": "sig_1"}])
+    # Mock extraction to return a single batch
+    pipeline.extract_batches = MagicMock(return_value=iter([[{"signal_id": "sig_1"}]]))
     transformed_data = [sample_fact_rejected_signal.model_dump(mode="json")]
     pipeline.transform = MagicMock(return_value=transformed_data)
     pipeline.cleanup = MagicMock()
@@ -388,9 +388,8 @@ def test_run_calls_schema_guardian(pipeline, mock_firestore, sample_fact_rejecte
 def test_extract_cutoff_date(pipeline, mock_firestore):
     """Test that the extract method uses a cutoff date of T-7 days."""
     # Setup mock to avoid crash
-    mock_query = (
-        mock_firestore.collection.return_value.where.return_value.limit.return_value
-    )
+    ordered = mock_firestore.collection.return_value.where.return_value
+    mock_query = ordered.order_by.return_value.order_by.return_value.limit.return_value
     mock_query.stream.return_value = []
 
     pipeline.extract()
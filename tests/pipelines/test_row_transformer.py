@@ -0,0 +1,164 @@
+"""Tests and throughput benchmark for the compiled row transformers."""
+
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from crypto_signals.domain.schemas import (
+    AssetClass,
+    ExitReason,
+    FactTheoreticalSignal,
+    OrderSide,
+    TradeExecution,
+)
+from crypto_signals.pipelines.row_transformer import (
+    RowTransformer,
+    encode_ndjson,
+    get_row_transformer,
+)
+from loguru import logger
+from pydantic import BaseModel, ValidationError, field_validator
+
+from tests.factories import FactTheoreticalSignalFactory
+
+BENCHMARK_ROWS = 2000
+
+
+def _trade_row(i):
+    entry_time = datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc) + timedelta(hours=i)
+    return {
+        "ds": entry_time.date(),
+        "trade_id": f"trade_{i}",
+        "account_id": "account_abc",
+        "asset_class": AssetClass.CRYPTO,
+        "symbol": "BTC/USD",
+        "side": OrderSide.BUY,
+        "qty": 1.0,
+        "entry_price": 50000.0 + i,
+        "exit_price": 52000.0 + i,
+        "entry_time": entry_time.isoformat(),
+        "exit_time": (entry_time + timedelta(days=1)).isoformat(),
+        "exit_reason": ExitReason.TP1,
+        "pnl_pct": 4.0,
+        "pnl_usd": 2000.0,
+        "fees_usd": 10.0,
+        "slippage_pct": 0.1,
+        "trade_duration": 86400,
+    }
+
+
+def _theoretical_rows(count):
+    return [
+        FactTheoreticalSignalFactory.build().model_dump(mode="python")
+        for _ in range(count)
+    ]
+
+
+class _Strict(BaseModel):
+    id: str
+    value: float
+
+    @field_validator("value")
+    @classmethod
+    def _not_sentinel(cls, v):
+        if v == -1:
+            raise TypeError("sentinel value")  # Not wrapped by pydantic
+        return v
+
+
+class TestRowTransformer:
+    """Batch validation keeps per-record error isolation."""
+
+    def test_validate_isolates_failures_by_index(self):
+        transformer = RowTransformer(_Strict)
+
+        results = transformer.validate(
+            [{"id": "a", "value": 1}, {"id": "b", "value": "x"}, {"id": "c", "value": 3}]
+        )
+
+        assert [r.id for r in results if not isinstance(r, Exception)] == ["a", "c"]
+        assert isinstance(results[1], ValidationError)
+
+    def test_validate_isolates_non_validation_errors(self):
+        results = RowTransformer(_Strict).validate(
+            [{"id": "a", "value": -1}, {"id": "b", "value": 2}]
+        )
+
+        assert isinstance(results[0], TypeError)
+        assert results[1].value == 2.0
+
+    def test_transform_matches_per_row_dump(self):
+        rows = [_trade_row(i) for i in range(5)]
+        expected = [TradeExecution(**r).model_dump(mode="json") for r in rows]
+
+        assert get_row_transformer(TradeExecution).transform(rows) == expected
+
+    def test_transformer_is_cached_per_model(self):
+        assert get_row_transformer(TradeExecution) is get_row_transformer(TradeExecution)
+        assert get_row_transformer(TradeExecution) is not get_row_transformer(
+            FactTheoreticalSignal
+        )
+
+
+def _rows_per_second(fn, rows, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return len(rows) / best, out
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "model, make_rows",
+    [
+        pytest.param(FactTheoreticalSignal, _theoretical_rows, id="theoretical_signal"),
+        pytest.param(
+            TradeExecution,
+            lambda n: [_trade_row(i) for i in range(n)],
+            id="trade_execution",
+        ),
+    ],
+)
+def test_benchmark_rows_per_second(model, make_rows):
+    """Validate -> dump -> NDJSON: compiled batch path vs the per-row path."""
+    rows = make_rows(BENCHMARK_ROWS)
+    transformer = get_row_transformer(model)
+
+    def per_row(batch):
+        dumped = [model.model_validate(r).model_dump(mode="json") for r in batch]
+        # What load_table_from_json does per row
+        return "\n".join(json.dumps(r, ensure_ascii=False) for r in dumped)
+
+    def compiled(batch):
+        return encode_ndjson(transformer.dump(transformer.validate(batch)))
+
+    before, expected = _rows_per_second(per_row, rows)
+    after, actual = _rows_per_second(compiled, rows)
+
+    logger.info(
+        f"{model.__name__}: per-row {before:,.0f} rows/s, "
+        f"compiled {after:,.0f} rows/s ({after / before:.2f}x)"
+    )
+    assert [json.loads(line) for line in actual.splitlines()] == [
+        json.loads(line) for line in expected.splitlines()
+    ]
+    # Loose bound for CI variance (typically 1.2-1.8x faster)
+    assert after > before * 0.9, f"compiled {after:,.0f} vs per-row {before:,.0f}"
+
+
+def test_date_and_datetime_columns_serialize_as_iso():
+    row = _trade_row(0)
+
+    (dumped,) = get_row_transformer(TradeExecution).transform([row])
+
+    assert dumped["ds"] == date(2024, 1, 15).isoformat()
+    assert dumped["entry_time"].startswith("2024-01-15T10:00:00")
+
+
+def test_encode_ndjson_nulls_non_finite_floats():
+    payload = encode_ndjson([{"a": 1.5}, {"a": float("nan")}])
+
+    assert payload.splitlines() == [b'{"a":1.5}', b'{"a":null}']
@@ -198,4 +198,5 @@ def test_merge_via_temp_table(pipeline, mock_bq):
     assert "UPDATE `test-project.crypto_analytics.dim_strategies` AS T" in query
     assert "INSERT INTO `test-project.crypto_analytics.dim_strategies`" in query
     assert "pattern_name" in query
-    assert "FROM `_stg_strategy_sync_0` AS S" in query
+    assert "FROM `test-project.crypto_analytics._stg_strategy_sync_" in query
+    mock_bq.load_table_from_file.assert_called_once()
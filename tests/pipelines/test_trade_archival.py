@@ -1,9 +1,14 @@
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
-from crypto_signals.pipelines.trade_archival import TradeArchivalPipeline
+from crypto_signals.engine.activity_ledger import ActivityLedger
+from crypto_signals.pipelines.trade_archival import (
+    TradeArchivalPipeline,
+    _window_reduce,
+)
 
 
 @pytest.fixture
@@ -42,6 +47,7 @@ def pipeline(mock_alpaca, mock_firestore, mock_market_provider):
     ):
         mock_get_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
         mock_get_settings.return_value.ENVIRONMENT = "PROD"  # Set default environment
+        mock_get_settings.return_value.ARCHIVAL_MAX_WORKERS = 4
 
         # Instantiate pipeline with mocked execution engine
         mock_exec = MagicMock()
@@ -49,6 +55,10 @@ def pipeline(mock_alpaca, mock_firestore, mock_market_provider):
             "taker_fee_pct": 0.25,
             "tier_name": "Tier 0",
         }
+        # No fee activities: fees fall back to estimation
+        mock_exec.get_activity_ledger.side_effect = lambda start, end: ActivityLedger(
+            start_date=start, end_date=end
+        )
         pipe = TradeArchivalPipeline(execution_engine=mock_exec)
         # Inject mocks again to be sure (since __init__ creates them)
         pipe.alpaca = mock_alpaca
@@ -111,6 +121,7 @@ def test_transform_mfe_long(pipeline, mock_market_provider, mock_alpaca):
     assert len(transformed) == 1
     trade = transformed[0]
     assert trade["max_favorable_excursion"] == 4900.0  # 55000 - 50100 (actual entry)
+    assert trade["max_adverse_excursion"] == 1100.0  # 50100 - 49000
     # Verify pnl_usd is correctly calculated and rounded
     # PnL = (exit_price - entry_price) * qty = (52000 - 50100) * 1.0 = 1900.0
     assert trade["pnl_usd"] == 1644.75
@@ -177,6 +188,7 @@ def test_transform_mfe_short(pipeline, mock_market_provider, mock_alpaca):
     assert len(transformed) == 1
     trade = transformed[0]
     assert trade["max_favorable_excursion"] == 5000.0  # 50000 - 45000
+    assert trade["max_adverse_excursion"] == 5000.0  # 55000 - 50000
     # Verify pnl_usd is correctly calculated for short position
     # Short PnL = (entry_price - exit_price) * qty = (50000 - 48000) * 1.0 = 2000.0
     assert trade["pnl_usd"] == 1755.0
@@ -522,3 +534,72 @@ def test_transform_exit_order_id_defaults_to_none(
     # CRITICAL: Verify exit_order_id defaults to None for legacy positions
     assert "exit_order_id" in trade
     assert trade["exit_order_id"] is None
+
+
+def test_transform_excursions_per_trade_window(
+    pipeline, mock_market_provider, mock_alpaca
+):
+    """Trades on one symbol get excursions from their own (overlapping) windows."""
+
+    def position(pid, entry_day, exit_day):
+        return {
+            "position_id": pid,
+            "symbol": "BTC/USD",
+            "asset_class": "CRYPTO",
+            # Midnight exits keep the window to [entry day, exit day]
+            "entry_time": datetime(2023, 1, entry_day, tzinfo=timezone.utc),
+            "exit_time": datetime(2023, 1, exit_day, tzinfo=timezone.utc),
+            "exit_fill_price": 52000.0,
+            "qty": 1.0,
+            "side": "buy",
+            "account_id": "acc_1",
+            "strategy_id": "strat_1",
+        }
+
+    def get_order(client_order_id):
+        if client_order_id == "broken":
+            raise RuntimeError("connection reset")
+        order = MagicMock()
+        order.filled_avg_price = "50000.0"
+        order.filled_qty = "1.0"
+        order.side = "buy"
+        order.id = f"uuid-{client_order_id}"
+        return order
+
+    mock_alpaca.get_order_by_client_id.side_effect = get_order
+    dates = pd.date_range("2023-01-01", periods=3, freq="D", tz="UTC")
+    mock_market_provider.get_daily_bars.return_value = pd.DataFrame(
+        {"high": [51000.0, 55000.0, 52000.0], "low": [49000.0, 50000.0, 47000.0]},
+        index=dates,
+    )
+
+    transformed = pipeline.transform(
+        [
+            position("day_1", 1, 1),
+            position("broken", 1, 3),
+            position("days_2_3", 2, 3),
+        ]
+    )
+
+    by_id = {t["trade_id"]: t for t in transformed}
+    # A failed order lookup drops only that position
+    assert set(by_id) == {"day_1", "days_2_3"}
+    assert by_id["day_1"]["max_favorable_excursion"] == 1000.0
+    assert by_id["day_1"]["max_adverse_excursion"] == 1000.0
+    assert by_id["days_2_3"]["max_favorable_excursion"] == 5000.0
+    assert by_id["days_2_3"]["max_adverse_excursion"] == 3000.0
+    mock_market_provider.get_daily_bars.assert_called_once()
+
+
+def test_window_reduce_handles_overlap_and_empty_windows():
+    """Window reductions match slicing, with NaN for empty windows."""
+    values = np.array([3.0, 1.0, np.nan, 5.0, 2.0])
+    starts = np.array([0, 1, 3, 4, 5])
+    ends = np.array([5, 3, 3, 5, 5])
+
+    result = _window_reduce(values, starts, ends, np.fmax)
+
+    assert result[:2].tolist() == [5.0, 1.0]
+    assert np.isnan(result[2])  # Empty window
+    assert result[3] == 2.0
+    assert np.isnan(result[4])  # Window after the last bar
@@ -11,6 +11,7 @@ from crypto_signals.domain.schemas import (
     TradeStatus,
 )
 from crypto_signals.repository.firestore import (
+    BatchWriteError,
     PositionRepository,
     RejectedSignalRepository,
     SignalRepository,
@@ -184,6 +185,71 @@ class TestSignalRepositoryGetById:
         mock_collection.document.assert_called_with("nonexistent-signal")
 
 
+class TestSignalRepositoryBatchOperations:
+    """Tests for SignalRepository.get_by_ids and update_signals_batch."""
+
+    def test_get_by_ids_single_round_trip(self, mock_settings, mock_firestore_client):
+        """Test get_by_ids de-duplicates IDs and skips missing documents."""
+        signal = SignalFactory.build(signal_id="sig-1")
+        found = MagicMock(exists=True, id="sig-1")
+        found.to_dict.return_value = signal.model_dump(mode="json")
+        missing = MagicMock(exists=False, id="sig-2")
+        mock_db = mock_firestore_client.return_value
+        mock_db.get_all.return_value = [found, missing]
+
+        repo = SignalRepository()
+        result = repo.get_by_ids(["sig-1", "sig-2", "sig-1"])
+
+        assert list(result) == ["sig-1"]
+        mock_db.get_all.assert_called_once()
+        assert len(mock_db.get_all.call_args[0][0]) == 2
+
+    def test_get_by_ids_empty(self, mock_settings, mock_firestore_client):
+        """Test get_by_ids short-circuits without IDs."""
+        repo = SignalRepository()
+
+        assert repo.get_by_ids([]) == {}
+        mock_firestore_client.return_value.get_all.assert_not_called()
+
+    def test_update_signals_batch_chunks_commits(
+        self, mock_settings, mock_firestore_client
+    ):
+        """Test update_signals_batch commits once per chunk."""
+        mock_db = mock_firestore_client.return_value
+        batch = mock_db.batch.return_value
+        updates = {f"sig-{i}": {"status": "ACTIVE"} for i in range(5)}
+
+        repo = SignalRepository()
+        with patch("crypto_signals.repository.firestore.BATCH_WRITE_SIZE", 2):
+            assert repo.update_signals_batch(updates) == set(updates)
+
+        assert batch.update.call_count == 5
+        assert batch.commit.call_count == 3
+
+    def test_update_signals_batch_failure_returns_no_ids(
+        self, mock_settings, mock_firestore_client
+    ):
+        """Test update_signals_batch reports commit failures."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.batch.return_value.commit.side_effect = Exception("Firestore error")
+
+        repo = SignalRepository()
+
+        assert repo.update_signals_batch({"sig-1": {"status": "ACTIVE"}}) == set()
+
+    def test_update_signals_batch_returns_committed_chunks(
+        self, mock_settings, mock_firestore_client
+    ):
+        """Test a failed later chunk keeps the IDs of chunks that committed."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.batch.return_value.commit.side_effect = [None, Exception("quota")]
+        updates = {f"sig-{i}": {"status": "ACTIVE"} for i in range(3)}
+
+        repo = SignalRepository()
+        with patch("crypto_signals.repository.firestore.BATCH_WRITE_SIZE", 2):
+            assert repo.update_signals_batch(updates) == {"sig-0", "sig-1"}
+
+
 # =============================================================================
 # SignalRepository.update_signal_atomic Tests
 # =============================================================================
@@ -421,6 +487,58 @@ class TestPositionRepositoryUpdate:
         assert "updated_at" in saved_data
 
 
+class TestPositionRepositoryUpdateBatch:
+    """Tests for PositionRepository.update_positions_batch method."""
+
+    def test_update_positions_batch(
+        self, mock_settings, mock_firestore_client, sample_position
+    ):
+        """Test batched position updates merge like update_position."""
+        mock_db = mock_firestore_client.return_value
+        batch = mock_db.batch.return_value
+
+        repo = PositionRepository()
+        repo.update_positions_batch([sample_position])
+
+        batch.set.assert_called_once()
+        call_args, call_kwargs = batch.set.call_args
+        assert call_kwargs.get("merge") is True
+        assert call_args[1]["ds"] == "2025-01-15"
+        assert "updated_at" in call_args[1]
+        batch.commit.assert_called_once()
+
+    def test_update_positions_batch_propagates_errors(
+        self, mock_settings, mock_firestore_client, sample_position
+    ):
+        """Test batch commit errors propagate to the caller."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.batch.return_value.commit.side_effect = Exception("Firestore error")
+
+        repo = PositionRepository()
+        with pytest.raises(Exception, match="Firestore error"):
+            repo.update_positions_batch([sample_position])
+
+    def test_update_positions_batch_reports_committed_chunks(
+        self, mock_settings, mock_firestore_client, sample_position
+    ):
+        """Test a failed later chunk reports the positions already written."""
+        mock_db = mock_firestore_client.return_value
+        mock_db.batch.return_value.commit.side_effect = [None, Exception("quota")]
+        positions = [
+            sample_position.model_copy(update={"position_id": f"pos-{i}"})
+            for i in range(3)
+        ]
+
+        repo = PositionRepository()
+        with (
+            patch("crypto_signals.repository.firestore.BATCH_WRITE_SIZE", 2),
+            pytest.raises(BatchWriteError) as exc_info,
+        ):
+            repo.update_positions_batch(positions)
+
+        assert exc_info.value.committed == {"pos-0", "pos-1"}
+
+
 class TestRepositoryRouting:
     """Tests for environment-based repository routing."""
 
@@ -0,0 +1,217 @@
+"""Unit tests for the simulated external services."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from alpaca.common.exceptions import APIError
+from alpaca.data.requests import CryptoBarsRequest
+from alpaca.data.timeframe import TimeFrame
+from alpaca.trading.enums import OrderClass, OrderSide, OrderStatus, TimeInForce
+from alpaca.trading.requests import (
+    MarketOrderRequest,
+    StopLossRequest,
+    TakeProfitRequest,
+)
+from crypto_signals.simulation.alpaca import (
+    FakeMarketDataClient,
+    FakeTradingClient,
+    SimulatedMarket,
+)
+from crypto_signals.simulation.firestore import FakeFirestoreClient, transactional
+from crypto_signals.simulation.service import ServiceProfile, SimulatedService
+from google.api_core.exceptions import NotFound
+from google.cloud import firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+
+def _service(name="test", **profile):
+    return SimulatedService(name, ServiceProfile(**profile))
+
+
+class TestSimulatedService:
+    """Call accounting and token-bucket throttling."""
+
+    def test_counts_calls_per_method(self):
+        service = _service()
+        service.call("get")
+        service.call("get")
+        service.call("post")
+
+        stats = service.stats()
+        assert stats[("test", "get")].calls == 2
+        assert stats[("test", "post")].calls == 1
+        assert service.total_calls() == 3
+
+    def test_burst_then_throttled(self):
+        # 6000/min = 100/s, burst of 2: the third call waits ~10ms
+        service = _service(requests_per_minute=6000, burst=2)
+        for _ in range(3):
+            service.call("get")
+
+        stats = service.stats()[("test", "get")]
+        assert stats.throttled == 1
+        assert stats.throttle_wait_seconds > 0
+
+    def test_unlimited_service_never_throttles(self):
+        service = _service()
+        for _ in range(50):
+            service.call("get")
+
+        assert service.stats()[("test", "get")].throttled == 0
+
+
+@pytest.fixture
+def db():
+    return FakeFirestoreClient(_service("firestore"))
+
+
+class TestFakeFirestore:
+    """Document and query semantics the repositories rely on."""
+
+    def test_set_get_round_trip_normalizes_datetimes(self, db):
+        naive = datetime(2026, 1, 2, 3, 4, 5)
+        db.collection("signals").document("a").set({"ts": naive, "n": 1})
+
+        data = db.collection("signals").document("a").get().to_dict()
+        assert data == {"ts": naive.replace(tzinfo=timezone.utc), "n": 1}
+
+    def test_unsupported_type_raises(self, db):
+        with pytest.raises(TypeError):
+            db.collection("signals").document("a").set({"day": date(2026, 1, 2)})
+
+    def test_update_missing_document_raises_not_found(self, db):
+        with pytest.raises(NotFound):
+            db.collection("signals").document("missing").update({"a": 1})
+
+    def test_merge_and_delete_field(self, db):
+        ref = db.collection("signals").document("a")
+        ref.set({"a": 1, "nested": {"x": 1, "y": 2}})
+        ref.set({"nested": {"y": firestore.DELETE_FIELD, "z": 3}}, merge=True)
+
+        assert ref.get().to_dict() == {"a": 1, "nested": {"x": 1, "z": 3}}
+
+    def test_where_order_limit(self, db):
+        signals = db.collection("signals")
+        for i, status in enumerate(["OPEN", "CLOSED", "OPEN", "OPEN"]):
+            signals.document(f"s{i}").set({"status": status, "rank": i})
+
+        docs = (
+            signals.where(filter=FieldFilter("status", "==", "OPEN"))
+            .order_by("rank", direction=firestore.Query.DESCENDING)
+            .limit(2)
+            .stream()
+        )
+
+        assert [d.id for d in docs] == ["s3", "s2"]
+
+    def test_start_after_pages_through_collection(self, db):
+        signals = db.collection("signals")
+        for i in range(5):
+            signals.document(f"s{i}").set({"rank": i})
+
+        query = signals.order_by("rank").limit(2)
+        first = list(query.stream())
+        second = list(query.start_after(first[-1]).stream())
+
+        assert [d.id for d in first] == ["s0", "s1"]
+        assert [d.id for d in second] == ["s2", "s3"]
+
+    def test_range_filter_does_not_match_other_types(self, db):
+        signals = db.collection("signals")
+        signals.document("a").set({"v": 5})
+        signals.document("b").set({"v": "text"})
+
+        assert [d.id for d in signals.where("v", ">", 1).stream()] == ["a"]
+
+    def test_count_aggregation(self, db):
+        signals = db.collection("signals")
+        for i in range(3):
+            signals.document(f"s{i}").set({"rank": i})
+
+        result = signals.where("rank", ">=", 1).count(alias="total").get()
+        assert result[0][0].value == 2
+
+    def test_transaction_commits_after_function(self, db):
+        ref = db.collection("locks").document("job")
+
+        @transactional
+        def acquire(transaction, reference):
+            assert not reference.get(transaction=transaction).exists
+            transaction.set(reference, {"owner": "me"})
+            # Buffered until the function returns
+            assert not reference.get().exists
+
+        acquire(db.transaction(), ref)
+
+        assert ref.get().to_dict() == {"owner": "me"}
+        assert ("firestore", "transaction.commit") in db.service.stats()
+
+
+@pytest.fixture
+def market():
+    return SimulatedMarket(history_days=120, seed=1)
+
+
+class TestFakeAlpaca:
+    """Market data and paper-broker behaviour."""
+
+    def test_synthetic_bars_are_deterministic_per_symbol(self, market):
+        again = SimulatedMarket(history_days=120, seed=1)
+
+        assert market.frame("BTC/USD").equals(again.frame("BTC/USD"))
+        assert not market.frame("BTC/USD").equals(market.frame("ETH/USD"))
+
+    def test_bars_response_is_symbol_indexed(self, market):
+        client = FakeMarketDataClient(market, _service("alpaca_data"))
+        request = CryptoBarsRequest(
+            symbol_or_symbols=["BTC/USD"], timeframe=TimeFrame.Day
+        )
+
+        df = client.get_crypto_bars(request).df
+
+        assert df.index.names == ["symbol", "timestamp"]
+        assert len(df.loc["BTC/USD"]) == 120
+
+    def test_bracket_order_fills_and_creates_legs(self, market):
+        broker = FakeTradingClient(market, _service("alpaca_trading"), ["BTC/USD"])
+        price = market.last_price("BTC/USD")
+
+        order = broker.submit_order(
+            MarketOrderRequest(
+                symbol="BTC/USD",
+                qty=1,
+                side=OrderSide.BUY,
+                time_in_force=TimeInForce.GTC,
+                order_class=OrderClass.BRACKET,
+                take_profit=TakeProfitRequest(limit_price=round(price * 1.1, 2)),
+                stop_loss=StopLossRequest(stop_price=round(price * 0.9, 2)),
+                client_order_id="sig-1",
+            )
+        )
+
+        assert order.status == OrderStatus.FILLED
+        assert [leg.status for leg in order.legs] == [OrderStatus.NEW, OrderStatus.HELD]
+        assert float(broker.get_open_position("BTCUSD").qty) == 1
+        assert broker.get_order_by_client_id("sig-1").id == order.id
+
+    def test_duplicate_client_order_id_rejected(self, market):
+        broker = FakeTradingClient(market, _service("alpaca_trading"), ["BTC/USD"])
+        request = MarketOrderRequest(
+            symbol="BTC/USD",
+            qty=1,
+            side=OrderSide.BUY,
+            time_in_force=TimeInForce.GTC,
+            client_order_id="sig-1",
+        )
+        broker.submit_order(request)
+
+        with pytest.raises(APIError) as exc:
+            broker.submit_order(request)
+        assert exc.value.status_code == 422
+
+    def test_missing_position_raises_404(self, market):
+        broker = FakeTradingClient(market, _service("alpaca_trading"))
+
+        with pytest.raises(APIError) as exc:
+            broker.get_open_position("ETH/USD")
+        assert exc.value.status_code == 404
@@ -0,0 +1,59 @@
+"""End-to-end test of the job simulator."""
+
+import signal
+
+import pytest
+from crypto_signals.config import get_settings
+from crypto_signals.simulation.runner import (
+    ALPACA_DATA,
+    FIRESTORE,
+    SimulationConfig,
+    run_simulation,
+    synthetic_symbols,
+)
+
+
+@pytest.fixture
+def report():
+    handler = signal.getsignal(signal.SIGTERM)
+    result = run_simulation(
+        SimulationConfig(
+            crypto_symbols=synthetic_symbols(6),
+            equity_symbols=synthetic_symbols(2, asset_class="equity"),
+            history_days=300,
+            latency=False,
+            rate_limits=False,
+        )
+    )
+    assert signal.getsignal(signal.SIGTERM) == handler
+    return result
+
+
+def test_full_job_runs_against_simulated_services(report):
+    assert report.exit_code == 0
+    assert report.symbols == 8
+    for phase in ("signal_generation", "signal_processing", "position_sync", "total"):
+        assert phase in report.phases
+    assert "initialize_services" in report.phases
+    assert report.wall_seconds >= report.phases["signal_generation"]
+
+
+def test_reports_api_calls_per_service(report):
+    by_service = report.calls_by_service()
+
+    # One bars request per symbol at least (plus startup / sync traffic)
+    calls = report.api_calls
+    bars = calls[(ALPACA_DATA, "get_crypto_bars")].calls
+    assert bars >= 6
+    assert calls[(ALPACA_DATA, "get_stock_bars")].calls >= 2
+    assert by_service[FIRESTORE] > 0
+    assert all(stats.throttled == 0 for stats in calls.values())
+
+    data = report.to_dict()
+    assert {"service", "method", "calls"} <= set(data["api_calls"][0])
+
+
+def test_settings_restored_after_run(report):
+    get_settings.cache_clear()
+
+    assert get_settings().GOOGLE_CLOUD_PROJECT == "test-project-id"
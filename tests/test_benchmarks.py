@@ -0,0 +1,125 @@
+"""Unit tests for the benchmark suite and its regression gate."""
+
+import random
+
+import pytest
+from crypto_signals.benchmarks import (
+    CASES,
+    SUITE_FULL,
+    SUITE_QUICK,
+    BenchmarkResult,
+    compare_results,
+    load_results,
+    mann_whitney_greater,
+    run_suite,
+    save_results,
+    synthetic_ohlcv,
+)
+
+
+def _result(name, samples, **params):
+    return BenchmarkResult(name, params or {"bars": 250}, list(samples))
+
+
+def _noisy(median, n=30, seed=0):
+    rng = random.Random(seed)
+    return [median * rng.uniform(0.95, 1.05) for _ in range(n)]
+
+
+class TestSyntheticData:
+    """Seeded OHLCV frames."""
+
+    def test_same_seed_same_frame(self):
+        first = synthetic_ohlcv(500, seed=7)
+
+        assert first.equals(synthetic_ohlcv(500, seed=7))
+        assert not first.equals(synthetic_ohlcv(500, seed=8))
+
+    def test_frame_is_valid_ohlcv(self):
+        df = synthetic_ohlcv(1_000)
+
+        assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+        assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+        assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+        assert (df["low"] > 0).all() and (df["volume"] > 0).all()
+        assert df.index.is_monotonic_increasing and str(df.index.tz) == "UTC"
+
+    def test_large_frames_fit_timestamp_range(self):
+        assert synthetic_ohlcv(200_000).index[-1].year < 2262
+
+
+class TestComparison:
+    """Significance test, effect threshold and budgets."""
+
+    def test_mann_whitney_direction(self):
+        fast, slow = _noisy(1.0, seed=1), _noisy(1.5, seed=2)
+
+        assert mann_whitney_greater(slow, fast) < 1e-6
+        assert mann_whitney_greater(fast, slow) > 0.99
+        assert mann_whitney_greater([1.0] * 5, [1.0] * 5) == 1.0
+
+    def test_flags_only_significant_and_large_slowdowns(self):
+        baseline = [
+            _result("a", _noisy(1.0, seed=1)),
+            _result("b", _noisy(1.0, seed=3)),
+            _result("c", _noisy(1.0, seed=5)),
+        ]
+        current = [
+            _result("a", _noisy(1.3, seed=2)),  # 30% slower
+            _result("b", _noisy(1.0, seed=4)),  # Noise
+            _result("c", _noisy(1.04, seed=6)),  # Slower, but below 10%
+        ]
+
+        report = compare_results(baseline, current, min_slowdown=0.10)
+
+        assert [c.key for c in report.regressions] == ["a[bars=250]"]
+        assert not report.passed
+
+    def test_budgets_and_missing_cases(self):
+        baseline = [_result("structural.find_pivots", [0.001] * 5)]
+        current = [
+            _result("harmonics.scan_all_patterns", [0.003] * 5),
+            _result("structural.zigzag_core", [0.004] * 5, bars=1_000_000),
+            _result("structural.zigzag_core", [0.5] * 5, bars=10_000),  # No budget
+        ]
+
+        report = compare_results(baseline, current)
+
+        assert report.missing == ["structural.find_pivots[bars=250]"]
+        assert [b.key for b in report.budget_violations] == [
+            "harmonics.scan_all_patterns[bars=250]"
+        ]
+        assert len(report.budgets) == 2
+        assert compare_results([], current, budget_scale=2.0).passed
+
+
+def test_suite_round_trip(tmp_path):
+    results = run_suite(
+        SUITE_QUICK,
+        only=["harmonics.scan_all_patterns[bars=250]", "generate_signals[symbols=1]"],
+        min_samples=2,
+        max_samples=2,
+        max_time=0,
+    )
+    path = tmp_path / "baseline.json"
+    save_results(results, str(path), SUITE_QUICK)
+
+    loaded = load_results(str(path))
+
+    assert [r.key for r in loaded] == [
+        "harmonics.scan_all_patterns[bars=250]",
+        "signal_generator.generate_signals[symbols=1]",
+    ]
+    assert [r.samples for r in loaded] == [r.samples for r in results]
+    assert all(len(r.samples) == 2 and min(r.samples) > 0 for r in loaded)
+    assert compare_results(loaded, results).regressions == []
+
+
+def test_full_suite_covers_sizes_and_unknown_suite_fails():
+    sizes = {case.name: case.sizes(SUITE_FULL) for case in CASES}
+
+    assert sizes["structural.zigzag_core"][-1] == 1_000_000
+    assert sizes["signal_generator.check_exits"] == [1, 10, 100, 1_000]
+    assert max(sizes["patterns.check_patterns"]) == 10_000
+    with pytest.raises(ValueError):
+        run_suite("nightly")
@@ -1,5 +1,7 @@
 """Unit tests for the main application entrypoint."""
 
+import json
+import threading
 from datetime import date, datetime, timedelta, timezone
 from unittest.mock import ANY, MagicMock, Mock, call, patch
 
@@ -31,6 +33,24 @@ def caplog(caplog):
     logger.remove(handler_id)
 
 
+# Startup job prerequisites enforced by the scheduler in main()
+PIPELINE_DEPENDENCIES = [
+    ("reconcile", "archive"),
+    ("archive", "backtest_archive"),
+    ("archive", "fee_patch"),
+    ("fee_patch", "price_patch"),
+]
+
+
+def _assert_runs_before(calls, edges):
+    """Assert each (before, after) pair ran in order when both ran."""
+    for before, after in edges:
+        if before in calls and after in calls:
+            assert calls.index(before) < calls.index(
+                after
+            ), f"{before} must run before {after}: {calls}"
+
+
 @pytest.fixture
 def main_test_setup(mock_main_dependencies):
     """Shared setup fixture for main execution tests."""
@@ -165,17 +185,20 @@ def test_main_execution_flow(mock_main_dependencies, main_test_setup):
     # Legacy update should NOT be called
     mock_repo_instance.update_signal.assert_not_called()
 
-    # Verify precise call order for Pipelines
+    # Pipelines run concurrently: verify each ran once and dependencies held
     actual_calls = [c[0] for c in pipeline_manager.mock_calls]
-    assert actual_calls == [
-        "rejected_archive",
-        "expired_archive",
-        "reconcile",
-        "archive",
-        "backtest_archive",
-        "fee_patch",
-        "price_patch",
-    ], f"Actual calls mismatch: {actual_calls}"
+    assert sorted(actual_calls) == sorted(
+        [
+            "rejected_archive",
+            "expired_archive",
+            "reconcile",
+            "archive",
+            "backtest_archive",
+            "fee_patch",
+            "price_patch",
+        ]
+    ), f"Actual calls mismatch: {actual_calls}"
+    _assert_runs_before(actual_calls, PIPELINE_DEPENDENCIES)
 
 
 def test_main_legacy_archival_disabled(mock_main_dependencies, main_test_setup):
@@ -186,16 +209,154 @@ def test_main_legacy_archival_disabled(mock_main_dependencies, main_test_setup):
     # Execute
     main(smoke_test=False)
 
-    # Verify explicit call order skips legacy
+    # Verify legacy pipelines are skipped and dependencies held
     pipeline_manager = main_test_setup["pipeline_manager"]
     actual_calls = [c[0] for c in pipeline_manager.mock_calls]
-    assert actual_calls == [
-        "reconcile",
-        "archive",
-        "backtest_archive",
-        "fee_patch",
-        "price_patch",
-    ], f"Actual calls mismatch: {actual_calls}"
+    assert sorted(actual_calls) == sorted(
+        ["reconcile", "archive", "backtest_archive", "fee_patch", "price_patch"]
+    ), f"Actual calls mismatch: {actual_calls}"
+    _assert_runs_before(actual_calls, PIPELINE_DEPENDENCIES)
+
+
+def test_main_reconciliation_failure_skips_dependent_jobs(
+    mock_main_dependencies, main_test_setup
+):
+    """Archival and patch jobs depend on reconciliation; signal generation does not."""
+    mock_main_dependencies[
+        "reconciler"
+    ].return_value.reconcile.side_effect = RuntimeError("Alpaca down")
+
+    main(smoke_test=False)
+
+    actual_calls = [c[0] for c in main_test_setup["pipeline_manager"].mock_calls]
+    assert "archive" not in actual_calls
+    assert "backtest_archive" not in actual_calls
+    assert "fee_patch" not in actual_calls
+    assert "price_patch" not in actual_calls
+    # Independent jobs still run
+    assert "rejected_archive" in actual_calls
+    assert "expired_archive" in actual_calls
+    main_test_setup["generator"].generate_signals.assert_called()
+
+
+def test_main_pipeline_init_failure_is_isolated(mock_main_dependencies, main_test_setup):
+    """Pipelines are built inside their jobs; a constructor error only fails that job."""
+    mock_main_dependencies["fee_patch"].side_effect = RuntimeError("BigQuery auth")
+
+    main(smoke_test=False)
+
+    actual_calls = [c[0] for c in main_test_setup["pipeline_manager"].mock_calls]
+    assert "fee_patch" not in actual_calls
+    assert "archive" in actual_calls
+    assert "price_patch" in actual_calls
+    main_test_setup["generator"].generate_signals.assert_called()
+
+
+def test_main_pipeline_failure_skips_dependent_jobs(
+    mock_main_dependencies, main_test_setup
+):
+    """A failed job gates its dependents; ordering-only successors still run."""
+    mock_main_dependencies["trade_archival"].return_value.run.side_effect = RuntimeError(
+        "BigQuery down"
+    )
+    mock_main_dependencies[
+        "rejected_archival"
+    ].return_value.run.side_effect = RuntimeError("BigQuery down")
+
+    main(smoke_test=False)
+
+    actual_calls = [c[0] for c in main_test_setup["pipeline_manager"].mock_calls]
+    assert "backtest_archive" not in actual_calls
+    # Fee reconciliation patches older rows: ordered after archival, not gated
+    assert "fee_patch" in actual_calls
+    assert "price_patch" in actual_calls
+    _assert_runs_before(actual_calls, PIPELINE_DEPENDENCIES)
+    # Cleanup must not delete data the archival failed to copy
+    main_test_setup["repo"].cleanup_expired.assert_not_called()
+
+
+def test_main_skips_position_writes_while_timed_out_job_runs(
+    mock_main_dependencies, main_test_setup
+):
+    """A timed-out archival may still delete positions: no Phase 3 or sync writes."""
+    release = threading.Event()
+    archival_run = mock_main_dependencies["trade_archival"].return_value.run
+    archival_run.side_effect = lambda: release.wait(5)
+    mock_settings = mock_main_dependencies["settings"].return_value
+    mock_settings.JOB_TIMEOUT_SECONDS = 0.05
+    mock_settings.ENABLE_EXECUTION = True
+
+    try:
+        main(smoke_test=False)
+    finally:
+        release.set()
+
+    main_test_setup["generator"].generate_signals.assert_called()
+    main_test_setup["repo"].save.assert_not_called()
+    mock_main_dependencies[
+        "position_repo"
+    ].return_value.get_open_positions.assert_not_called()
+
+
+def test_main_releases_job_lock(mock_main_dependencies, main_test_setup):
+    """The job lock is released when the run ends, not at interpreter exit."""
+    main(smoke_test=False)
+
+    mock_main_dependencies["job_lock"].return_value.release_lock.assert_called_once_with(
+        "signal_generator_cron"
+    )
+
+
+def test_main_exports_run_trace(mock_main_dependencies, main_test_setup, tmp_path):
+    """TRACE_EXPORT_DIR writes one Chrome trace with the run's span tree."""
+    settings = mock_main_dependencies["settings"].return_value
+    settings.TRACE_EXPORT_DIR = str(tmp_path)
+    settings.TRACE_EXPORT_FORMAT = "chrome"
+
+    main(smoke_test=False)
+
+    (trace_file,) = tmp_path.glob("signal_generator_*.chrome.json")
+    events = json.loads(trace_file.read_text())["traceEvents"]
+    names = {e["name"] for e in events if e["ph"] == "X"}
+    assert {
+        "signal_generator",
+        "initialize_services",
+        "phase.signal_generation",
+        "phase.signal_processing",
+        "scheduler.wait_all",
+    } <= names
+    symbols = [e for e in events if e["name"] == "symbol"]
+    assert {e["args"]["symbol"] for e in symbols} == {"BTC/USD", "ETH/USD", "XRP/USD"}
+
+
+def test_main_profiles_run_per_phase(mock_main_dependencies, main_test_setup, tmp_path):
+    """PROFILE_DIR samples the whole run and writes phase-attributed stacks."""
+    settings = mock_main_dependencies["settings"].return_value
+    settings.PROFILE_DIR = str(tmp_path)
+    settings.PROFILE_INTERVAL_MS = 1
+    settings.PROFILE_FORMAT = "collapsed"
+
+    main(smoke_test=False)
+
+    (profile,) = tmp_path.glob("signal_generator_*.collapsed.txt")
+    phases = {line.split(";", 1)[0] for line in profile.read_text().splitlines()}
+    assert "phase:startup" in phases
+
+
+def test_lazy_import_defers_module_load():
+    """_LazyImport resolves its target on first call only."""
+    from crypto_signals.main import _LazyImport
+
+    with patch("crypto_signals.main.importlib.import_module") as mock_import:
+        proxy = _LazyImport("some.module", "Pipeline")
+        mock_import.assert_not_called()
+
+        proxy(1, key="v")
+        proxy()
+
+    mock_import.assert_called_once_with("some.module")
+    pipeline_cls = mock_import.return_value.Pipeline
+    assert pipeline_cls.call_args_list == [call(1, key="v"), call()]
 
 
 def test_send_signal_captures_thread_id(mock_main_dependencies):
@@ -1031,10 +1192,10 @@ def test_intra_run_active_transition(mock_main_dependencies):
         trade_type=TradeType.EXECUTED,
         status=TradeStatus.OPEN,
     )
-    execution_engine.execute_signal.return_value = executed_position
+    execution_engine.execute_signals.return_value = {"new_signal_id": executed_position}
 
-    # Mock Alpaca return None (no existing position) for pre-execution check
-    execution_engine.alpaca.get_open_position.return_value = None
+    # No existing Alpaca positions for the pre-execution check
+    execution_engine.alpaca.get_all_positions.return_value = []
 
     # 3. Execute Main
     main(smoke_test=False)
@@ -0,0 +1,205 @@
+"""Unit tests for the metrics registry and its OpenMetrics export."""
+
+import random
+import threading
+import urllib.request
+
+import pytest
+from crypto_signals.metrics import (
+    API_CALL_DURATION,
+    API_CALLS,
+    OPENMETRICS_CONTENT_TYPE,
+    OPERATION_DURATION,
+    RATE_LIMITER_WAIT,
+    MetricsRegistry,
+    get_metrics_registry,
+    start_metrics_server,
+    track_api_call,
+)
+from crypto_signals.observability import MetricsCollector, log_execution_time, timed
+from crypto_signals.utils.rate_limit import RateLimiter
+from loguru import logger
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+@pytest.fixture
+def global_registry():
+    """The process-wide registry, emptied around the test."""
+    registry = get_metrics_registry()
+    registry.reset()
+    yield registry
+    registry.reset()
+
+
+def _series(registry, name, **labels):
+    family = next(f for f in registry.collect() if f.name == name)
+    return family.labels(**labels)
+
+
+class TestSeries:
+    """Counters, gauges and histograms."""
+
+    def test_counter_merges_per_thread_shards(self, registry):
+        counter = registry.counter("events", "Events", ["kind"]).labels(kind="a")
+
+        def worker():
+            for _ in range(1000):
+                counter.inc()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert counter.value == 8000
+
+    def test_histogram_quantiles_within_bucket_error(self, registry):
+        histogram = registry.histogram("latency_seconds").labels()
+        values = [random.uniform(0.001, 2.0) for _ in range(5000)]
+        for v in values:
+            histogram.observe(v)
+
+        snap = histogram.snapshot()
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * len(ordered)) - 1]
+            assert snap.quantile(q) == pytest.approx(exact, rel=0.05)
+        assert snap.count == 5000
+        assert snap.quantile(1.0) == max(values)
+
+    def test_family_rejects_mismatched_labels(self, registry):
+        family = registry.gauge("queue_depth", "Depth", ["queue"])
+
+        with pytest.raises(ValueError):
+            family.labels(name="x")
+        with pytest.raises(ValueError):
+            registry.counter("queue_depth")
+
+
+class TestExport:
+    """OpenMetrics text, file and HTTP endpoint."""
+
+    def test_render_openmetrics(self, registry):
+        registry.counter("orders", "Orders", ["side"]).labels(side='b"uy').inc(2)
+        registry.gauge("phase_seconds", "", ["phase"]).labels(phase="sync").set(1.5)
+        registry.histogram("call_seconds", "Calls").labels().observe(0.25)
+
+        text = registry.render_openmetrics()
+
+        assert (
+            '# TYPE orders counter\n# HELP orders Orders\norders_total{side="b\\"uy"} 2.0'
+            in text
+        )
+        assert 'phase_seconds{phase="sync"} 1.5' in text
+        assert "# TYPE call_seconds summary" in text
+        assert 'call_seconds{quantile="0.99"} 0.25' in text
+        assert "call_seconds_count 1" in text
+        assert text.endswith("# EOF\n")
+
+    def test_write_openmetrics_creates_directory(self, registry, tmp_path):
+        registry.counter("runs").labels().inc()
+        path = tmp_path / "nested" / "metrics.prom"
+
+        registry.write_openmetrics(str(path))
+
+        assert "runs_total 1.0" in path.read_text()
+
+    def test_log_snapshot_emits_metric_series(self, registry):
+        registry.histogram("h", "", ["symbol"]).labels(symbol="BTC/USD").observe(0.5)
+        registry.histogram("empty").labels()
+        records = []
+        handler_id = logger.add(lambda m: records.append(m.record), level="INFO")
+        try:
+            assert registry.log_snapshot() == 1
+        finally:
+            logger.remove(handler_id)
+
+        (row,) = [r["extra"]["extra"] for r in records]
+        assert row["metric_type"] == "metric_series"
+        assert row["labels"] == {"symbol": "BTC/USD"}
+        assert row["p50"] == row["p99"] == 0.5
+
+    def test_http_endpoint_serves_metrics(self, registry):
+        registry.counter("scrapes").labels().inc()
+        server = start_metrics_server(0, host="127.0.0.1", registry=registry)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert content_type == OPENMETRICS_CONTENT_TYPE
+        assert "scrapes_total 1.0" in body
+
+
+class TestAutomaticFeeds:
+    """Timing helpers and the rate limiter record into the global registry."""
+
+    def test_log_execution_time_and_timed(self, global_registry):
+        with log_execution_time(logger, "load"):
+            pass
+
+        @timed("fails")
+        def boom():
+            raise RuntimeError("x")
+
+        with pytest.raises(RuntimeError):
+            boom()
+
+        load = _series(
+            global_registry, OPERATION_DURATION, operation="load", outcome="success"
+        )
+        failed = _series(
+            global_registry, OPERATION_DURATION, operation="fails", outcome="failure"
+        )
+        assert load.snapshot().count == 1
+        assert failed.snapshot().count == 1
+
+    def test_metrics_collector_feeds_histogram(self, global_registry):
+        MetricsCollector().record_success("signal_generation", 0.2)
+
+        series = _series(
+            global_registry,
+            OPERATION_DURATION,
+            operation="signal_generation",
+            outcome="success",
+        )
+        assert series.snapshot().total == pytest.approx(0.2)
+
+    def test_track_api_call_counts_outcomes(self, global_registry):
+        with track_api_call("alpaca", "get_order"):
+            pass
+        with pytest.raises(ValueError), track_api_call("alpaca", "get_order"):
+            raise ValueError("boom")
+
+        latency = _series(
+            global_registry, API_CALL_DURATION, service="alpaca", endpoint="get_order"
+        )
+        errors = _series(
+            global_registry,
+            API_CALLS,
+            service="alpaca",
+            endpoint="get_order",
+            outcome="error",
+        )
+        assert latency.snapshot().count == 2
+        assert errors.value == 1
+
+    def test_rate_limiter_records_waits(self, global_registry):
+        limiter = RateLimiter(requests_per_minute=60 * 100, name="test")  # 10ms
+
+        limiter.acquire()
+        limiter.acquire()
+
+        snap = _series(global_registry, RATE_LIMITER_WAIT, limiter="test").snapshot()
+        assert snap.count == 2
+        assert snap.min == 0.0
+        assert snap.max > 0.0
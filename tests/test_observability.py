@@ -2,10 +2,15 @@
 
 import importlib.util
 import sys
+import threading
+import time
+from contextlib import contextmanager
 from importlib import reload
 from unittest.mock import MagicMock, patch
 
 import crypto_signals.observability as obs
+import pytest
+from loguru import logger
 
 # [Strategy Setup] Detect if the real library is installed to choose the correct patch method
 HAS_GCP_LIBRARY = importlib.util.find_spec("google.cloud.logging") is not None
@@ -279,6 +284,135 @@ class TestSerializationHelpers:
         assert result["timestamp"] == "2024-12-23T19:00:00"
 
 
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def gcp_logger():
+    """Mock GCP Logger recording the payloads of each committed batch."""
+    mock = MagicMock()
+    mock.committed = []
+
+    def new_batch():
+        batch = MagicMock()
+        entries = []
+        batch.log_struct.side_effect = lambda payload, severity: entries.append(
+            (payload, severity)
+        )
+        batch.commit.side_effect = lambda: mock.committed.append(entries)
+        return batch
+
+    mock.batch.side_effect = new_batch
+    return mock
+
+
+@contextmanager
+def _attached(sink):
+    """Attach a sink to loguru for the duration of a test."""
+    handler_id = logger.add(sink, format="{message}", level="DEBUG")
+    try:
+        yield
+    finally:
+        logger.remove(handler_id)
+        sink.close()
+
+
+class TestBufferedGcpSink:
+    """The GCP sink enqueues on the caller and writes batches in the background."""
+
+    def test_logging_does_not_call_the_api_inline(self, gcp_logger):
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=100, flush_interval=60)
+
+        with _attached(sink):
+            logger.bind(symbol="BTC/USD").info("queued")
+            gcp_logger.batch.assert_not_called()
+
+            assert sink.flush() == 1
+
+        ((payload, severity),) = gcp_logger.committed[0]
+        assert payload["message"] == "queued"
+        assert payload["symbol"] == "BTC/USD"
+        assert severity == "INFO"
+
+    def test_flushes_when_batch_size_is_reached(self, gcp_logger):
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=3, flush_interval=60)
+
+        with _attached(sink):
+            for i in range(3):
+                logger.debug(f"msg {i}")
+
+            assert _wait_for(lambda: sink.sent == 3)
+        assert [len(batch) for batch in gcp_logger.committed] == [3]
+
+    def test_flushes_on_interval(self, gcp_logger):
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=100, flush_interval=0.05)
+
+        with _attached(sink):
+            logger.warning("slow trickle")
+
+            assert _wait_for(lambda: sink.sent == 1)
+
+    def test_full_buffer_drops_oldest(self, gcp_logger):
+        sink = obs.BufferedGcpSink(
+            gcp_logger, capacity=3, batch_size=100, flush_interval=60
+        )
+
+        with _attached(sink):
+            for i in range(5):
+                logger.info(f"msg {i}")
+            sink.flush()
+
+        shipped = [p["message"] for batch in gcp_logger.committed for p, _ in batch]
+        assert shipped == ["msg 2", "msg 3", "msg 4"]
+        assert sink.stats()["dropped"] == 2
+
+    def test_failed_write_is_counted_not_raised(self, gcp_logger):
+        gcp_logger.batch.side_effect = RuntimeError("unavailable")
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=100, flush_interval=60)
+
+        with _attached(sink):
+            logger.error("lost")
+            assert sink.flush() == 0
+
+        assert sink.stats()["failed"] == 1
+
+    def test_close_drains_remaining_entries(self, gcp_logger):
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=2, flush_interval=60)
+        handler_id = logger.add(sink, format="{message}", level="DEBUG")
+        for i in range(5):
+            logger.info(f"msg {i}")
+        logger.remove(handler_id)
+
+        sink.close()
+
+        stats = sink.stats()
+        assert stats["sent"] == 5
+        assert stats["buffered"] == 0
+
+    def test_flush_reenters_locks_held_by_interrupted_caller(self, gcp_logger):
+        """A SIGTERM flush on a thread already inside the sink must not deadlock."""
+        sink = obs.BufferedGcpSink(gcp_logger, batch_size=100, flush_interval=60)
+        written = []
+
+        def interrupted_call():
+            # What the handler sees when SIGTERM lands mid-__call__ / mid-flush
+            with sink._lock, sink._flush_lock:
+                written.append(sink.flush(timeout=1))
+
+        with _attached(sink):
+            logger.info("in flight")
+            worker = threading.Thread(target=interrupted_call, daemon=True)
+            worker.start()
+            worker.join(timeout=5)
+
+        assert not worker.is_alive()
+        assert written == [1]
+
+
 class TestConfigIntegration:
     """Test configuration integration for GCP logging."""
 
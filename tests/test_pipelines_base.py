@@ -1,11 +1,13 @@
 """Unit tests for the BigQueryPipelineBase class."""
 
+import json
 from datetime import date
 from typing import Any, List
 from unittest.mock import patch
 
 import pytest
 from crypto_signals.pipelines.base import BigQueryPipelineBase
+from google.cloud import bigquery
 from pydantic import BaseModel, Field
 
 from tests.utils.sql_assertion import assert_merge_query_structure, assert_sql_equal
@@ -107,8 +109,8 @@ def test_get_merge_sql_constructs_correct_sql(pipeline):
     expected_sql = f"""
         MERGE `{pipeline.fact_table_id}` AS T
         USING `{source_table}` AS S
-        ON T.{pipeline.id_column} = S.{pipeline.id_column}
-        AND T.{pipeline.partition_column} = S.{pipeline.partition_column}
+        ON T.{pipeline.partition_column} = S.{pipeline.partition_column}
+        AND T.{pipeline.id_column} = S.{pipeline.id_column}
         WHEN MATCHED THEN
             UPDATE SET {update_clause}
         WHEN NOT MATCHED THEN
@@ -118,26 +120,126 @@ def test_get_merge_sql_constructs_correct_sql(pipeline):
     assert_sql_equal(query, expected_sql)
 
 
-def test_merge_via_temp_table_executes_queries(pipeline, mock_bq_client):
-    """Test that _merge_via_temp_table runs the correct SQL script."""
-    data = [{"id": "1", "ds": "2024-01-01", "value": 100}]
-    pipeline._merge_via_temp_table(data)
+def test_merge_via_temp_table_loads_then_merges(pipeline, mock_bq_client):
+    """Rows go through one load job into a staging table, then one MERGE."""
+    pipeline.guardian.generate_schema.return_value = [
+        bigquery.SchemaField("id", "STRING"),
+        bigquery.SchemaField("ds", "DATE"),
+        bigquery.SchemaField("value", "INTEGER"),
+    ]
+    data = [{"id": str(i), "ds": "2024-01-01", "value": i} for i in range(3)]
 
-    call_args = mock_bq_client.query.call_args
-    assert call_args is not None
-    called_sql = call_args[0][0]
+    pipeline._merge_via_temp_table(data)
 
-    assert "CREATE TEMP TABLE" in called_sql
+    created = mock_bq_client.create_table.call_args[0][0]
+    staging_id = f"{created.project}.{created.dataset_id}.{created.table_id}"
+    assert created.table_id.startswith("_stg_test_pipeline_")
+    assert created.expires is not None
+
+    mock_bq_client.load_table_from_file.assert_called_once()
+    payload, destination = mock_bq_client.load_table_from_file.call_args[0]
+    job_config = mock_bq_client.load_table_from_file.call_args[1]["job_config"]
+    rows = [json.loads(line) for line in payload.getvalue().splitlines()]
+    assert rows == data
+    assert job_config.source_format == bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
+    assert destination == staging_id
+    assert [f.name for f in job_config.schema] == ["id", "ds", "value"]
+
+    mock_bq_client.query.assert_called_once()
+    called_sql = mock_bq_client.query.call_args[0][0]
     assert "MERGE" in called_sql
-    assert "_stg_test_pipeline_0" in called_sql
+    assert f"USING `{staging_id}` AS S" in called_sql
+    mock_bq_client.delete_table.assert_called_once_with(staging_id, not_found_ok=True)
 
-    # Check for structural SQL assertion as requested
-    assert (
-        "CREATE TEMP TABLE" in called_sql
-    ), f"Expected CREATE TEMP TABLE in SQL, got: {called_sql[:200]}"
+
+def test_get_merge_sql_prunes_partitions_and_updates_clustering_fields(pipeline):
+    """Batch range bounds the target scan; mutable clustering fields are updated."""
+    pipeline.clustering_fields = ["value"]
+
+    query = pipeline._get_merge_sql("src", ("DATE", "2024-01-01", "2024-01-03"))
+
+    expected_sql = f"""
+        MERGE `{pipeline.fact_table_id}` AS T
+        USING `src` AS S
+        ON T.ds BETWEEN @partition_min AND @partition_max
+        AND T.ds = S.ds
+        AND T.id = S.id
+        WHEN MATCHED THEN
+            UPDATE SET T.value = S.value
+        WHEN NOT MATCHED THEN
+            INSERT (ds, id, value)
+            VALUES (S.ds, S.id, S.value)
+    """
+    # A changed clustering value (e.g. signal status) must not INSERT a duplicate
+    assert_sql_equal(query, expected_sql)
+
+
+def test_merge_binds_batch_partition_range_and_records_bytes(pipeline, mock_bq_client):
+    """MERGE is pruned to the batch's min/max partition and bytes are tallied."""
+    pipeline.guardian.generate_schema.return_value = [
+        bigquery.SchemaField("id", "STRING"),
+        bigquery.SchemaField("ds", "DATE"),
+        bigquery.SchemaField("value", "INTEGER"),
+    ]
+    mock_bq_client.query.return_value.total_bytes_processed = 2048
+    data = [
+        {"id": "1", "ds": "2024-01-05", "value": 1},
+        {"id": "2", "ds": "2024-01-02", "value": 2},
+        {"id": "3", "ds": "2024-01-09", "value": 3},
+    ]
+
+    pipeline._merge_via_temp_table(data)
+    pipeline._merge_via_temp_table(data)
+
+    job_config = mock_bq_client.query.call_args[1]["job_config"]
+    params = {p.name: (p.type_, p.value) for p in job_config.query_parameters}
+    assert params == {
+        "partition_min": ("DATE", date(2024, 1, 2)),
+        "partition_max": ("DATE", date(2024, 1, 9)),
+    }
     assert (
-        "MERGE" in called_sql
-    ), f"Expected MERGE statement in SQL, got: {called_sql[:200]}"
+        "BETWEEN @partition_min AND @partition_max"
+        in (mock_bq_client.query.call_args[0][0])
+    )
+    assert pipeline.merge_bytes_processed == 4096
+
+
+def test_merge_without_partition_values_scans_unpruned(pipeline, mock_bq_client):
+    """Rows missing the partition value fall back to an unpruned MERGE."""
+    pipeline.guardian.generate_schema.return_value = [
+        bigquery.SchemaField("id", "STRING"),
+        bigquery.SchemaField("ds", "DATE"),
+    ]
+
+    pipeline._merge_via_temp_table([{"id": "1", "ds": None}])
+
+    assert mock_bq_client.query.call_args[1]["job_config"].query_parameters == []
+    assert "BETWEEN" not in mock_bq_client.query.call_args[0][0]
+
+
+def test_merge_via_temp_table_drops_staging_on_failure(pipeline, mock_bq_client):
+    """The staging table is deleted even when the MERGE fails."""
+    pipeline.guardian.generate_schema.return_value = []
+    mock_bq_client.query.return_value.result.side_effect = RuntimeError("merge failed")
+
+    with pytest.raises(RuntimeError, match="merge failed"):
+        pipeline._merge_via_temp_table([{"id": "1", "ds": "2024-01-01", "value": 1}])
+
+    mock_bq_client.delete_table.assert_called_once()
+
+
+def test_encode_rows_serializes_json_columns():
+    """Dict values for STRING columns become JSON text; unknown keys are dropped."""
+    schema = [
+        bigquery.SchemaField("id", "STRING"),
+        bigquery.SchemaField("metadata", "STRING"),
+        bigquery.SchemaField("tags", "STRING", mode="REPEATED"),
+    ]
+    rows = BigQueryPipelineBase._encode_rows(
+        [{"id": "1", "metadata": {"a": 1}, "tags": ["x"], "extra": 5}], schema
+    )
+
+    assert rows == [{"id": "1", "metadata": '{"a": 1}', "tags": ["x"]}]
 
 
 def test_run_orchestrates_flow(pipeline):
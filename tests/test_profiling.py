@@ -0,0 +1,93 @@
+"""Unit tests for the sampling profiler."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from crypto_signals import profiling
+from crypto_signals.profiling import (
+    PROFILE_FORMAT_BOTH,
+    SamplingProfiler,
+    set_profile_phase,
+    start_profiler,
+    stop_profiler,
+)
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(200))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+    thread.start()
+    yield
+    stop.set()
+    thread.join()
+
+
+class TestSamplingProfiler:
+    """Stack aggregation and per-phase attribution."""
+
+    def test_samples_are_attributed_to_phase_and_thread(self, busy_thread):
+        profiler = SamplingProfiler()
+
+        profiler.phase = "signal_generation"
+        for _ in range(5):
+            profiler.sample(skip_thread_id=threading.get_ident())
+
+        collapsed = profiler.to_collapsed()
+        busy = [line for line in collapsed.splitlines() if "thread:busy" in line]
+        assert busy
+        assert all(line.startswith("phase:signal_generation;") for line in busy)
+        assert any("_busy_loop (test_profiling.py:" in line for line in busy)
+        assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) == 5
+        assert profiler.phase_totals()["signal_generation"] >= 5
+
+    def test_idle_pool_workers_are_skipped(self):
+        profiler = SamplingProfiler()
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="idle") as pool:
+            pool.submit(lambda: None).result()
+            time.sleep(0.05)
+            profiler.sample(skip_thread_id=threading.get_ident())
+
+        assert "thread:idle" not in profiler.to_collapsed()
+
+    def test_speedscope_has_one_profile_per_phase(self, busy_thread):
+        profiler = SamplingProfiler(interval=0.01)
+        for phase in ("startup", "signal_generation", "signal_generation"):
+            profiler.phase = phase
+            profiler.sample()
+
+        doc = profiler.to_speedscope("signal_generator")
+
+        assert doc["$schema"] == profiling.SPEEDSCOPE_SCHEMA
+        assert [p["name"] for p in doc["profiles"]] == ["signal_generation", "startup"]
+        frames = doc["shared"]["frames"]
+        for profile in doc["profiles"]:
+            assert len(profile["samples"]) == len(profile["weights"])
+            assert profile["endValue"] == pytest.approx(sum(profile["weights"]))
+            assert all(0 <= i < len(frames) for s in profile["samples"] for i in s)
+
+
+def test_profiler_lifecycle_writes_both_formats(busy_thread, tmp_path):
+    set_profile_phase("ignored")  # No active profiler: no-op
+
+    start_profiler(interval=0.002)
+    set_profile_phase("signal_generation")
+    time.sleep(0.1)
+    paths = stop_profiler(str(tmp_path), PROFILE_FORMAT_BOTH, "signal_generator")
+
+    assert sorted(p.rsplit(".", 2)[-2] for p in paths) == ["collapsed", "speedscope"]
+    collapsed = next(p for p in paths if p.endswith(".collapsed.txt"))
+    assert "phase:signal_generation;thread:busy;" in open(collapsed).read()
+    speedscope = next(p for p in paths if p.endswith(".speedscope.json"))
+    assert json.loads(open(speedscope).read())["profiles"]
+    assert "thread:sampling-profiler" not in open(collapsed).read()
+    assert stop_profiler(str(tmp_path), PROFILE_FORMAT_BOTH, "again") == []
@@ -0,0 +1,153 @@
+"""Unit tests for run tracing and its Chrome / OTLP exports."""
+
+import json
+
+import pytest
+from crypto_signals.engine.job_scheduler import JobScheduler
+from crypto_signals.metrics import track_api_call
+from crypto_signals.observability import log_execution_time
+from crypto_signals.tracing import (
+    TRACE_FORMAT_CHROME,
+    TracedThreadPoolExecutor,
+    Tracer,
+    annotate_span,
+    export_trace,
+    get_tracer,
+    start_trace,
+    traced,
+)
+from loguru import logger
+
+
+@pytest.fixture
+def tracer():
+    """The process-wide tracer, stopped after the test."""
+    yield get_tracer()
+    get_tracer().stop()
+
+
+def _by_name(spans):
+    return {s.name: s for s in spans}
+
+
+class TestSpans:
+    """Span nesting and context propagation."""
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer()
+
+        with tracer.span("idle") as span:
+            span.set_attribute("k", "v")
+
+        assert tracer.spans() == []
+
+    def test_nested_spans_form_a_tree(self, tracer):
+        root = start_trace("run")
+        with tracer.span("phase"):
+            with tracer.span("step", symbol="BTC/USD"):
+                pass
+        root.end()
+
+        spans = _by_name(tracer.spans())
+        assert spans["run"].parent_id is None
+        assert spans["phase"].parent_id == spans["run"].span_id
+        assert spans["step"].parent_id == spans["phase"].span_id
+        assert spans["step"].attributes == {"symbol": "BTC/USD"}
+        assert {s.trace_id for s in spans.values()} == {tracer.trace_id}
+
+    def test_context_propagates_into_executor_workers(self, tracer):
+        @traced("worker")
+        def work(symbol):
+            annotate_span(symbol=symbol)
+            with track_api_call("alpaca", "get_bars"):
+                pass
+
+        root = start_trace("run")
+        with tracer.span("phase"), TracedThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(work, ["BTC/USD", "ETH/USD"]))
+        root.end()
+
+        spans = tracer.spans()
+        phase = _by_name(spans)["phase"]
+        workers = [s for s in spans if s.name == "worker"]
+        calls = [s for s in spans if s.name == "alpaca.get_bars"]
+        assert {w.parent_id for w in workers} == {phase.span_id}
+        assert sorted(w.attributes["symbol"] for w in workers) == ["BTC/USD", "ETH/USD"]
+        assert {c.parent_id for c in calls} == {w.span_id for w in workers}
+        assert all(c.kind == "client" for c in calls)
+
+    def test_scheduler_jobs_are_children_of_the_caller(self, tracer):
+        root = start_trace("run")
+        scheduler = JobScheduler(max_workers=2)
+        scheduler.add("reconcile", lambda: None)
+        scheduler.start()
+        scheduler.wait_all()
+        root.end()
+
+        job = _by_name(tracer.spans())["job.reconcile"]
+        assert job.parent_id == root.span_id
+
+    def test_failures_mark_span_error(self, tracer):
+        root = start_trace("run")
+        with pytest.raises(RuntimeError):
+            with log_execution_time(logger, "load_secrets"):
+                raise RuntimeError("boom")
+        root.end()
+
+        failed = _by_name(tracer.spans())["load_secrets"]
+        assert failed.error == "RuntimeError: boom"
+
+    def test_span_cap_counts_dropped(self):
+        tracer = Tracer(max_spans=2)
+        tracer.start_trace("run")
+        for _ in range(3):
+            with tracer.span("s"):
+                pass
+
+        assert len(tracer.spans()) == 2
+        assert tracer.dropped == 1
+
+
+class TestExport:
+    """Chrome trace and OTLP JSON payloads."""
+
+    @pytest.fixture
+    def finished(self, tracer):
+        root = start_trace("run")
+        with tracer.span("stagger_sleep", seconds=0.5):
+            pass
+        with pytest.raises(ValueError), track_api_call("firestore", "save"):
+            raise ValueError("bad")
+        root.end()
+        return tracer
+
+    def test_chrome_trace_events(self, finished):
+        trace = finished.to_chrome_trace()
+
+        complete = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+        assert set(complete) == {"run", "stagger_sleep", "firestore.save"}
+        assert complete["stagger_sleep"]["args"] == {"seconds": 0.5}
+        assert complete["firestore.save"]["args"]["error"] == "ValueError: bad"
+        assert complete["run"]["dur"] >= complete["stagger_sleep"]["dur"]
+        assert any(e["ph"] == "M" for e in trace["traceEvents"])
+
+    def test_otlp_json_spans(self, finished):
+        payload = finished.to_otlp_json()
+
+        (scope,) = payload["resourceSpans"][0]["scopeSpans"]
+        spans = {s["name"]: s for s in scope["spans"]}
+        root = spans["run"]
+        call = spans["firestore.save"]
+        assert "parentSpanId" not in root
+        assert call["parentSpanId"] == root["spanId"]
+        assert call["kind"] == 3
+        assert call["status"]["code"] == 2
+        assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+        assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+
+    def test_export_trace_writes_file_and_stops(self, finished, tmp_path):
+        path = export_trace(str(tmp_path), TRACE_FORMAT_CHROME, "signal_generator")
+
+        assert path is not None and path.endswith(".chrome.json")
+        assert json.loads(open(path).read())["otherData"]["trace_id"]
+        assert not finished.enabled
@@ -1,5 +1,8 @@
+import json
 from unittest.mock import MagicMock, patch
 
+from crypto_signals.engine.activity_ledger import fetch_activity_ledger
+from crypto_signals.engine.schema_guardian import SchemaGuardian
 from crypto_signals.pipelines.trade_archival import TradeArchivalPipeline
 
 
@@ -23,11 +26,12 @@ def test_trade_archival_orchestration_flow():
         patch("google.cloud.firestore.Client") as mock_firestore_cls,
         patch("crypto_signals.pipelines.base.bigquery.Client") as mock_bq_cls,
         patch("crypto_signals.engine.execution.ExecutionEngine") as mock_exec_engine,
-        patch("crypto_signals.pipelines.base.SchemaGuardian"),
+        patch("crypto_signals.pipelines.base.SchemaGuardian") as mock_guardian_cls,
     ):
         # 1. Setup Environment
         mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
         mock_settings.return_value.ENVIRONMENT = "PROD"  # Simulate PROD
+        mock_settings.return_value.ARCHIVAL_MAX_WORKERS = 4
 
         # 2. Setup Firestore Data (Mock Closed Position with Scale Outs)
         mock_firestore = mock_firestore_cls.return_value
@@ -80,6 +84,10 @@ def test_trade_archival_orchestration_flow():
         mock_alpaca.return_value.get.return_value = [mock_activity]
 
         # 4. Setup Execution Engine (Fees)
+        # The engine serves activities from a ledger fetched via the Alpaca client
+        mock_exec_engine.return_value.get_activity_ledger.side_effect = (
+            lambda start, end: fetch_activity_ledger(mock_alpaca.return_value, start, end)
+        )
         mock_exec_engine.return_value.get_current_fee_tier.return_value = {
             "tier_name": "Tier 0",
             "taker_fee_pct": 0.1,
@@ -87,6 +95,10 @@ def test_trade_archival_orchestration_flow():
 
         # 5. Setup BigQuery Mock
         mock_bq = mock_bq_cls.return_value
+        # Staging schema comes from the real model-to-schema mapping
+        mock_guardian_cls.return_value.generate_schema.side_effect = SchemaGuardian(
+            mock_bq
+        ).generate_schema
         # Ensure tables exist (mock get_table success)
         mock_bq.get_table.return_value = True
         # Ensure insert_rows_json returns empty list (no errors)
@@ -108,18 +120,11 @@ def test_trade_archival_orchestration_flow():
         # Avg Exit Price = 51500
         # PnL Gross = (51500 - 50000) * 1.0 = 1500
 
-        # We can inspect the calls to query to check the data in _merge_via_temp_table
-        # It should have been called once for the temp table creation and merge
+        # Rows are loaded into the staging table by a single load job, then merged
         assert mock_bq.query.called
-        call_args_list = mock_bq.query.call_args_list
-        # The last call should contain our JSON data in the parameters
-        last_call = call_args_list[-1]
-        job_config = last_call[1]["job_config"]
-        json_data = job_config.query_parameters[0].value
-        import json
-
-        rows = json.loads(json_data)
-        row = rows[0]
+        mock_bq.load_table_from_file.assert_called_once()
+        payload = mock_bq.load_table_from_file.call_args[0][0].getvalue()
+        row = json.loads(payload.splitlines()[0])
 
         assert row["trade_id"] == "pos_123"
         assert row["exit_price"] == 51500.0
@@ -24,6 +24,7 @@ def test_archival_fallback_for_theoretical_trades():
         # Setup Environment
         mock_settings.return_value.GOOGLE_CLOUD_PROJECT = "test-project"
         mock_settings.return_value.ENVIRONMENT = "DEV"
+        mock_settings.return_value.ARCHIVAL_MAX_WORKERS = 4
 
         # Setup ExecutionEngine fee tier for crypto handling
         # It's called in transform loop
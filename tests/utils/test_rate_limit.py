@@ -0,0 +1,76 @@
+"""Tests for the shared RateLimiter."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+from alpaca.trading.client import TradingClient
+from crypto_signals.utils.rate_limit import (
+    RateLimiter,
+    get_alpaca_data_rate_limiter,
+    get_alpaca_rate_limiter,
+    rate_limited,
+)
+
+
+def test_acquire_spaces_calls_across_threads():
+    """Concurrent callers are released one interval apart."""
+    limiter = RateLimiter(requests_per_minute=60 * 50)  # 20ms interval
+    starts = []
+    lock = threading.Lock()
+
+    def worker():
+        limiter.acquire()
+        with lock:
+            starts.append(time.monotonic())
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    starts.sort()
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.015 for gap in gaps), gaps
+
+
+def test_first_acquire_does_not_wait():
+    """An idle limiter grants the first slot immediately."""
+    limiter = RateLimiter(requests_per_minute=1)
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start < 0.05
+
+
+def test_rate_limited_paces_every_rest_request():
+    """Each HTTP request of a wrapped alpaca-py client acquires a slot first."""
+    client = TradingClient("key", "secret", paper=True)
+    send = MagicMock(return_value={"id": "acct"})
+    client._one_request = send
+    limiter = MagicMock(spec=RateLimiter)
+
+    rate_limited(client, limiter)
+    result = client._request("GET", "/account")
+
+    assert result == {"id": "acct"}
+    limiter.acquire.assert_called_once()
+    send.assert_called_once()
+
+
+def test_rate_limited_leaves_clients_without_rest_layer():
+    """Fakes without RESTClient internals are returned unchanged."""
+    fake = object()
+
+    assert rate_limited(fake, MagicMock(spec=RateLimiter)) is fake
+
+
+def test_trading_and_data_clients_use_shared_limiters():
+    """Factory clients are paced by one limiter per Alpaca API."""
+    with patch("crypto_signals.utils.rate_limit.get_settings") as settings:
+        settings.return_value.ALPACA_REQUESTS_PER_MINUTE = 600
+        settings.return_value.ALPACA_DATA_REQUESTS_PER_MINUTE = 600
+        assert get_alpaca_rate_limiter() is get_alpaca_rate_limiter()
+        assert get_alpaca_data_rate_limiter() is not get_alpaca_rate_limiter()